@@ -1,3 +1,4 @@
+import importlib
 import logging
 from collections import namedtuple
 from typing import (
@@ -6,33 +7,49 @@ from typing import (
 )
 
 from pcs.cli.common import middleware
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    dr,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    scsi,
-    services,
-    status,
-    stonith,
-    stonith_agent,
-    tag,
-)
-from pcs.lib.commands.constraint import colocation as constraint_colocation
-from pcs.lib.commands.constraint import order as constraint_order
-from pcs.lib.commands.constraint import ticket as constraint_ticket
-from pcs.lib.env import LibraryEnvironment
+
+
+class _LazyModule:
+    """
+    A module imported when any of its attributes is accessed for the first time
+    """
+
+    def __init__(self, name: str):
+        """
+        name -- full name of the module
+        """
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# Library commands are imported only when their part of the library is used,
+# so that running a pcs command does not import all of them.
+acl = _LazyModule("pcs.lib.commands.acl")
+alert = _LazyModule("pcs.lib.commands.alert")
+booth = _LazyModule("pcs.lib.commands.booth")
+cib_options = _LazyModule("pcs.lib.commands.cib_options")
+cluster = _LazyModule("pcs.lib.commands.cluster")
+constraint_colocation = _LazyModule("pcs.lib.commands.constraint.colocation")
+constraint_order = _LazyModule("pcs.lib.commands.constraint.order")
+constraint_ticket = _LazyModule("pcs.lib.commands.constraint.ticket")
+dr = _LazyModule("pcs.lib.commands.dr")
+fencing_topology = _LazyModule("pcs.lib.commands.fencing_topology")
+node = _LazyModule("pcs.lib.commands.node")
+pcsd = _LazyModule("pcs.lib.commands.pcsd")
+qdevice = _LazyModule("pcs.lib.commands.qdevice")
+quorum = _LazyModule("pcs.lib.commands.quorum")
+remote_node = _LazyModule("pcs.lib.commands.remote_node")
+resource = _LazyModule("pcs.lib.commands.resource")
+resource_agent = _LazyModule("pcs.lib.commands.resource_agent")
+sbd = _LazyModule("pcs.lib.commands.sbd")
+scsi = _LazyModule("pcs.lib.commands.scsi")
+services = _LazyModule("pcs.lib.commands.services")
+status = _LazyModule("pcs.lib.commands.status")
+stonith = _LazyModule("pcs.lib.commands.stonith")
+stonith_agent = _LazyModule("pcs.lib.commands.stonith_agent")
+tag = _LazyModule("pcs.lib.commands.tag")
 
 # Note: not properly typed
 _CACHE: Dict[Any, Any] = {}
@@ -43,6 +60,10 @@ def wrapper(dictionary):
 
 
 def cli_env_to_lib_env(cli_env):
+    # pcs.lib.env imports a large part of pcs.lib, import it only when needed
+    # pylint: disable=import-outside-toplevel
+    from pcs.lib.env import LibraryEnvironment
+
     return LibraryEnvironment(
         logging.getLogger("pcs"),
         cli_env.report_processor,
@@ -53,6 +74,7 @@ def cli_env_to_lib_env(cli_env):
         booth_files_data=cli_env.booth,
         known_hosts_getter=cli_env.known_hosts_getter,
         request_timeout=cli_env.request_timeout,
+        debug=cli_env.debug,
     )
 
 
@@ -104,6 +126,13 @@ def bind_all(env, run_with_middleware, dictionary):
     )
 
 
+def clear_cache():
+    """
+    Forget library parts bound to environments of previously used libraries
+    """
+    _CACHE.clear()
+
+
 def get_module(env, middleware_factory, name):
     if name not in _CACHE:
         _CACHE[name] = load_module(env, middleware_factory, name)
@@ -360,6 +389,8 @@ def load_module(env, middleware_factory, name):
                 "list_agents": resource_agent.list_agents,
                 "list_ocf_providers": resource_agent.list_ocf_providers,
                 "list_standards": resource_agent.list_standards,
+                "warm_metadata_cache": resource_agent.warm_metadata_cache,
+                "clear_metadata_cache": resource_agent.clear_metadata_cache,
             },
         )
 
@@ -379,6 +410,7 @@ def load_module(env, middleware_factory, name):
                 "create_as_clone": resource.create_as_clone,
                 "create_in_group": resource.create_in_group,
                 "create_into_bundle": resource.create_into_bundle,
+                "delete": resource.delete,
                 "disable": resource.disable,
                 "disable_safe": resource.disable_safe,
                 "disable_simulate": resource.disable_simulate,
@@ -429,6 +461,8 @@ def load_module(env, middleware_factory, name):
                 "full_cluster_status_plaintext": (
                     status.full_cluster_status_plaintext
                 ),
+                "node_status_dto": status.node_status_dto,
+                "pcsd_node_status": status.pcsd_node_status,
             },
         )
 
@@ -1,3 +1,4 @@
+import importlib
 from typing import (
     Any,
     Callable,
@@ -39,3 +40,22 @@ def create_router(
             )
 
     return _router
+
+
+def import_cmd(module_name: str, cmd_name: str) -> CliCmdInterface:
+    """
+    Return a command which imports its module only when the command is run
+
+    This prevents importing modules of all commands when running just one of
+    them.
+
+    module_name -- full name of a module defining the command
+    cmd_name -- name of the command function in the module
+    """
+
+    def _cmd(lib: Any, argv: List[str], modifiers: InputModifiers) -> None:
+        return getattr(importlib.import_module(module_name), cmd_name)(
+            lib, argv, modifiers
+        )
+
+    return _cmd
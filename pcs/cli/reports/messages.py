@@ -261,6 +261,17 @@ class UseCommandNodeRemoveGuest(CliReportMessageCustom):
         )
 
 
+class UseCommandNodeRemoveRemote(CliReportMessageCustom):
+    _obj: messages.UseCommandNodeRemoveRemote
+
+    @property
+    def message(self) -> str:
+        return (
+            "this command is not sufficient for removing a remote node, use"
+            " 'pcs cluster node remove-remote'"
+        )
+
+
 class UseCommandNodeAddGuest(CliReportMessageCustom):
     _obj: messages.UseCommandNodeAddGuest
 
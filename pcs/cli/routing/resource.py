@@ -25,6 +25,13 @@ resource_cmd = create_router(
         "standards": resource.resource_standards,
         "providers": resource.resource_providers,
         "agents": resource.resource_agents,
+        "metadata-cache": create_router(
+            {
+                "warm": resource.resource_metadata_cache_warm,
+                "clear": resource.resource_metadata_cache_clear,
+            },
+            ["resource", "metadata-cache"],
+        ),
         "update": resource.update_cmd,
         "meta": resource.meta_cmd,
         "delete": resource.resource_remove_cmd,
@@ -1,7 +1,13 @@
 import base64
 import io
 import re
-from collections import namedtuple
+import selectors
+import time
+from collections import (
+    OrderedDict,
+    deque,
+    namedtuple,
+)
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -126,6 +132,17 @@ class Request:
         """
         self._current_dest = next(self._current_dest_iterator)
 
+    def use_dest(self, dest):
+        """
+        Move to the specified host connection. Following calls of next_dest
+        continue with connections placed after it in the target's dest_list.
+
+        Destination dest -- one of the target's destinations
+        """
+        index = self._target.dest_list.index(dest)
+        self._current_dest_iterator = iter(self._target.dest_list[index + 1 :])
+        self._current_dest = dest
+
     @property
     def url(self):
         """
@@ -176,13 +193,25 @@ class Response:
     property.
     """
 
-    def __init__(self, handle, was_connected, errno=None, error_msg=None):
+    def __init__(
+        self, handle, was_connected, errno=None, error_msg=None, request=None
+    ):
+        """
+        pycurl.Curl handle -- processed curl easy handle
+        bool was_connected -- was the connection successful
+        int errno -- error number
+        string error_msg -- text description of error
+        Request request -- request of the response, defaults to the request
+            the handle has been set up for
+        """
+        # pylint: disable=too-many-arguments
         self._handle = handle
+        self._request = request if request is not None else handle.request_obj
         self._was_connected = was_connected
         self._errno = errno
         self._error_msg = error_msg
-        self._data = None
-        self._debug = None
+        # values read from the handle, kept so that the handle can be reused
+        self._handle_values = {}
 
     @classmethod
     def connection_successful(cls, handle):
@@ -204,9 +233,19 @@ class Response:
         """
         return cls(handle, False, errno, error_msg)
 
+    def detach_handle(self):
+        """
+        Read everything needed from the curl handle, so the handle can be
+        reused for another request without affecting this response
+        """
+        # pylint: disable=pointless-statement
+        self.data
+        self.debug
+        self.response_code
+
     @property
     def request(self):
-        return self._handle.request_obj
+        return self._request
 
     @property
     def handle(self):
@@ -226,21 +265,34 @@ class Response:
 
     @property
     def data(self):
-        if self._data is None:
-            self._data = self._handle.output_buffer.getvalue().decode("utf-8")
-        return self._data
+        return self._get_handle_value(
+            "data",
+            lambda: self._handle.output_buffer.getvalue().decode("utf-8"),
+        )
 
     @property
     def debug(self):
-        if self._debug is None:
-            self._debug = self._handle.debug_buffer.getvalue().decode("utf-8")
-        return self._debug
+        def _get_debug():
+            debug_buffer = self._handle.debug_buffer
+            if debug_buffer is None:
+                return ""
+            return debug_buffer.getvalue().decode("utf-8", "ignore")
+
+        return self._get_handle_value("debug", _get_debug)
 
     @property
     def response_code(self):
         if not self.was_connected:
             return None
-        return self._handle.getinfo(pycurl.RESPONSE_CODE)
+        return self._get_handle_value(
+            "response_code",
+            lambda: self._handle.getinfo(pycurl.RESPONSE_CODE),
+        )
+
+    def _get_handle_value(self, name, getter):
+        if name not in self._handle_values:
+            self._handle_values[name] = getter()
+        return self._handle_values[name]
 
     def __repr__(self):
         return str(
@@ -256,26 +308,399 @@ class Response:
         )
 
 
+class DebugCapture:
+    """
+    Settings of capturing libcurl debug output of requests
+
+    Capturing the debug output is expensive. Libcurl calls a python callback
+    for every chunk of transferred data and all the data get copied to
+    a buffer. Only turn it on when the debug output is going to be used.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        int max_size -- if set, keep only last max_size bytes of debug output
+            of each request
+        """
+        self.max_size = max_size
+
+    def create_buffer(self):
+        if self.max_size:
+            return _RingBuffer(self.max_size)
+        return io.BytesIO()
+
+
+class _RingBuffer:
+    """
+    Bytes buffer keeping only the last max_size bytes written to it
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._chunks = deque()
+        self._size = 0
+
+    def write(self, data):
+        self._chunks.append(data)
+        self._size += len(data)
+        while self._size - len(self._chunks[0]) >= self._max_size:
+            self._size -= len(self._chunks.popleft())
+        if self._size > self._max_size:
+            self._chunks[0] = self._chunks[0][self._size - self._max_size :]
+            self._size = self._max_size
+        return len(data)
+
+    def getvalue(self):
+        return b"".join(self._chunks)
+
+
 class NodeCommunicatorFactory:
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout,
+        debug_capture=None,
+        engine_class=None,
+    ):
+        """
+        DebugCapture debug_capture -- if set, capture debug output of requests
+        class engine_class -- class driving curl multi handles of communicators
+        """
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        # options passed to all communicators created by the factory
+        self._communicator_options = {
+            "debug_capture": debug_capture,
+            "engine_class": engine_class,
+        }
+        self._handle_pool = None
+        self._preferred_dests = {}
 
     def get_communicator(self, request_timeout=None):
+        if settings.node_communication_pooled:
+            return self.get_pooled_communicator(request_timeout=request_timeout)
         return self.get_simple_communicator(request_timeout=request_timeout)
 
     def get_simple_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            **self._communicator_options,
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            **self._communicator_options,
+            race_stagger=settings.node_communication_race_stagger,
+            preferred_dests=self._preferred_dests,
+        )
+
+    def get_pooled_communicator(self, request_timeout=None):
+        """
+        Return a communicator reusing connections to nodes
+
+        All pooled communicators created by this factory share one pool, so
+        connections and TLS sessions opened in one round of requests are
+        reused in the following rounds.
+        """
+        timeout = request_timeout if request_timeout else self._request_timeout
+        return PooledCommunicator(
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            **self._communicator_options,
+            handle_pool=self.handle_pool,
+        )
+
+    @property
+    def handle_pool(self):
+        if self._handle_pool is None:
+            self._handle_pool = CurlHandlePool()
+        return self._handle_pool
+
+
+class RequestScheduler:
+    """
+    Queue of requests limiting how many requests run at the same time
+
+    Requests are started in a round-robin manner across hosts, so a slow host
+    with many queued requests does not hold up requests to other hosts.
+    """
+
+    def __init__(self, max_running=0, max_running_per_host=0):
+        """
+        int max_running -- max number of running requests, 0 means no limit
+        int max_running_per_host -- max number of running requests to one
+            host, 0 means no limit
+        """
+        self._max_running = max_running
+        self._max_running_per_host = max_running_per_host
+        # host label -> deque of [request, time queued, deferred flag]
+        self._queues = OrderedDict()
+        self._running_per_host = {}
+        self._running_count = 0
+
+    @property
+    def running_count(self):
+        return self._running_count
+
+    @property
+    def queued_count(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(self, request):
+        """
+        Put a request to the queue
+
+        Request request -- request to be started
+        """
+        self._queues.setdefault(request.host_label, deque()).append(
+            [request, time.monotonic(), False]
+        )
+
+    def dequeue(self, request):
+        """
+        Remove a request waiting in the queue, return True if it was there
+
+        Request request -- request put to the queue by enqueue
+        """
+        queue = self._queues.get(request.host_label)
+        if not queue:
+            return False
+        for item in queue:
+            if item[0] is request:
+                queue.remove(item)
+                if not queue:
+                    del self._queues[request.host_label]
+                return True
+        return False
+
+    def request_finished(self, request):
+        """
+        Free the slot occupied by a started request
+
+        Request request -- a finished request returned by dequeue_ready
+        """
+        self._running_count -= 1
+        label = request.host_label
+        self._running_per_host[label] -= 1
+        if self._running_per_host[label] < 1:
+            del self._running_per_host[label]
+
+    def dequeue_ready(self):
+        """
+        Return a list of requests which can be started now
+
+        Items of the list are tuples (request, queue time). Queue time is the
+        number of seconds a request waited in the queue. It is None for
+        requests which have not been postponed, i.e. the ones which could be
+        started right when they were put to the queue.
+        """
+        ready_list = []
+        progress = True
+        while progress and self._queues and self._has_free_slot():
+            progress = False
+            for label in list(self._queues):
+                if not self._has_free_slot():
+                    break
+                if (
+                    self._max_running_per_host > 0
+                    and self._running_per_host.get(label, 0)
+                    >= self._max_running_per_host
+                ):
+                    continue
+                queue = self._queues[label]
+                request, queued_at, deferred = queue.popleft()
+                if queue:
+                    # let other hosts go first in the next round
+                    self._queues.move_to_end(label)
+                else:
+                    del self._queues[label]
+                self._running_count += 1
+                self._running_per_host[label] = (
+                    self._running_per_host.get(label, 0) + 1
+                )
+                ready_list.append(
+                    (
+                        request,
+                        time.monotonic() - queued_at if deferred else None,
+                    )
+                )
+                progress = True
+        for queue in self._queues.values():
+            for item in queue:
+                item[2] = True
+        return ready_list
+
+    def _has_free_slot(self):
+        return self._max_running < 1 or self._running_count < self._max_running
+
+
+class MultiSelectEngine:
+    """
+    Drives transfers of a curl multi handle by polling it using select
+    """
+
+    curl_multi_select_timeout_default = 0.8  # in seconds
+
+    def __init__(self, multi_handle):
+        """
+        pycurl.CurlMulti multi_handle -- multi handle to be driven
+        """
+        self._multi_handle = multi_handle
+
+    def run_once(self, max_wait=None):
+        """
+        Run transfers and wait until there is something to process
+
+        float max_wait -- max number of seconds to wait, None means no limit
+        """
+        self.kick()
+        self._wait_for_multi_handle(max_wait)
+
+    def kick(self):
+        """
+        Start processing of newly added handles
+        """
+        # run all internal operation required by libcurl
+        status, dummy_num_to_process = self._multi_handle.perform()
+        # if perform returns E_CALL_MULTI_PERFORM it requires to call perform
+        # once again right away
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, dummy_num_to_process = self._multi_handle.perform()
+
+    def _wait_for_multi_handle(self, max_wait=None):
+        deadline = time.monotonic() + max_wait if max_wait is not None else None
+        # try to wait until there is something to do for us
+        need_to_wait = True
+        while need_to_wait:
+            timeout = self._multi_handle.timeout()
+            if timeout == 0:
+                # if timeout == 0 then there is something to precess already
+                return
+            timeout = (
+                timeout / 1000.0
+                if timeout > 0
+                # curl don't have timeout set, so we can use our default
+                else self.curl_multi_select_timeout_default
+            )
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                timeout = min(timeout, remaining)
+            # when value returned from select is -1, it timed out, so we can
+            # wait
+            need_to_wait = self._multi_handle.select(timeout) == -1
+
+
+class MultiSocketActionEngine:
+    """
+    Drives transfers of a curl multi handle in an event-driven way
+
+    Libcurl tells us which sockets to watch and when its timeouts expire. We
+    wait for the sockets using a selector and let libcurl process only the
+    sockets which are ready, right after they are ready.
+    """
+
+    # Used when libcurl does not ask for any timeout. It is only a safety net,
+    # libcurl always sets a timer when it has some work to do.
+    wait_timeout_default = 0.8  # in seconds
+
+    def __init__(self, multi_handle):
+        """
+        pycurl.CurlMulti multi_handle -- multi handle to be driven
+        """
+        self._multi_handle = multi_handle
+        self._selector = selectors.DefaultSelector()
+        self._timer_deadline = None
+        self._multi_handle.setopt(
+            pycurl.M_SOCKETFUNCTION, self._socket_callback
+        )
+        self._multi_handle.setopt(pycurl.M_TIMERFUNCTION, self._timer_callback)
+
+    def run_once(self, max_wait=None):
+        """
+        Wait for sockets or a timeout, then let libcurl process them
+
+        float max_wait -- max number of seconds to wait, None means no limit
+        """
+        timeout = self.wait_timeout_default
+        if self._timer_deadline is not None:
+            timeout = max(0, self._timer_deadline - time.monotonic())
+        if max_wait is not None:
+            timeout = min(timeout, max_wait)
+        if self._selector.get_map():
+            ready_list = self._selector.select(timeout)
+        else:
+            # selectors raise an error on some platforms when there is nothing
+            # to wait for
+            time.sleep(timeout)
+            ready_list = []
+        for key, events in ready_list:
+            ev_bitmask = 0
+            if events & selectors.EVENT_READ:
+                ev_bitmask |= pycurl.CSELECT_IN
+            if events & selectors.EVENT_WRITE:
+                ev_bitmask |= pycurl.CSELECT_OUT
+            self._socket_action(key.fd, ev_bitmask)
+        if (
+            self._timer_deadline is not None
+            and self._timer_deadline <= time.monotonic()
+        ) or (not ready_list and self._timer_deadline is None):
+            self._timer_deadline = None
+            self._socket_action(pycurl.SOCKET_TIMEOUT, 0)
+
+    def kick(self):
+        """
+        Start processing of newly added handles
+        """
+        # Libcurl sets a zero timeout when a handle is added. The next call of
+        # run_once will start the transfer without any waiting.
+
+    def _socket_action(self, sockfd, ev_bitmask):
+        status, dummy_running = self._multi_handle.socket_action(
+            sockfd, ev_bitmask
+        )
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, dummy_running = self._multi_handle.socket_action(
+                sockfd, ev_bitmask
+            )
+
+    def _socket_callback(self, what, sockfd, multi_handle, socketp):
+        # pylint: disable=unused-argument
+        registered = sockfd in self._selector.get_map()
+        if what == pycurl.POLL_REMOVE:
+            if registered:
+                self._selector.unregister(sockfd)
+            return
+        events = 0
+        if what in (pycurl.POLL_IN, pycurl.POLL_INOUT):
+            events |= selectors.EVENT_READ
+        if what in (pycurl.POLL_OUT, pycurl.POLL_INOUT):
+            events |= selectors.EVENT_WRITE
+        if registered:
+            self._selector.modify(sockfd, events)
+        else:
+            self._selector.register(sockfd, events)
+
+    def _timer_callback(self, timeout_ms):
+        self._timer_deadline = (
+            time.monotonic() + timeout_ms / 1000.0 if timeout_ms >= 0 else None
         )
 
 
@@ -286,17 +711,58 @@ class Communicator:
     only in a single thread. Use an unique instance for each thread.
     """
 
-    curl_multi_select_timeout_default = 0.8  # in seconds
-
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    # The communicator keeps settings of requests, the queue of requests, the
+    # multi handle with its engine and the running easy handles.
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        max_running=None,
+        max_running_per_host=None,
+        debug_capture=None,
+        engine_class=None,
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger -- logger
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- request timeout in seconds
+        int max_running -- max number of requests running at once, requests
+            over the limit are queued, 0 means no limit
+        int max_running_per_host -- max number of requests running at once to
+            one host, requests over the limit are queued, 0 means no limit
+        DebugCapture debug_capture -- if set, capture debug output of requests
+            to be available in responses
+        class engine_class -- class driving the curl multi handle,
+            MultiSelectEngine by default
+        """
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
+        self._debug_capture = debug_capture
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
             request_timeout
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._scheduler = RequestScheduler(
+            max_running=(
+                max_running
+                if max_running is not None
+                else settings.node_communication_max_running
+            ),
+            max_running_per_host=(
+                max_running_per_host
+                if max_running_per_host is not None
+                else settings.node_communication_max_running_per_host
+            ),
+        )
         self._multi_handle = pycurl.CurlMulti()
+        self._engine = (engine_class or MultiSelectEngine)(self._multi_handle)
         self._is_running = False
         # This is used just for storing references of curl easy handles.
         # We need to have references for all the handles, so they don't be
@@ -310,19 +776,23 @@ class Communicator:
         getting responses from generator.  Requests are not performed after
         calling this method, but only when generator returned by start_loop
         method is in progress (returned at least one response and not raised
-        StopIteration exception).
+        StopIteration exception). If there are too many requests running,
+        the requests wait in the queue for the running ones to finish.
 
         list request_list -- Request objects to add to the queue
         """
         for request in request_list:
-            handle = _create_request_handle(
-                request,
-                self._auth_cookies,
-                self._request_timeout,
-            )
+            self._scheduler.enqueue(request)
+        self.__start_ready_requests()
+
+    def __start_ready_requests(self):
+        for request, queue_time in self._scheduler.dequeue_ready():
+            handle = self._get_request_handle(request)
             self._easy_handle_list.append(handle)
             self._multi_handle.add_handle(handle)
             if self._is_running:
+                if queue_time is not None:
+                    self._logger.log_request_queued(request, queue_time)
                 self._logger.log_request_start(request)
 
     def start_loop(self):
@@ -356,22 +826,82 @@ class Communicator:
 
         finished_count = 0
         while finished_count < len(self._easy_handle_list):
-            self.__multi_perform()
-            self.__wait_for_multi_handle()
+            self._engine.run_once(max_wait=self._get_max_wait())
+            self._process_timers()
             response_list = self.__get_all_ready_responses()
             for response in response_list:
                 # free up memory for next usage of this Communicator instance
                 self._multi_handle.remove_handle(response.handle)
+                self._release_request_handle(response)
+                self._scheduler.request_finished(response.request)
                 self._logger.log_response(response)
+                # start queued requests waiting for a free slot
+                self.__start_ready_requests()
                 yield response
                 # if something was added to the queue in the meantime, run it
                 # immediately, so we don't need to wait until all responses will
                 # be processed
-                self.__multi_perform()
+                self._engine.kick()
             finished_count += len(response_list)
         self._easy_handle_list = []
         self._is_running = False
 
+    def _get_request_handle(self, request):
+        """
+        Return a curl easy handle set up for the specified request
+
+        Request request -- request to be performed using the handle
+        """
+        return _create_request_handle(
+            request,
+            self._auth_cookies,
+            self._request_timeout,
+            debug_capture=self._debug_capture,
+        )
+
+    def _release_request_handle(self, response):
+        """
+        Called when a handle has been processed and removed from the multi
+        handle
+
+        Response response -- response created from the processed handle
+        """
+
+    def _get_max_wait(self):
+        """
+        Return max number of seconds to wait for transfers before calling
+        _process_timers, None means no limit
+        """
+        # pylint: disable=no-self-use
+        return None
+
+    def _process_timers(self):
+        """
+        Called after each wait for transfers, before responses are processed
+        """
+
+    def _cancel_request(self, request):
+        """
+        Stop processing a request without producing a response for it
+
+        Only call this from _process_timers, as the request must not have
+        a response ready to be processed.
+
+        Request request -- queued or running request
+        """
+        if self._scheduler.dequeue(request):
+            return
+        for handle in self._easy_handle_list:
+            if handle.request_obj is request:
+                self._multi_handle.remove_handle(handle)
+                self._easy_handle_list.remove(handle)
+                # The transfer has not finished, its connection cannot be
+                # reused. Do not leave it open until the handle is collected.
+                handle.close()
+                self._scheduler.request_finished(request)
+                self.__start_ready_requests()
+                return
+
     def __get_all_ready_responses(self):
         response_list = []
         repeat = True
@@ -387,33 +917,6 @@ class Communicator:
             repeat = num_queued > 0
         return response_list
 
-    def __multi_perform(self):
-        # run all internal operation required by libcurl
-        status, num_to_process = self._multi_handle.perform()
-        # if perform returns E_CALL_MULTI_PERFORM it requires to call perform
-        # once again right away
-        while status == pycurl.E_CALL_MULTI_PERFORM:
-            status, num_to_process = self._multi_handle.perform()
-        return num_to_process
-
-    def __wait_for_multi_handle(self):
-        # try to wait until there is something to do for us
-        need_to_wait = True
-        while need_to_wait:
-            timeout = self._multi_handle.timeout()
-            if timeout == 0:
-                # if timeout == 0 then there is something to precess already
-                return
-            timeout = (
-                timeout / 1000.0
-                if timeout > 0
-                # curl don't have timeout set, so we can use our default
-                else self.curl_multi_select_timeout_default
-            )
-            # when value returned from select is -1, it timed out, so we can
-            # wait
-            need_to_wait = self._multi_handle.select(timeout) == -1
-
 
 class MultiaddressCommunicator(Communicator):
     """
@@ -421,9 +924,76 @@ class MultiaddressCommunicator(Communicator):
     it takes advantage of multiple hosts in RequestTarget. So if it is not
     possible to connect to target using first hostname, it will use next one
     until connection will be successful or there is no host left.
+
+    In racing mode, it does not wait for a connection attempt to fail before
+    trying the next address. If the attempt is still pending after a stagger
+    delay, it starts connecting to the next address in parallel. The first
+    attempt which connects wins and the others are cancelled. Addresses which
+    won are remembered per host and tried first by the following requests.
     """
 
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        max_running=None,
+        max_running_per_host=None,
+        debug_capture=None,
+        engine_class=None,
+        race_stagger=None,
+        preferred_dests=None,
+    ):
+        """
+        float race_stagger -- number of seconds to wait for a connection to an
+            address before trying the next address in parallel, None disables
+            the racing mode
+        dict preferred_dests -- host label -> Destination which won a race,
+            share the dict between communicators to remember winning addresses
+            across them
+        """
+        # pylint: disable=too-many-arguments
+        super().__init__(
+            communicator_logger,
+            user,
+            groups,
+            request_timeout=request_timeout,
+            max_running=max_running,
+            max_running_per_host=max_running_per_host,
+            debug_capture=debug_capture,
+            engine_class=engine_class,
+        )
+        # Racing needs to know when a connection has been established, which
+        # requires CURLOPT_PREREQFUNCTION (libcurl >= 7.80.0).
+        self._race_stagger = (
+            race_stagger if hasattr(pycurl, "PREREQFUNCTION") else None
+        )
+        self._preferred_dests = (
+            preferred_dests if preferred_dests is not None else {}
+        )
+        self._race_list = []
+        # attempt request -> _AddressRace
+        self._attempt_races = {}
+
+    def add_requests(self, request_list):
+        if self._race_stagger is None:
+            super().add_requests(request_list)
+            return
+        for request in request_list:
+            dest_list = list(request.target.dest_list)
+            preferred = self._preferred_dests.get(request.host_label)
+            if preferred in dest_list:
+                dest_list.remove(preferred)
+                dest_list.insert(0, preferred)
+            race = _AddressRace(request, dest_list)
+            self._race_list.append(race)
+            self._start_attempt(race)
+
     def start_loop(self):
+        if self._race_stagger is not None:
+            yield from self._start_racing_loop()
+            return
         for response in super().start_loop():
             if response.was_connected:
                 yield response
@@ -437,8 +1007,285 @@ class MultiaddressCommunicator(Communicator):
                 self._logger.log_no_more_addresses(response)
                 yield response
 
+    def _start_racing_loop(self):
+        for response in super().start_loop():
+            attempt = response.request
+            race = self._attempt_races.pop(attempt)
+            race.attempt_list.remove(attempt)
+            if race.winner is not None and race.winner is not attempt:
+                # another address won the race, this attempt has been aborted
+                continue
+            if response.was_connected:
+                self._preferred_dests[race.request.host_label] = attempt.dest
+                if not race.attempt_list:
+                    self._race_list.remove(race)
+                # else the other attempts get cancelled in _process_timers
+                yield self._race_response(race, response, attempt.dest)
+                continue
+            race.winner = None
+            if race.pending_dest_list:
+                self._logger.log_retry(
+                    self._race_response(
+                        race, response, race.pending_dest_list[0]
+                    ),
+                    attempt.dest,
+                )
+                self._start_attempt(race)
+                continue
+            if race.attempt_list:
+                # other addresses are still being tried
+                continue
+            self._race_list.remove(race)
+            response = self._race_response(race, response, attempt.dest)
+            self._logger.log_no_more_addresses(response)
+            yield response
+
+    def _start_attempt(self, race):
+        dest = race.pending_dest_list.popleft()
+        target = race.request.target
+        attempt = Request(
+            RequestTarget(target.label, token=target.token, dest_list=[dest]),
+            RequestData(race.request.action, data=race.request.data),
+        )
+        race.attempt_list.append(attempt)
+        race.next_attempt_time = (
+            time.monotonic() + self._race_stagger
+            if race.pending_dest_list
+            else None
+        )
+        self._attempt_races[attempt] = race
+        super().add_requests([attempt])
+
+    @staticmethod
+    def _race_response(race, response, dest):
+        # Report responses of attempts as responses of the original request
+        # set to the attempt's address. The handle stays bound to the attempt.
+        race.request.use_dest(dest)
+        return Response(
+            response.handle,
+            response.was_connected,
+            response.errno,
+            response.error_msg,
+            request=race.request,
+        )
+
+    def _get_request_handle(self, request):
+        handle = super()._get_request_handle(request)
+        race = self._attempt_races.get(request)
+        if race is not None:
+
+            def _on_connected(*_):
+                if race.winner is None:
+                    race.winner = request
+                return (
+                    pycurl.PREREQFUNC_OK
+                    if race.winner is request
+                    else pycurl.PREREQFUNC_ABORT
+                )
+
+            handle.setopt(pycurl.PREREQFUNCTION, _on_connected)
+        return handle
+
+    def _get_max_wait(self):
+        deadline_list = [
+            race.next_attempt_time
+            for race in self._race_list
+            if race.winner is None and race.next_attempt_time is not None
+        ]
+        if not deadline_list:
+            return None
+        return max(0, min(deadline_list) - time.monotonic())
+
+    def _process_timers(self):
+        for race in list(self._race_list):
+            if race.winner is not None:
+                for attempt in race.attempt_list:
+                    if attempt is not race.winner:
+                        self._cancel_request(attempt)
+                        del self._attempt_races[attempt]
+                race.attempt_list = [
+                    attempt
+                    for attempt in race.attempt_list
+                    if attempt is race.winner
+                ]
+                race.next_attempt_time = None
+                if not race.attempt_list:
+                    # the winner has been processed already
+                    self._race_list.remove(race)
+                continue
+            while (
+                race.next_attempt_time is not None
+                and race.next_attempt_time <= time.monotonic()
+            ):
+                self._start_attempt(race)
+
+
+class _AddressRace:
+    """
+    Attempts to connect to addresses of one request in racing mode
+    """
+
+    def __init__(self, request, dest_list):
+        self.request = request
+        self.pending_dest_list = deque(dest_list)
+        # started attempts, each of them is a Request with one destination
+        self.attempt_list = []
+        # the attempt which connected first
+        self.winner = None
+        self.next_attempt_time = None
+
+
+class CurlHandlePool:
+    """
+    Pool of curl easy handles sharing connections and TLS sessions
+
+    All handles provided by the pool are attached to one CurlShare object, so
+    libcurl can keep connections to nodes open and reuse them (as well as TLS
+    sessions and DNS records) across requests and across multi handles. Idle
+    easy handles are kept per destination to be reused by following requests
+    to the same destination.
+    The pool is not thread-safe, do not share it between threads.
+    """
+
+    default_max_idle_per_dest = 4
+    default_max_connections = 128
+
+    def __init__(self, max_idle_per_dest=None, max_connections=None):
+        """
+        int max_idle_per_dest -- max number of idle handles kept per destination
+        int max_connections -- max number of open connections kept in the pool
+        """
+        self._max_idle_per_dest = (
+            max_idle_per_dest
+            if max_idle_per_dest is not None
+            else self.default_max_idle_per_dest
+        )
+        self.max_connections = (
+            max_connections
+            if max_connections is not None
+            else self.default_max_connections
+        )
+        self._share = pycurl.CurlShare()
+        for lock_data in (
+            pycurl.LOCK_DATA_CONNECT,
+            pycurl.LOCK_DATA_DNS,
+            pycurl.LOCK_DATA_SSL_SESSION,
+        ):
+            self._share.setopt(pycurl.SH_SHARE, lock_data)
+        self._idle_handles = {}
+
+    @staticmethod
+    def _dest_key(dest):
+        return (dest.addr, dest.port)
+
+    def get_handle(self, request, cookies, timeout, debug_capture=None):
+        """
+        Return an easy handle set up for the specified request
+
+        Request request -- request specification
+        dict cookies -- cookies to add to request
+        int timeout -- request timeout
+        DebugCapture debug_capture -- if set, capture debug output of request
+        """
+        idle_list = self._idle_handles.get(self._dest_key(request.dest))
+        if idle_list:
+            handle = idle_list.pop()
+            # reset keeps live connections and the share object
+            handle.reset()
+        else:
+            handle = pycurl.Curl()
+            handle.setopt(pycurl.SHARE, self._share)
+        return _setup_request_handle(
+            handle, request, cookies, timeout, debug_capture=debug_capture
+        )
+
+    def release_handle(self, handle, dest):
+        """
+        Put a processed handle back to the pool
+
+        pycurl.Curl handle -- easy handle provided by this pool
+        Destination dest -- destination the handle was used for
+        """
+        idle_list = self._idle_handles.setdefault(self._dest_key(dest), [])
+        if len(idle_list) < self._max_idle_per_dest:
+            # do not keep references to the request and its data
+            handle.request_obj = None
+            handle.output_buffer = None
+            handle.debug_buffer = None
+            idle_list.append(handle)
+        else:
+            handle.close()
+
+    def close(self):
+        """
+        Close all idle handles and the connections kept by the pool
+        """
+        for idle_list in self._idle_handles.values():
+            for handle in idle_list:
+                handle.close()
+        self._idle_handles = {}
+        self._share.close()
+
+
+class PooledCommunicator(Communicator):
+    """
+    Class with same interface as Communicator. In difference with Communicator,
+    it takes curl handles from a CurlHandlePool, so connections to nodes are
+    kept open and reused by following requests.
+    """
+
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        max_running=None,
+        max_running_per_host=None,
+        debug_capture=None,
+        engine_class=None,
+        handle_pool=None,
+    ):
+        # pylint: disable=too-many-arguments
+        super().__init__(
+            communicator_logger,
+            user,
+            groups,
+            request_timeout=request_timeout,
+            max_running=max_running,
+            max_running_per_host=max_running_per_host,
+            debug_capture=debug_capture,
+            engine_class=engine_class,
+        )
+        self._handle_pool = (
+            handle_pool if handle_pool is not None else CurlHandlePool()
+        )
+        # By default, libcurl limits the connection cache according to the
+        # number of handles in the multi handle. That would make it close some
+        # of the pooled connections once a round of requests is finished.
+        self._multi_handle.setopt(
+            pycurl.M_MAXCONNECTS, self._handle_pool.max_connections
+        )
+
+    def _get_request_handle(self, request):
+        return self._handle_pool.get_handle(
+            request,
+            self._auth_cookies,
+            self._request_timeout,
+            debug_capture=self._debug_capture,
+        )
+
+    def _release_request_handle(self, response):
+        # The handle is going to be reused. Load everything the response needs
+        # from it now.
+        response.detach_handle()
+        self._handle_pool.release_handle(response.handle, response.request.dest)
+
 
 class CommunicatorLoggerInterface:
+    def log_request_queued(self, request, queue_time):
+        raise NotImplementedError()
+
     def log_request_start(self, request):
         raise NotImplementedError()
 
@@ -475,13 +1322,31 @@ def _get_auth_cookies(user, group_list):
     return cookies
 
 
-def _create_request_handle(request, cookies, timeout):
+def _create_request_handle(request, cookies, timeout, debug_capture=None):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
+    DebugCapture debug_capture -- if set, capture debug output of request
+    """
+    return _setup_request_handle(
+        pycurl.Curl(), request, cookies, timeout, debug_capture=debug_capture
+    )
+
+
+def _setup_request_handle(
+    handle, request, cookies, timeout, debug_capture=None
+):
+    """
+    Set up a Curl object (easy handle) with specified parameters, return it
+
+    pycurl.Curl handle -- a new or reset easy handle
+    Request request -- request specification
+    dict cookies -- cookies to add to request
+    int timeot -- request timeout
+    DebugCapture debug_capture -- if set, capture debug output of request
     """
     # it is not possible to take this callback out of this function, because of
     # curl API
@@ -501,15 +1366,15 @@ def _create_request_handle(request, cookies, timeout):
                 debug_output.write(b"\n")
 
     output = io.BytesIO()
-    debug_output = io.BytesIO()
+    debug_output = debug_capture.create_buffer() if debug_capture else None
     cookies.update(request.cookies)
-    handle = pycurl.Curl()
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if debug_output is not None:
+        handle.setopt(pycurl.VERBOSE, 1)
+        handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1)  # required for multi-threading
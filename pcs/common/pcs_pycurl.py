@@ -10,6 +10,8 @@ required_constants = {
     "PROTOCOLS": 181,
     "PROTO_HTTPS": 2,
     "E_OPERATION_TIMEDOUT": 28,
+    # shared connection cache is supported since libcurl 7.57.0
+    "LOCK_DATA_CONNECT": 5,
     # these are types of debug messages
     # see https://curl.haxx.se/libcurl/c/CURLOPT_DEBUGFUNCTION.html
     "DEBUG_TEXT": 0,
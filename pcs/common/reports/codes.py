@@ -36,6 +36,7 @@ AGENT_GENERIC_ERROR = M("AGENT_GENERIC_ERROR")
 AGENT_IMPLEMENTS_UNSUPPORTED_OCF_VERSION = M(
     "AGENT_IMPLEMENTS_UNSUPPORTED_OCF_VERSION"
 )
+AGENT_METADATA_LOAD_TIMED_OUT = M("AGENT_METADATA_LOAD_TIMED_OUT")
 AGENT_NAME_GUESS_FOUND_MORE_THAN_ONE = M("AGENT_NAME_GUESS_FOUND_MORE_THAN_ONE")
 AGENT_NAME_GUESS_FOUND_NONE = M("AGENT_NAME_GUESS_FOUND_NONE")
 AGENT_NAME_GUESSED = M("AGENT_NAME_GUESSED")
@@ -102,6 +103,9 @@ CANNOT_MOVE_RESOURCE_STOPPED_NO_NODE_SPECIFIED = M(
     "CANNOT_MOVE_RESOURCE_STOPPED_NO_NODE_SPECIFIED"
 )
 CANNOT_REMOVE_ALL_CLUSTER_NODES = M("CANNOT_REMOVE_ALL_CLUSTER_NODES")
+CANNOT_STOP_RESOURCES_BEFORE_DELETING = M(
+    "CANNOT_STOP_RESOURCES_BEFORE_DELETING"
+)
 CANNOT_UNMOVE_UNBAN_RESOURCE_MASTER_RESOURCE_NOT_PROMOTABLE = M(
     "CANNOT_UNMOVE_UNBAN_RESOURCE_MASTER_RESOURCE_NOT_PROMOTABLE"
 )
@@ -124,6 +128,7 @@ CIB_LOAD_ERROR_GET_NODES_FOR_VALIDATION = M(
     "CIB_LOAD_ERROR_GET_NODES_FOR_VALIDATION"
 )
 CIB_NVSET_AMBIGUOUS_PROVIDE_NVSET_ID = M("CIB_NVSET_AMBIGUOUS_PROVIDE_NVSET_ID")
+CIB_REMOVE_DEPENDANT_ELEMENTS = M("CIB_REMOVE_DEPENDANT_ELEMENTS")
 CIB_LOAD_ERROR_SCOPE_MISSING = M("CIB_LOAD_ERROR_SCOPE_MISSING")
 CIB_PUSH_ERROR = M("CIB_PUSH_ERROR")
 CIB_SAVE_TMP_ERROR = M("CIB_SAVE_TMP_ERROR")
@@ -300,6 +305,7 @@ NODE_COMMUNICATION_FINISHED = M("NODE_COMMUNICATION_FINISHED")
 NODE_COMMUNICATION_NOT_CONNECTED = M("NODE_COMMUNICATION_NOT_CONNECTED")
 NODE_COMMUNICATION_NO_MORE_ADDRESSES = M("NODE_COMMUNICATION_NO_MORE_ADDRESSES")
 NODE_COMMUNICATION_PROXY_IS_SET = M("NODE_COMMUNICATION_PROXY_IS_SET")
+NODE_COMMUNICATION_QUEUED = M("NODE_COMMUNICATION_QUEUED")
 NODE_COMMUNICATION_RETRYING = M("NODE_COMMUNICATION_RETRYING")
 NODE_COMMUNICATION_STARTED = M("NODE_COMMUNICATION_STARTED")
 NODE_NAMES_ALREADY_EXIST = M("NODE_NAMES_ALREADY_EXIST")
@@ -437,9 +443,11 @@ RULE_EXPRESSION_PARSE_ERROR = M("RULE_EXPRESSION_PARSE_ERROR")
 RULE_EXPRESSION_SINCE_GREATER_THAN_UNTIL = M(
     "RULE_EXPRESSION_SINCE_GREATER_THAN_UNTIL"
 )
+RUN_EXTERNAL_PROCESS_DURATION = M("RUN_EXTERNAL_PROCESS_DURATION")
 RUN_EXTERNAL_PROCESS_ERROR = M("RUN_EXTERNAL_PROCESS_ERROR")
 RUN_EXTERNAL_PROCESS_FINISHED = M("RUN_EXTERNAL_PROCESS_FINISHED")
 RUN_EXTERNAL_PROCESS_STARTED = M("RUN_EXTERNAL_PROCESS_STARTED")
+RUN_EXTERNAL_PROCESSES_FINISHED = M("RUN_EXTERNAL_PROCESSES_FINISHED")
 SBD_CHECK_STARTED = M("SBD_CHECK_STARTED")
 SBD_CHECK_SUCCESS = M("SBD_CHECK_SUCCESS")
 SBD_CONFIG_ACCEPTED_BY_NODE = M("SBD_CONFIG_ACCEPTED_BY_NODE")
@@ -502,6 +510,7 @@ STONITH_UNFENCING_SKIPPED_DEVICES_FENCED = M(
 STONITH_RESTARTLESS_UPDATE_UNABLE_TO_PERFORM = M(
     "STONITH_RESTARTLESS_UPDATE_UNABLE_TO_PERFORM"
 )
+STOPPING_RESOURCES_BEFORE_DELETING = M("STOPPING_RESOURCES_BEFORE_DELETING")
 SERVICE_COMMANDS_ON_NODES_STARTED = M("SERVICE_COMMANDS_ON_NODES_STARTED")
 SERVICE_COMMANDS_ON_NODES_SKIPPED = M("SERVICE_COMMANDS_ON_NODES_SKIPPED")
 SERVICE_COMMAND_ON_NODE_ERROR = M("SERVICE_COMMAND_ON_NODE_ERROR")
@@ -572,6 +581,7 @@ UNSUPPORTED_OPERATION_ON_NON_SYSTEMD_SYSTEMS = M(
 USE_COMMAND_NODE_ADD_REMOTE = M("USE_COMMAND_NODE_ADD_REMOTE")
 USE_COMMAND_NODE_ADD_GUEST = M("USE_COMMAND_NODE_ADD_GUEST")
 USE_COMMAND_NODE_REMOVE_GUEST = M("USE_COMMAND_NODE_REMOVE_GUEST")
+USE_COMMAND_NODE_REMOVE_REMOTE = M("USE_COMMAND_NODE_REMOVE_REMOTE")
 USING_DEFAULT_ADDRESS_FOR_HOST = M("USING_DEFAULT_ADDRESS_FOR_HOST")
 USING_DEFAULT_WATCHDOG = M("USING_DEFAULT_WATCHDOG")
 WAIT_FOR_IDLE_STARTED = M("WAIT_FOR_IDLE_STARTED")
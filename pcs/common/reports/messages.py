@@ -933,6 +933,55 @@ class RunExternalProcessFinished(ReportItemMessage):
         )
 
 
+@dataclass(frozen=True)
+class RunExternalProcessDuration(ReportItemMessage):
+    """
+    Information about time spent running an external process
+
+    command -- the external process command
+    duration -- time in seconds the process was running
+    timed_out -- True if the process was killed due to a timeout
+    """
+
+    command: str
+    duration: float
+    timed_out: bool
+    _code = codes.RUN_EXTERNAL_PROCESS_DURATION
+
+    @property
+    def message(self) -> str:
+        if self.timed_out:
+            return (
+                f"Killed after {self.duration:.3f} s due to a timeout: "
+                f"{self.command}"
+            )
+        return f"Finished in {self.duration:.3f} s: {self.command}"
+
+
+@dataclass(frozen=True)
+class RunExternalProcessesFinished(ReportItemMessage):
+    """
+    Information about running several external processes in parallel
+
+    process_count -- number of processes which have been run
+    max_parallel -- max number of processes running at the same time
+    duration -- time in seconds spent running all the processes
+    """
+
+    process_count: int
+    max_parallel: int
+    duration: float
+    _code = codes.RUN_EXTERNAL_PROCESSES_FINISHED
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Finished running {self.process_count} "
+            f"{format_plural(self.process_count, 'process', 'processes')} "
+            f"in {self.duration:.3f} s, at most {self.max_parallel} at a time"
+        )
+
+
 @dataclass(frozen=True)
 class RunExternalProcessError(ReportItemMessage):
     """
@@ -986,6 +1035,27 @@ class NodeCommunicationStarted(ReportItemMessage):
         return f"Sending HTTP Request to: {self.target}\n{data}"
 
 
+@dataclass(frozen=True)
+class NodeCommunicationQueued(ReportItemMessage):
+    """
+    Request had to wait for a free slot before it was sent, debug info
+
+    target -- where the request is about to be sent to
+    queue_time_ms -- how long the request waited, in milliseconds
+    """
+
+    target: str
+    queue_time_ms: int
+    _code = codes.NODE_COMMUNICATION_QUEUED
+
+    @property
+    def message(self) -> str:
+        return (
+            f"HTTP Request to: {self.target} waited in queue for "
+            f"{self.queue_time_ms} ms"
+        )
+
+
 @dataclass(frozen=True)
 class NodeCommunicationFinished(ReportItemMessage):
     """
@@ -3769,6 +3839,27 @@ class UnableToGetAgentMetadata(ReportItemMessage):
         )
 
 
+@dataclass(frozen=True)
+class AgentMetadataLoadTimedOut(ReportItemMessage):
+    """
+    Loading metadata of an agent took too long and has been stopped
+
+    agent -- agent whose metadata were not loaded
+    timeout -- time limit in seconds
+    """
+
+    agent: str
+    timeout: float
+    _code = codes.AGENT_METADATA_LOAD_TIMED_OUT
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Unable to load metadata of agent '{self.agent}' in "
+            f"{self.timeout} s, loading has been stopped"
+        )
+
+
 @dataclass(frozen=True)
 class InvalidResourceAgentName(ReportItemMessage):
     """
@@ -5114,6 +5205,19 @@ class UseCommandNodeRemoveGuest(ReportItemMessage):
         return "this command is not sufficient for removing a guest node"
 
 
+@dataclass(frozen=True)
+class UseCommandNodeRemoveRemote(ReportItemMessage):
+    """
+    Advise the user for more appropriate command.
+    """
+
+    _code = codes.USE_COMMAND_NODE_REMOVE_REMOTE
+
+    @property
+    def message(self) -> str:
+        return "this command is not sufficient for removing a remote node"
+
+
 @dataclass(frozen=True)
 class TmpFileWrite(ReportItemMessage):
     """
@@ -7576,3 +7680,68 @@ class ResourceStonithCommandsMismatch(ReportItemMessage):
             f"Ability of this command to accept {self.not_accepted_type} is "
             "deprecated and will be removed in a future release."
         )
+
+
+@dataclass(frozen=True)
+class StoppingResourcesBeforeDeleting(ReportItemMessage):
+    """
+    Resources are going to be stopped before they are deleted
+
+    resource_id_list -- ids of resources to be stopped
+    """
+
+    resource_id_list: List[str]
+    _code = codes.STOPPING_RESOURCES_BEFORE_DELETING
+
+    @property
+    def message(self) -> str:
+        return "Stopping {resource_pl} {resource_list} before deleting".format(
+            resource_pl=format_plural(self.resource_id_list, "resource"),
+            resource_list=format_list(self.resource_id_list),
+        )
+
+
+@dataclass(frozen=True)
+class CannotStopResourcesBeforeDeleting(ReportItemMessage):
+    """
+    Resources are still running after they have been disabled in order to be
+    deleted
+
+    resource_id_list -- ids of resources which have not been stopped
+    """
+
+    resource_id_list: List[str]
+    _code = codes.CANNOT_STOP_RESOURCES_BEFORE_DELETING
+
+    @property
+    def message(self) -> str:
+        return (
+            "Cannot stop {resource_pl} {resource_list} before deleting".format(
+                resource_pl=format_plural(self.resource_id_list, "resource"),
+                resource_list=format_list(self.resource_id_list),
+            )
+        )
+
+
+@dataclass(frozen=True)
+class CibRemoveDependantElements(ReportItemMessage):
+    """
+    Elements referencing deleted elements are going to be removed as well
+
+    id_tag_map -- ids of the elements to be removed mapped to their tags
+    """
+
+    id_tag_map: Dict[str, str]
+    _code = codes.CIB_REMOVE_DEPENDANT_ELEMENTS
+
+    @property
+    def message(self) -> str:
+        return "Removing dependant {element_pl}: {element_list}".format(
+            element_pl=format_plural(self.id_tag_map, "element"),
+            element_list=", ".join(
+                f"{tag} '{element_id}'"
+                for element_id, tag in sorted(
+                    self.id_tag_map.items(), key=lambda item: (item[1], item[0])
+                )
+            ),
+        )
@@ -1,9 +1,11 @@
 import os.path
 import re
 from typing import (
+    Dict,
     Iterable,
     List,
     Optional,
+    Sequence,
 )
 
 from .. import errors
@@ -11,6 +13,22 @@ from ..interfaces import (
     ExecutorInterface,
     ServiceManagerInterface,
 )
+from ..types import ServiceStatus
+
+# unit file states for which 'systemctl is-enabled' returns 0
+_ENABLED_UNIT_FILE_STATES = frozenset(
+    (
+        "alias",
+        "enabled",
+        "enabled-runtime",
+        "generated",
+        "indirect",
+        "static",
+        "transient",
+    )
+)
+# active states for which 'systemctl is-active' returns 0
+_RUNNING_ACTIVE_STATES = frozenset(("active", "reloading", "refreshing"))
 
 
 class SystemdDriver(ServiceManagerInterface):
@@ -108,6 +126,39 @@ class SystemdDriver(ServiceManagerInterface):
         )
         return result.retval == 0
 
+    def get_services_status(
+        self, service_list: Sequence[str]
+    ) -> Dict[str, ServiceStatus]:
+        if not service_list:
+            return {}
+        result = self._executor.run(
+            [
+                self._systemctl_bin,
+                "show",
+                "--property=UnitFileState,ActiveState",
+            ]
+            + [_format_service_name(service, None) for service in service_list]
+        )
+        unit_list = (
+            _parse_show_output(result.stdout) if result.retval == 0 else []
+        )
+        if len(unit_list) != len(service_list):
+            # Properties of units are printed in the order of the units, so
+            # they cannot be matched with the services otherwise.
+            return {
+                service: ServiceStatus(
+                    self.is_enabled(service), self.is_running(service)
+                )
+                for service in service_list
+            }
+        return {
+            service: ServiceStatus(
+                unit.get("UnitFileState") in _ENABLED_UNIT_FILE_STATES,
+                unit.get("ActiveState") in _RUNNING_ACTIVE_STATES,
+            )
+            for service, unit in zip(service_list, unit_list)
+        }
+
     def is_installed(self, service: str) -> bool:
         return service in self.get_available_services()
 
@@ -136,6 +187,22 @@ class SystemdDriver(ServiceManagerInterface):
         ) and os.path.isfile(self._systemctl_bin)
 
 
+def _parse_show_output(output: str) -> List[Dict[str, str]]:
+    """
+    Parse properties of units printed by 'systemctl show'
+
+    output -- properties of each unit, units are separated by an empty line
+    """
+    unit_list = []
+    for block in output.strip().split("\n\n"):
+        properties = dict(
+            line.split("=", 1) for line in block.splitlines() if "=" in line
+        )
+        if properties:
+            unit_list.append(properties)
+    return unit_list
+
+
 def _format_service_name(service: str, instance: Optional[str]) -> str:
     instance_str = f"@{instance}" if instance else ""
     return f"{service}{instance_str}.service"
@@ -1,7 +1,9 @@
 import os.path
 from typing import (
+    Dict,
     List,
     Optional,
+    Sequence,
 )
 
 from .. import errors
@@ -9,6 +11,7 @@ from ..interfaces import (
     ExecutorInterface,
     ServiceManagerInterface,
 )
+from ..types import ServiceStatus
 
 
 class SysVInitRhelDriver(ServiceManagerInterface):
@@ -59,6 +62,16 @@ class SysVInitRhelDriver(ServiceManagerInterface):
             == 0
         )
 
+    def get_services_status(
+        self, service_list: Sequence[str]
+    ) -> Dict[str, ServiceStatus]:
+        return {
+            service: ServiceStatus(
+                self.is_enabled(service), self.is_running(service)
+            )
+            for service in service_list
+        }
+
     def is_installed(self, service: str) -> bool:
         return service in self.get_available_services()
 
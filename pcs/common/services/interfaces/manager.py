@@ -1,8 +1,12 @@
 from typing import (
+    Dict,
     List,
     Optional,
+    Sequence,
 )
 
+from ..types import ServiceStatus
+
 
 class ServiceManagerInterface:
     def start(self, service: str, instance: Optional[str] = None) -> None:
@@ -65,6 +69,18 @@ class ServiceManagerInterface:
         """
         raise NotImplementedError()
 
+    def get_services_status(
+        self, service_list: Sequence[str]
+    ) -> Dict[str, ServiceStatus]:
+        """
+        service_list -- names of services to be checked
+
+        Returns enabled and running status of all specified services. It is
+        meant for checking several services at once in a cheaper way than
+        calling is_enabled and is_running for each of them.
+        """
+        raise NotImplementedError()
+
     def is_installed(self, service: str) -> bool:
         """
         service -- name of service to be checked
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import List
+
+from pcs.common.interface.dto import DataTransferObject
+from pcs.common.types import PrimitiveStatus
+
+
+@dataclass(frozen=True)
+class PrimitiveStatusDto(DataTransferObject):
+    id: str  # pylint: disable=invalid-name
+    status: PrimitiveStatus
+
+
+@dataclass(frozen=True)
+class NodeStatusDto(DataTransferObject):
+    # Node lists are kept flat, as the SNMP agent reports each of them
+    # separately.
+    # pylint: disable=too-many-instance-attributes
+
+    cluster_name: str
+    quorate: bool
+    known_node_list: List[str]
+    corosync_online_node_list: List[str]
+    corosync_offline_node_list: List[str]
+    pacemaker_online_node_list: List[str]
+    pacemaker_standby_node_list: List[str]
+    pacemaker_offline_node_list: List[str]
+    primitive_list: List[PrimitiveStatusDto]
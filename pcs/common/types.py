@@ -52,3 +52,10 @@ class CorosyncTransportType(AutoNameEnum):
             return cls(transport.upper())
         except ValueError:
             raise UnknownCorosyncTransportTypeException(transport) from None
+
+
+class PrimitiveStatus(AutoNameEnum):
+    RUNNING = auto()
+    DISABLED = auto()
+    FAILED = auto()
+    BLOCKED = auto()
@@ -1,7 +1,6 @@
 import sys
 import xml.dom.minidom
 from collections import defaultdict
-from enum import Enum
 from os.path import isfile
 from xml.dom.minidom import parseString
 
@@ -31,7 +30,18 @@ from pcs.common.reports import ReportItem
 from pcs.common.reports.constraints import colocation as colocation_format
 from pcs.common.reports.constraints import order as order_format
 from pcs.common.str_tools import format_list
+from pcs.common.tools import xml_fromstring
+from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.cib.constraint.index import ResourceConstraintIndex
 from pcs.lib.cib.constraint.order import ATTRIB as order_attrib
+from pcs.lib.cib.rule import (
+    RuleInEffectEvalAllAtOnce,
+    RuleInEffectEvalDummy,
+)
+from pcs.lib.cib.tools import (
+    get_constraints,
+    get_resources,
+)
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.pacemaker.values import (
     SCORE_INFINITY,
@@ -55,6 +65,14 @@ CRM_RULE_MISSING_MSG = (
     "shown. Consider upgrading pacemaker."
 )
 
+# order in which find_constraints_containing returns constraints
+_CONSTRAINT_TAGS_ORDER = (
+    "rsc_colocation",
+    "rsc_location",
+    "rsc_order",
+    "rsc_ticket",
+)
+
 RESOURCE_TYPE_RESOURCE = "resource"
 RESOURCE_TYPE_REGEXP = "regexp"
 
@@ -64,10 +82,12 @@ RULE_NOT_IN_EFFECT = "not yet in effect"
 RULE_UNKNOWN_STATUS = "unknown status"
 
 
-class CrmRuleReturnCode(Enum):
-    IN_EFFECT = 0
-    EXPIRED = 110
-    TO_BE_IN_EFFECT = 111
+_RULE_STATUS_LABELS = {
+    CibRuleInEffectStatus.IN_EFFECT: RULE_IN_EFFECT,
+    CibRuleInEffectStatus.EXPIRED: RULE_EXPIRED,
+    CibRuleInEffectStatus.NOT_YET_IN_EFFECT: RULE_NOT_IN_EFFECT,
+    CibRuleInEffectStatus.UNKNOWN: RULE_UNKNOWN_STATUS,
+}
 
 
 def constraint_location_cmd(lib, argv, modifiers):
@@ -663,12 +683,17 @@ def location_lines(
     all_loc_constraints = constraintsElement.getElementsByTagName(
         "rsc_location"
     )
-    cib = utils.get_cib()
-
     if not isfile(settings.crm_rule):
         if verify_expiration:
             warn(CRM_RULE_MISSING_MSG)
         verify_expiration = False
+    rule_evaluator = (
+        RuleInEffectEvalAllAtOnce(
+            xml_fromstring(utils.get_cib()), utils.cmd_runner()
+        )
+        if verify_expiration
+        else RuleInEffectEvalDummy()
+    )
 
     all_lines.append("Location Constraints:")
     for rsc_loc in all_loc_constraints:
@@ -761,7 +786,7 @@ def location_lines(
             )
         all_lines += _show_location_rules(
             ruleshash,
-            cib,
+            rule_evaluator,
             show_detail=showDetail,
             show_expired=show_expired,
             verify_expiration=verify_expiration,
@@ -784,7 +809,7 @@ def location_lines(
             miniruleshash[rsc] = ruleshash[rsc]
             rsc_lines += _show_location_rules(
                 miniruleshash,
-                cib,
+                rule_evaluator,
                 show_detail=showDetail,
                 show_expired=show_expired,
                 verify_expiration=verify_expiration,
@@ -835,7 +860,7 @@ def _hashtable_to_lines(hash_label, hash_type, hash_key, show_detail):
 
 def _show_location_rules(
     ruleshash,
-    cib,
+    rule_evaluator,
     show_detail,
     show_expired=False,
     verify_expiration=True,
@@ -888,7 +913,9 @@ def _show_location_rules(
             for rule in constrainthash[constraint_id]:
                 rule_status = RULE_UNKNOWN_STATUS
                 if verify_expiration:
-                    rule_status = _get_rule_status(rule.getAttribute("id"), cib)
+                    rule_status = _RULE_STATUS_LABELS[
+                        rule_evaluator.get_rule_status(rule.getAttribute("id"))
+                    ]
                     if rule_status != RULE_EXPIRED:
                         is_constraint_expired = False
 
@@ -934,19 +961,6 @@ def _verify_score(score):
         )
 
 
-def _get_rule_status(rule_id, cib):
-    _, _, retval = utils.cmd_runner().run(
-        [settings.crm_rule, "--check", "--rule", rule_id, "--xml-text", "-"],
-        cib,
-    )
-    translation_map = {
-        CrmRuleReturnCode.IN_EFFECT.value: RULE_IN_EFFECT,
-        CrmRuleReturnCode.EXPIRED.value: RULE_EXPIRED,
-        CrmRuleReturnCode.TO_BE_IN_EFFECT.value: RULE_NOT_IN_EFFECT,
-    }
-    return translation_map.get(retval, RULE_UNKNOWN_STATUS)
-
-
 def location_prefer(lib, argv, modifiers):
     """
     Options:
@@ -1405,9 +1419,17 @@ def constraint_ref(lib, argv, modifiers):
     if not argv:
         raise CmdLineInputError()
 
+    cib = xml_fromstring(utils.get_cib())
+    constraint_index = ResourceConstraintIndex(get_constraints(cib))
+    primitive_map = {
+        str(primitive_el.get("id")): primitive_el
+        for primitive_el in get_resources(cib).iter("primitive")
+    }
     for arg in argv:
         print("Resource: %s" % arg)
-        constraints, set_constraints = find_constraints_containing(arg)
+        constraints, set_constraints = _find_constraints_containing_indexed(
+            constraint_index, primitive_map, arg
+        )
         if not constraints and not set_constraints:
             print("  No Matches.")
         else:
@@ -1417,6 +1439,44 @@ def constraint_ref(lib, argv, modifiers):
                 print("  " + constraint)
 
 
+def _find_constraints_containing_indexed(
+    constraint_index, primitive_map, resource_id
+):
+    """
+    Commandline options: no options
+
+    ResourceConstraintIndex constraint_index -- index of the CIB's constraints
+    dict primitive_map -- primitive elements of the CIB by their ids
+    string resource_id -- id of a resource to find constraints of
+    """
+    constraints_found = []
+    set_constraints = []
+    primitive_el = primitive_map.get(resource_id)
+    if primitive_el is not None:
+        parent_el = primitive_el.getparent()
+        if parent_el.tag in ("master", "clone"):
+            (
+                constraints_found,
+                set_constraints,
+            ) = _find_constraints_containing_indexed(
+                constraint_index, primitive_map, str(parent_el.get("id"))
+            )
+    # keep the order of find_constraints_containing: by constraint type, then
+    # by position in the CIB
+    constraints_found.extend(
+        str(constraint_el.get("id"))
+        for constraint_el in sorted(
+            constraint_index.get_plain_constraints(resource_id),
+            key=lambda el: _CONSTRAINT_TAGS_ORDER.index(el.tag),
+        )
+    )
+    set_constraints.extend(
+        str(constraint_el.get("id"))
+        for constraint_el in constraint_index.get_set_constraints(resource_id)
+    )
+    return constraints_found, list(set(set_constraints))
+
+
 def remove_constraints_containing(
     resource_id, output=False, constraints_element=None, passed_dom=None
 ):
@@ -1424,28 +1484,29 @@ def remove_constraints_containing(
     Commandline options:
       * -f - CIB file, effective only if passed_dom is None
     """
-    lib = utils.get_library_wrapper()
-    modifiers = utils.get_input_modifiers()
     constraints, set_constraints = find_constraints_containing(
         resource_id, passed_dom
     )
-    for c in constraints:
-        if output:
-            print_to_stderr(f"Removing Constraint - {c}")
-        if constraints_element is not None:
-            constraint_rm(
-                lib,
-                [c],
-                modifiers,
-                True,
-                constraints_element,
-                passed_dom=passed_dom,
-            )
-        else:
-            constraint_rm(lib, [c], modifiers, passed_dom=passed_dom)
+    if not constraints and not set_constraints:
+        return None
+    (dom, constraintsElement) = getCurrentConstraints(passed_dom)
+    if constraints_element is not None:
+        constraintsElement = constraints_element
+
+    if constraints:
+        # remove all the constraints in one pass over the constraints section
+        constraints_to_remove = set(constraints)
+        for c in constraints:
+            if output:
+                print_to_stderr(f"Removing Constraint - {c}")
+        for co in constraintsElement.childNodes[:]:
+            if (
+                co.nodeType == xml.dom.Node.ELEMENT_NODE
+                and co.getAttribute("id") in constraints_to_remove
+            ):
+                constraintsElement.removeChild(co)
 
     if set_constraints:
-        (dom, constraintsElement) = getCurrentConstraints(passed_dom)
         for c in constraintsElement.getElementsByTagName("resource_ref")[:]:
             # If resource id is in a set, remove it from the set, if the set
             # is empty, then we remove the set, if the parent of the set
@@ -1472,9 +1533,9 @@ def remove_constraints_containing(
                                 pn2.getAttribute("id")
                             )
                         )
-        if passed_dom:
-            return dom
-        utils.replace_cib_configuration(dom)
+    if passed_dom:
+        return dom
+    utils.replace_cib_configuration(dom)
     return None
 
 
@@ -0,0 +1,511 @@
+"""
+Remote commands served by the python daemon without involving ruby pcsd
+
+Remote commands which are polled often by other nodes and clients are served
+here directly. Ruby pcsd would run them after a round trip over its socket and,
+for some of them, after running a pcs_internal process. Their responses are the
+same as those of ruby pcsd. All other remote commands are passed to ruby pcsd.
+"""
+import base64
+import binascii
+import json
+import os.path
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common import communication
+from pcs.common.tools import xml_fromstring
+from pcs.daemon import (
+    log,
+    ruby_pcsd,
+)
+from pcs.daemon.app.common import BaseHandler
+from pcs.daemon.auth import check_user_groups
+from pcs.daemon.internal_worker import WorkerPool
+
+PERMISSION_READ = "read"
+PERMISSION_WRITE = "write"
+PERMISSION_GRANT = "grant"
+PERMISSION_FULL = "full"
+
+_PERMISSION_ALSO_ALLOWS = {
+    PERMISSION_WRITE: {PERMISSION_READ},
+    PERMISSION_FULL: {PERMISSION_READ, PERMISSION_WRITE, PERMISSION_GRANT},
+}
+_PERMISSION_TYPE_USER = "user"
+_PERMISSION_TYPE_GROUP = "group"
+
+# (type, name) -> allowed permissions
+PermissionMap = Dict[Tuple[str, str], Set[str]]
+
+
+class RemoteUser(NamedTuple):
+    name: str
+    groups: List[str]
+
+
+class _FileCache:
+    """
+    Data loaded from a file, loaded again only when the file changes
+    """
+
+    def __init__(self, path: str, loader: Callable[[Optional[str]], Any]):
+        """
+        path -- file to load
+        loader -- make data from the file content, None if the file is missing
+        """
+        self._path = path
+        self._loader = loader
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._data: Any = None
+
+    def get(self) -> Any:
+        try:
+            stat = os.stat(self._path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature is None or signature != self._signature:
+            text = None
+            if signature is not None:
+                try:
+                    with open(self._path, "r") as file:
+                        text = file.read()
+                except OSError:
+                    signature = None
+            self._data = self._loader(text)
+            self._signature = signature
+        return self._data
+
+
+def _load_tokens(text: Optional[str]) -> Dict[str, str]:
+    try:
+        users = json.loads(text) if text else []
+        return {user["token"]: user["username"] for user in users}
+    except (ValueError, TypeError, KeyError):
+        return {}
+
+
+def _permission_map(permission_list: Iterable[Dict[str, Any]]) -> PermissionMap:
+    permission_map: PermissionMap = {}
+    for permission in permission_list:
+        permission_map.setdefault(
+            (permission["type"], permission["name"]), set()
+        ).update(permission["allow"])
+    return permission_map
+
+
+def _load_permissions(text: Optional[str]) -> PermissionMap:
+    # Members of the admin group get access if there is no pcs_settings file
+    # yet, the same way ruby pcsd does it. An old file format without
+    # permissions works the same way for backward compatibility.
+    default_permissions = [
+        dict(
+            type=_PERMISSION_TYPE_GROUP,
+            name=settings.pacemaker_gname,
+            allow=[PERMISSION_READ, PERMISSION_WRITE, PERMISSION_GRANT],
+        )
+    ]
+    if text is None:
+        return _permission_map(default_permissions)
+    if not text.strip():
+        return {}
+    try:
+        pcs_settings = json.loads(text)
+        if isinstance(pcs_settings, dict) and isinstance(
+            pcs_settings.get("format_version"), int
+        ):
+            format_version = pcs_settings["format_version"]
+        elif isinstance(pcs_settings, list):
+            format_version = 1
+        else:
+            raise ValueError("invalid file format")
+        if format_version >= 2:
+            return _permission_map(
+                (pcs_settings.get("permissions") or {}).get("local_cluster", [])
+            )
+        if format_version == 1:
+            return _permission_map(default_permissions)
+        log.pcsd.error("Unable to parse pcs_settings file")
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        log.pcsd.error("Unable to parse pcs_settings file: %s", e)
+    return {}
+
+
+def _is_allowed(allowed: Set[str], action: str) -> bool:
+    return action in allowed or any(
+        action in _PERMISSION_ALSO_ALLOWS.get(permission, set())
+        for permission in allowed
+    )
+
+
+class RemoteAuthProvider:
+    """
+    Authenticate remote requests by tokens and check permissions of their users
+    the same way ruby pcsd does it
+    """
+
+    def __init__(
+        self,
+        users_conf_path: Optional[str] = None,
+        settings_conf_path: Optional[str] = None,
+    ):
+        """
+        users_conf_path -- file with tokens, pcsd default if not specified
+        settings_conf_path -- file with permissions, pcsd default if not
+            specified
+        """
+        self._tokens = _FileCache(
+            users_conf_path or settings.pcsd_users_conf_location, _load_tokens
+        )
+        self._permissions = _FileCache(
+            settings_conf_path or settings.pcsd_settings_conf_location,
+            _load_permissions,
+        )
+
+    async def login_by_token(
+        self, token: Optional[str], cookies: Dict[str, str]
+    ) -> Optional[RemoteUser]:
+        """
+        Return a user the token belongs to, None if the token is not valid
+
+        token -- token sent by a client
+        cookies -- all cookies sent by the client, the superuser may use them
+            to specify a user to act as
+        """
+        if not token:
+            return None
+        username = self._tokens.get().get(token)
+        if username is None:
+            return None
+        if username != settings.pacemaker_uname:
+            # Groups are loaded by the authentication processes, so that
+            # the daemon is not blocked. No groups are returned if they cannot
+            # be determined.
+            user_auth_info = await check_user_groups(username)
+            return RemoteUser(username, list(user_auth_info.groups))
+        cib_user = cookies.get("CIB_user", "")
+        if not cib_user.strip():
+            return RemoteUser(username, [])
+        groups: List[str] = []
+        cib_user_groups = cookies.get("CIB_user_groups", "")
+        if cib_user_groups.strip():
+            try:
+                groups = (
+                    base64.b64decode(cib_user_groups)
+                    .decode(errors="replace")
+                    .split()
+                )
+            except (binascii.Error, ValueError):
+                groups = []
+        return RemoteUser(cib_user, groups)
+
+    def allows_local_cluster(self, user: RemoteUser, action: str) -> bool:
+        """
+        Check whether the user is allowed to do the action in the local cluster
+
+        user -- user running a request
+        action -- one of PERMISSION_*
+        """
+        if user.name == settings.pacemaker_uname:
+            return True
+        permission_map: PermissionMap = self._permissions.get()
+        return _is_allowed(
+            permission_map.get((_PERMISSION_TYPE_USER, user.name), set()),
+            action,
+        ) or any(
+            _is_allowed(
+                permission_map.get((_PERMISSION_TYPE_GROUP, group), set()),
+                action,
+            )
+            for group in user.groups
+        )
+
+
+@lru_cache(maxsize=None)
+def get_pcsd_capabilities() -> Tuple[str, ...]:
+    """
+    Return ids of capabilities of pcsd from the capabilities file
+    """
+    filename = os.path.join(settings.pcsd_exec_location, "capabilities.xml")
+    try:
+        with open(filename, "r") as file:
+            capabilities_xml = xml_fromstring(file.read())
+    except (OSError, etree.XMLSyntaxError) as e:
+        log.pcsd.error(
+            "Cannot read capabilities definition file '%s': '%s'", filename, e
+        )
+        return tuple()
+    return tuple(
+        str(feat.get("id"))
+        for feat in capabilities_xml.iterfind(".//capability")
+        if feat.get("in-pcsd") == "1"
+    )
+
+
+def _to_json(data: Any) -> str:
+    # the same format ruby pcsd uses
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class NativeRemote(BaseHandler):
+    """
+    NativeRemote is base class for handlers of remote commands which are served
+    without ruby pcsd. Requests of users without a valid token are refused.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # initialize is called from the parent's __init__
+        self._auth_provider: RemoteAuthProvider
+        self.remote_user: Optional[RemoteUser] = None
+        super().__init__(*args, **kwargs)
+
+    def initialize(self, auth_provider: RemoteAuthProvider):
+        # pylint: disable=arguments-differ
+        self._auth_provider = auth_provider
+
+    async def prepare(self):
+        # pylint: disable=invalid-overridden-method
+        self.remote_user = await self._auth_provider.login_by_token(
+            self.get_cookie("token"),
+            {name: morsel.value for name, morsel in self.cookies.items()},
+        )
+        if self.remote_user is None:
+            self.set_status(401)
+            self.finish('{"notauthorized":"true"}')
+
+    def check_local_cluster_permission(self, action: str) -> bool:
+        """
+        Refuse the request if the user is not allowed to do the action
+        """
+        if not self._auth_provider.allows_local_cluster(
+            self.remote_user, action
+        ):
+            self.set_status(403)
+            self.write("Permission denied")
+            return False
+        return True
+
+    async def get(self, *args, **kwargs):
+        del args, kwargs
+        await self.run()
+
+    async def post(self, *args, **kwargs):
+        del args, kwargs
+        await self.run()
+
+    async def run(self):
+        raise NotImplementedError()
+
+
+class CheckAuth(NativeRemote):
+    async def run(self):
+        # The token has been checked when preparing the request.
+        self.write('{"success":true}')
+
+
+class Capabilities(NativeRemote):
+    async def run(self):
+        self.write(
+            _to_json({"pcsd_capabilities": list(get_pcsd_capabilities())})
+        )
+
+
+def _old_format_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "severity": report["severity"]["level"],
+        "code": report["message"]["code"],
+        "info": report["message"]["payload"],
+        "forceable": report["severity"]["force_code"],
+        "report_text": report["message"]["message"],
+    }
+
+
+def _internal_output(status: str, status_msg: str) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "status_msg": status_msg,
+        "report_list": [],
+        "data": None,
+    }
+
+
+class PcsInternalProxyOld(NativeRemote):
+    """
+    PcsInternalProxyOld runs a library command by pcs_internal workers and
+    sends its result in the format of remote commands introduced until pcs
+    0.10.6
+    """
+
+    # pylint: disable=arguments-differ, attribute-defined-outside-init
+    cmd = ""
+    permission = PERMISSION_READ
+
+    def initialize(
+        self, auth_provider: RemoteAuthProvider, pcs_internal_pool: WorkerPool
+    ):
+        super().initialize(auth_provider)
+        self._pcs_internal_pool = pcs_internal_pool
+
+    async def run(self):
+        if not self.check_local_cluster_permission(self.permission):
+            return
+        self.write(_to_json(await self._run_internal()))
+
+    async def _run_internal(self) -> Dict[str, Any]:
+        try:
+            cmd_data = json.loads(self.get_argument("data_json", ""))
+        except ValueError as e:
+            log.pcsd.error("Invalid input data format: %s", e)
+            return _internal_output(
+                communication.const.COM_STATUS_INPUT_ERROR,
+                f"Invalid input data format: {e}",
+            )
+        return await self._run_library_command(cmd_data)
+
+    async def _run_library_command(self, cmd_data: Any) -> Dict[str, Any]:
+        output_json = await self._pcs_internal_pool.run(
+            json.dumps(
+                {
+                    "cmd": self.cmd,
+                    "cmd_data": cmd_data,
+                    "options": {"request_timeout": None},
+                }
+            ).encode(),
+            self.remote_user.name,
+            self.remote_user.groups or None,
+        )
+        try:
+            output = json.loads(output_json)
+        except ValueError as e:
+            log.pcsd.error(
+                "Invalid output data format of command '%s': %s", self.cmd, e
+            )
+            return _internal_output(
+                communication.const.COM_STATUS_EXCEPTION,
+                f"Invalid data format {e}",
+            )
+        if isinstance(output.get("report_list"), list):
+            # Remove all debug messages as they may contain sensitive info.
+            output["report_list"] = [
+                _old_format_report(report)
+                for report in output["report_list"]
+                if report["severity"]["level"] != "DEBUG"
+            ]
+        return output
+
+
+class ClusterStatusPlaintext(PcsInternalProxyOld):
+    cmd = "status.full_cluster_status_plaintext"
+
+
+class NodeStatus(PcsInternalProxyOld):
+    """
+    NodeStatus sends the status of the local node and its cluster. Requests
+    for the status of another node are passed to ruby pcsd which forwards them
+    to the node.
+    """
+
+    # pylint: disable=arguments-differ, attribute-defined-outside-init
+    cmd = "status.pcsd_node_status"
+
+    def initialize(
+        self,
+        auth_provider: RemoteAuthProvider,
+        pcs_internal_pool: WorkerPool,
+        ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
+    ):
+        super().initialize(auth_provider, pcs_internal_pool)
+        self._ruby_pcsd_wrapper = ruby_pcsd_wrapper
+
+    async def run(self):
+        if (
+            self.get_argument("node", "")
+            and self.get_argument("redirected", None) is None
+        ):
+            result = await self._ruby_pcsd_wrapper.request_remote(self.request)
+            for name, value in result.headers.items():
+                self.set_header(name, value)
+            self.set_status(result.status)
+            self.write(result.body)
+            return
+        if not self.check_local_cluster_permission(PERMISSION_READ):
+            return
+        version = self.get_argument("version", "1")
+        if version != "2":
+            self.set_status(400)
+            self.write(f"Unsupported version '{version}' of status requested")
+            return
+        output = await self._run_library_command(
+            {
+                "operations": self.get_argument("operations", "") == "1",
+                "skip_auth_check": (
+                    self.get_argument("skip_auth_check", "") == "1"
+                ),
+            }
+        )
+        if output.get("status") != communication.const.COM_STATUS_SUCCESS:
+            log.pcsd.error(
+                "Unable to get node status: %s", output.get("status_msg")
+            )
+            self.set_status(500)
+            self.write("Unable to get node status")
+            return
+        status = output["data"]
+        status["pcsd_capabilities"] = list(get_pcsd_capabilities())
+        self.write(_to_json(status))
+
+
+# remote command -> handler, whether it runs library commands and whether it
+# passes some requests to ruby pcsd
+REMOTE_COMMANDS: Dict[str, Tuple[Type[NativeRemote], bool, bool]] = {
+    "capabilities": (Capabilities, False, False),
+    "check_auth": (CheckAuth, False, False),
+    "cluster_status_plaintext": (ClusterStatusPlaintext, True, False),
+    "status": (NodeStatus, True, True),
+}
+
+
+def get_routes(
+    auth_provider: RemoteAuthProvider,
+    pcs_internal_pool: Optional[WorkerPool] = None,
+    ruby_pcsd_wrapper: Optional[ruby_pcsd.Wrapper] = None,
+) -> List[Tuple[str, Type[NativeRemote], Dict[str, Any]]]:
+    """
+    Return routes of remote commands served without ruby pcsd
+
+    Commands running library commands are only served when pcs_internal
+    workers are available, commands passing some requests to ruby pcsd are
+    only served when ruby pcsd is available. Ruby pcsd serves them otherwise.
+
+    auth_provider -- authenticates requests and checks permissions
+    pcs_internal_pool -- workers running library commands
+    ruby_pcsd_wrapper -- passes requests to ruby pcsd
+    """
+    routes = []
+    for command, (handler, needs_pool, needs_ruby) in REMOTE_COMMANDS.items():
+        kwargs: Dict[str, Any] = dict(auth_provider=auth_provider)
+        if needs_pool:
+            if pcs_internal_pool is None:
+                continue
+            kwargs["pcs_internal_pool"] = pcs_internal_pool
+        if needs_ruby:
+            if ruby_pcsd_wrapper is None:
+                continue
+            kwargs["ruby_pcsd_wrapper"] = ruby_pcsd_wrapper
+        routes.append((f"/remote/{command}", handler, kwargs))
+    return routes
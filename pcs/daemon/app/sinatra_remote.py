@@ -1,9 +1,13 @@
+from typing import Optional
+
 from tornado.locks import Lock
 
 from pcs.daemon import ruby_pcsd
+from pcs.daemon.app import remote
 from pcs.daemon.app.sinatra_common import Sinatra
 from pcs.daemon.auth import authorize_user
 from pcs.daemon.http_server import HttpsServerManage
+from pcs.daemon.internal_worker import WorkerPool
 
 
 class SinatraRemote(Sinatra):
@@ -91,6 +95,8 @@ def get_routes(
     ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
     sync_config_lock: Lock,
     https_server_manage: HttpsServerManage,
+    pcs_internal_pool: Optional[WorkerPool] = None,
+    remote_auth_provider: Optional[remote.RemoteAuthProvider] = None,
 ):
     ruby_wrapper = dict(ruby_pcsd_wrapper=ruby_pcsd_wrapper)
     lock = dict(sync_config_lock=sync_config_lock)
@@ -106,6 +112,12 @@ def get_routes(
             {**ruby_wrapper, **lock},
         ),
         (r"/remote/auth", Auth, ruby_wrapper),
+        # Frequently polled urls served without ruby pcsd.
+        *remote.get_routes(
+            remote_auth_provider or remote.RemoteAuthProvider(),
+            pcs_internal_pool,
+            ruby_pcsd_wrapper,
+        ),
         (r"/remote/.*", SinatraRemote, ruby_wrapper),
         (r"/api/.*", SinatraRemote, ruby_wrapper),
     ]
@@ -1,7 +1,10 @@
+import asyncio
 import grp
+import multiprocessing
 import pwd
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import (
     CDLL,
     CFUNCTYPE,
@@ -17,9 +20,9 @@ from ctypes import (
     sizeof,
 )
 from ctypes.util import find_library
+from time import monotonic
 
-from tornado.gen import coroutine
-
+from pcs import settings
 from pcs.daemon import log
 
 # pylint: disable=invalid-name, too-few-public-methods
@@ -191,25 +194,177 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
     return check_user_groups_sync(username, LoginLogger())
 
 
-# TODO async/await version - how to do it?
-# When async/await is used then the problem is:
-# "TypeError: object Future can't be used in 'await' expression" is raised even
-# if the function "convert_yielded" is used according to
-# http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
-@coroutine
-def run_in_process(sync_fn, *args):
-    with ProcessPoolExecutor(max_workers=1) as pool:
-        result = yield pool.submit(sync_fn, *args)
-    return result
+class AuthPoolError(Exception):
+    pass
+
+
+def _ping():
+    return True
+
+
+class AuthPool:
+    """
+    Long-running processes authenticating users and checking their groups
 
+    PAM modules may block or misbehave, so they are not run in the daemon
+    itself. Processes are started once and reused, they are restarted when one
+    of them dies or does not finish a task in time.
+    """
 
-@coroutine
-def authorize_user(username, password) -> UserAuthInfo:
-    user = yield run_in_process(authorize_user_sync, username, password)
+    def __init__(self, worker_count, timeout):
+        """
+        int worker_count -- max number of tasks running at the same time
+        float timeout -- max time in seconds to wait for a task to finish
+        """
+        self._worker_count = worker_count
+        self._timeout = timeout
+        self._executor = None
+
+    def start(self):
+        if self._executor is None:
+            # The pool is restarted from the running daemon which runs
+            # threads, forking it is not safe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._worker_count,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            # processes are started on the first task
+            self._executor.submit(_ping)
+
+    def stop(self):
+        if self._executor is not None:
+            self._stop_executor(self._executor)
+            self._executor = None
+
+    @staticmethod
+    def _stop_executor(executor):
+        # Processes stuck in a task would block the shutdown.
+        # pylint: disable=protected-access
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    def _restart(self, failed_executor):
+        # Tasks running at the same time fail together, the processes are
+        # restarted only once.
+        if failed_executor is self._executor:
+            self.stop()
+            self.start()
+
+    async def run(self, sync_fn, *args):
+        """
+        Run a function in a worker process, return its result
+
+        callable sync_fn -- picklable function to run
+        """
+        self.start()
+        executor = self._executor
+        try:
+            try:
+                future = executor.submit(sync_fn, *args)
+            except BrokenProcessPool:
+                # A process died since the last task, the task has not been
+                # run yet.
+                log.pcsd.warning("Authentication process died, restarting")
+                self._restart(executor)
+                executor = self._executor
+                future = executor.submit(sync_fn, *args)
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self._timeout
+            )
+        except asyncio.TimeoutError as e:
+            log.pcsd.error(
+                "Authentication process did not finish in %s seconds, "
+                "restarting",
+                self._timeout,
+            )
+            self._restart(executor)
+            raise AuthPoolError("timeout") from e
+        except BrokenProcessPool as e:
+            log.pcsd.error("Authentication process died, restarting")
+            self._restart(executor)
+            raise AuthPoolError("process died") from e
+
+    async def check_health(self):
+        """
+        Restart the processes if they do not respond, return True if they do
+        """
+        if self._executor is None:
+            return True
+        try:
+            return await self.run(_ping)
+        except AuthPoolError:
+            return False
+
+
+class UserGroupsCache:
+    """
+    Groups of authorized users, kept for a short time
+
+    Only groups of users allowed to log in are cached, failed checks remove
+    users from the cache.
+    """
+
+    def __init__(self, ttl, time_fn=monotonic):
+        """
+        float ttl -- number of seconds to keep groups of a user, 0 disables
+            the cache
+        """
+        self._ttl = ttl
+        self._time_fn = time_fn
+        self._cache = {}
+
+    def get(self, username):
+        if username not in self._cache:
+            return None
+        expiration, groups = self._cache[username]
+        if expiration <= self._time_fn():
+            del self._cache[username]
+            return None
+        return groups
+
+    def update(self, user_auth_info: UserAuthInfo):
+        if user_auth_info.is_authorized and self._ttl > 0:
+            self._cache[user_auth_info.name] = (
+                self._time_fn() + self._ttl,
+                user_auth_info.groups,
+            )
+        else:
+            self._cache.pop(user_auth_info.name, None)
+
+    def clear(self):
+        self._cache.clear()
+
+
+# pylint: disable=invalid-name
+auth_pool = AuthPool(
+    settings.pcsd_auth_worker_count, settings.pcsd_auth_timeout
+)
+user_groups_cache = UserGroupsCache(settings.pcsd_user_groups_cache_ttl)
+
+
+async def run_in_process(sync_fn, *args):
+    return await auth_pool.run(sync_fn, *args)
+
+
+async def authorize_user(username, password) -> UserAuthInfo:
+    try:
+        user = await run_in_process(authorize_user_sync, username, password)
+    except AuthPoolError:
+        user = UserAuthInfo(username, [], is_authorized=False)
+    user_groups_cache.update(user)
     return user
 
 
-@coroutine
-def check_user_groups(username) -> UserAuthInfo:
-    user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+async def check_user_groups(username) -> UserAuthInfo:
+    groups = user_groups_cache.get(username)
+    if groups is not None:
+        return UserAuthInfo(username, groups, is_authorized=True)
+    try:
+        user = await run_in_process(
+            check_user_groups_sync, username, PlainLogger()
+        )
+    except AuthPoolError:
+        user = UserAuthInfo(username, [], is_authorized=False)
+    user_groups_cache.update(user)
     return user
@@ -0,0 +1,203 @@
+"""
+Run pcs_internal requests in a pool of long-running worker processes
+
+Ruby pcsd sends pcs_internal requests to a unix socket instead of running
+a new pcs_internal process for each of them. A request consists of two lines.
+The first one is a json object with keys "user" and "groups" specifying who
+runs the request. The second one is a json exactly as pcs_internal expects on
+its standard input. A response, in the same format as pcs_internal prints to
+its standard output, is sent back and the connection is closed.
+"""
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    Awaitable,
+    List,
+    Optional,
+)
+
+from tornado.ioloop import IOLoop
+from tornado.iostream import (
+    IOStream,
+    StreamClosedError,
+)
+from tornado.netutil import bind_unix_socket
+from tornado.tcpserver import TCPServer
+
+from pcs.common import communication
+from pcs.common.interface import dto
+from pcs.daemon import log
+
+
+def _init_worker() -> None:
+    # Import everything needed to run requests in advance, so that requests
+    # do not pay for it. Workers are separate processes, the daemon itself
+    # does not import these modules.
+    # pylint: disable=import-outside-toplevel
+    from pcs import (
+        pcs_internal,
+        utils,
+    )
+    from pcs.cli.common import lib_wrapper
+
+    logging.basicConfig()
+    middleware_factory = utils.get_middleware_factory()
+    for namespace in sorted(
+        {cmd.split(".")[0] for cmd in pcs_internal.SUPPORTED_COMMANDS}
+    ):
+        lib_wrapper.load_module(None, middleware_factory, namespace)
+    lib_wrapper.clear_cache()
+
+
+def _warm_up() -> None:
+    pass
+
+
+def _run_request(
+    request_json: bytes, user: Optional[str], groups: Optional[List[str]]
+) -> bytes:
+    # pylint: disable=import-outside-toplevel
+    from pcs import pcs_internal
+
+    return json.dumps(
+        pcs_internal.run_request(request_json, user, groups)
+    ).encode()
+
+
+def _error_response(
+    status: communication.types.CommunicationResultStatus, status_msg: str
+) -> bytes:
+    return json.dumps(
+        dto.to_dict(
+            communication.dto.InternalCommunicationResultDto(
+                status, status_msg, [], None
+            )
+        )
+    ).encode()
+
+
+class WorkerPool:
+    """
+    Processes running pcs_internal requests
+    """
+
+    def __init__(self, worker_count: int):
+        """
+        worker_count -- number of processes running requests at the same time
+        """
+        self._worker_count = worker_count
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def worker_count(self) -> int:
+        return self._worker_count
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        # The daemon runs threads, forking it is not safe.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # all the processes are started and initialized on the first task
+        self._executor.submit(_warm_up)
+
+    def stop(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def run(
+        self,
+        request_json: bytes,
+        user: Optional[str],
+        groups: Optional[List[str]],
+    ) -> bytes:
+        """
+        Run a request in a worker process, return its response
+
+        request_json -- InternalCommunicationRequestDto in json
+        user -- name of a user running the request
+        groups -- groups of the user running the request
+        """
+        if self._executor is None:
+            self.start()
+        try:
+            return await IOLoop.current().run_in_executor(
+                self._executor, _run_request, request_json, user, groups
+            )
+        except BrokenProcessPool as e:
+            # A worker process died, the pool cannot be used anymore.
+            log.pcsd.error("pcs_internal worker process failed: %s", e)
+            self.stop()
+            self.start()
+            return _error_response(
+                communication.const.COM_STATUS_EXCEPTION,
+                "pcs_internal worker process failed",
+            )
+
+
+class InternalServer(TCPServer):
+    """
+    Receive pcs_internal requests on a unix socket and run them in a pool
+    """
+
+    def __init__(self, pool: WorkerPool):
+        super().__init__()
+        self._pool = pool
+
+    def stop(self) -> None:
+        super().stop()
+        self._pool.stop()
+
+    def handle_stream(self, stream: IOStream, address) -> Awaitable[None]:
+        # TCPServer.handle_stream is not a coroutine, but it may return one,
+        # tornado runs it then
+        return self._handle_request(stream)
+
+    async def _handle_request(self, stream: IOStream) -> None:
+        try:
+            header_json = await stream.read_until(b"\n")
+            request_json = await stream.read_until(b"\n")
+            try:
+                header = json.loads(header_json)
+                user = header.get("user") or None
+                groups = header.get("groups") or None
+            except (json.JSONDecodeError, AttributeError) as e:
+                response = _error_response(
+                    communication.const.COM_STATUS_INPUT_ERROR,
+                    f"Unable to parse request header: {e}",
+                )
+            else:
+                response = await self._pool.run(request_json, user, groups)
+            await stream.write(response)
+        except StreamClosedError:
+            log.pcsd.warning("pcs_internal client closed connection")
+        finally:
+            stream.close()
+
+
+def start(socket_path: str, pool: WorkerPool) -> InternalServer:
+    """
+    Start serving pcs_internal requests on a unix socket
+
+    The socket is only accessible by the user running the daemon, as the
+    requests specify which user runs them.
+
+    socket_path -- where to create the socket
+    pool -- processes running the requests, shared with remote commands served
+        by the daemon itself
+    """
+    server = InternalServer(pool)
+    server.add_socket(bind_unix_socket(socket_path, mode=0o600))
+    pool.start()
+    log.pcsd.info(
+        "Running pcs_internal requests in %s worker processes",
+        pool.worker_count,
+    )
+    return server
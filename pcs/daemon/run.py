@@ -1,14 +1,21 @@
 import os
 import signal
 import socket
+import sqlite3
 from pathlib import Path
+from typing import Optional
 
-from tornado.ioloop import IOLoop
+from tornado.ioloop import (
+    IOLoop,
+    PeriodicCallback,
+)
 from tornado.locks import Lock
 from tornado.web import Application
 
 from pcs import settings
 from pcs.daemon import (
+    auth,
+    internal_worker,
     log,
     ruby_pcsd,
     session,
@@ -24,10 +31,15 @@ from pcs.daemon.app.common import RedirectHandler
 from pcs.daemon.env import prepare_env
 from pcs.daemon.http_server import HttpsServerManage
 
+AUTH_POOL_HEALTH_CHECK_INTERVAL = 60
+
 
 class SignalInfo:
     # pylint: disable=too-few-public-methods
     server_manage = None
+    internal_server = None
+    pcs_internal_pool = None
+    session_storage = None
     ioloop_started = False
 
 
@@ -36,6 +48,13 @@ def handle_signal(incomming_signal, frame):
     log.pcsd.warning("Caught signal: %s, shutting down", incomming_signal)
     if SignalInfo.server_manage:
         SignalInfo.server_manage.stop()
+    if SignalInfo.internal_server:
+        SignalInfo.internal_server.stop()
+    if SignalInfo.pcs_internal_pool:
+        SignalInfo.pcs_internal_pool.stop()
+    auth.auth_pool.stop()
+    if SignalInfo.session_storage:
+        SignalInfo.session_storage.close()
     if SignalInfo.ioloop_started:
         IOLoop.current().stop()
     raise SystemExit(0)
@@ -61,6 +80,7 @@ def configure_app(
     public_dir,
     disable_gui=False,
     debug=False,
+    pcs_internal_pool: Optional[internal_worker.WorkerPool] = None,
 ):
     def make_app(https_server_manage: HttpsServerManage):
         """
@@ -72,6 +92,7 @@ def configure_app(
             ruby_pcsd_wrapper,
             sync_config_lock,
             https_server_manage,
+            pcs_internal_pool,
         )
 
         if not disable_gui:
@@ -108,18 +129,44 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    if settings.pcs_internal_worker_count > 0:
+        SignalInfo.pcs_internal_pool = internal_worker.WorkerPool(
+            settings.pcs_internal_worker_count
+        )
+
+    # Start the processes before the daemon starts its threads.
+    auth.auth_pool.start()
+
+    session_backend = None
+    if settings.pcsd_session_persistent:
+        try:
+            session_backend = session.SqliteBackend(
+                settings.pcsd_session_db_location
+            )
+        except sqlite3.Error as e:
+            log.pcsd.error(
+                "Unable to open the session database '%s', sessions will not "
+                "be kept over restarts: %s",
+                settings.pcsd_session_db_location,
+                e,
+            )
+    SignalInfo.session_storage = session.Storage(
+        env.PCSD_SESSION_LIFETIME, backend=session_backend
+    )
+
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         settings.pcsd_ruby_socket,
         debug=env.PCSD_DEBUG,
     )
     make_app = configure_app(
-        session.Storage(env.PCSD_SESSION_LIFETIME),
+        SignalInfo.session_storage,
         ruby_pcsd_wrapper,
         sync_config_lock,
         env.PCSD_STATIC_FILES_DIR,
         disable_gui=env.PCSD_DISABLE_GUI,
         debug=env.PCSD_DEV,
+        pcs_internal_pool=SignalInfo.pcs_internal_pool,
     )
     pcsd_ssl = ssl.PcsdSSL(
         server_name=socket.gethostname(),
@@ -149,9 +196,28 @@ def main():
         log.pcsd.error("Invalid SSL certificate and/or key, exiting")
         raise SystemExit(1) from e
 
+    if SignalInfo.pcs_internal_pool:
+        try:
+            SignalInfo.internal_server = internal_worker.start(
+                settings.pcs_internal_socket,
+                SignalInfo.pcs_internal_pool,
+            )
+        except OSError as e:
+            # Ruby pcsd runs pcs_internal processes for each request in such
+            # a case. The workers are still used by remote commands served by
+            # the daemon itself.
+            log.pcsd.error(
+                "Unable to serve pcs_internal requests of ruby pcsd by "
+                "workers, continuing without them: %s",
+                e,
+            )
+
     ioloop = IOLoop.current()
     ioloop.add_callback(sign_ioloop_started)
     if systemd.is_systemd() and env.NOTIFY_SOCKET:
         ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
     ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
+    PeriodicCallback(
+        auth.auth_pool.check_health, AUTH_POOL_HEALTH_CHECK_INTERVAL * 1000
+    ).start()
     ioloop.start()
@@ -1,5 +1,10 @@
+import heapq
+import itertools
+import json
+import os
 import random
-import string
+import secrets
+import sqlite3
 from time import time as now
 
 
@@ -11,6 +16,7 @@ class Session:
         groups=None,
         is_authenticated=False,
         ajax_id=None,
+        last_access=None,
     ):
         # Session id propageted via cookies.
         self.__sid = sid
@@ -32,6 +38,8 @@ class Session:
         self.__groups = groups or []
         # The moment of the last access. The only muttable attribute.
         self.refresh()
+        if last_access is not None:
+            self.__last_access = last_access
 
     @property
     def is_authenticated(self):
@@ -65,14 +73,149 @@ class Session:
         self.__last_access = now()
         return self
 
+    @property
+    def last_access(self):
+        return self.__last_access
+
     def was_unused_last(self, seconds):
         return now() > self.__last_access + seconds
 
 
+class SqliteBackend:
+    """
+    Keep sessions in a sqlite database, so that they survive daemon restarts
+
+    Only sessions of users who tried to log in are stored. Times of the last
+    access to sessions are not written on each access, they are written when
+    the storage checks whether the sessions expired and when it is closed.
+    """
+
+    def __init__(self, path):
+        """
+        string path -- database file, it is created if it does not exist
+        """
+        # Sessions allow to act as their users, only pcsd can read them.
+        old_umask = os.umask(0o077)
+        try:
+            self.__connection = sqlite3.connect(path)
+        finally:
+            os.umask(old_umask)
+        # Losing the last few changes on a power failure is acceptable for
+        # sessions, waiting for a disk write on each login is not.
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        with self.__connection:
+            self.__connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    sid TEXT PRIMARY KEY,
+                    username TEXT,
+                    groups TEXT,
+                    is_authenticated INTEGER,
+                    ajax_id TEXT,
+                    last_access REAL
+                )
+                """
+            )
+
+    def load(self, min_last_access):
+        """
+        Return sessions accessed since the specified time, indexed by sids
+        """
+        return {
+            sid: Session(
+                sid,
+                username=username,
+                groups=json.loads(groups),
+                is_authenticated=bool(is_authenticated),
+                ajax_id=ajax_id,
+                last_access=last_access,
+            )
+            for (
+                sid,
+                username,
+                groups,
+                is_authenticated,
+                ajax_id,
+                last_access,
+            ) in self.__connection.execute(
+                "SELECT sid, username, groups, is_authenticated, ajax_id, "
+                "last_access FROM sessions WHERE last_access >= ?",
+                (min_last_access,),
+            )
+        }
+
+    def save(self, session):
+        with self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    session.sid,
+                    session.username,
+                    json.dumps(session.groups),
+                    int(session.is_authenticated),
+                    session.ajax_id,
+                    session.last_access,
+                ),
+            )
+
+    def update_last_access(self, last_access_list):
+        """
+        iterable last_access_list -- pairs of a sid and a time of last access
+        """
+        with self.__connection:
+            self.__connection.executemany(
+                "UPDATE sessions SET last_access = ? WHERE sid = ?",
+                [(last_access, sid) for sid, last_access in last_access_list],
+            )
+
+    def delete(self, sid_list):
+        with self.__connection:
+            self.__connection.executemany(
+                "DELETE FROM sessions WHERE sid = ?",
+                [(sid,) for sid in sid_list],
+            )
+
+    def delete_older(self, min_last_access):
+        with self.__connection:
+            self.__connection.execute(
+                "DELETE FROM sessions WHERE last_access < ?",
+                (min_last_access,),
+            )
+
+    def close(self):
+        self.__connection.close()
+
+
 class Storage:
-    def __init__(self, lifetime_seconds):
+    """
+    Sessions indexed by their sid and by their expiration
+
+    The expiration index is a heap with one entry per session. An entry holds
+    the time of the last access to its session known when the entry was
+    created. Sessions accessed since then are not expired, their entries are
+    replaced when they get to the top of the heap. Dropping expired sessions
+    therefore does not go through all the sessions.
+    """
+
+    def __init__(self, lifetime_seconds, backend=None):
+        """
+        int lifetime_seconds -- sessions not accessed for this long expire
+        SqliteBackend backend -- persistent storage of sessions, optional
+        """
         self.__sessions = {}
         self.__lifetime_seconds = lifetime_seconds
+        self.__backend = backend
+        # (last access, entry id, sid)
+        self.__expiration_heap = []
+        # sid -> id of the current entry of the session in the heap
+        self.__expiration_entry = {}
+        self.__entry_counter = itertools.count()
+        if self.__backend:
+            min_last_access = now() - self.__lifetime_seconds
+            self.__backend.delete_older(min_last_access)
+            for sid, session in self.__backend.load(min_last_access).items():
+                self.__add(sid, session)
 
     def provide(self, sid=None) -> Session:
         if self.__is_valid_sid(sid):
@@ -80,17 +223,35 @@ class Storage:
         return self.__register(self.__generate_sid())
 
     def drop_expired(self):
-        obsolete_sid_list = [
-            sid
-            for sid, session in self.__sessions.items()
-            if session.was_unused_last(self.__lifetime_seconds)
-        ]
-        for sid in obsolete_sid_list:
-            del self.__sessions[sid]
+        heap = self.__expiration_heap
+        expiration_limit = now() - self.__lifetime_seconds
+        obsolete_sid_list = []
+        refreshed_list = []
+        while heap and heap[0][0] < expiration_limit:
+            dummy_last_access, entry_id, sid = heapq.heappop(heap)
+            if self.__expiration_entry.get(sid) != entry_id:
+                # the session has been destroyed or replaced
+                continue
+            session = self.__sessions[sid]
+            if session.was_unused_last(self.__lifetime_seconds):
+                del self.__sessions[sid]
+                del self.__expiration_entry[sid]
+                obsolete_sid_list.append(sid)
+            else:
+                self.__push_expiration(sid, session.last_access)
+                refreshed_list.append((sid, session.last_access))
+        if self.__backend:
+            if obsolete_sid_list:
+                self.__backend.delete(obsolete_sid_list)
+            if refreshed_list:
+                self.__backend.update_last_access(refreshed_list)
 
     def destroy(self, sid):
         if sid in self.__sessions:
             del self.__sessions[sid]
+            del self.__expiration_entry[sid]
+            if self.__backend:
+                self.__backend.delete([sid])
         return self
 
     def login(self, sid, username, groups, ajax_id=None) -> Session:
@@ -105,6 +266,19 @@ class Storage:
     def rejected_user(self, sid, username) -> Session:
         return self.__register(self.__valid_sid(sid), username=username)
 
+    def close(self):
+        """
+        Write times of the last access to sessions and close the backend
+        """
+        if self.__backend:
+            # Sessions not in the backend are not updated.
+            self.__backend.update_last_access(
+                (sid, session.last_access)
+                for sid, session in self.__sessions.items()
+            )
+            self.__backend.close()
+            self.__backend = None
+
     def __is_valid_sid(self, sid):
         return not (
             sid is None
@@ -117,17 +291,26 @@ class Storage:
     def __valid_sid(self, sid):
         return sid if self.__is_valid_sid(sid) else self.__generate_sid()
 
-    def __register(self, *args, **kwargs) -> Session:
-        session = Session(*args, **kwargs)
-        self.__sessions[session.sid] = session
+    def __register(self, sid, **kwargs) -> Session:
+        session = Session(sid, **kwargs)
+        self.__add(sid, session)
+        # Sessions without a user have nothing worth keeping.
+        if self.__backend and session.username is not None:
+            self.__backend.save(session)
         return session
 
+    def __add(self, sid, session):
+        # Properties of sessions refresh them, the storage must not use them.
+        self.__sessions[sid] = session
+        self.__push_expiration(sid, session.last_access)
+
+    def __push_expiration(self, sid, last_access):
+        entry_id = next(self.__entry_counter)
+        self.__expiration_entry[sid] = entry_id
+        heapq.heappush(self.__expiration_heap, (last_access, entry_id, sid))
+
     def __generate_sid(self):
-        for _ in range(10):
-            sid = "".join(
-                random.choices(string.ascii_lowercase + string.digits, k=64)
-            )
+        while True:
+            sid = secrets.token_hex(32)
             if sid not in self.__sessions:
                 return sid
-        # TODO what to do?
-        raise Exception("Cannot generate unique sid")
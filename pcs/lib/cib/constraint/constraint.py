@@ -1,7 +1,9 @@
 from typing import (
     Any,
     Callable,
+    Container,
     Dict,
+    Iterable,
     List,
     cast,
 )
@@ -16,6 +18,7 @@ from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItem
 from pcs.lib.cib import resource
 from pcs.lib.cib.constraint import resource_set
+from pcs.lib.cib.constraint.index import ResourceConstraintIndex
 from pcs.lib.cib.tools import (
     find_element_by_tag_and_id,
     find_unique_id,
@@ -188,3 +191,41 @@ def create_with_set(constraint_section, tag_name, options, resource_set_list):
     for resource_set_item in resource_set_list:
         resource_set.create(element, resource_set_item)
     return element
+
+
+def remove_references_to_resources(
+    constraint_section: _Element, resource_ids: Iterable[str]
+) -> List[_Element]:
+    """
+    Remove constraints and resource set references of specified resources
+
+    Resource sets left empty are removed as well as constraints left without
+    resource sets. Return a list of removed constraint elements.
+
+    constraint_section -- element constraints
+    resource_ids -- ids of resources (or tags) whose references are removed
+    """
+    return ResourceConstraintIndex(constraint_section).remove_references(
+        resource_ids
+    )
+
+
+def remove_location_constraints_on_nodes(
+    constraint_section: _Element, node_names: Container[str]
+) -> List[_Element]:
+    """
+    Remove location constraints placing resources on specified nodes
+
+    Return a list of removed constraint elements.
+
+    constraint_section -- element constraints
+    node_names -- names of nodes whose location constraints are removed
+    """
+    removed_list = [
+        constraint_el
+        for constraint_el in constraint_section.iterchildren("rsc_location")
+        if constraint_el.get("node") in node_names
+    ]
+    for constraint_el in removed_list:
+        constraint_section.remove(constraint_el)
+    return removed_list
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    List,
+)
+
+from lxml.etree import _Element
+
+# constraint tags with attributes referencing resources
+RESOURCE_REFERENCE_ATTRIBUTES = {
+    "rsc_colocation": ("rsc", "with-rsc"),
+    "rsc_location": ("rsc",),
+    "rsc_order": ("first", "then"),
+    "rsc_ticket": ("rsc",),
+}
+
+
+class ResourceConstraintIndex:
+    """
+    Constraints referencing resources indexed by ids of the resources
+
+    The index is built from a constraints section once. Constraints and
+    resource references removed by the index's methods are removed from both
+    the CIB and the index, so the index can be used for any number of lookups
+    and removals. Changes of the constraints section done by other means are
+    not reflected in the index.
+    """
+
+    def __init__(self, constraint_section: _Element):
+        """
+        constraint_section -- element constraints
+        """
+        self._constraint_section = constraint_section
+        # Dicts with None values are used as ordered sets, so that elements
+        # are always returned in the document order.
+        self._plain: Dict[str, Dict[_Element, None]] = defaultdict(dict)
+        self._refs: Dict[str, Dict[_Element, None]] = defaultdict(dict)
+        for constraint_el in constraint_section.iterchildren(
+            *RESOURCE_REFERENCE_ATTRIBUTES
+        ):
+            for resource_id in self._referenced_ids(constraint_el):
+                self._plain[resource_id][constraint_el] = None
+            for ref_el in constraint_el.iterfind("resource_set/resource_ref"):
+                self._refs[str(ref_el.get("id"))][ref_el] = None
+
+    @staticmethod
+    def _referenced_ids(constraint_el: _Element) -> List[str]:
+        return [
+            str(constraint_el.get(attr))
+            for attr in RESOURCE_REFERENCE_ATTRIBUTES[str(constraint_el.tag)]
+            if constraint_el.get(attr) is not None
+        ]
+
+    def get_plain_constraints(self, resource_id: str) -> List[_Element]:
+        """
+        Return constraints referencing a resource by their attributes
+
+        resource_id -- id of the resource
+        """
+        return list(self._plain.get(resource_id, {}))
+
+    def get_set_constraints(self, resource_id: str) -> List[_Element]:
+        """
+        Return constraints referencing a resource in their resource sets
+
+        resource_id -- id of the resource
+        """
+        return list(
+            dict.fromkeys(
+                ref_el.getparent().getparent()
+                for ref_el in self._refs.get(resource_id, {})
+            )
+        )
+
+    def get_set_references(self, resource_id: str) -> List[_Element]:
+        """
+        Return resource_ref elements referencing a resource
+
+        resource_id -- id of the resource
+        """
+        return list(self._refs.get(resource_id, {}))
+
+    def remove_constraint(self, constraint_el: _Element) -> None:
+        """
+        Remove a constraint from the CIB and from the index
+
+        constraint_el -- the constraint to be removed
+        """
+        for resource_id in self._referenced_ids(constraint_el):
+            self._plain[resource_id].pop(constraint_el, None)
+        for ref_el in constraint_el.iterfind("resource_set/resource_ref"):
+            self._refs[str(ref_el.get("id"))].pop(ref_el, None)
+        self._constraint_section.remove(constraint_el)
+
+    def remove_set_reference(self, ref_el: _Element) -> List[_Element]:
+        """
+        Remove a resource_ref element from the CIB and from the index
+
+        A resource set left empty is removed as well as a constraint left
+        without resource sets. Return a list of removed sets and constraints.
+
+        ref_el -- the resource_ref element to be removed
+        """
+        removed_list = []
+        self._refs[str(ref_el.get("id"))].pop(ref_el, None)
+        set_el = ref_el.getparent()
+        set_el.remove(ref_el)
+        if set_el.find("resource_ref") is None:
+            constraint_el = set_el.getparent()
+            constraint_el.remove(set_el)
+            removed_list.append(set_el)
+            if constraint_el.find("resource_set") is None:
+                self.remove_constraint(constraint_el)
+                removed_list.append(constraint_el)
+        return removed_list
+
+    def remove_references(self, resource_ids: Iterable[str]) -> List[_Element]:
+        """
+        Remove constraints and resource set references of specified resources
+
+        Resource sets left empty are removed as well as constraints left
+        without resource sets. Return a list of removed constraint elements.
+
+        resource_ids -- ids of resources (or tags) whose references are removed
+        """
+        removed_list = []
+        for resource_id in resource_ids:
+            for constraint_el in self.get_plain_constraints(resource_id):
+                self.remove_constraint(constraint_el)
+                removed_list.append(constraint_el)
+            for ref_el in self.get_set_references(resource_id):
+                removed_list.extend(
+                    element
+                    for element in self.remove_set_reference(ref_el)
+                    if element.tag in RESOURCE_REFERENCE_ATTRIBUTES
+                )
+        return removed_list
@@ -0,0 +1,259 @@
+from contextlib import contextmanager
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from lxml import etree
+from lxml.etree import (
+    _Element,
+    _ElementTree,
+)
+
+# Elements with an id attribute which does not serve as an id. They reference
+# other elements or, in case of acl_target, a user.
+NOT_ID_TAGS = frozenset(("acl_target", "role", "obj_ref", "resource_ref"))
+
+# Elements which may have the id, the rules of the index are checked on them
+_find_id_candidates = etree.XPath(
+    '//*[@id=$check_id] | //nvpair[@name="remote-node" and @value=$check_id]'
+)
+_find_remote_node_nvpairs = etree.XPath(
+    './/primitive/meta_attributes/nvpair[@name="remote-node" and @value]'
+)
+
+
+def _root_element(tree: Union[_Element, _ElementTree]) -> _Element:
+    if isinstance(tree, _ElementTree):
+        return tree.getroot()
+    return tree.getroottree().getroot()
+
+
+class CibIdIndex:
+    """
+    Elements of a CIB indexed by their ids
+
+    The index follows the same rules as get_configuration_elements_by_id: the
+    status section is not indexed, elements which have an id attribute not
+    serving as an id are skipped and primitives are indexed by values of their
+    remote-node meta attribute as well.
+
+    The index is built on its first use. Elements found in the index are
+    checked that they are still in the CIB and still have the id, so the index
+    never returns removed or changed elements. An id not found in the index is
+    searched for in the CIB before it is reported as missing and the index is
+    built again if the id is found. In a block of lookups not modifying the
+    CIB, the index is built again on the second missing id instead and then
+    trusted for the rest of the block. Ids handed out for new elements are
+    reserved in the index, so that elements created with them do not have to
+    be added to the index.
+    """
+
+    def __init__(self, cib: _Element):
+        """
+        cib -- root element of a CIB
+        """
+        self._cib = cib
+        self._elements: Dict[str, List[_Element]] = {}
+        self._is_built = False
+        self._reserved_ids: Set[str] = set()
+        self._unchanged_level = 0
+        self._checked_unchanged = False
+        self._searched_unchanged = False
+
+    @property
+    def cib(self) -> _Element:
+        return self._cib
+
+    def get_elements(self, element_id: str) -> List[_Element]:
+        """
+        Return elements with the specified id in the document order
+
+        element_id -- id to look for
+        """
+        if not self._is_built:
+            self._build()
+        element_list = self._get_valid_elements(element_id)
+        if element_list or self._checked_unchanged:
+            return element_list
+        if self._searched_unchanged:
+            # More ids are missing in a block of lookups. Searching the CIB
+            # for each of them would be slower than building the index once
+            # and relying on it in the rest of the block.
+            self._build()
+            return self._get_valid_elements(element_id)
+        self._searched_unchanged = self._unchanged_level > 0
+        if self._is_in_cib(element_id):
+            # elements have been added or their ids changed
+            self._build()
+            return self._get_valid_elements(element_id)
+        return element_list
+
+    def id_exists(self, element_id: str) -> bool:
+        """
+        Check if an element with the id exists or the id has been reserved
+
+        element_id -- id to check
+        """
+        return element_id in self._reserved_ids or bool(
+            self.get_elements(element_id)
+        )
+
+    @contextmanager
+    def unchanged_cib(self) -> Iterator["CibIdIndex"]:
+        """
+        Check whether the CIB changed at most once for lookups in the block
+
+        Use it for a series of lookups during which the CIB is not modified.
+        """
+        self._unchanged_level += 1
+        try:
+            yield self
+        finally:
+            self._unchanged_level -= 1
+            if not self._unchanged_level:
+                self._checked_unchanged = False
+                self._searched_unchanged = False
+
+    def reserve_id(self, element_id: str) -> None:
+        """
+        Mark an id as used by an element which is going to be put to the CIB
+
+        element_id -- id to reserve
+        """
+        self._reserved_ids.add(element_id)
+
+    def _build(self) -> None:
+        elements: Dict[str, List[_Element]] = {}
+        if self._cib.tag == "cib":
+            section_list = [
+                section
+                for section in self._cib.iterchildren(etree.Element)
+                if section.tag != "status"
+            ]
+        else:
+            section_list = [self._cib]
+        for section in section_list:
+            for element in section.iterdescendants(etree.Element):
+                element_id = element.get("id")
+                if element_id is None or element.tag in NOT_ID_TAGS:
+                    continue
+                element_list = elements.get(element_id)
+                if element_list is None:
+                    elements[element_id] = [element]
+                else:
+                    element_list.append(element)
+            for nvpair in _find_remote_node_nvpairs(section):
+                primitive = nvpair.getparent().getparent()
+                element_list = elements.setdefault(str(nvpair.get("value")), [])
+                if primitive not in element_list:
+                    element_list.append(primitive)
+        self._elements = elements
+        self._is_built = True
+        self._checked_unchanged = self._unchanged_level > 0
+
+    def _is_in_cib(self, element_id: str) -> bool:
+        for element in _find_id_candidates(self._cib, check_id=element_id):
+            if self._is_valid(element, element_id):
+                return True
+            if element.tag == "nvpair":
+                meta_attributes = element.getparent()
+                if (
+                    meta_attributes.tag == "meta_attributes"
+                    and meta_attributes.getparent() is not None
+                    and self._is_valid(meta_attributes.getparent(), element_id)
+                ):
+                    return True
+        return False
+
+    def _get_valid_elements(self, element_id: str) -> List[_Element]:
+        element_list = self._elements.get(element_id)
+        if not element_list:
+            return []
+        valid_list = [
+            element
+            for element in element_list
+            if self._is_valid(element, element_id)
+        ]
+        if len(valid_list) != len(element_list):
+            if valid_list:
+                self._elements[element_id] = valid_list
+            else:
+                del self._elements[element_id]
+        return valid_list
+
+    def _is_valid(self, element: _Element, element_id: str) -> bool:
+        if not (
+            element.get("id") == element_id and element.tag not in NOT_ID_TAGS
+        ) and not (
+            element.tag == "primitive"
+            and element_id in self._get_remote_node_names(element)
+        ):
+            return False
+        # the element must not have been removed or moved to the status
+        node = element
+        parent = node.getparent()
+        while parent is not None:
+            if parent is self._cib:
+                if self._cib.tag != "cib":
+                    return True
+                # node is a section of the cib
+                return node is not element and node.tag != "status"
+            node = parent
+            parent = node.getparent()
+        return False
+
+    @staticmethod
+    def _get_remote_node_names(primitive: _Element) -> List[str]:
+        return [
+            str(nvpair.get("value"))
+            for nvpair in primitive.iterfind("meta_attributes/nvpair")
+            if nvpair.get("name") == "remote-node"
+            and nvpair.get("value") is not None
+        ]
+
+
+# Only the CIB loaded by a library environment is indexed. Other trees, e.g.
+# trees created in tests, are searched directly.
+_attached_index: Optional[CibIdIndex] = None
+
+
+def attach_id_index(cib: _Element) -> CibIdIndex:
+    """
+    Create an id index of a CIB and use it for searching ids in the CIB
+
+    cib -- root element of a CIB
+    """
+    # pylint: disable=global-statement
+    global _attached_index
+    _attached_index = CibIdIndex(cib)
+    return _attached_index
+
+
+def detach_id_index(cib: _Element) -> None:
+    """
+    Stop using an id index of a CIB
+
+    cib -- root element of a CIB
+    """
+    # pylint: disable=global-statement
+    global _attached_index
+    if _attached_index is not None and _attached_index.cib is cib:
+        _attached_index = None
+
+
+def get_id_index(tree: Union[_Element, _ElementTree]) -> Optional[CibIdIndex]:
+    """
+    Return an id index of the CIB an element belongs to, if the CIB is indexed
+
+    tree -- any element of a CIB or the CIB tree
+    """
+    if _attached_index is not None and _attached_index.cib is _root_element(
+        tree
+    ):
+        return _attached_index
+    return None
@@ -1,9 +1,13 @@
 from .cib_to_dto import rule_element_to_dto
+from .evaluator import get_next_change as get_rule_next_change
+from .evaluator import is_rule_in_effect
 from .expression_part import BoolExpr as RuleRoot
 from .in_effect import (
     RuleInEffectEval,
+    RuleInEffectEvalAllAtOnce,
     RuleInEffectEvalDummy,
     RuleInEffectEvalOneByOne,
+    RuleInEffectEvalPython,
 )
 from .parsed_to_cib import export as rule_to_cib
 from .parser import (
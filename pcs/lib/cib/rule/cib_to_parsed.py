@@ -0,0 +1,101 @@
+from typing import (
+    List,
+    cast,
+)
+
+from lxml.etree import _Element
+
+from pcs.lib.xml_tools import export_attributes
+
+from .expression_part import (
+    DATE_OP_GT,
+    DATE_OP_LT,
+    BoolExpr,
+    BoolOperator,
+    DateInRangeExpr,
+    DatespecExpr,
+    DateUnaryExpr,
+    NodeAttrExpr,
+    NodeAttrOperator,
+    NodeAttrType,
+    OpExpr,
+    RscExpr,
+    RuleExprPart,
+)
+
+
+def rule_element_to_parsed(rule_el: _Element) -> BoolExpr:
+    """
+    Export a rule xml element including its children to a parsed rule tree
+
+    rule_el -- the rule to be converted
+    """
+    return _Exporter().export_rule(rule_el)
+
+
+class _Exporter:
+    # pylint - all *_to_parsed methods must have the same interface
+    # pylint: disable=no-self-use
+    def export_rule(self, rule_el: _Element) -> BoolExpr:
+        children: List[RuleExprPart] = [
+            self._tag_to_export[str(child.tag)](self, child)
+            # The xpath method has a complicated return value, but we know our
+            # xpath expression only returns elements.
+            for child in cast(_Element, rule_el.xpath(self._xpath_for_export))
+        ]
+        # "and" is a documented pacemaker default
+        return BoolExpr(
+            BoolOperator(str(rule_el.get("boolean-op", "and")).upper()),
+            children,
+        )
+
+    def _node_attr_to_parsed(self, expr_el: _Element) -> NodeAttrExpr:
+        attr_type = expr_el.get("type")
+        return NodeAttrExpr(
+            NodeAttrOperator(str(expr_el.get("operation", "")).upper()),
+            str(expr_el.get("attribute", "")),
+            expr_el.get("value"),
+            NodeAttrType(attr_type.upper()) if attr_type else None,
+        )
+
+    def _date_to_parsed(self, expr_el: _Element) -> RuleExprPart:
+        operation = expr_el.get("operation", "")
+        if operation == "date_spec":
+            date_spec = expr_el.find("./date_spec")
+            return DatespecExpr(
+                []
+                if date_spec is None
+                else list(export_attributes(date_spec, with_id=False).items())
+            )
+        if operation == "gt":
+            return DateUnaryExpr(DATE_OP_GT, str(expr_el.get("start", "")))
+        if operation == "lt":
+            return DateUnaryExpr(DATE_OP_LT, str(expr_el.get("end", "")))
+        duration = expr_el.find("./duration")
+        return DateInRangeExpr(
+            expr_el.get("start"),
+            expr_el.get("end"),
+            None
+            if duration is None
+            else list(export_attributes(duration, with_id=False).items()),
+        )
+
+    def _op_to_parsed(self, expr_el: _Element) -> OpExpr:
+        return OpExpr(str(expr_el.get("name", "")), expr_el.get("interval"))
+
+    def _rsc_to_parsed(self, expr_el: _Element) -> RscExpr:
+        return RscExpr(
+            expr_el.get("class"), expr_el.get("provider"), expr_el.get("type")
+        )
+
+    _tag_to_export = {
+        "rule": export_rule,
+        "expression": _node_attr_to_parsed,
+        "date_expression": _date_to_parsed,
+        "op_expression": _op_to_parsed,
+        "rsc_expression": _rsc_to_parsed,
+    }
+
+    _xpath_for_export = "./*[{export_tags}]".format(
+        export_tags=" or ".join(f"self::{tag}" for tag in _tag_to_export)
+    )
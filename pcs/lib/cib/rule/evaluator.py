@@ -0,0 +1,499 @@
+"""
+Evaluate parsed rules without running pacemaker tools
+
+Rules are evaluated with a precision of one second. Dates without a time zone
+and date-spec expressions are evaluated in the local time, as in pacemaker.
+"""
+from datetime import (
+    datetime,
+    timedelta,
+)
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from dateutil import parser as dateutil_parser
+from dateutil.relativedelta import relativedelta
+
+from pcs.common.types import CibRuleInEffectStatus
+
+from .expression_part import (
+    BOOL_OR,
+    DATE_OP_GT,
+    NODE_ATTR_OP_DEFINED,
+    NODE_ATTR_OP_EQ,
+    NODE_ATTR_OP_GT,
+    NODE_ATTR_OP_GTE,
+    NODE_ATTR_OP_LT,
+    NODE_ATTR_OP_LTE,
+    NODE_ATTR_OP_NE,
+    NODE_ATTR_OP_NOT_DEFINED,
+    NODE_ATTR_TYPE_INTEGER,
+    NODE_ATTR_TYPE_NUMBER,
+    NODE_ATTR_TYPE_VERSION,
+    BoolExpr,
+    DateInRangeExpr,
+    DatespecExpr,
+    DateUnaryExpr,
+    NodeAttrExpr,
+    RuleExprPart,
+)
+
+# A rule may keep its value over many changes of its date expressions. Stop
+# looking for its next change after this number of changes.
+_MAX_CHANGES = 1000
+
+_ONE_SECOND = timedelta(seconds=1)
+
+_UNIT_SECOND = "second"
+_UNIT_MINUTE = "minute"
+_UNIT_HOUR = "hour"
+_UNIT_DAY = "day"
+_UNIT_WEEK = "week"
+_UNIT_MONTH = "month"
+_UNIT_YEAR = "year"
+_UNIT_WEEKYEAR = "weekyear"
+
+_UNIT_STEP = {
+    _UNIT_SECOND: relativedelta(seconds=1),
+    _UNIT_MINUTE: relativedelta(minutes=1),
+    _UNIT_HOUR: relativedelta(hours=1),
+    _UNIT_DAY: relativedelta(days=1),
+    _UNIT_WEEK: relativedelta(weeks=1),
+    _UNIT_MONTH: relativedelta(months=1),
+}
+
+
+class _DatespecPart:
+    def __init__(
+        self, getter: Callable[[datetime], int], unit: str, max_steps: int
+    ):
+        """
+        getter -- get the part's value from a date
+        unit -- the largest time unit in which the value doesn't change
+        max_steps -- how many units to check when looking for the next change
+        """
+        self.getter = getter
+        self.unit = unit
+        self.max_steps = max_steps
+
+
+# date-spec parts from the coarsest to the finest
+_DATESPEC_PARTS: Dict[str, _DatespecPart] = {
+    "years": _DatespecPart(lambda date: date.year, _UNIT_YEAR, 0),
+    "weekyears": _DatespecPart(
+        lambda date: date.isocalendar()[0], _UNIT_WEEKYEAR, 0
+    ),
+    "months": _DatespecPart(lambda date: date.month, _UNIT_MONTH, 12),
+    # week 53 is not in every year
+    "weeks": _DatespecPart(lambda date: date.isocalendar()[1], _UNIT_WEEK, 600),
+    # day 366 is not in every year
+    "yeardays": _DatespecPart(
+        lambda date: date.timetuple().tm_yday, _UNIT_DAY, 3000
+    ),
+    # the name used by CIB schema
+    "yearsdays": _DatespecPart(
+        lambda date: date.timetuple().tm_yday, _UNIT_DAY, 3000
+    ),
+    "monthdays": _DatespecPart(lambda date: date.day, _UNIT_DAY, 400),
+    "weekdays": _DatespecPart(lambda date: date.isoweekday(), _UNIT_DAY, 7),
+    "hours": _DatespecPart(lambda date: date.hour, _UNIT_HOUR, 24),
+    "minutes": _DatespecPart(lambda date: date.minute, _UNIT_MINUTE, 60),
+    "seconds": _DatespecPart(lambda date: date.second, _UNIT_SECOND, 60),
+}
+
+_DURATION_PARTS = frozenset(
+    ("years", "months", "weeks", "days", "hours", "minutes", "seconds")
+)
+
+
+def is_rule_in_effect(
+    rule: BoolExpr,
+    date: Optional[datetime] = None,
+    node_attrs: Optional[Mapping[str, str]] = None,
+) -> bool:
+    """
+    Figure out if a rule is in effect at a point in time on a node
+
+    Resource and operation expressions are considered to be satisfied, they
+    only specify which resources or operations a rule applies to. Raise
+    ValueError if the rule contains invalid or unsupported values.
+
+    rule -- parsed rule to be evaluated
+    date -- point in time to evaluate the rule at, defaults to the current time
+    node_attrs -- attributes of the node to evaluate the rule on
+    """
+    return _is_in_effect(rule, _normalize_date(date), node_attrs or {})
+
+
+def get_next_change(
+    rule: BoolExpr,
+    date: Optional[datetime] = None,
+    node_attrs: Optional[Mapping[str, str]] = None,
+) -> Optional[datetime]:
+    """
+    Figure out when a rule starts or stops being in effect on a node
+
+    Return None if the rule is not going to change. Raise ValueError if the
+    rule contains invalid or unsupported values.
+
+    rule -- parsed rule to be evaluated
+    date -- point in time to start at, defaults to the current time
+    node_attrs -- attributes of the node to evaluate the rule on
+    """
+    return _get_next_change(rule, _normalize_date(date), node_attrs or {})
+
+
+def get_in_effect_status(
+    rule: BoolExpr, date: Optional[datetime] = None
+) -> Optional[CibRuleInEffectStatus]:
+    """
+    Figure out if a rule is expired, in effect or not yet in effect
+
+    Only date expressions are evaluated, like crm_rule does. Resource and
+    operation expressions do not depend on time, so they are not taken into
+    account in "and" rules and they make the status of "or" rules unknown.
+    UNKNOWN is returned for rules without date expressions and for rules which
+    cannot be evaluated. None is returned for rules with node attribute
+    expressions, their status is left to crm_rule to decide.
+
+    rule -- parsed rule to be evaluated
+    date -- point in time to evaluate the rule at, defaults to the current time
+    """
+    if _has_node_attr_expr(rule):
+        return None
+    date_rule = _get_date_part(rule)
+    if date_rule is None:
+        return CibRuleInEffectStatus.UNKNOWN
+    date = _normalize_date(date)
+    try:
+        if _is_in_effect(date_rule, date, {}):
+            return CibRuleInEffectStatus.IN_EFFECT
+        if _get_next_change(date_rule, date, {}) is None:
+            return CibRuleInEffectStatus.EXPIRED
+        return CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+    except (ValueError, OverflowError):
+        # invalid dates, durations or date-spec values
+        return CibRuleInEffectStatus.UNKNOWN
+
+
+def _normalize_date(date: Optional[datetime]) -> datetime:
+    return (date or datetime.now()).astimezone().replace(microsecond=0)
+
+
+def _has_node_attr_expr(expr: RuleExprPart) -> bool:
+    if isinstance(expr, NodeAttrExpr):
+        return True
+    return isinstance(expr, BoolExpr) and any(
+        _has_node_attr_expr(child) for child in expr.children
+    )
+
+
+def _get_date_part(expr: RuleExprPart) -> Optional[RuleExprPart]:
+    """
+    Return the part of an expression depending on time, None if there's none
+    """
+    if isinstance(expr, (DateUnaryExpr, DateInRangeExpr, DatespecExpr)):
+        return expr
+    if not isinstance(expr, BoolExpr):
+        return None
+    children = [_get_date_part(child) for child in expr.children]
+    if expr.operator == BOOL_OR and None in children:
+        # the expression may be in effect regardless of time
+        return None
+    date_children = [child for child in children if child is not None]
+    return BoolExpr(expr.operator, date_children) if date_children else None
+
+
+def _get_next_change(
+    expr: RuleExprPart, date: datetime, node_attrs: Mapping[str, str]
+) -> Optional[datetime]:
+    in_effect = _is_in_effect(expr, date, node_attrs)
+    for _ in range(_MAX_CHANGES):
+        next_date = _get_next_date_change(expr, date)
+        if next_date is None:
+            return None
+        if _is_in_effect(expr, next_date, node_attrs) != in_effect:
+            return next_date
+        date = next_date
+    return None
+
+
+def _is_in_effect(
+    expr: RuleExprPart, date: datetime, node_attrs: Mapping[str, str]
+) -> bool:
+    # pylint: disable=too-many-return-statements
+    if isinstance(expr, BoolExpr):
+        if expr.operator == BOOL_OR:
+            return any(
+                _is_in_effect(child, date, node_attrs)
+                for child in expr.children
+            )
+        return all(
+            _is_in_effect(child, date, node_attrs) for child in expr.children
+        )
+    if isinstance(expr, DateUnaryExpr):
+        if expr.operator == DATE_OP_GT:
+            return date > _parse_date(expr.date)
+        return date < _parse_date(expr.date)
+    if isinstance(expr, DateInRangeExpr):
+        start, end = _get_range(expr)
+        return (start is None or start <= date) and (end is None or date <= end)
+    if isinstance(expr, DatespecExpr):
+        return _datespec_matches(_get_datespec_ranges(expr), _local(date))
+    if isinstance(expr, NodeAttrExpr):
+        return _node_attr_matches(expr, node_attrs)
+    # resource and operation expressions
+    return True
+
+
+def _get_next_date_change(
+    expr: RuleExprPart, date: datetime
+) -> Optional[datetime]:
+    """
+    Return the nearest point in time after a date when an expression or any of
+    its subexpressions changes because of time
+    """
+    change_list: List[Optional[datetime]] = []
+    if isinstance(expr, BoolExpr):
+        change_list = [
+            _get_next_date_change(child, date) for child in expr.children
+        ]
+    elif isinstance(expr, DateUnaryExpr):
+        if expr.operator == DATE_OP_GT:
+            change_list = [_parse_date(expr.date) + _ONE_SECOND]
+        else:
+            change_list = [_parse_date(expr.date)]
+    elif isinstance(expr, DateInRangeExpr):
+        start, end = _get_range(expr)
+        change_list = [start, end + _ONE_SECOND if end else None]
+    elif isinstance(expr, DatespecExpr):
+        local_change = _get_datespec_next_change(
+            _get_datespec_ranges(expr), _local(date)
+        )
+        change_list = [local_change.astimezone() if local_change else None]
+    future_changes = [
+        change for change in change_list if change is not None and change > date
+    ]
+    return min(future_changes) if future_changes else None
+
+
+def _get_range(
+    expr: DateInRangeExpr,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    start = _parse_date(expr.date_start) if expr.date_start else None
+    end = _parse_date(expr.date_end) if expr.date_end else None
+    if start is not None and expr.duration_parts:
+        end = start + _parse_duration(
+            tuple((name, value) for name, value in expr.duration_parts)
+        )
+    return start, end
+
+
+def _node_attr_matches(
+    expr: NodeAttrExpr, node_attrs: Mapping[str, str]
+) -> bool:
+    value = node_attrs.get(expr.attr_name)
+    if expr.operator == NODE_ATTR_OP_DEFINED:
+        return value is not None
+    if expr.operator == NODE_ATTR_OP_NOT_DEFINED:
+        return value is None
+    if value is None or expr.attr_value is None:
+        # only "ne" is true when comparing an undefined value, as in pacemaker
+        if expr.operator == NODE_ATTR_OP_EQ:
+            return value == expr.attr_value
+        return expr.operator == NODE_ATTR_OP_NE and value != expr.attr_value
+    cmp = _compare_attr_values(
+        value, expr.attr_value, _get_attr_type(expr, value)
+    )
+    return {
+        NODE_ATTR_OP_EQ: cmp == 0,
+        NODE_ATTR_OP_NE: cmp != 0,
+        NODE_ATTR_OP_LT: cmp < 0,
+        NODE_ATTR_OP_LTE: cmp <= 0,
+        NODE_ATTR_OP_GT: cmp > 0,
+        NODE_ATTR_OP_GTE: cmp >= 0,
+    }.get(expr.operator, False)
+
+
+def _get_attr_type(expr: NodeAttrExpr, value: str) -> str:
+    if expr.attr_type:
+        return expr.attr_type
+    # pacemaker defaults
+    if expr.operator in (
+        NODE_ATTR_OP_LT,
+        NODE_ATTR_OP_LTE,
+        NODE_ATTR_OP_GT,
+        NODE_ATTR_OP_GTE,
+    ):
+        if "." in value or "." in str(expr.attr_value):
+            return NODE_ATTR_TYPE_NUMBER
+        return NODE_ATTR_TYPE_INTEGER
+    return ""
+
+
+def _compare_attr_values(left: str, right: str, attr_type: str) -> int:
+    try:
+        if attr_type == NODE_ATTR_TYPE_INTEGER:
+            return _cmp(int(left), int(right))
+        if attr_type == NODE_ATTR_TYPE_NUMBER:
+            return _cmp(float(left), float(right))
+        if attr_type == NODE_ATTR_TYPE_VERSION:
+            return _compare_versions(left, right)
+    except ValueError:
+        # pacemaker compares values as strings if they cannot be converted
+        pass
+    return _cmp(left.casefold(), right.casefold())
+
+
+def _compare_versions(left: str, right: str) -> int:
+    left_parts = [int(part) for part in left.split(".")]
+    right_parts = [int(part) for part in right.split(".")]
+    length = max(len(left_parts), len(right_parts))
+    return _cmp(
+        left_parts + [0] * (length - len(left_parts)),
+        right_parts + [0] * (length - len(right_parts)),
+    )
+
+
+def _cmp(left: Any, right: Any) -> int:
+    return (left > right) - (left < right)
+
+
+def _local(date: datetime) -> datetime:
+    """
+    Return a naive local time of a date, date-specs are evaluated on it
+    """
+    return date.astimezone().replace(tzinfo=None)
+
+
+def _get_datespec_ranges(expr: DatespecExpr) -> Dict[str, Tuple[int, int]]:
+    ranges = {}
+    for name, value in expr.date_parts:
+        if name not in _DATESPEC_PARTS:
+            raise ValueError(f"Unsupported date-spec part: {name}")
+        ranges[name] = _parse_range(value)
+    return ranges
+
+
+def _datespec_matches(
+    ranges: Mapping[str, Tuple[int, int]], date: datetime
+) -> bool:
+    return _get_datespec_mismatch(ranges, date) is None
+
+
+def _get_datespec_mismatch(
+    ranges: Mapping[str, Tuple[int, int]], date: datetime
+) -> Optional[str]:
+    """
+    Return the coarsest date-spec part not matching a date
+    """
+    for name, part in _DATESPEC_PARTS.items():
+        if name in ranges:
+            low, high = ranges[name]
+            if not low <= part.getter(date) <= high:
+                return name
+    return None
+
+
+def _get_datespec_next_change(
+    ranges: Mapping[str, Tuple[int, int]], date: datetime
+) -> Optional[datetime]:
+    if _datespec_matches(ranges, date):
+        # The date-spec stops matching as soon as any of its parts does.
+        part_changes = [
+            _get_part_next_change(name, low, high, date, False)
+            for name, (low, high) in ranges.items()
+        ]
+        changes = [change for change in part_changes if change is not None]
+        return min(changes) if changes else None
+    # Move to the next date matching the coarsest non-matching part until all
+    # the parts match. Finer parts start at their lowest values then.
+    for _ in range(_MAX_CHANGES):
+        mismatch = _get_datespec_mismatch(ranges, date)
+        if mismatch is None:
+            return date
+        low, high = ranges[mismatch]
+        next_date = _get_part_next_change(mismatch, low, high, date, True)
+        if next_date is None:
+            return None
+        date = next_date
+    return None
+
+
+def _get_part_next_change(
+    name: str, low: int, high: int, date: datetime, to_match: bool
+) -> Optional[datetime]:
+    """
+    Return the start of the nearest time unit after a date in which a date-spec
+    part starts or stops matching
+
+    name -- name of the date-spec part
+    low -- the lowest matching value of the part
+    high -- the highest matching value of the part
+    date -- naive local time to start at
+    to_match -- look for the part to start (True) or to stop (False) matching
+    """
+    part = _DATESPEC_PARTS[name]
+    if part.unit in (_UNIT_YEAR, _UNIT_WEEKYEAR):
+        # years only grow
+        if to_match:
+            return (
+                _year_start(part.unit, low) if part.getter(date) < low else None
+            )
+        return _year_start(part.unit, high + 1)
+    unit_start = _unit_start(part.unit, date)
+    for _ in range(part.max_steps):
+        unit_start += _UNIT_STEP[part.unit]
+        if (low <= part.getter(unit_start) <= high) == to_match:
+            return unit_start
+    return None
+
+
+def _unit_start(unit: str, date: datetime) -> datetime:
+    if unit == _UNIT_SECOND:
+        return date.replace(microsecond=0)
+    if unit == _UNIT_MINUTE:
+        return date.replace(second=0, microsecond=0)
+    if unit == _UNIT_HOUR:
+        return date.replace(minute=0, second=0, microsecond=0)
+    day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    if unit == _UNIT_WEEK:
+        return day_start - timedelta(days=date.isoweekday() - 1)
+    if unit == _UNIT_MONTH:
+        return day_start.replace(day=1)
+    return day_start
+
+
+def _year_start(unit: str, year: int) -> datetime:
+    if unit == _UNIT_WEEKYEAR:
+        return datetime.fromisocalendar(year, 1, 1)
+    return datetime(year, 1, 1)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date: str) -> datetime:
+    # Dates without a time zone are in the local time, as in pacemaker.
+    return dateutil_parser.isoparse(date).astimezone()
+
+
+@lru_cache(maxsize=1024)
+def _parse_duration(duration_parts: Sequence[Tuple[str, str]]) -> relativedelta:
+    unsupported_parts = {name for name, _ in duration_parts} - _DURATION_PARTS
+    if unsupported_parts:
+        raise ValueError(f"Unsupported duration parts: {unsupported_parts}")
+    return relativedelta(**{name: int(value) for name, value in duration_parts})
+
+
+@lru_cache(maxsize=1024)
+def _parse_range(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
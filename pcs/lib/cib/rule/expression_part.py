@@ -64,7 +64,7 @@ class DateInRangeExpr(RuleExprPart):
     Represents a 'date in range' expression
     """
 
-    date_start: str
+    date_start: Optional[str]
     date_end: Optional[str]
     duration_parts: Optional[Sequence[Tuple[str, str]]]
 
@@ -1,10 +1,30 @@
+from datetime import datetime
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    cast,
+)
+
 from lxml.etree import _Element
 
 from pcs.common.types import CibRuleInEffectStatus
 from pcs.lib.external import CommandRunner
-from pcs.lib.pacemaker.live import get_rule_in_effect_status
+from pcs.lib.pacemaker.live import (
+    get_rule_in_effect_status,
+    get_rules_in_effect_status,
+)
 from pcs.lib.xml_tools import etree_to_str
 
+from .cib_to_parsed import rule_element_to_parsed
+from .evaluator import (
+    get_in_effect_status,
+    get_next_change,
+    is_rule_in_effect,
+)
+from .expression_part import BoolExpr
+
 
 class RuleInEffectEval:
     """
@@ -49,8 +69,170 @@ class RuleInEffectEvalOneByOne(RuleInEffectEval):
         return get_rule_in_effect_status(self._runner, self._cib_xml, rule_id)
 
 
-# TODO Implement this once the pacemaker tool is capable of evaluating more
-# than one rule per go. If we can eval all rules by running the tool once, it
-# would be a significant speedup comparing to running the tool for each rule.
-# class RuleInEffectEvalAllAtOnce(RuleInEffectEval):
-#     pass
+class RuleInEffectEvalAllAtOnce(RuleInEffectEval):
+    """
+    Evaluate all rules in a CIB by running a pacemaker tool once.
+
+    Rules are evaluated when a status of a rule is requested for the first
+    time. Rules which the tool is not capable of evaluating all at once are
+    evaluated in python. Rules depending on node attributes are evaluated by
+    running the tool for each of them then.
+    """
+
+    def __init__(self, cib: _Element, runner: CommandRunner):
+        """
+        cib -- the whole cib containing the rule expressions
+        runner -- a class for running external processes
+        """
+        self._runner = runner
+        self._cib = cib
+        self._status_map: Optional[Dict[str, CibRuleInEffectStatus]] = None
+
+    def get_rule_status(self, rule_id: str) -> CibRuleInEffectStatus:
+        if self._status_map is None:
+            self._status_map = self._evaluate_all()
+        return self._status_map.get(rule_id, CibRuleInEffectStatus.UNKNOWN)
+
+    def _evaluate_all(self) -> Dict[str, CibRuleInEffectStatus]:
+        rule_el_list = cast(
+            List[_Element], self._cib.xpath("./configuration//rule[@id]")
+        )
+        cib_xml = etree_to_str(self._cib)
+        status_map = get_rules_in_effect_status(
+            self._runner,
+            cib_xml,
+            [str(rule_el.get("id")) for rule_el in rule_el_list],
+        )
+        python_eval = RuleInEffectEvalPython(self._cib)
+        for rule_el in rule_el_list:
+            rule_id = str(rule_el.get("id"))
+            if rule_id in status_map:
+                continue
+            status = python_eval.get_decidable_rule_status(rule_id)
+            if status is None:
+                # python refuses to decide, let the tool check the rule alone
+                status = get_rule_in_effect_status(
+                    self._runner, cib_xml, rule_id
+                )
+            status_map[rule_id] = status
+        return status_map
+
+
+class RuleInEffectEvalPython(RuleInEffectEval):
+    """
+    Evaluate rules in python without running any pacemaker tools.
+
+    Rule elements are converted to parsed rule trees the first time they are
+    evaluated and the trees are cached. That makes it cheap to evaluate rules
+    repeatedly, e.g. at various points in time or on various nodes.
+    """
+
+    def __init__(self, cib: _Element, date: Optional[datetime] = None):
+        """
+        cib -- the whole cib containing the rule expressions
+        date -- point in time to get rule statuses at, defaults to current time
+        """
+        self._cib = cib
+        self._date = date
+        self._rule_el_map: Optional[Dict[str, _Element]] = None
+        self._parsed_map: Dict[str, BoolExpr] = {}
+
+    def get_rule_status(self, rule_id: str) -> CibRuleInEffectStatus:
+        status = self.get_decidable_rule_status(rule_id)
+        return CibRuleInEffectStatus.UNKNOWN if status is None else status
+
+    def get_decidable_rule_status(
+        self, rule_id: str
+    ) -> Optional[CibRuleInEffectStatus]:
+        """
+        Figure out if a rule is expired, in effect, not yet in effect
+
+        Return None if the status depends on node attributes, pacemaker tools
+        have to be used to decide it then.
+
+        rule_id -- ID of the rule to be evaluated
+        """
+        rule = self._get_parsed_rule(rule_id)
+        if rule is None:
+            return CibRuleInEffectStatus.UNKNOWN
+        return get_in_effect_status(rule, self._date)
+
+    def is_rule_in_effect(
+        self,
+        rule_id: str,
+        date: Optional[datetime] = None,
+        node_attrs: Optional[Mapping[str, str]] = None,
+    ) -> bool:
+        """
+        Figure out if a rule is in effect at a point in time on a node
+
+        Raise ValueError if the rule contains invalid or unsupported values.
+
+        rule_id -- ID of the rule to be evaluated
+        date -- point in time to evaluate the rule at, defaults to current time
+        node_attrs -- attributes of the node to evaluate the rule on
+        """
+        rule = self._get_parsed_rule(rule_id)
+        return rule is not None and is_rule_in_effect(rule, date, node_attrs)
+
+    def get_rule_next_change(
+        self,
+        rule_id: str,
+        date: Optional[datetime] = None,
+        node_attrs: Optional[Mapping[str, str]] = None,
+    ) -> Optional[datetime]:
+        """
+        Figure out when a rule starts or stops being in effect on a node
+
+        Return None if the rule is not going to change. Raise ValueError if
+        the rule contains invalid or unsupported values.
+
+        rule_id -- ID of the rule to be evaluated
+        date -- point in time to start at, defaults to the current time
+        node_attrs -- attributes of the node to evaluate the rule on
+        """
+        rule = self._get_parsed_rule(rule_id)
+        return None if rule is None else get_next_change(rule, date, node_attrs)
+
+    def get_rules_in_effect(
+        self,
+        date: Optional[datetime] = None,
+        node_attrs: Optional[Mapping[str, str]] = None,
+    ) -> List[str]:
+        """
+        Return IDs of top level rules in effect at a point in time on a node
+
+        Rules containing invalid or unsupported values are not in effect.
+
+        date -- point in time to evaluate the rules at, defaults to current time
+        node_attrs -- attributes of the node to evaluate the rules on
+        """
+        result = []
+        for rule_id, rule_el in self._get_rule_el_map().items():
+            if rule_el.getparent().tag == "rule":
+                continue
+            try:
+                if self.is_rule_in_effect(rule_id, date, node_attrs):
+                    result.append(rule_id)
+            except (ValueError, OverflowError):
+                pass
+        return result
+
+    def _get_rule_el_map(self) -> Dict[str, _Element]:
+        if self._rule_el_map is None:
+            self._rule_el_map = {
+                str(rule_el.get("id")): rule_el
+                for rule_el in cast(
+                    List[_Element],
+                    self._cib.xpath("./configuration//rule[@id]"),
+                )
+            }
+        return self._rule_el_map
+
+    def _get_parsed_rule(self, rule_id: str) -> Optional[BoolExpr]:
+        if rule_id not in self._parsed_map:
+            rule_el = self._get_rule_el_map().get(rule_id)
+            if rule_el is None:
+                return None
+            self._parsed_map[rule_id] = rule_element_to_parsed(rule_el)
+        return self._parsed_map[rule_id]
@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from typing import (
     Any,
     Iterator,
@@ -60,8 +62,33 @@ _token_to_node_expr_type = {
     "version": NODE_ATTR_TYPE_VERSION,
 }
 
-
-pyparsing.ParserElement.enablePackrat()
+# Number of parsed rule strings kept in the parse cache
+_PARSE_CACHE_SIZE = 1024
+
+# The most common rules consist of one simple expression. Those are parsed by
+# regular expressions without running the whole grammar. Tokens are separated
+# by the same whitespace characters as pyparsing uses by default and their
+# values follow the definitions in the grammar. Rules not matched by these
+# regular expressions are parsed by the grammar.
+_FAST_PATH_SPACE = r"[ \t\n\r]"
+_FAST_PATH_VALUE = r"[^\s()]+"
+_fast_path_date_unary_expr = re.compile(
+    rf"{_FAST_PATH_SPACE}*date{_FAST_PATH_SPACE}+(?P<operator>gt|lt)"
+    rf"{_FAST_PATH_SPACE}+(?P<date>{_FAST_PATH_VALUE}){_FAST_PATH_SPACE}*",
+    re.IGNORECASE,
+)
+_fast_path_node_attr_unary_expr = re.compile(
+    rf"{_FAST_PATH_SPACE}*(?P<operator>defined|not_defined)"
+    rf"{_FAST_PATH_SPACE}+(?P<attr_name>{_FAST_PATH_VALUE})"
+    rf"{_FAST_PATH_SPACE}*",
+    re.IGNORECASE,
+)
+_fast_path_rsc_expr = re.compile(
+    rf"{_FAST_PATH_SPACE}*resource{_FAST_PATH_SPACE}+"
+    r"(?P<standard>[^\s:()]+)?:(?P<provider>[^\s:()]+)?:(?P<type>[^\s:()]+)?"
+    rf"{_FAST_PATH_SPACE}*",
+    re.IGNORECASE,
+)
 
 
 class RuleParseError(Exception):
@@ -87,10 +114,22 @@ def parse_rule(rule_string: str) -> BoolExpr:
     """
     Parse a rule string and return a corresponding semantic tree
 
+    Parsed trees are cached and shared by all callers parsing the same rule
+    string, they must not be modified.
+
     rule_string -- the whole rule expression
     """
     if not rule_string:
         return BoolExpr(BOOL_AND, [])
+    return __parse_rule_cached(rule_string)
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def __parse_rule_cached(rule_string: str) -> BoolExpr:
+    # Parse errors are raised as exceptions, so they are not cached.
+    parsed = __parse_simple_rule(rule_string)
+    if parsed is not None:
+        return BoolExpr(BOOL_AND, [parsed])
 
     try:
         parsed = __get_rule_parser().parseString(rule_string, parseAll=True)[0]
@@ -113,6 +152,38 @@ def parse_rule(rule_string: str) -> BoolExpr:
     return parsed
 
 
+def __parse_simple_rule(rule_string: str) -> Optional[RuleExprPart]:
+    """
+    Parse a rule consisting of one common simple expression without the grammar
+
+    Return None if the rule is not one of the supported simple expressions.
+
+    rule_string -- the whole rule expression
+    """
+    match = _fast_path_date_unary_expr.fullmatch(rule_string)
+    if match:
+        return DateUnaryExpr(
+            _token_to_date_expr_unary_op[match.group("operator").lower()],
+            match.group("date"),
+        )
+    match = _fast_path_node_attr_unary_expr.fullmatch(rule_string)
+    if match:
+        return NodeAttrExpr(
+            _token_to_node_expr_unary_op[match.group("operator").lower()],
+            match.group("attr_name"),
+            None,
+            None,
+        )
+    match = _fast_path_rsc_expr.fullmatch(rule_string)
+    if match:
+        return RscExpr(
+            match.group("standard"),
+            match.group("provider"),
+            match.group("type"),
+        )
+    return None
+
+
 def __operator_operands(
     token_list: pyparsing.ParseResults,
 ) -> Iterator[Tuple[Any, Any]]:
@@ -266,8 +337,15 @@ def __get_date_common_parser_part() -> pyparsing.ParserElement:
     )
 
 
+@lru_cache(maxsize=None)
 def __get_rule_parser() -> pyparsing.ParserElement:
-    # This function defines the rule grammar
+    # This function defines the rule grammar. The grammar is built only once,
+    # when a rule is parsed for the first time.
+
+    # Packrat parsing speeds up parsing of nested expressions a lot. It is
+    # a global pyparsing setting, so it is only enabled once the grammar is
+    # actually needed instead of when this module is imported.
+    pyparsing.ParserElement.enablePackrat()
 
     # How to add new rule expressions:
     #   1 Create new grammar rules in a way similar to existing rsc_expr and
@@ -132,9 +132,10 @@ class Validator:
             report_list.append(
                 reports.item.ReportItem.error(
                     message=reports.messages.RuleExpressionSinceGreaterThanUntil(
-                        expr.date_start,
-                        # If end_date is not None, then expr.date_end is not
-                        # None, but mypy does not see it.
+                        # If start_date and end_date are not None, then
+                        # expr.date_start and expr.date_end are not None, but
+                        # mypy does not see it.
+                        cast(str, expr.date_start),
                         cast(str, expr.date_end),
                     ),
                 )
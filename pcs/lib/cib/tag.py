@@ -591,6 +591,28 @@ def remove_obj_ref(obj_ref_list: Iterable[_Element]) -> None:
             remove_one_element(tag)
 
 
+def remove_references_to_elements(
+    tags_section: _Element, element_ids: Container[str]
+) -> List[_Element]:
+    """
+    Remove obj_ref elements referencing specified elements and also tags which
+    remain empty. Return a list of removed tag elements.
+
+    tags_section -- element tags
+    element_ids -- ids of elements whose references are removed
+    """
+    obj_ref_list = [
+        obj_ref
+        for obj_ref in tags_section.iterfind(f"./{TAG_TAG}/{TAG_OBJREF}")
+        if obj_ref.get("id") in element_ids
+    ]
+    tag_list = list(
+        dict.fromkeys(obj_ref.getparent() for obj_ref in obj_ref_list)
+    )
+    remove_obj_ref(obj_ref_list)
+    return [tag for tag in tag_list if tag.getparent() is None]
+
+
 def add_obj_ref(
     tag_element: _Element,
     obj_ref_el_list: Iterable[_Element],
@@ -1,7 +1,11 @@
 import re
+from contextlib import nullcontext
+from functools import partial
 from typing import (
+    ContextManager,
     Iterable,
     List,
+    Optional,
     Pattern,
     Set,
     Tuple,
@@ -24,6 +28,11 @@ from pcs.common.reports.item import (
 )
 from pcs.common.tools import Version
 from pcs.lib.cib import sections
+from pcs.lib.cib.id_index import (
+    NOT_ID_TAGS,
+    CibIdIndex,
+    get_id_index,
+)
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import (
     sanitize_id,
@@ -69,16 +78,20 @@ class IdProvider:
         """
         reported_ids = set()
         report_list = []
-        for _id in id_list:
-            if _id in reported_ids:
-                continue
-            if _id in self._booked_ids or does_id_exist(self._cib, _id):
-                report_list.append(
-                    ReportItem.error(reports.messages.IdAlreadyExists(_id))
-                )
-                reported_ids.add(_id)
-                continue
-            self._booked_ids.add(_id)
+        id_index = get_id_index(self._cib)
+        with _unchanged_cib(id_index):
+            for _id in id_list:
+                if _id in reported_ids:
+                    continue
+                if _id in self._booked_ids or does_id_exist(self._cib, _id):
+                    report_list.append(
+                        ReportItem.error(reports.messages.IdAlreadyExists(_id))
+                    )
+                    reported_ids.add(_id)
+                    continue
+                self._booked_ids.add(_id)
+                if id_index:
+                    id_index.reserve_id(_id)
         return report_list
 
 
@@ -200,6 +213,10 @@ class ElementSearcher:
 
     def _execute(self):
         self._executed = True
+        id_index = get_id_index(self._context_element)
+        if id_index and self._is_indexed_context():
+            self._element = self._find_in_index(id_index)
+            return
         for tag in self._tag_list:
             element_list = self._context_element.xpath(
                 ".//*[local-name()=$tag_name and @id=$element_id]",
@@ -210,6 +227,32 @@ class ElementSearcher:
                 self._element = element_list[0]
                 return
 
+    def _is_indexed_context(self):
+        # the index contains neither the status section nor elements with an
+        # id attribute which does not serve as an id
+        if NOT_ID_TAGS.intersection(self._tag_list):
+            return False
+        if self._context_element.getparent() is None:
+            return False
+        return not self._context_element.xpath("ancestor-or-self::status")
+
+    def _find_in_index(self, id_index):
+        element_list = [
+            element
+            for element in id_index.get_elements(self._element_id)
+            if element.get("id") == self._element_id
+            and self._context_element in element.iterancestors()
+        ]
+        for tag in self._tag_list:
+            for element in element_list:
+                if element.tag == tag:
+                    return element
+        return None
+
+
+def _unchanged_cib(id_index: Optional[CibIdIndex]) -> ContextManager:
+    return id_index.unchanged_cib() if id_index else nullcontext()
+
 
 def get_configuration_elements_by_id(
     tree: _Element, check_id: str
@@ -223,6 +266,9 @@ def get_configuration_elements_by_id(
         searched
     check_id -- id to find
     """
+    id_index = get_id_index(tree)
+    if id_index:
+        return id_index.get_elements(check_id)
     # do not search in /cib/status, it may contain references to previously
     # existing and deleted resources and thus preventing creating them again
 
@@ -299,11 +345,12 @@ def get_elements_by_ids(
     """
     found_element_list = []
     id_not_found_list = []
-    for element_id in element_ids:
-        try:
-            found_element_list.append(get_element_by_id(cib, element_id))
-        except ElementNotFound:
-            id_not_found_list.append(element_id)
+    with _unchanged_cib(get_id_index(cib)):
+        for element_id in element_ids:
+            try:
+                found_element_list.append(get_element_by_id(cib, element_id))
+            except ElementNotFound:
+                id_not_found_list.append(element_id)
     return found_element_list, id_not_found_list
 
 
@@ -339,11 +386,16 @@ def find_unique_id(tree, check_id, reserved_ids=None):
     """
     if not reserved_ids:
         reserved_ids = set()
+    id_index = get_id_index(tree)
+    id_exists = id_index.id_exists if id_index else partial(does_id_exist, tree)
     counter = 1
     temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
-        temp_id = "{0}-{1}".format(check_id, counter)
-        counter += 1
+    with _unchanged_cib(id_index):
+        while temp_id in reserved_ids or id_exists(temp_id):
+            temp_id = "{0}-{1}".format(check_id, counter)
+            counter += 1
+    if id_index:
+        id_index.reserve_id(temp_id)
     return temp_id
 
 
@@ -432,7 +432,9 @@ def create_in_cluster(
         primitive.create, env.report_processor, resources_section, id_provider
     )
     agent_factory = ResourceAgentFacadeFactory(
-        env.cmd_runner(), report_processor
+        env.cmd_runner(),
+        report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
     )
 
     # Group id validation is not needed since create_id creates a new unique
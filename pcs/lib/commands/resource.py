@@ -4,6 +4,7 @@ from functools import partial
 from typing import (
     Any,
     Callable,
+    Container,
     Dict,
     FrozenSet,
     Iterable,
@@ -32,17 +33,33 @@ from pcs.common.tools import (
     timeout_to_seconds,
 )
 from pcs.lib.cib import const as cib_const
-from pcs.lib.cib import resource
+from pcs.lib.cib import (
+    resource,
+    sections,
+)
 from pcs.lib.cib import status as cib_status
-from pcs.lib.cib.tag import expand_tag
+from pcs.lib.cib.acl import remove_permissions_referencing
+from pcs.lib.cib.constraint.constraint import (
+    remove_location_constraints_on_nodes,
+    remove_references_to_resources,
+)
+from pcs.lib.cib.fencing_topology import remove_device_from_all_levels
+from pcs.lib.cib.tag import (
+    expand_tag,
+    remove_references_to_elements,
+)
 from pcs.lib.cib.tools import (
     ElementNotFound,
     IdProvider,
     find_element_by_tag_and_id,
+    get_acls,
+    get_constraints,
     get_element_by_id,
     get_elements_by_ids,
+    get_fencing_topology,
     get_resources,
     get_status,
+    get_tags,
 )
 from pcs.lib.env import (
     LibraryEnvironment,
@@ -62,6 +79,7 @@ from pcs.lib.pacemaker.live import (
     get_cluster_status_dom,
     has_resource_unmove_unban_expired_support,
     push_cib_diff_xml,
+    remove_node,
     resource_ban,
     resource_move,
     resource_unmove_unban,
@@ -86,11 +104,13 @@ from pcs.lib.resource_agent import (
     resource_agent_error_to_report_item,
     split_resource_agent_name,
 )
+from pcs.lib.resource_agent.cache import ResourceAgentNameCache
 from pcs.lib.tools import get_tmp_cib
 from pcs.lib.validate import ValueTimeInterval
 from pcs.lib.xml_tools import (
     etree_to_str,
     get_root,
+    remove_one_element,
 )
 
 
@@ -157,12 +177,15 @@ def _get_agent_facade(
     factory: ResourceAgentFacadeFactory,
     name: str,
     allow_absent_agent: bool,
+    name_cache: Optional[ResourceAgentNameCache] = None,
 ) -> ResourceAgentFacade:
     try:
         split_name = (
             split_resource_agent_name(name)
             if ":" in name
-            else find_one_resource_agent_by_type(runner, report_processor, name)
+            else find_one_resource_agent_by_type(
+                runner, report_processor, name, name_cache=name_cache
+            )
         )
         if split_name.is_stonith:
             report_processor.report(
@@ -392,13 +415,18 @@ def create(
         flag is set to False and warning is produced otherwise
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     resource_agent = _get_agent_facade(
         env.report_processor,
         runner,
         agent_factory,
         resource_agent_name,
         allow_absent_agent,
+        name_cache=env.resource_agent_name_cache,
     )
     with resource_environment(
         env,
@@ -488,13 +516,18 @@ def create_as_clone(
     allow_not_suitable_command -- turn forceable errors into warnings
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     resource_agent = _get_agent_facade(
         env.report_processor,
         runner,
         agent_factory,
         resource_agent_name,
         allow_absent_agent,
+        name_cache=env.resource_agent_name_cache,
     )
     with resource_environment(
         env,
@@ -598,13 +631,18 @@ def create_in_group(
     allow_not_suitable_command -- turn forceable errors into warnings
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     resource_agent = _get_agent_facade(
         env.report_processor,
         runner,
         agent_factory,
         resource_agent_name,
         allow_absent_agent,
+        name_cache=env.resource_agent_name_cache,
     )
     with resource_environment(
         env,
@@ -736,13 +774,18 @@ def create_into_bundle(
     allow_not_accessible_resource -- turn forceable errors into warnings
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     resource_agent = _get_agent_facade(
         env.report_processor,
         runner,
         agent_factory,
         resource_agent_name,
         allow_absent_agent,
+        name_cache=env.resource_agent_name_cache,
     )
     required_cib_version = get_required_cib_version_for_primitive(
         operation_list
@@ -1419,6 +1462,247 @@ def manage(
     env.push_cib()
 
 
+def delete(
+    env: LibraryEnvironment,
+    resource_ids: Iterable[str],
+    force_flags: Container[reports.types.ForceCode] = (),
+    wait: WaitType = False,
+) -> None:
+    """
+    Remove specified resources and all references to them from the CIB
+
+    In a live cluster, running resources are stopped and the cluster waits for
+    them to stop before they are removed.
+
+    env -- provides all for communication with externals
+    resource_ids -- ids of the resources, stonith resources, groups, clones or
+        bundles to be removed
+    force_flags -- list of flags codes
+    wait -- flag for controlling waiting for pacemaker idle mechanism, waiting
+        for resources to stop and for remote connections to stop before their
+        nodes are removed is never skipped
+    """
+    force = reports.codes.FORCE in force_flags
+    wait_timeout = env.ensure_wait_satisfiable(wait)
+    # resources must be stopped before they are removed
+    stop_wait_timeout = max(wait_timeout, 0)
+    cib = env.get_cib()
+    resource_el_list, report_list = _delete_find_elements(cib, resource_ids)
+    if env.report_processor.report_list(report_list).has_errors:
+        raise LibraryError()
+    node_name_list = []
+    for resource_el in resource_el_list:
+        if not resource.primitive.is_primitive(resource_el):
+            continue
+        node_name = resource.remote_node.get_node_name_from_resource(
+            resource_el
+        )
+        report_msg: reports.item.ReportItemMessage = (
+            reports.messages.UseCommandNodeRemoveRemote()
+        )
+        if node_name is None:
+            node_name = resource.guest_node.get_node_name_from_resource(
+                resource_el
+            )
+            report_msg = reports.messages.UseCommandNodeRemoveGuest()
+        if node_name is not None:
+            node_name_list.append(node_name)
+            env.report_processor.report(
+                ReportItem(
+                    severity=reports.item.get_severity(
+                        reports.codes.FORCE, force
+                    ),
+                    message=report_msg,
+                )
+            )
+    if env.report_processor.has_errors:
+        raise LibraryError()
+
+    if env.is_cib_live and _delete_stop_resources(
+        env, cib, resource_el_list, force, stop_wait_timeout
+    ):
+        # the disabled resources have been pushed, load the CIB again
+        cib = env.get_cib()
+        resource_el_list, report_list = _delete_find_elements(cib, resource_ids)
+        if env.report_processor.report_list(report_list).has_errors:
+            raise LibraryError()
+
+    _delete_remove_elements(env, cib, resource_el_list, node_name_list)
+    if env.is_cib_live and node_name_list:
+        # remote connections must be stopped before the nodes are removed
+        env.push_cib(wait_timeout=stop_wait_timeout)
+        for node_name in node_name_list:
+            remove_node(env.cmd_runner(), node_name)
+    else:
+        env.push_cib(wait_timeout=wait_timeout)
+
+
+def _delete_find_elements(
+    cib: _Element, resource_ids: Iterable[str]
+) -> Tuple[List[_Element], ReportItemList]:
+    """
+    Find elements to be removed in order to remove specified resources
+
+    Return resource elements in document order including inner resources of
+    specified resources and parent resources which would remain empty.
+    """
+    resource_el_list, report_list = resource.common.find_resources(
+        get_resources(cib), resource_ids
+    )
+    to_remove: Set[_Element] = set()
+    for resource_el in resource_el_list:
+        to_remove.update(resource.common.find_resources_to_delete(resource_el))
+    # groups are only removed with their last primitive by
+    # find_resources_to_delete, remove the groups with all primitives removed
+    for group_el in {
+        resource.common.get_parent_resource(resource_el)
+        for resource_el in to_remove
+        if resource.primitive.is_primitive(resource_el)
+    }:
+        if (
+            group_el is not None
+            and group_el not in to_remove
+            and resource.group.is_group(group_el)
+            and to_remove.issuperset(
+                resource.group.get_inner_resources(group_el)
+            )
+        ):
+            to_remove.update(resource.common.find_resources_to_delete(group_el))
+    return (
+        [el for el in get_resources(cib).iter() if el in to_remove],
+        report_list,
+    )
+
+
+def _delete_stop_resources(
+    env: LibraryEnvironment,
+    cib: _Element,
+    resource_el_list: Iterable[_Element],
+    force: bool,
+    wait_timeout: int,
+) -> bool:
+    """
+    Disable running resources and wait for them to stop
+
+    Return True if the CIB has been pushed, False if no resources were running
+
+    wait_timeout -- timeout of waiting for the resources to stop in seconds,
+        if 0 wait indefinitely
+    """
+    state = env.get_cluster_state()
+    running_el_list = [
+        resource_el
+        for resource_el in resource_el_list
+        if (
+            resource.primitive.is_primitive(resource_el)
+            or resource.bundle.is_bundle(resource_el)
+        )
+        and get_resource_state(state, str(resource_el.attrib["id"]))
+    ]
+    if not running_el_list:
+        return False
+    running_id_list = [
+        str(resource_el.attrib["id"]) for resource_el in running_el_list
+    ]
+    env.report_processor.report(
+        ReportItem.info(
+            reports.messages.StoppingResourcesBeforeDeleting(running_id_list)
+        )
+    )
+    if env.report_processor.report_list(
+        _resource_list_enable_disable(
+            running_el_list, resource.common.disable, IdProvider(cib), state
+        )
+    ).has_errors:
+        raise LibraryError()
+    env.push_cib(wait_timeout=wait_timeout)
+
+    state = env.get_cluster_state()
+    still_running_id_list = [
+        resource_id
+        for resource_id in running_id_list
+        if get_resource_state(state, resource_id)
+    ]
+    if (
+        still_running_id_list
+        and env.report_processor.report(
+            ReportItem(
+                severity=reports.item.get_severity(reports.codes.FORCE, force),
+                message=reports.messages.CannotStopResourcesBeforeDeleting(
+                    still_running_id_list
+                ),
+            )
+        ).has_errors
+    ):
+        raise LibraryError()
+    return True
+
+
+def _delete_remove_elements(
+    env: LibraryEnvironment,
+    cib: _Element,
+    resource_el_list: Iterable[_Element],
+    node_name_list: Iterable[str],
+) -> None:
+    """
+    Remove resource elements and all references to them from the CIB
+    """
+    resource_el_set = set(resource_el_list)
+    removed_id_set = {
+        str(resource_el.attrib["id"]) for resource_el in resource_el_set
+    }
+    dependant_el_list: List[_Element] = []
+
+    if sections.exists(cib, sections.TAGS):
+        removed_tag_list = remove_references_to_elements(
+            get_tags(cib), removed_id_set
+        )
+        dependant_el_list.extend(removed_tag_list)
+        # constraints and ACLs may reference the removed tags
+        removed_id_set.update(
+            str(tag_el.attrib["id"]) for tag_el in removed_tag_list
+        )
+    constraint_section = get_constraints(cib)
+    dependant_el_list.extend(
+        remove_references_to_resources(constraint_section, removed_id_set)
+    )
+    dependant_el_list.extend(
+        remove_location_constraints_on_nodes(
+            constraint_section, set(node_name_list)
+        )
+    )
+    if sections.exists(cib, sections.FENCING_TOPOLOGY):
+        topology_el = get_fencing_topology(cib)
+        for resource_el in resource_el_set:
+            if resource.stonith.is_stonith(resource_el):
+                remove_device_from_all_levels(
+                    topology_el, str(resource_el.attrib["id"])
+                )
+    if sections.exists(cib, sections.ACLS):
+        acls_section = get_acls(cib)
+        for removed_id in removed_id_set:
+            remove_permissions_referencing(acls_section, removed_id)
+
+    for resource_el in resource_el_set:
+        # inner resources are removed with their parents
+        if resource.common.get_parent_resource(resource_el) not in (
+            resource_el_set
+        ):
+            remove_one_element(resource_el)
+
+    if dependant_el_list:
+        env.report_processor.report(
+            ReportItem.info(
+                reports.messages.CibRemoveDependantElements(
+                    {
+                        str(element.attrib["id"]): str(element.tag)
+                        for element in dependant_el_list
+                    }
+                )
+            )
+        )
+
+
 def group_add(
     env: LibraryEnvironment,
     group_id: str,
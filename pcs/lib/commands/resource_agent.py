@@ -6,6 +6,7 @@ from typing import (
     Optional,
 )
 
+from pcs import settings
 from pcs.common.interface.dto import to_dict
 from pcs.common.pacemaker.resource.operations import (
     OCF_CHECK_LEVEL_INSTANCE_ATTRIBUTE_NAME,
@@ -35,6 +36,7 @@ from pcs.lib.resource_agent import (
     ResourceAgentNameDto,
     StandardProviderTuple,
     find_one_resource_agent_by_type,
+    list_all_resource_agents,
     list_resource_agents,
     list_resource_agents_ocf_providers,
     list_resource_agents_standards,
@@ -42,6 +44,7 @@ from pcs.lib.resource_agent import (
     resource_agent_error_to_report_item,
     split_resource_agent_name,
 )
+from pcs.lib.resource_agent.cache import ResourceAgentMetadataCache
 from pcs.lib.resource_agent.name import name_to_void_metadata
 
 
@@ -106,43 +109,32 @@ def list_agents(
     runner = lib_env.cmd_runner()
 
     # list agents for all standards and providers
-    agent_names = []
-    for std_prov in list_resource_agents_standards_and_providers(runner):
-        if std_prov.is_stonith:
-            continue
-        agent_names.extend(_get_agent_names(runner, std_prov))
     return _complete_agent_list(
         runner,
         lib_env.report_processor,
-        sorted(agent_names, key=lambda item: item.full_name),
+        [
+            name
+            for name in list_all_resource_agents(
+                runner, lib_env.resource_agent_name_cache
+            )
+            if not name.is_stonith
+        ],
         describe,
         search,
+        metadata_cache=lib_env.resource_agent_metadata_cache,
     )
 
 
-def _get_agent_names(
-    runner: CommandRunner, standard_provider: StandardProviderTuple
-) -> List[ResourceAgentName]:
-    return [
-        ResourceAgentName(
-            standard_provider.standard, standard_provider.provider, agent
-        )
-        for agent in list_resource_agents(runner, standard_provider)
-    ]
-
-
 def get_agents_list(lib_env: LibraryEnvironment) -> ListResourceAgentNameDto:
     """
     List all resource agents on the local host
     """
-    runner = lib_env.cmd_runner()
-    agent_names = []
-    for std_prov in list_resource_agents_standards_and_providers(runner):
-        agent_names.extend(_get_agent_names(runner, std_prov))
     return ListResourceAgentNameDto(
         names=[
             name.to_dto()
-            for name in sorted(agent_names, key=lambda item: item.full_name)
+            for name in list_all_resource_agents(
+                lib_env.cmd_runner(), lib_env.resource_agent_name_cache
+            )
         ]
     )
 
@@ -213,26 +205,38 @@ def _complete_agent_list(
     agent_names: Iterable[ResourceAgentName],
     describe: bool,
     search: Optional[str],
+    metadata_cache: Optional[ResourceAgentMetadataCache] = None,
 ) -> List[Dict[str, Any]]:
-    agent_factory = ResourceAgentFacadeFactory(runner, report_processor)
     search_lower = search.lower() if search else None
+    if search_lower:
+        agent_names = [
+            name
+            for name in agent_names
+            if search_lower in name.full_name.lower()
+        ]
+    if not describe:
+        return [
+            _agent_metadata_to_dict(name_to_void_metadata(name), describe)
+            for name in agent_names
+        ]
+
+    agent_factory = ResourceAgentFacadeFactory(
+        runner, report_processor, metadata_cache=metadata_cache
+    )
     agent_list = []
-    for name in agent_names:
-        if search_lower and search_lower not in name.full_name.lower():
-            continue
-        try:
-            metadata = (
-                agent_factory.facade_from_parsed_name(name).metadata
-                if describe
-                else name_to_void_metadata(name)
-            )
-            agent_list.append(_agent_metadata_to_dict(metadata, describe))
-        except ResourceAgentError as e:
+    for facade in agent_factory.facades_from_parsed_names(
+        list(agent_names),
+        max_parallel=settings.resource_agent_metadata_load_max_parallel,
+        timeout=settings.resource_agent_metadata_load_timeout,
+    ):
+        if isinstance(facade, ResourceAgentError):
             report_processor.report(
                 resource_agent_error_to_report_item(
-                    e, ReportItemSeverity.warning()
+                    facade, ReportItemSeverity.warning()
                 )
             )
+        else:
+            agent_list.append(_agent_metadata_to_dict(facade.metadata, True))
     return agent_list
 
 
@@ -240,8 +244,11 @@ def _get_agent_metadata(
     runner: CommandRunner,
     report_processor: ReportProcessor,
     agent_name: ResourceAgentNameDto,
+    metadata_cache: Optional[ResourceAgentMetadataCache] = None,
 ) -> ResourceAgentMetadata:
-    agent_factory = ResourceAgentFacadeFactory(runner, report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner, report_processor, metadata_cache=metadata_cache
+    )
     try:
         return agent_factory.facade_from_parsed_name(
             ResourceAgentName.from_dto(agent_name)
@@ -263,6 +270,7 @@ def get_agent_metadata(
         lib_env.cmd_runner(),
         lib_env.report_processor,
         agent_name,
+        metadata_cache=lib_env.resource_agent_metadata_cache,
     ).to_dto()
 
 
@@ -278,13 +286,20 @@ def describe_agent(
     """
     runner = lib_env.cmd_runner()
     report_processor = lib_env.report_processor
-    agent_factory = ResourceAgentFacadeFactory(runner, report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        report_processor,
+        metadata_cache=lib_env.resource_agent_metadata_cache,
+    )
     try:
         found_name = (
             split_resource_agent_name(agent_name)
             if ":" in agent_name
             else find_one_resource_agent_by_type(
-                runner, report_processor, agent_name
+                runner,
+                report_processor,
+                agent_name,
+                name_cache=lib_env.resource_agent_name_cache,
             )
         )
         return _agent_metadata_to_dict(
@@ -304,7 +319,10 @@ def get_agent_default_operations(
     report_list, operation_list = uniquify_operations_intervals(
         get_default_operations(
             _get_agent_metadata(
-                lib_env.cmd_runner(), lib_env.report_processor, agent_name
+                lib_env.cmd_runner(),
+                lib_env.report_processor,
+                agent_name,
+                metadata_cache=lib_env.resource_agent_metadata_cache,
             ),
             necessary_only,
         )
@@ -324,3 +342,43 @@ def get_structured_agent_name(
     except ResourceAgentError as e:
         lib_env.report_processor.report(resource_agent_error_to_report_item(e))
         raise LibraryError() from e
+
+
+def warm_metadata_cache(lib_env: LibraryEnvironment) -> None:
+    """
+    Load names and metadata of all resource and stonith agents to the caches
+    """
+    name_cache = lib_env.resource_agent_name_cache
+    metadata_cache = lib_env.resource_agent_metadata_cache
+    if name_cache is None and metadata_cache is None:
+        return
+    runner = lib_env.cmd_runner()
+    agent_names = list_all_resource_agents(runner, name_cache)
+    if metadata_cache is None:
+        return
+    agent_factory = ResourceAgentFacadeFactory(
+        runner, lib_env.report_processor, metadata_cache=metadata_cache
+    )
+    for facade in agent_factory.facades_from_parsed_names(
+        agent_names,
+        max_parallel=settings.resource_agent_metadata_load_max_parallel,
+        timeout=settings.resource_agent_metadata_load_timeout,
+    ):
+        if isinstance(facade, ResourceAgentError):
+            lib_env.report_processor.report(
+                resource_agent_error_to_report_item(
+                    facade, ReportItemSeverity.warning()
+                )
+            )
+
+
+def clear_metadata_cache(lib_env: LibraryEnvironment) -> None:
+    """
+    Remove names and metadata of all resource and stonith agents from the caches
+    """
+    name_cache = lib_env.resource_agent_name_cache
+    if name_cache is not None:
+        name_cache.clear()
+    metadata_cache = lib_env.resource_agent_metadata_cache
+    if metadata_cache is not None:
+        metadata_cache.clear()
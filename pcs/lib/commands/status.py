@@ -1,9 +1,15 @@
 import os.path
+import re
 from typing import (
+    Any,
+    Dict,
     Iterable,
     List,
     Mapping,
     NamedTuple,
+    Optional,
+    Set,
+    Tuple,
     cast,
 )
 
@@ -18,11 +24,18 @@ from pcs.common.node_communicator import Communicator
 from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItem
 from pcs.common.services.interfaces import ServiceManagerInterface
+from pcs.common.status_dto import (
+    NodeStatusDto,
+    PrimitiveStatusDto,
+)
 from pcs.common.str_tools import (
     format_list,
     indent,
 )
+from pcs.common.types import PrimitiveStatus
+from pcs.lib import pcsd_node_status as pcsd_format
 from pcs.lib.cib import nvpair
+from pcs.lib.cib.alert import get_all_alerts
 from pcs.lib.cib.resource import stonith
 from pcs.lib.cib.tools import (
     get_crm_config,
@@ -30,17 +43,37 @@ from pcs.lib.cib.tools import (
 )
 from pcs.lib.communication.nodes import CheckReachability
 from pcs.lib.communication.tools import run as run_communication
+from pcs.lib.corosync.live import (
+    QuorumStatus,
+    QuorumStatusException,
+    get_quorum_status_args,
+    process_quorum_status_text,
+)
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
+from pcs.lib.external import CommandRunner
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.node_communication import NodeTargetLibFactory
 from pcs.lib.pacemaker.live import (
-    get_cluster_status_text,
+    StatusCommand,
+    get_cib,
+    get_cib_version_list,
+    get_cib_xml_command,
+    get_cluster_status_text_command,
+    get_cluster_status_xml_command,
     get_cluster_status_xml_raw,
-    get_ticket_status_text,
+    get_ticket_status_text_command,
+    parse_cluster_status_xml,
+    run_status_commands,
 )
+from pcs.lib.pacemaker.state import ClusterState
+from pcs.lib.pacemaker.values import is_true
 from pcs.lib.resource_agent.const import STONITH_ACTION_REPLACED_BY
-from pcs.lib.sbd import get_sbd_service_name
+from pcs.lib.sbd import (
+    get_local_sbd_config,
+    get_sbd_service_name,
+)
+from pcs.lib.tools import environment_file_to_dict
 
 
 class _ServiceStatus(NamedTuple):
@@ -50,6 +83,42 @@ class _ServiceStatus(NamedTuple):
     running: bool
 
 
+class _PacemakerNodes(NamedTuple):
+    online: List[str]
+    standby: List[str]
+    offline: List[str]
+
+
+class _CibPrimitives(NamedTuple):
+    # admin_epoch and epoch of the CIB the primitives were read from
+    epoch: Tuple[str, str]
+    # primitive id and whether the primitive is disabled
+    primitive_list: List[Tuple[str, bool]]
+
+
+class _CorosyncMembership(NamedTuple):
+    member_list: List[str]
+    # corosync id of the local node, empty if not available
+    local_node_id: str
+
+
+# services reported in pcsd node status
+_PCSD_NODE_SERVICES = (
+    "pacemaker",
+    "pacemaker_remote",
+    "corosync",
+    "pcsd",
+    "sbd",
+)
+
+_PROC_UPTIME = "/proc/uptime"
+
+# Primitives read by the last node_status_dto call. Long-running processes
+# calling the command repeatedly, e.g. the SNMP agent, reuse them as long as
+# the configuration in the CIB has not changed.
+_cib_primitives_snapshot: Optional[_CibPrimitives] = None
+
+
 def pacemaker_status_xml(env: LibraryEnvironment) -> str:
     """
     Return pacemaker status in pacemaker-native XML string
@@ -102,32 +171,29 @@ def full_cluster_status_plaintext(
     live = env.is_cib_live and env.is_corosync_conf_live
     is_sbd_running = False
 
-    # load status, cib, corosync.conf
-    status_text, warning_list = get_cluster_status_text(
-        runner, hide_inactive_resources, verbose
-    )
+    # load corosync.conf, status, cib
     corosync_conf = None
     # If we are live on a remote node, we have no corosync.conf.
     # TODO Use the new file framework so the path is not exposed.
     if not live or os.path.exists(settings.corosync_conf_file):
         corosync_conf = env.get_corosync_conf()
-    cib = env.get_cib()
+    command_list = [
+        get_cluster_status_text_command(
+            runner, hide_inactive_resources, verbose
+        ),
+        get_cib_xml_command(),
+    ]
     if verbose:
-        (
-            ticket_status_text,
-            ticket_status_stderr,
-            ticket_status_retval,
-        ) = get_ticket_status_text(runner)
-    # get extra info if live
-    if live:
-        service_manager = env.service_manager
-        try:
-            is_sbd_running = service_manager.is_running(
-                get_sbd_service_name(service_manager)
-            )
-        except LibraryError:
-            pass
-        local_services_status = _get_local_services_status(service_manager)
+        command_list.append(get_ticket_status_text_command())
+    local_services_status: List[_ServiceStatus] = []
+    node_name_list: List[str] = []
+    node_reachability: Mapping[str, str] = {}
+
+    def load_local_services_and_nodes() -> None:
+        nonlocal local_services_status, node_name_list, node_reachability
+        if not live:
+            return
+        local_services_status = _get_local_services_status(env.service_manager)
         if verbose and corosync_conf:
             node_name_list, node_names_report_list = get_existing_nodes_names(
                 corosync_conf
@@ -140,6 +206,34 @@ def full_cluster_status_plaintext(
                 node_name_list,
             )
 
+    # Pacemaker tools are run at the same time. Meanwhile, services and nodes
+    # are checked in this thread. Outputs of the tools are processed here once
+    # all of them finish.
+    (
+        (status_text, warning_list),
+        cib_xml,
+        *ticket_status_list,
+    ) = run_status_commands(
+        runner,
+        command_list,
+        settings.cluster_status_load_max_parallel,
+        while_running=load_local_services_and_nodes,
+    )
+    cib = get_cib(cib_xml)
+    if verbose:
+        (
+            ticket_status_text,
+            ticket_status_stderr,
+            ticket_status_retval,
+        ) = ticket_status_list[0]
+    if live:
+        sbd_service = get_sbd_service_name(env.service_manager)
+        is_sbd_running = any(
+            service_status.running
+            for service_status in local_services_status
+            if service_status.service == sbd_service
+        )
+
     # check stonith configuration
     warning_list = list(warning_list)
     warning_list.extend(_stonith_warnings(cib, is_sbd_running))
@@ -189,6 +283,308 @@ def full_cluster_status_plaintext(
     return "\n".join(parts)
 
 
+def node_status_dto(env: LibraryEnvironment) -> NodeStatusDto:
+    """
+    Return status of the cluster nodes and resources seen from the local node
+
+    Pacemaker nodes and resources are left empty if they cannot be loaded,
+    e.g. when pacemaker is not running on the local node.
+
+    env -- LibraryEnvironment
+    """
+    runner = env.cmd_runner()
+    corosync_conf = env.get_corosync_conf()
+    corosync_node_list, report_list = get_existing_nodes_names(corosync_conf)
+    env.report_processor.report_list(report_list)
+
+    status_dom, corosync_member_list, cib_primitive_list = _load_node_status(
+        runner
+    )
+
+    corosync_online, corosync_offline = _split_corosync_nodes(
+        corosync_node_list, corosync_member_list
+    )
+    pacemaker_nodes = _PacemakerNodes([], [], [])
+    running_id_set: Set[str] = set()
+    failed_id_set: Set[str] = set()
+    quorate = False
+    if status_dom is not None:
+        pacemaker_nodes = _get_pacemaker_nodes(status_dom)
+        running_id_set, failed_id_set = _get_resource_id_sets(status_dom)
+        current_dc_el = status_dom.find("summary/current_dc")
+        quorate = current_dc_el is not None and is_true(
+            current_dc_el.get("with_quorum", "")
+        )
+
+    return NodeStatusDto(
+        cluster_name=corosync_conf.get_cluster_name(),
+        quorate=quorate,
+        known_node_list=list(
+            dict.fromkeys(
+                corosync_online
+                + corosync_offline
+                + pacemaker_nodes.online
+                + pacemaker_nodes.offline
+                + pacemaker_nodes.standby
+            )
+        ),
+        corosync_online_node_list=corosync_online,
+        corosync_offline_node_list=corosync_offline,
+        pacemaker_online_node_list=pacemaker_nodes.online,
+        pacemaker_standby_node_list=pacemaker_nodes.standby,
+        pacemaker_offline_node_list=pacemaker_nodes.offline,
+        primitive_list=[
+            PrimitiveStatusDto(
+                primitive_id,
+                _get_primitive_status(
+                    disabled,
+                    primitive_id in running_id_set,
+                    primitive_id in failed_id_set,
+                ),
+            )
+            for primitive_id, disabled in cib_primitive_list
+        ],
+    )
+
+
+def pcsd_node_status(
+    env: LibraryEnvironment,
+    operations: bool = False,
+    skip_auth_check: bool = False,
+) -> Dict[str, Any]:
+    """
+    Return status of the cluster seen from the local node in the pcsd format
+
+    This is the status pcsd nodes and the web UI read by the remote/status
+    request. Parts which cannot be loaded are left empty.
+
+    env -- LibraryEnvironment
+    operations -- if True, list operations of resources
+    skip_auth_check -- if True, do not check whether the local node is
+        authorized against the known nodes
+    """
+    # pylint: disable=too-many-locals
+    # pylint: disable=unbalanced-tuple-unpacking
+    runner = env.cmd_runner()
+    # There is no corosync.conf on remote nodes.
+    # TODO Use the new file framework so the path is not exposed.
+    corosync_conf = None
+    if os.path.exists(settings.corosync_conf_file):
+        corosync_conf = env.get_corosync_conf()
+    services: Dict[str, Dict[str, bool]] = {}
+
+    def load_local_services() -> None:
+        services.update(_get_pcsd_node_services(env.service_manager))
+
+    # Pacemaker tools and corosync-quorumtool are run at the same time.
+    # Meanwhile, services are checked in this thread.
+    status_xml, cib_xml, corosync_membership = run_status_commands(
+        runner,
+        [
+            get_cluster_status_xml_command(),
+            get_cib_xml_command(),
+            StatusCommand(
+                get_quorum_status_args(), _process_corosync_membership
+            ),
+        ],
+        settings.cluster_status_load_max_parallel,
+        ignore_errors=True,
+        while_running=load_local_services,
+    )
+    status_dom = None
+    if status_xml is not None:
+        try:
+            status_dom = parse_cluster_status_xml(status_xml)
+        except LibraryError:
+            pass
+    cib = None
+    if cib_xml is not None:
+        try:
+            cib = get_cib(cib_xml)
+        except LibraryError:
+            pass
+    if corosync_membership is None:
+        corosync_membership = _CorosyncMembership([], "")
+
+    node_lists: Dict[str, List[str]] = {
+        "corosync_online": [],
+        "corosync_offline": [],
+        "pacemaker_online": [],
+        "pacemaker_offline": [],
+        "pacemaker_standby": [],
+    }
+    # Like in the 'pcs status nodes both' command, nodes are only listed if
+    # the local node is in a cluster.
+    if corosync_conf is not None:
+        corosync_node_list, report_list = get_existing_nodes_names(
+            corosync_conf
+        )
+        env.report_processor.report_list(report_list)
+        (
+            node_lists["corosync_online"],
+            node_lists["corosync_offline"],
+        ) = _split_corosync_nodes(
+            corosync_node_list, corosync_membership.member_list
+        )
+        if status_dom is not None:
+            pacemaker_nodes = _get_pacemaker_nodes(status_dom)
+            node_lists["pacemaker_online"] = pacemaker_nodes.online
+            node_lists["pacemaker_offline"] = pacemaker_nodes.offline
+            node_lists["pacemaker_standby"] = pacemaker_nodes.standby
+    known_node_list = list(
+        dict.fromkeys(
+            node for node_list in node_lists.values() for node in node_list
+        )
+    )
+
+    not_authorized_node_list: List[str] = []
+    if not skip_auth_check and known_node_list:
+        node_reachability = _get_node_reachability(
+            env.get_node_target_factory(),
+            env.get_node_communicator(request_timeout=3),
+            env.report_processor,
+            known_node_list,
+        )
+        not_authorized_node_list = [
+            node
+            for node in known_node_list
+            if node_reachability.get(node, CheckReachability.UNAUTH)
+            == CheckReachability.UNAUTH
+        ]
+
+    try:
+        sbd_config: Optional[Dict[str, str]] = environment_file_to_dict(
+            get_local_sbd_config()
+        )
+    except LibraryError:
+        sbd_config = None
+
+    status: Dict[str, Any] = {
+        "cluster_name": (
+            corosync_conf.get_cluster_name() if corosync_conf else ""
+        ),
+        "cluster_uuid": (
+            (corosync_conf.get_cluster_uuid() or "") if corosync_conf else ""
+        ),
+        "groups": [],
+        "constraints": {},
+        "cluster_settings": {},
+        "acls": {},
+        "username": env.user_login,
+        "fence_levels": {},
+        "node_attr": {},
+        "nodes_utilization": {},
+        "alerts": None,
+        "known_nodes": known_node_list,
+    }
+    status.update(node_lists)
+    if cib is not None:
+        status.update(
+            groups=pcsd_format.get_resource_group_ids(cib),
+            constraints=pcsd_format.get_constraints(cib),
+            cluster_settings=pcsd_format.get_cluster_settings(cib),
+            acls=pcsd_format.get_acls(cib),
+            fence_levels=pcsd_format.get_fence_levels(cib),
+            node_attr=pcsd_format.get_node_attributes(cib),
+            nodes_utilization=pcsd_format.get_nodes_utilization(cib),
+        )
+    status["node"] = pcsd_format.get_local_node(
+        status_dom,
+        corosync_membership.local_node_id,
+        services,
+        pcsd_format.format_uptime(_get_uptime_seconds()),
+        sbd_config,
+        not_authorized_node_list,
+    )
+    status["resource_list"] = (
+        pcsd_format.get_resource_list(cib, status_dom, operations)
+        if cib is not None
+        else []
+    )
+    if cib is not None:
+        # this adds missing alerts element to the CIB, so it goes last
+        status["alerts"] = get_all_alerts(cib)
+    return status
+
+
+def _split_corosync_nodes(
+    node_list: Iterable[str], member_list: Iterable[str]
+) -> Tuple[List[str], List[str]]:
+    """
+    Return online and offline nodes from corosync.conf
+    """
+    member_set = set(member_list)
+    return (
+        sorted(node for node in node_list if node in member_set),
+        sorted(node for node in node_list if node not in member_set),
+    )
+
+
+def _get_pacemaker_nodes(status_dom: _Element) -> _PacemakerNodes:
+    online: List[str] = []
+    standby: List[str] = []
+    offline: List[str] = []
+    for node in ClusterState(status_dom).node_section.nodes:
+        if node.attrs.type == "remote":
+            continue
+        if not node.attrs.online:
+            offline.append(node.attrs.name)
+            continue
+        if node.attrs.standby:
+            standby.append(node.attrs.name)
+        if node.attrs.maintenance or not node.attrs.standby:
+            online.append(node.attrs.name)
+    return _PacemakerNodes(online, standby, offline)
+
+
+def _get_resource_id_sets(status_dom: _Element) -> Tuple[Set[str], Set[str]]:
+    """
+    Return ids of running and failed primitives
+    """
+    running_id_set = set()
+    failed_id_set = set()
+    for resource_el in status_dom.iterfind("resources//resource"):
+        # instances of clones are distinguished by a suffix
+        resource_id = str(resource_el.get("id")).split(":", maxsplit=1)[0]
+        if is_true(resource_el.get("active", "")):
+            running_id_set.add(resource_id)
+        elif is_true(resource_el.get("failed", "")):
+            failed_id_set.add(resource_id)
+    return running_id_set, failed_id_set
+
+
+def _load_node_status(
+    runner: CommandRunner,
+) -> Tuple[Optional[_Element], List[str], List[Tuple[str, bool]]]:
+    """
+    Return status dom, corosync members and CIB primitives, empty on errors
+    """
+    cib_primitive_list = _get_cib_primitives_from_snapshot(runner)
+    command_list = [
+        get_cluster_status_xml_command(),
+        StatusCommand(get_quorum_status_args(), _process_corosync_member_list),
+    ]
+    if cib_primitive_list is None:
+        command_list.append(get_cib_xml_command())
+    # The tools are run at the same time, their outputs are processed here
+    # once all of them finish.
+    (status_xml, corosync_member_list, *cib_xml_list,) = run_status_commands(
+        runner,
+        command_list,
+        settings.cluster_status_load_max_parallel,
+        ignore_errors=True,
+    )
+    status_dom = None
+    if status_xml is not None:
+        try:
+            status_dom = parse_cluster_status_xml(status_xml)
+        except LibraryError:
+            pass
+    if cib_primitive_list is None:
+        cib_primitive_list = _get_cib_primitive_list(runner, cib_xml_list[0])
+    return status_dom, corosync_member_list, cib_primitive_list
+
+
 def _stonith_warnings(cib: _Element, is_sbd_running: bool) -> List[str]:
     warning_list = []
 
@@ -262,20 +658,49 @@ def _get_local_services_status(
         ("pcsd", True),
         (get_sbd_service_name(service_manager), False),
     ]
-    service_status_list = []
-    for service, display_always in service_def:
-        try:
-            service_status_list.append(
-                _ServiceStatus(
-                    service,
-                    display_always,
-                    service_manager.is_enabled(service),
-                    service_manager.is_running(service),
-                )
-            )
-        except LibraryError:
-            pass
-    return service_status_list
+    try:
+        status_dict = service_manager.get_services_status(
+            [service for service, dummy_display_always in service_def]
+        )
+    except LibraryError:
+        return []
+    return [
+        _ServiceStatus(
+            service,
+            display_always,
+            status_dict[service].enabled,
+            status_dict[service].running,
+        )
+        for service, display_always in service_def
+        if service in status_dict
+    ]
+
+
+def _get_pcsd_node_services(
+    service_manager: ServiceManagerInterface,
+) -> Dict[str, Dict[str, bool]]:
+    services = {
+        service: {"installed": False, "enabled": False, "running": False}
+        for service in _PCSD_NODE_SERVICES
+    }
+    try:
+        status_dict = service_manager.get_services_status(_PCSD_NODE_SERVICES)
+    except LibraryError:
+        return services
+    for service, service_info in services.items():
+        service_info["installed"] = service_manager.is_installed(service)
+        if service in status_dict:
+            service_info["enabled"] = status_dict[service].enabled
+            service_info["running"] = status_dict[service].running
+    return services
+
+
+def _get_uptime_seconds() -> int:
+    try:
+        with open(_PROC_UPTIME, "r") as uptime_file:
+            return int(uptime_file.read().split()[0].split(".")[0])
+    except (OSError, IndexError, ValueError):
+        return 0
 
 
 def _format_local_services_status(
@@ -326,3 +751,102 @@ def _format_node_reachability(
         )
         for node_name in sorted(node_name_list)
     ]
+
+
+def _process_corosync_member_list(
+    stdout: str, stderr: str, retval: int
+) -> List[str]:
+    try:
+        return QuorumStatus.from_string(
+            process_quorum_status_text(stdout, stderr, retval)
+        ).node_names
+    except QuorumStatusException:
+        return []
+
+
+def _process_corosync_membership(
+    stdout: str, stderr: str, retval: int
+) -> _CorosyncMembership:
+    try:
+        quorum_status_text = process_quorum_status_text(stdout, stderr, retval)
+        member_list = QuorumStatus.from_string(quorum_status_text).node_names
+    except QuorumStatusException:
+        return _CorosyncMembership([], "")
+    # corosync-quorumtool prints the local node id, so there is no need to
+    # run corosync-cmapctl to get it
+    match = re.search(r"^Node ID:\s*(\d+)", quorum_status_text, re.MULTILINE)
+    return _CorosyncMembership(member_list, match.group(1) if match else "")
+
+
+def _get_cib_primitives_from_snapshot(
+    runner: CommandRunner,
+) -> Optional[List[Tuple[str, bool]]]:
+    # only primitives of a live cluster are kept for next calls
+    if runner.env_vars.get("CIB_file") or _cib_primitives_snapshot is None:
+        return None
+    version_list = get_cib_version_list(runner)
+    if version_list is not None and _cib_primitives_snapshot.epoch == tuple(
+        version_list[:2]
+    ):
+        return _cib_primitives_snapshot.primitive_list
+    return None
+
+
+def _get_cib_primitive_list(
+    runner: CommandRunner, cib_xml: Optional[str]
+) -> List[Tuple[str, bool]]:
+    # pylint: disable=global-statement
+    global _cib_primitives_snapshot
+    if cib_xml is None:
+        return []
+    primitive_list: List[Tuple[str, bool]] = []
+    try:
+        cib = get_cib(cib_xml)
+        # top level primitives go first, then groups and clones, the same way
+        # pcsd lists them
+        resources_el = get_resources(cib)
+    except LibraryError:
+        return []
+    for tag in ("primitive", "group", "clone", "master"):
+        for resource_el in resources_el.iterchildren(tag):
+            _add_primitives(resource_el, False, primitive_list)
+    if not runner.env_vars.get("CIB_file"):
+        _cib_primitives_snapshot = _CibPrimitives(
+            (str(cib.get("admin_epoch", "")), str(cib.get("epoch", ""))),
+            primitive_list,
+        )
+    return primitive_list
+
+
+def _add_primitives(
+    resource_el: _Element,
+    parent_disabled: bool,
+    primitive_list: List[Tuple[str, bool]],
+) -> None:
+    disabled = parent_disabled or _is_target_role_stopped(resource_el)
+    if resource_el.tag == "primitive":
+        primitive_list.append((str(resource_el.get("id")), disabled))
+        return
+    for member_el in resource_el.iterchildren("primitive", "group"):
+        _add_primitives(member_el, disabled, primitive_list)
+
+
+def _is_target_role_stopped(resource_el: _Element) -> bool:
+    # the last value counts if there are more of them
+    target_role = ""
+    for nvpair_el in resource_el.iterfind("meta_attributes/nvpair"):
+        if nvpair_el.get("name") == "target-role":
+            target_role = str(nvpair_el.get("value", ""))
+    return target_role.lower() == "stopped"
+
+
+def _get_primitive_status(
+    disabled: bool, running: bool, failed: bool
+) -> PrimitiveStatus:
+    if disabled:
+        return PrimitiveStatus.DISABLED
+    if running:
+        return PrimitiveStatus.RUNNING
+    if failed:
+        return PrimitiveStatus.FAILED
+    return PrimitiveStatus.BLOCKED
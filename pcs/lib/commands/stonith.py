@@ -138,7 +138,11 @@ def create(
     wait -- flag for controlling waiting for pacemaker idle mechanism
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     stonith_agent = _get_agent_facade(
         env.report_processor,
         agent_factory,
@@ -222,7 +226,11 @@ def create_in_group(
     wait -- flag for controlling waiting for pacemaker idle mechanism
     """
     runner = env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        env.report_processor,
+        metadata_cache=env.resource_agent_metadata_cache,
+    )
     stonith_agent = _get_agent_facade(
         env.report_processor,
         agent_factory,
@@ -8,7 +8,6 @@ from typing import (
 from pcs.lib.commands.resource_agent import (
     _agent_metadata_to_dict,
     _complete_agent_list,
-    _get_agent_names,
 )
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
@@ -18,6 +17,7 @@ from pcs.lib.resource_agent import (
     ResourceAgentFacadeFactory,
     ResourceAgentName,
     StandardProviderTuple,
+    list_resource_agents,
     resource_agent_error_to_report_item,
 )
 
@@ -40,11 +40,17 @@ def list_agents(
         runner,
         lib_env.report_processor,
         sorted(
-            _get_agent_names(runner, StandardProviderTuple("stonith")),
+            (
+                ResourceAgentName("stonith", None, agent)
+                for agent in list_resource_agents(
+                    runner, StandardProviderTuple("stonith")
+                )
+            ),
             key=lambda item: item.full_name,
         ),
         describe,
         search,
+        metadata_cache=lib_env.resource_agent_metadata_cache,
     )
 
 
@@ -59,7 +65,11 @@ def describe_agent(
     agent_name -- name of the agent (not containing "stonith:" prefix)
     """
     runner = lib_env.cmd_runner()
-    agent_factory = ResourceAgentFacadeFactory(runner, lib_env.report_processor)
+    agent_factory = ResourceAgentFacadeFactory(
+        runner,
+        lib_env.report_processor,
+        metadata_cache=lib_env.resource_agent_metadata_cache,
+    )
     try:
         if ":" in agent_name:
             raise InvalidResourceAgentName(agent_name)
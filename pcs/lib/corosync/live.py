@@ -27,9 +27,23 @@ def get_quorum_status_text(runner):
     """
     Get runtime quorum status from the local node
     """
-    stdout, stderr, retval = runner.run(
-        [os.path.join(settings.corosync_binaries, "corosync-quorumtool"), "-p"]
-    )
+    return process_quorum_status_text(*runner.run(get_quorum_status_args()))
+
+
+def get_quorum_status_args():
+    """
+    Return a command getting runtime quorum status from the local node
+    """
+    return [
+        os.path.join(settings.corosync_binaries, "corosync-quorumtool"),
+        "-p",
+    ]
+
+
+def process_quorum_status_text(stdout, stderr, retval):
+    """
+    Get runtime quorum status from output of the get_quorum_status_args command
+    """
     # retval is 0 on success if the node is not in a partition with quorum
     # retval is 1 on error OR on success if the node has quorum
     if retval not in [0, 1] or stderr.strip():
@@ -161,6 +175,13 @@ class QuorumStatus:
         """
         return bool(self._data["quorate"])
 
+    @property
+    def node_names(self):
+        """
+        Names of nodes which are members of the cluster
+        """
+        return [node_info["name"] for node_info in self._data["node_list"]]
+
     @property
     def votes_needed_for_quorum(self):
         """
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from typing import (
     Mapping,
     Optional,
@@ -7,12 +8,14 @@ from typing import (
 
 from lxml.etree import _Element
 
+from pcs import settings
 from pcs.common import (
     file_type_codes,
     reports,
 )
 from pcs.common.node_communicator import (
     Communicator,
+    DebugCapture,
     NodeCommunicatorFactory,
 )
 from pcs.common.reports import ReportProcessor
@@ -20,6 +23,10 @@ from pcs.common.reports.item import ReportItem
 from pcs.common.services.interfaces import ServiceManagerInterface
 from pcs.common.tools import Version
 from pcs.lib.booth.env import BoothEnv
+from pcs.lib.cib.id_index import (
+    attach_id_index,
+    detach_id_index,
+)
 from pcs.lib.communication import qdevice
 from pcs.lib.communication.corosync import (
     CheckCorosyncOffline,
@@ -46,7 +53,7 @@ from pcs.lib.node_communication import (
     NodeTargetLibFactory,
 )
 from pcs.lib.pacemaker.live import (
-    diff_cibs_xml,
+    diff_cibs,
     ensure_cib_version,
     get_cib,
     get_cib_xml,
@@ -56,6 +63,12 @@ from pcs.lib.pacemaker.live import (
     wait_for_idle,
 )
 from pcs.lib.pacemaker.values import get_valid_timeout_seconds
+from pcs.lib.resource_agent.cache import (
+    ResourceAgentMetadataCache,
+    ResourceAgentNameCache,
+    get_default_metadata_cache,
+    get_default_name_cache,
+)
 from pcs.lib.services import get_service_manager
 from pcs.lib.tools import create_tmp_cib
 from pcs.lib.xml_tools import etree_to_str
@@ -95,7 +108,12 @@ class LibraryEnvironment:
         booth_files_data=None,
         known_hosts_getter=None,
         request_timeout=None,
+        debug=False,
     ):
+        """
+        debug -- gather debug info which is only needed for debug reports,
+            e.g. libcurl debug output of communication with nodes
+        """
         # pylint: disable=too-many-arguments
         self._logger = logger
         self._report_processor = report_processor
@@ -119,6 +137,7 @@ class LibraryEnvironment:
             self.user_login,
             self.user_groups,
             self._request_timeout,
+            debug_capture=DebugCapture() if debug else None,
         )
         self.__loaded_booth_env = None
         self.__loaded_dr_env = None
@@ -157,8 +176,11 @@ class LibraryEnvironment:
         if self.__loaded_cib_diff_source is not None:
             raise AssertionError("CIB has already been loaded")
 
-        self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
-        self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
+        cib_xml = get_cib_xml(self.cmd_runner())
+        self.__loaded_cib_to_modify = get_cib(cib_xml)
+        self.__loaded_cib_diff_source = self.__get_cib_diff_source(
+            cib_xml, self.__loaded_cib_to_modify
+        )
 
         if (
             nice_to_have_version is not None
@@ -180,7 +202,9 @@ class LibraryEnvironment:
                 )
                 if was_upgraded:
                     self.__loaded_cib_to_modify = upgraded_cib
-                    self.__loaded_cib_diff_source = etree_to_str(upgraded_cib)
+                    self.__loaded_cib_diff_source = self.__get_cib_diff_source(
+                        None, upgraded_cib
+                    )
                     if not self._cib_upgrade_reported:
                         self.report_processor.report(
                             ReportItem.info(
@@ -189,8 +213,21 @@ class LibraryEnvironment:
                         )
                     self._cib_upgrade_reported = True
 
+        attach_id_index(self.__loaded_cib_to_modify)
         return self.__loaded_cib_to_modify
 
+    @staticmethod
+    def __get_cib_diff_source(
+        cib_xml: Optional[str], cib: _Element
+    ) -> Union[str, _Element]:
+        if settings.cib_diff_native:
+            # Keep the original CIB parsed, so that it is not parsed again
+            # when diffing it with the modified one.
+            return deepcopy(cib)
+        # crm_diff reads the CIBs from files, the original XML is written as
+        # it was loaded.
+        return etree_to_str(cib) if cib_xml is None else cib_xml
+
     @property
     def cib(self):
         if self.__loaded_cib_diff_source is None:
@@ -269,11 +306,11 @@ class LibraryEnvironment:
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
+        cib_diff_xml = diff_cibs(
             cmd_runner,
             self.report_processor,
             self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify),
+            self.__loaded_cib_to_modify,
         )
         if cib_diff_xml:
             push_cib_diff_xml(cmd_runner, cib_diff_xml)
@@ -281,6 +318,8 @@ class LibraryEnvironment:
     def __do_push_cib(self, push_strategy, wait_timeout: int):
         push_strategy()
         self._cib_upgrade_reported = False
+        if self.__loaded_cib_to_modify is not None:
+            detach_id_index(self.__loaded_cib_to_modify)
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_to_modify = None
         if self.is_cib_live:
@@ -462,6 +501,16 @@ class LibraryEnvironment:
 
         return CommandRunner(self.logger, self.report_processor, runner_env)
 
+    @property
+    def resource_agent_metadata_cache(
+        self,
+    ) -> Optional[ResourceAgentMetadataCache]:
+        return get_default_metadata_cache()
+
+    @property
+    def resource_agent_name_cache(self) -> Optional[ResourceAgentNameCache]:
+        return get_default_name_cache()
+
     @property
     def communicator_factory(self):
         return self._communicator_factory
@@ -1,9 +1,18 @@
-import signal
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from logging import Logger
 from shlex import quote as shell_quote
 from typing import (
+    Callable,
     Dict,
+    List,
     Mapping,
     Optional,
     Sequence,
@@ -53,13 +62,131 @@ class CommandRunner:
         env_extend: Optional[Mapping[str, str]] = None,
         binary_output: bool = False,
     ) -> Tuple[str, str, int]:
+        env_vars = self._get_env_vars(env_extend)
+        log_args = self._log_start(args, stdin_string, env_vars)
+        process = self._start_process(
+            args, stdin_string, env_vars, binary_output, log_args
+        )
+        try:
+            out_std, out_err = process.communicate(stdin_string)
+            retval = process.returncode
+        except OSError as e:
+            raise self._process_error(log_args, e) from e
+        self._log_finish(log_args, retval, out_std, out_err)
+        return out_std, out_err, retval
+
+    def run_parallel(
+        self,
+        args_list: Sequence[Sequence[str]],
+        env_extend: Optional[Mapping[str, str]] = None,
+        max_parallel: int = 1,
+        timeout: Optional[float] = None,
+        while_running: Optional[Callable[[], None]] = None,
+    ) -> List[Optional[Tuple[str, str, int]]]:
+        """
+        Run several processes, at most max_parallel of them at the same time
+
+        args_list -- commands to run
+        env_extend -- environment variables to add for all the processes
+        max_parallel -- max number of processes running at the same time
+        timeout -- seconds after which a process is killed, None = no limit
+        while_running -- a function to call in this thread once the first
+            processes have been started, they keep running meanwhile
+
+        Return a list of (stdout, stderr, return value) in the order of
+        args_list. None is returned for processes killed due to the timeout.
+        """
+        result_list: List[Optional[Tuple[str, str, int]]] = [None] * len(
+            args_list
+        )
+        if not args_list:
+            if while_running is not None:
+                while_running()
+            return result_list
+        max_parallel = max(1, max_parallel)
+        env_vars = self._get_env_vars(env_extend)
+        pending = deque(range(len(args_list)))
+        # running process -> (its index in args_list, command for logging)
+        running: Dict[Future, Tuple[int, str]] = {}
+        start_all = time.monotonic()
+        # Processes are only spawned from this thread. Worker threads just
+        # wait for the processes and collect their output.
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            while pending or running:
+                while pending and len(running) < max_parallel:
+                    index = pending.popleft()
+                    future, log_args = self._start_parallel_process(
+                        executor, args_list[index], env_vars, timeout
+                    )
+                    running[future] = (index, log_args)
+                if while_running is not None:
+                    while_running()
+                    while_running = None
+                for future in sorted(
+                    wait(running, return_when=FIRST_COMPLETED).done,
+                    key=lambda item: running[item][0],
+                ):
+                    index, log_args = running.pop(future)
+                    result_list[index] = self._finish_parallel_process(
+                        future, log_args
+                    )
+        self._reporter.report(
+            ReportItem.debug(
+                reports.messages.RunExternalProcessesFinished(
+                    len(args_list), max_parallel, time.monotonic() - start_all
+                )
+            )
+        )
+        return result_list
+
+    def _start_parallel_process(
+        self,
+        executor: ThreadPoolExecutor,
+        args: Sequence[str],
+        env_vars: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Tuple[Future, str]:
+        log_args = self._log_start(args, None, env_vars)
+        process = self._start_process(args, None, env_vars, False, log_args)
+        return (
+            executor.submit(_communicate_with_timeout, process, timeout),
+            log_args,
+        )
+
+    def _finish_parallel_process(
+        self, future: Future, log_args: str
+    ) -> Optional[Tuple[str, str, int]]:
+        try:
+            out_std, out_err, retval, timed_out, duration = future.result()
+        except OSError as e:
+            raise self._process_error(log_args, e) from e
+        self._log_finish(log_args, retval, out_std, out_err)
+        self._reporter.report(
+            ReportItem.debug(
+                reports.messages.RunExternalProcessDuration(
+                    log_args, duration, timed_out
+                )
+            )
+        )
+        return None if timed_out else (out_std, out_err, retval)
+
+    def _get_env_vars(
+        self, env_extend: Optional[Mapping[str, str]]
+    ) -> Dict[str, str]:
         # Allow overriding default settings. If a piece of code really wants to
         # set own PATH or CIB_file, we must allow it. I.e. it wants to run
         # a pacemaker tool on a CIB in a file but cannot afford the risk of
         # changing the CIB in the file specified by the user.
         env_vars = dict(self._env_vars)
         env_vars.update(dict(env_extend) if env_extend else {})
+        return env_vars
 
+    def _log_start(
+        self,
+        args: Sequence[str],
+        stdin_string: Optional[str],
+        env_vars: Mapping[str, str],
+    ) -> str:
         log_args = " ".join([shell_quote(x) for x in args])
         self._logger.debug(
             "Running: {args}\nEnvironment:{env_vars}{stdin_string}".format(
@@ -95,11 +222,22 @@ class CommandRunner:
                 )
             )
         )
+        return log_args
 
+    def _start_process(
+        self,
+        args: Sequence[str],
+        stdin_string: Optional[str],
+        env_vars: Mapping[str, str],
+        binary_output: bool,
+        log_args: str,
+    ) -> subprocess.Popen:
         try:
-            # pylint: disable=subprocess-popen-preexec-fn, consider-using-with
-            # this is OK as pcs is only single-threaded application
-            process = subprocess.Popen(
+            # pylint: disable=consider-using-with
+            # No preexec_fn here, it is not safe to use in a process with
+            # threads. SIGPIPE, ignored by python, is set back to its default
+            # action in the child by restore_signals.
+            return subprocess.Popen(
                 args,
                 # Some commands react differently if they get anything via stdin
                 stdin=(
@@ -109,27 +247,30 @@ class CommandRunner:
                 ),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                preexec_fn=(
-                    lambda: signal.signal(signal.SIGPIPE, signal.SIG_DFL)
-                ),
+                restore_signals=True,
                 close_fds=True,
                 shell=False,
                 env=env_vars,
                 # decodes newlines and in python3 also converts bytes to str
                 universal_newlines=(not binary_output),
             )
-            out_std, out_err = process.communicate(stdin_string)
-            retval = process.returncode
         except OSError as e:
-            raise LibraryError(
-                ReportItem.error(
-                    reports.messages.RunExternalProcessError(
-                        log_args,
-                        e.strerror,
-                    )
+            raise self._process_error(log_args, e) from e
+
+    @staticmethod
+    def _process_error(log_args: str, e: OSError) -> LibraryError:
+        return LibraryError(
+            ReportItem.error(
+                reports.messages.RunExternalProcessError(
+                    log_args,
+                    e.strerror,
                 )
-            ) from e
+            )
+        )
 
+    def _log_finish(
+        self, log_args: str, retval: int, out_std: str, out_err: str
+    ) -> None:
         self._logger.debug(
             (
                 "Finished running: {args}\nReturn value: {retval}"
@@ -149,7 +290,35 @@ class CommandRunner:
                 )
             )
         )
-        return out_std, out_err, retval
+
+
+def _communicate_with_timeout(
+    process: subprocess.Popen, timeout: Optional[float]
+) -> Tuple[str, str, int, bool, float]:
+    """
+    Wait for a process to finish, kill it if it does not finish in time
+
+    process -- a running process
+    timeout -- seconds to wait for the process, None = no limit
+
+    Return stdout, stderr, return value, a flag set if the process was killed
+    and number of seconds spent waiting for the process
+    """
+    start = time.monotonic()
+    try:
+        out_std, out_err = process.communicate(None, timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        process.kill()
+        out_std, out_err = process.communicate()
+        timed_out = True
+    return (
+        out_std,
+        out_err,
+        process.returncode,
+        timed_out,
+        time.monotonic() - start,
+    )
 
 
 def kill_services(runner, services):
@@ -25,6 +25,21 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
         self._logger = logger
         self._reporter = reporter
 
+    def log_request_queued(self, request, queue_time):
+        queue_time_ms = int(queue_time * 1000)
+        self._logger.debug(
+            "HTTP Request to: {url} waited in queue for {time} ms".format(
+                url=request.url, time=queue_time_ms
+            )
+        )
+        self._reporter.report(
+            ReportItem.debug(
+                reports.messages.NodeCommunicationQueued(
+                    request.url, queue_time_ms
+                )
+            )
+        )
+
     def log_request_start(self, request):
         msg = "Sending HTTP Request to: {url}"
         if request.data:
@@ -96,6 +111,9 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
     def _log_debug(self, response):
         url = response.request.url
         debug_data = response.debug
+        if not debug_data:
+            # debug output has not been captured
+            return
         self._logger.debug(
             (
                 "Communication debug info for calling: {url}\n"
@@ -0,0 +1,415 @@
+"""
+Patchsets of CIBs computed without running crm_diff
+
+The patchset is created by the same algorithm pacemaker uses when running
+"crm_diff --no-version" (xml_calculate_changes and xml_create_v2_patchset in
+pacemaker's xml.c), so that the result is identical to crm_diff's output,
+including pacemaker's quirks in matching elements without an id.
+"""
+from copy import deepcopy
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from lxml import etree
+from lxml.etree import _Element
+
+# crm_diff --no-version ignores changes of these attributes of the cib element
+_VERSION_ATTRS = ("admin_epoch", "epoch", "num_updates")
+# pacemaker creates patchsets in the format 2 only for newer CIBs
+_PATCHSET_V1_MAX_FEATURE_SET = (3, 0, 8)
+
+
+class UnsupportedCib(Exception):
+    """
+    A patchset of the CIBs cannot be created here, use crm_diff instead
+    """
+
+
+def diff_cibs(cib_old: _Element, cib_new: _Element) -> Optional[_Element]:
+    """
+    Return a patchset transforming cib_old to cib_new, None if they are equal
+
+    cib_old -- original CIB
+    cib_new -- modified CIB
+    """
+    if cib_old.tag != cib_new.tag:
+        raise UnsupportedCib()
+    if not _uses_patchset_v2(cib_old.get("crm_feature_set")):
+        raise UnsupportedCib()
+    builder = _PatchsetBuilder(cib_new)
+    builder.mark_changes(cib_old, cib_new)
+    return builder.create_patchset()
+
+
+def _uses_patchset_v2(feature_set: Optional[str]) -> bool:
+    if feature_set is None:
+        return False
+    try:
+        version = [int(part) for part in feature_set.split(".")]
+    except ValueError as e:
+        raise UnsupportedCib() from e
+    limit = list(_PATCHSET_V1_MAX_FEATURE_SET)
+    # missing parts of a version are zeros
+    length = max(len(version), len(limit))
+    version.extend([0] * (length - len(version)))
+    limit.extend([0] * (length - len(limit)))
+    return version > limit
+
+
+def _is_comment(node: _Element) -> bool:
+    return node.tag is etree.Comment
+
+
+def _path_segment(node: _Element) -> str:
+    if _is_comment(node):
+        return "/comment"
+    node_id = node.get("id")
+    if node_id is None:
+        return f"/{node.tag}"
+    return f"/{node.tag}[@id='{node_id}']"
+
+
+class _SiblingPositions:
+    """
+    Positions of sibling nodes not counting nodes marked to be skipped
+    """
+
+    def __init__(self, size: int):
+        # Fenwick tree counting skipped nodes
+        self._tree = [0] * (size + 1)
+        self._skipped: Set[int] = set()
+
+    def skip(self, index: int) -> None:
+        if index in self._skipped:
+            return
+        self._skipped.add(index)
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += 1
+            index += index & -index
+
+    def is_skipped(self, index: int) -> bool:
+        return index in self._skipped
+
+    def position(self, index: int) -> int:
+        skipped = 0
+        tree_index = index
+        while tree_index > 0:
+            skipped += self._tree[tree_index]
+            tree_index -= tree_index & -tree_index
+        return index - skipped
+
+
+class _Children:
+    """
+    Child nodes of an element indexed the way pacemaker matches them
+    """
+
+    def __init__(self, parent: _Element):
+        self.nodes: List[_Element] = list(parent)
+        self.positions = _SiblingPositions(len(self.nodes))
+        self._first_by_tag: Dict[str, int] = {}
+        self._first_by_id: Dict[Tuple[str, str], int] = {}
+        for index, node in enumerate(self.nodes):
+            if _is_comment(node):
+                continue
+            if not isinstance(node.tag, str):
+                # processing instructions, entities
+                raise UnsupportedCib()
+            self._first_by_tag.setdefault(node.tag, index)
+            node_id = node.get("id")
+            if node_id is not None:
+                self._first_by_id.setdefault((node.tag, node_id), index)
+
+    def match(self, needles: "_Children", needle_index: int) -> Optional[int]:
+        """
+        Return an index of a child matching a node from other children
+
+        needles -- children containing the node to be matched
+        needle_index -- index of the node to be matched
+        """
+        needle = needles.nodes[needle_index]
+        if _is_comment(needle):
+            return self._match_comment(needles, needle_index)
+        # The first element with the same name and id matches. Elements without
+        # an id match the first element with the same name.
+        needle_id = needle.get("id")
+        if needle_id is None:
+            return self._first_by_tag.get(needle.tag)
+        return self._first_by_id.get((needle.tag, needle_id))
+
+    def _match_comment(
+        self, needles: "_Children", needle_index: int
+    ) -> Optional[int]:
+        # Comments only match comments with the same text at the same position
+        search_position = needles.positions.position(needle_index)
+        text = (needles.nodes[needle_index].text or "").lower()
+        # A position is never greater than an index
+        for index in range(search_position, len(self.nodes)):
+            position = self.positions.position(index)
+            if position > search_position:
+                return None
+            if position < search_position or self.positions.is_skipped(index):
+                continue
+            node = self.nodes[index]
+            if _is_comment(node) and (node.text or "").lower() == text:
+                return index
+            return None
+        return None
+
+
+def _are_children_aligned(
+    old_nodes: List[_Element], new_nodes: List[_Element]
+) -> bool:
+    """
+    Check that each child matches the child at the same position
+
+    When children are aligned, the full matching algorithm finds no deleted,
+    created nor moved children, so it can be skipped.
+    """
+    if len(old_nodes) != len(new_nodes):
+        return False
+    seen_tags: Set[str] = set()
+    seen_ids: Set[Tuple[str, str]] = set()
+    for old_node, new_node in zip(old_nodes, new_nodes):
+        if _is_comment(old_node) or _is_comment(new_node):
+            if not (
+                _is_comment(old_node)
+                and _is_comment(new_node)
+                and (old_node.text or "").lower()
+                == (new_node.text or "").lower()
+            ):
+                return False
+            continue
+        tag = old_node.tag
+        node_id = old_node.get("id")
+        if (
+            not isinstance(tag, str)
+            or new_node.tag != tag
+            or new_node.get("id") != node_id
+        ):
+            return False
+        # the node must be the first one matching its name and id
+        if node_id is None:
+            if tag in seen_tags:
+                return False
+        elif (tag, node_id) in seen_ids:
+            return False
+        else:
+            seen_ids.add((tag, node_id))
+        seen_tags.add(tag)
+    return True
+
+
+class _PatchsetBuilder:
+    """
+    Patchset of changes found by comparing matching nodes of two CIBs
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    # Changes of each kind are kept separately, the way pacemaker marks them in
+    # the new CIB, so that they are put to a patchset in pacemaker's order.
+
+    def __init__(self, cib_new: _Element):
+        self._cib_new = cib_new
+        # new nodes already compared to old nodes
+        self._compared: Set[_Element] = set()
+        # new nodes mapped to their attributes, changed and removed attributes
+        self._attr_changes: Dict[
+            _Element,
+            Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[str]],
+        ] = {}
+        self._created: Set[_Element] = set()
+        self._moved: Set[_Element] = set()
+        # new nodes with changes in their descendants
+        self._changed_subtrees: Set[_Element] = set()
+        # paths and positions of deleted nodes
+        self._deleted: List[Tuple[str, Optional[int]]] = []
+        self._path_cache: Dict[_Element, str] = {}
+
+    def mark_changes(self, old: _Element, new: _Element) -> bool:
+        """
+        Find differences between matching nodes of the old and new CIB
+
+        Return True if the new node or its descendants differ from the old ones
+        """
+        if new in self._compared:
+            return False
+        self._compared.add(new)
+        if _is_comment(new):
+            return False
+        changed = self._mark_attr_changes(old, new)
+        if len(old) == 0 and len(new) == 0:
+            return changed
+
+        old_nodes = list(old)
+        new_nodes = list(new)
+        children_changed = False
+        if _are_children_aligned(old_nodes, new_nodes):
+            for old_child, new_child in zip(old_nodes, new_nodes):
+                if self.mark_changes(old_child, new_child):
+                    children_changed = True
+        else:
+            children_changed = self._mark_children_changes(old, new)
+        if children_changed:
+            self._changed_subtrees.add(new)
+        return changed or children_changed
+
+    def _mark_children_changes(self, old: _Element, new: _Element) -> bool:
+        changed = False
+        old_children = _Children(old)
+        new_children = _Children(new)
+
+        for old_index, old_child in enumerate(old_children.nodes):
+            new_index = new_children.match(old_children, old_index)
+            if new_index is not None:
+                if self.mark_changes(old_child, new_children.nodes[new_index]):
+                    changed = True
+                continue
+            # pacemaker only records positions of deleted comments
+            self._deleted.append(
+                (
+                    self._path(new) + _path_segment(old_child),
+                    (
+                        old_children.positions.position(old_index)
+                        if _is_comment(old_child)
+                        else None
+                    ),
+                )
+            )
+            old_children.positions.skip(old_index)
+            changed = True
+
+        for new_index, new_child in enumerate(new_children.nodes):
+            matched_index = old_children.match(new_children, new_index)
+            if matched_index is None:
+                new_children.positions.skip(new_index)
+                self._created.add(new_child)
+                changed = True
+                continue
+            new_position = new_children.positions.position(new_index)
+            old_position = old_children.positions.position(matched_index)
+            if old_position != new_position:
+                self._moved.add(new_child)
+                changed = True
+                if old_position > new_position:
+                    old_children.positions.skip(matched_index)
+                else:
+                    new_children.positions.skip(new_index)
+        return changed
+
+    def _mark_attr_changes(self, old: _Element, new: _Element) -> bool:
+        new_attrs = new.items()
+        if new is self._cib_new:
+            new_attrs = self._ignore_version_change(old, new_attrs)
+        elif new_attrs == old.items():
+            return False
+        new_names = {name for name, dummy_value in new_attrs}
+        changed_attrs = [
+            (name, value) for name, value in new_attrs if old.get(name) != value
+        ]
+        removed_attrs = [name for name in old.keys() if name not in new_names]
+        if not changed_attrs and not removed_attrs:
+            return False
+        self._attr_changes[new] = (new_attrs, changed_attrs, removed_attrs)
+        return True
+
+    def create_patchset(self) -> Optional[_Element]:
+        """
+        Return the patchset of found differences, None if there are none
+        """
+        patchset = etree.Element("diff", format="2")
+        for path, position in self._deleted:
+            change = etree.SubElement(
+                patchset, "change", operation="delete", path=path
+            )
+            if position is not None:
+                change.set("position", str(position))
+        self._add_changes(patchset, self._cib_new, 0)
+        return patchset if len(patchset) else None
+
+    def _add_changes(
+        self, patchset: _Element, node: _Element, position: int
+    ) -> None:
+        if node in self._created:
+            change = etree.SubElement(
+                patchset,
+                "change",
+                operation="create",
+                path=self._path(node.getparent()),
+                position=str(position),
+            )
+            node_copy = deepcopy(node)
+            node_copy.tail = None
+            change.append(node_copy)
+            return
+        if node in self._attr_changes:
+            self._add_attr_changes(patchset, node)
+        if node in self._changed_subtrees:
+            for child_position, child in enumerate(node):
+                self._add_changes(patchset, child, child_position)
+        if node in self._moved:
+            etree.SubElement(
+                patchset,
+                "change",
+                operation="move",
+                path=self._path(node),
+                position=str(position),
+            )
+
+    def _add_attr_changes(self, patchset: _Element, node: _Element) -> None:
+        new_attrs, changed_attrs, removed_attrs = self._attr_changes[node]
+        change = etree.SubElement(
+            patchset, "change", operation="modify", path=self._path(node)
+        )
+        change_list = etree.SubElement(change, "change-list")
+        for name, value in changed_attrs:
+            etree.SubElement(
+                change_list,
+                "change-attr",
+                name=name,
+                operation="set",
+                value=value,
+            )
+        for name in removed_attrs:
+            etree.SubElement(
+                change_list, "change-attr", name=name, operation="unset"
+            )
+        change_result = etree.SubElement(change, "change-result")
+        result = etree.SubElement(change_result, node.tag)
+        for name, value in new_attrs:
+            result.set(name, value)
+
+    @staticmethod
+    def _ignore_version_change(
+        old: _Element, new_attrs: List[Tuple[str, str]]
+    ) -> List[Tuple[str, str]]:
+        # crm_diff --no-version copies version attributes from the old CIB to
+        # the new one, so that they are not detected as a change
+        new_attrs = list(new_attrs)
+        new_names = [name for name, dummy_value in new_attrs]
+        for name in _VERSION_ATTRS:
+            value = old.get(name)
+            if value is None:
+                continue
+            if name in new_names:
+                new_attrs[new_names.index(name)] = (name, value)
+            else:
+                new_attrs.append((name, value))
+                new_names.append(name)
+        return new_attrs
+
+    def _path(self, node: _Element) -> str:
+        path = self._path_cache.get(node)
+        if path is None:
+            parent = node.getparent()
+            path = (
+                "" if parent is None else self._path(parent)
+            ) + _path_segment(node)
+            self._path_cache[node] = path
+        return path
@@ -1,11 +1,22 @@
+import hashlib
+import json
+import os
 import os.path
 import re
+import time
+from functools import partial
 from typing import (
+    Any,
+    Callable,
     Dict,
     Iterable,
     List,
+    Mapping,
+    NamedTuple,
     Optional,
+    Sequence,
     Tuple,
+    Union,
     cast,
 )
 
@@ -27,9 +38,15 @@ from pcs.lib import tools
 from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
-from pcs.lib.pacemaker import api_result
+from pcs.lib.pacemaker import (
+    api_result,
+    cib_diff,
+)
 from pcs.lib.pacemaker.state import ClusterState
-from pcs.lib.xml_tools import etree_to_str
+from pcs.lib.xml_tools import (
+    etree_to_str,
+    get_relaxng_validator,
+)
 
 __EXITCODE_NOT_CONNECTED = 102
 __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT = 105
@@ -45,9 +62,278 @@ class FenceHistoryCommandErrorException(Exception):
     pass
 
 
+### status snapshots
+
+# Bump when the format of snapshots changes
+_STATUS_SNAPSHOT_FORMAT_VERSION = 1
+_STATUS_SNAPSHOT_CIB = "cib"
+_STATUS_SNAPSHOT_CLUSTER_STATUS = "cluster-status"
+
+
+class StatusSnapshotCache:
+    """
+    Short-lived snapshots of cluster status and CIB shared by pcs processes
+
+    Read-only commands run by monitoring tools often and at the same time get
+    the same cluster status and CIB over and over. A snapshot of crm_mon or
+    cibadmin output is reused for ttl seconds as long as the CIB has not
+    changed, i.e. its admin_epoch, epoch and num_updates are the same as when
+    the snapshot was taken. Snapshots are kept for each CIB user separately,
+    as ACLs restrict what users can see.
+
+    A snapshot which cannot be read or stored is ignored, the tools are run
+    instead.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float) -> None:
+        """
+        cache_dir -- directory to store the snapshots in
+        ttl -- max age of a snapshot in seconds
+        """
+        self._cache_dir = cache_dir
+        self._ttl = ttl
+
+    def get(self, kind: str, key: Mapping[str, Any]) -> Optional[str]:
+        """
+        Return a snapshot or None if it is not available or is outdated
+
+        kind -- what the snapshot contains
+        key -- identification of the CIB and user the snapshot was taken for
+        """
+        try:
+            with open(
+                self._get_entry_path(kind, key), encoding="utf-8"
+            ) as entry_file:
+                entry = json.load(entry_file)
+            if entry.get("key") != key:
+                return None
+            if not 0 <= time.time() - entry["created"] <= self._ttl:
+                return None
+            return str(entry["data"])
+        except (OSError, ValueError, LookupError, TypeError):
+            return None
+
+    def put(self, kind: str, key: Mapping[str, Any], data: str) -> None:
+        """
+        Store a snapshot, replace the previous one of the same kind and user
+
+        kind -- what the snapshot contains
+        key -- identification of the CIB and user the snapshot was taken for
+        data -- the snapshot
+        """
+        try:
+            tools.write_json_file_atomically(
+                self._get_entry_path(kind, key),
+                {"key": key, "created": time.time(), "data": data},
+            )
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove all snapshots
+        """
+        try:
+            with os.scandir(self._cache_dir) as entries:
+                path_list = [
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(".json")
+                ]
+        except OSError:
+            return
+        for path in path_list:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _get_entry_path(self, kind: str, key: Mapping[str, Any]) -> str:
+        # User names may contain characters not suitable for file names
+        digest = hashlib.sha256(str(key["user"]).encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, f"{kind}-{digest}.json")
+
+
+def get_default_status_snapshot_cache() -> Optional[StatusSnapshotCache]:
+    """
+    Return the status snapshot cache configured in settings, None if disabled
+    """
+    if (
+        not settings.pacemaker_status_snapshot_dir
+        or settings.pacemaker_status_snapshot_ttl <= 0
+    ):
+        return None
+    return StatusSnapshotCache(
+        settings.pacemaker_status_snapshot_dir,
+        settings.pacemaker_status_snapshot_ttl,
+    )
+
+
+def _get_status_snapshot_cache(
+    runner: CommandRunner,
+) -> Optional[StatusSnapshotCache]:
+    cache = get_default_status_snapshot_cache()
+    # snapshots are only taken of a live cluster
+    if cache is None or runner.env_vars.get("CIB_file"):
+        return None
+    return cache
+
+
+def get_cib_version_list(runner: CommandRunner) -> Optional[List[str]]:
+    """
+    Return admin_epoch, epoch and num_updates of the live CIB, None on errors
+
+    runner -- a class for running external processes
+    """
+    stdout, dummy_stderr, retval = runner.run(
+        [
+            __exec("cibadmin"),
+            "--local",
+            "--query",
+            "--xpath=/cib",
+            "--no-children",
+        ]
+    )
+    if retval != 0:
+        return None
+    try:
+        cib = xml_fromstring(stdout)
+    except etree.XMLSyntaxError:
+        return None
+    version_list = [
+        cib.get(name) for name in ("admin_epoch", "epoch", "num_updates")
+    ]
+    if None in version_list:
+        return None
+    return cast(List[str], version_list)
+
+
+def _load_with_status_snapshot(
+    runner: CommandRunner, kind: str, load: Callable[[], str]
+) -> str:
+    """
+    Reuse a snapshot of output of a pacemaker tool if it is enabled and valid
+
+    runner -- a class for running external processes
+    kind -- what the output contains
+    load -- function running the tool and returning its output
+    """
+    cache = _get_status_snapshot_cache(runner)
+    if cache is None:
+        return load()
+    key = _get_status_snapshot_key(runner)
+    if key is None:
+        return load()
+    data = cache.get(kind, key)
+    if data is None:
+        data = load()
+        cache.put(kind, key, data)
+    return data
+
+
+def _get_status_snapshot_key(runner: CommandRunner) -> Optional[Dict[str, Any]]:
+    # The version is read before running a tool. If the CIB changes in the
+    # meantime, the snapshot is newer than the version, never older.
+    cib_version_list = get_cib_version_list(runner)
+    if cib_version_list is None:
+        return None
+    return {
+        "format": _STATUS_SNAPSHOT_FORMAT_VERSION,
+        "pcs": settings.pcs_version,
+        "cib": cib_version_list,
+        "user": runner.env_vars.get("CIB_user", ""),
+    }
+
+
+def invalidate_status_snapshots(runner: CommandRunner) -> None:
+    """
+    Remove status snapshots after the CIB has been changed
+
+    runner -- a class for running external processes
+    """
+    cache = _get_status_snapshot_cache(runner)
+    if cache is not None:
+        cache.clear()
+
+
 ### status
 
 
+class StatusCommand(NamedTuple):
+    """
+    A tool run by run_status_commands and processing of its output
+    """
+
+    args: List[str]
+    # make a result from stdout, stderr and return value of the tool
+    process: Callable[[str, str, int], Any]
+    # reuse the output from a status snapshot of this kind if it is enabled
+    snapshot_kind: Optional[str] = None
+
+
+def run_status_commands(
+    runner: CommandRunner,
+    command_list: Sequence[StatusCommand],
+    max_parallel: int,
+    ignore_errors: bool = False,
+    while_running: Optional[Callable[[], None]] = None,
+) -> List[Any]:
+    """
+    Run tools at the same time and return their processed outputs
+
+    runner -- a class for running external processes
+    command_list -- tools to run
+    max_parallel -- max number of tools running at the same time
+    ignore_errors -- if True, return None for a tool whose output processing
+        raised a LibraryError, otherwise raise the first such error
+    while_running -- a function to call in the calling thread while the tools
+        are running
+
+    Results are returned in the order of command_list. The processes are
+    started from the calling thread and their outputs are processed in it once
+    all of them finish.
+    """
+    result_list: List[Any] = [None] * len(command_list)
+    cache = None
+    key = None
+    if any(command.snapshot_kind for command in command_list):
+        cache = _get_status_snapshot_cache(runner)
+        if cache is not None:
+            key = _get_status_snapshot_key(runner)
+    run_index_list = []
+    for index, command in enumerate(command_list):
+        data = None
+        if cache is not None and key is not None and command.snapshot_kind:
+            data = cache.get(command.snapshot_kind, key)
+        if data is None:
+            run_index_list.append(index)
+        else:
+            result_list[index] = data
+    output_list = runner.run_parallel(
+        [command_list[index].args for index in run_index_list],
+        max_parallel=max_parallel,
+        while_running=while_running,
+    )
+    for index, output in zip(run_index_list, output_list):
+        command = command_list[index]
+        try:
+            # there is no timeout, so there is an output of each process
+            result_list[index] = command.process(
+                *cast(Tuple[str, str, int], output)
+            )
+        except LibraryError:
+            if not ignore_errors:
+                raise
+            continue
+        if cache is not None and key is not None and command.snapshot_kind:
+            cache.put(command.snapshot_kind, key, result_list[index])
+    return result_list
+
+
+def _get_cluster_status_xml_args() -> List[str]:
+    return [__exec("crm_mon"), "--one-shot", "--inactive", "--output-as", "xml"]
+
+
 def get_cluster_status_xml_raw(runner: CommandRunner) -> Tuple[str, str, int]:
     """
     Run pacemaker tool to get XML status. This function doesn't do any
@@ -55,8 +341,19 @@ def get_cluster_status_xml_raw(runner: CommandRunner) -> Tuple[str, str, int]:
 
     runner -- a class for running external processes
     """
-    return runner.run(
-        [__exec("crm_mon"), "--one-shot", "--inactive", "--output-as", "xml"]
+    return runner.run(_get_cluster_status_xml_args())
+
+
+def get_cluster_status_xml_command() -> StatusCommand:
+    """
+    Return a command loading pacemaker XML status for run_status_commands
+
+    Its result is to be parsed by parse_cluster_status_xml.
+    """
+    return StatusCommand(
+        _get_cluster_status_xml_args(),
+        _process_cluster_status_xml,
+        _STATUS_SNAPSHOT_CLUSTER_STATUS,
     )
 
 
@@ -66,7 +363,18 @@ def _get_cluster_status_xml(runner: CommandRunner) -> str:
 
     runner -- a class for running external processes
     """
-    stdout, stderr, retval = get_cluster_status_xml_raw(runner)
+    return _load_with_status_snapshot(
+        runner,
+        _STATUS_SNAPSHOT_CLUSTER_STATUS,
+        lambda: _load_cluster_status_xml(runner),
+    )
+
+
+def _load_cluster_status_xml(runner: CommandRunner) -> str:
+    return _process_cluster_status_xml(*get_cluster_status_xml_raw(runner))
+
+
+def _process_cluster_status_xml(stdout: str, stderr: str, retval: int) -> str:
     if retval == 0:
         return stdout
 
@@ -91,8 +399,12 @@ def _get_cluster_status_xml(runner: CommandRunner) -> str:
 
 
 def get_cluster_status_dom(runner: CommandRunner) -> _Element:
+    return parse_cluster_status_xml(_get_cluster_status_xml(runner))
+
+
+def parse_cluster_status_xml(xml: str) -> _Element:
     try:
-        return _get_api_result_dom(_get_cluster_status_xml(runner))
+        return _get_api_result_dom(xml)
     except (etree.XMLSyntaxError, etree.DocumentInvalid) as e:
         raise LibraryError(
             ReportItem.error(reports.messages.BadClusterStateFormat())
@@ -104,6 +416,24 @@ def get_cluster_status_text(
     hide_inactive_resources: bool,
     verbose: bool,
 ) -> Tuple[str, List[str]]:
+    command = get_cluster_status_text_command(
+        runner, hide_inactive_resources, verbose
+    )
+    return command.process(*runner.run(command.args))
+
+
+def get_cluster_status_text_command(
+    runner: CommandRunner,
+    hide_inactive_resources: bool,
+    verbose: bool,
+) -> StatusCommand:
+    """
+    Return a command loading plaintext status for run_status_commands
+
+    runner -- a class for running external processes
+    hide_inactive_resources -- if True, do not display non-running resources
+    verbose -- if True, display more info
+    """
     cmd = [__exec("crm_mon"), "--one-shot"]
     if not hide_inactive_resources:
         cmd.append("--inactive")
@@ -113,8 +443,14 @@ def get_cluster_status_text(
         # with verbose==True, we display the whole history
         if is_fence_history_supported_status(runner):
             cmd.append("--fence-history=3")
-    stdout, stderr, retval = runner.run(cmd)
+    return StatusCommand(
+        cmd, partial(_process_cluster_status_text, verbose=verbose)
+    )
 
+
+def _process_cluster_status_text(
+    stdout: str, stderr: str, retval: int, verbose: bool
+) -> Tuple[str, List[str]]:
     if retval != 0:
         raise LibraryError(
             ReportItem.error(
@@ -133,23 +469,66 @@ def get_cluster_status_text(
 
 
 def get_ticket_status_text(runner: CommandRunner) -> Tuple[str, str, int]:
-    stdout, stderr, retval = runner.run([__exec("crm_ticket"), "--details"])
+    command = get_ticket_status_text_command()
+    return command.process(*runner.run(command.args))
+
+
+def get_ticket_status_text_command() -> StatusCommand:
+    """
+    Return a command loading plaintext ticket status for run_status_commands
+    """
+    return StatusCommand(
+        [__exec("crm_ticket"), "--details"], _process_ticket_status_text
+    )
+
+
+def _process_ticket_status_text(
+    stdout: str, stderr: str, retval: int
+) -> Tuple[str, str, int]:
     return stdout.strip(), stderr.strip(), retval
 
 
 ### cib
 
 
-def get_cib_xml_cmd_results(runner, scope=None):
+def _get_cib_xml_args(scope: Optional[str] = None) -> List[str]:
     command = [__exec("cibadmin"), "--local", "--query"]
     if scope:
         command.append("--scope={0}".format(scope))
-    stdout, stderr, returncode = runner.run(command)
+    return command
+
+
+def get_cib_xml_cmd_results(runner, scope=None):
+    stdout, stderr, returncode = runner.run(_get_cib_xml_args(scope))
     return stdout, stderr, returncode
 
 
 def get_cib_xml(runner, scope=None):
-    stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope)
+    if scope:
+        return _load_cib_xml(runner, scope)
+    return _load_with_status_snapshot(
+        runner, _STATUS_SNAPSHOT_CIB, lambda: _load_cib_xml(runner)
+    )
+
+
+def get_cib_xml_command() -> StatusCommand:
+    """
+    Return a command loading the CIB for run_status_commands
+    """
+    return StatusCommand(
+        _get_cib_xml_args(), _process_cib_xml, _STATUS_SNAPSHOT_CIB
+    )
+
+
+def _load_cib_xml(runner, scope=None):
+    return _process_cib_xml(
+        *get_cib_xml_cmd_results(runner, scope), scope=scope
+    )
+
+
+def _process_cib_xml(
+    stdout: str, stderr: str, retval: int, scope: Optional[str] = None
+) -> str:
     if retval != 0:
         if retval == __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT and scope:
             raise LibraryError(
@@ -226,6 +605,7 @@ def replace_cib_configuration_xml(runner, xml):
         "configuration",
     ]
     stdout, stderr, retval = runner.run(cmd, stdin_string=xml)
+    invalidate_status_snapshots(runner)
     if retval != 0:
         raise LibraryError(
             ReportItem.error(reports.messages.CibPushError(stderr, stdout))
@@ -244,12 +624,47 @@ def push_cib_diff_xml(runner, cib_diff_xml):
         "--xml-pipe",
     ]
     stdout, stderr, retval = runner.run(cmd, stdin_string=cib_diff_xml)
+    invalidate_status_snapshots(runner)
     if retval != 0:
         raise LibraryError(
             ReportItem.error(reports.messages.CibPushError(stderr, stdout))
         )
 
 
+def diff_cibs(
+    runner: CommandRunner,
+    reporter: ReportProcessor,
+    cib_old: Union[str, _Element],
+    cib_new: _Element,
+) -> str:
+    """
+    Return xml diff of two CIBs, computed by pcs if enabled in settings
+
+    runner
+    reporter
+    cib_old -- original CIB, either parsed or as loaded from the cluster
+    cib_new -- modified CIB
+    """
+    if settings.cib_diff_native:
+        try:
+            patchset = cib_diff.diff_cibs(
+                xml_fromstring(cib_old)
+                if isinstance(cib_old, str)
+                else cib_old,
+                cib_new,
+            )
+            return "" if patchset is None else etree_to_str(patchset)
+        except (etree.XMLSyntaxError, cib_diff.UnsupportedCib):
+            # Let crm_diff deal with the CIBs, it reports errors properly
+            pass
+    return diff_cibs_xml(
+        runner,
+        reporter,
+        cib_old if isinstance(cib_old, str) else etree_to_str(cib_old),
+        etree_to_str(cib_new),
+    )
+
+
 def diff_cibs_xml(
     runner: CommandRunner,
     reporter: ReportProcessor,
@@ -356,6 +771,7 @@ def _upgrade_cib(runner):
     stdout, stderr, retval = runner.run(
         [__exec("cibadmin"), "--upgrade", "--force"]
     )
+    invalidate_status_snapshots(runner)
     # If we are already on the latest schema available, cibadmin exits with 0.
     # That is fine. We do not know here what version is required anyway. The
     # caller knows that and is responsible for dealing with it.
@@ -731,6 +1147,16 @@ def has_rule_in_effect_status_tool() -> bool:
     return os.path.isfile(__exec("crm_rule"))
 
 
+# crm_rule return codes, others mean errors:
+# 105: non-existent
+# 112: undetermined (rule is too complicated for current implementation)
+_CRM_RULE_RETURN_CODE_TO_STATUS = {
+    0: CibRuleInEffectStatus.IN_EFFECT,
+    110: CibRuleInEffectStatus.EXPIRED,
+    111: CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
+}
+
+
 def get_rule_in_effect_status(
     runner: CommandRunner, cib_xml: str, rule_id: str
 ) -> CibRuleInEffectStatus:
@@ -741,21 +1167,61 @@ def get_rule_in_effect_status(
     cib_xml -- CIB containing rules
     rule_id -- ID of the rule to be checked
     """
-    # TODO Once crm_rule is capable of evaluating more than one rule per go, we
-    # should make use of it. Running the tool for each rule may really slow pcs
-    # down.
-    translation_map = {
-        0: CibRuleInEffectStatus.IN_EFFECT,
-        110: CibRuleInEffectStatus.EXPIRED,
-        111: CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
-        # 105:non-existent
-        # 112: undetermined (rule is too complicated for current implementation)
-    }
     dummy_stdout, dummy_stderr, retval = runner.run(
         [__exec("crm_rule"), "--check", "--rule", rule_id, "--xml-text", "-"],
         stdin_string=cib_xml,
     )
-    return translation_map.get(retval, CibRuleInEffectStatus.UNKNOWN)
+    return _CRM_RULE_RETURN_CODE_TO_STATUS.get(
+        retval, CibRuleInEffectStatus.UNKNOWN
+    )
+
+
+def get_rules_in_effect_status(
+    runner: CommandRunner, cib_xml: str, rule_id_list: Iterable[str]
+) -> Dict[str, CibRuleInEffectStatus]:
+    """
+    Figure out if rules are in effect, expired or not yet in effect
+
+    All the rules are checked by running crm_rule once. Rules missing in the
+    returned dict have not been checked. That happens if crm_rule is not
+    capable of checking more than one rule at once.
+
+    runner -- a class for running external processes
+    cib_xml -- CIB containing rules
+    rule_id_list -- IDs of the rules to be checked
+    """
+    rule_args = [arg for rule_id in rule_id_list for arg in ("--rule", rule_id)]
+    if not rule_args:
+        return {}
+    stdout, dummy_stderr, dummy_retval = runner.run(
+        [
+            __exec("crm_rule"),
+            "--check",
+            "--output-as",
+            "xml",
+            "--xml-text",
+            "-",
+        ]
+        + rule_args,
+        stdin_string=cib_xml,
+    )
+    try:
+        dom = xml_fromstring(stdout)
+    except etree.XMLSyntaxError:
+        # crm_rule doesn't support xml output
+        return {}
+    result = {}
+    for check_el in dom.iterfind("rule-check"):
+        try:
+            retval = int(str(check_el.get("rc")))
+        except ValueError:
+            retval = -1
+        result[
+            str(check_el.get("rule-id"))
+        ] = _CRM_RULE_RETURN_CODE_TO_STATUS.get(
+            retval, CibRuleInEffectStatus.UNKNOWN
+        )
+    return result
 
 
 def _get_api_result_dom(xml: str) -> _Element:
@@ -763,7 +1229,7 @@ def _get_api_result_dom(xml: str) -> _Element:
     rng = settings.pacemaker_api_result_schema
     dom = xml_fromstring(xml)
     if os.path.isfile(rng):
-        etree.RelaxNG(file=rng).assertValid(dom)
+        get_relaxng_validator(rng).assertValid(dom)
     return dom
 
 
@@ -0,0 +1,744 @@
+"""
+Cluster configuration and status in the format of pcsd node status
+
+Pcsd nodes and the web UI read these structures from the remote/status
+request. They have been built by ruby pcsd, the functions here build exactly
+the same ones.
+"""
+import re
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+from lxml.etree import _Element
+
+from pcs.lib.pacemaker.values import is_true
+
+RESOURCE_STATUS_RUNNING = "running"
+RESOURCE_STATUS_PARTIALLY_RUNNING = "partially running"
+RESOURCE_STATUS_DISABLED = "disabled"
+RESOURCE_STATUS_FAILED = "failed"
+RESOURCE_STATUS_BLOCKED = "blocked"
+RESOURCE_STATUS_UNKNOWN = "unknown"
+
+# pcsd uses the old names of roles
+_ROLE_MAP = {
+    "Promoted": "Master",
+    "Unpromoted": "Slave",
+}
+
+# (rc-code, operation or None for any operation) not meaning a failure
+_OPERATION_RC_NOT_FAILED = (
+    # OCF_SUCCESS
+    (0, None),
+    # OCF_NOT_RUNNING, the resource is safely stopped
+    (7, "monitor"),
+    # OCF_RUNNING_MASTER, the resource is running in master mode
+    (8, None),
+    # PCMK_OCF_UNKNOWN, the operation is still in progress
+    (193, None),
+)
+
+ResourceStatusList = Dict[str, List[Dict[str, Any]]]
+
+
+def _to_int(value: Optional[str]) -> int:
+    # Leading digits count, anything else is zero, the same way pcsd does it.
+    match = re.match(r"\s*([-+]?\d+)", value or "")
+    return int(match.group(1)) if match else 0
+
+
+def _normalize_role(role: Optional[str]) -> Optional[str]:
+    return _ROLE_MAP.get(role, role) if role is not None else None
+
+
+def _get_nvpair_list(element: _Element, nvset_tag: str) -> List[Dict[str, Any]]:
+    # A name defined again replaces its previous definition and moves to
+    # the end of the list.
+    nvpair_dict: Dict[Optional[str], Dict[str, Any]] = {}
+    for nvpair_el in element.iterfind(f"{nvset_tag}/nvpair"):
+        name = nvpair_el.get("name")
+        nvpair_dict.pop(name, None)
+        nvpair_dict[name] = {
+            "id": nvpair_el.get("id"),
+            "name": name,
+            "value": nvpair_el.get("value"),
+        }
+    return list(nvpair_dict.values())
+
+
+def _get_nvpair_value(
+    nvpair_list: Iterable[Dict[str, Any]], name: str
+) -> Optional[str]:
+    for nvpair in nvpair_list:
+        if nvpair["name"] == name:
+            return nvpair["value"]
+    return None
+
+
+def get_cluster_settings(cib: _Element) -> Dict[str, Optional[str]]:
+    """
+    Return cluster properties, the last value of a property counts
+    """
+    return {
+        str(nvpair_el.get("name")): nvpair_el.get("value")
+        for nvpair_el in cib.iterfind("configuration/crm_config//nvpair")
+    }
+
+
+def get_acls(cib: _Element) -> Dict[str, Dict[str, Any]]:
+    """
+    Return ACL roles with their permissions and roles of users and groups
+    """
+    acls: Dict[str, Dict[str, Any]] = {
+        "role": {},
+        "group": {},
+        "user": {},
+        "target": {},
+    }
+    for acl_el in cib.xpath("/cib/configuration/acls/*"):
+        acl_type = str(acl_el.tag)[4:]
+        acl_id = acl_el.get("id")
+        if acl_el.tag == "acl_role":
+            permission_list = []
+            for permission_el in acl_el.iterfind("acl_permission"):
+                if permission_el.get("xpath") is not None:
+                    value = "xpath {0}".format(permission_el.get("xpath"))
+                elif permission_el.get("reference") is not None:
+                    value = "id {0}".format(permission_el.get("reference"))
+                else:
+                    continue
+                permission_list.append(
+                    "{kind} {value} ({id})".format(
+                        kind=permission_el.get("kind", ""),
+                        value=value,
+                        id=permission_el.get("id", ""),
+                    )
+                )
+            acls[acl_type][acl_id] = {
+                "description": acl_el.get("description", ""),
+                "permissions": permission_list,
+            }
+        elif acl_el.tag in ("acl_target", "acl_group"):
+            acls[acl_type][acl_id] = [
+                role_el.get("id") for role_el in acl_el.iterfind("role")
+            ]
+    acls["user"] = acls["target"]
+    return acls
+
+
+def get_fence_levels(cib: _Element) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return fencing levels of nodes specified by their names
+    """
+    fence_levels: Dict[str, List[Dict[str, Any]]] = {}
+    for level_el in cib.iterfind(
+        "configuration/fencing-topology/fencing-level"
+    ):
+        target = level_el.get("target")
+        if target is not None:
+            fence_levels.setdefault(target, []).append(
+                {
+                    "level": level_el.get("index"),
+                    "devices": level_el.get("devices"),
+                }
+            )
+    for level_list in fence_levels.values():
+        level_list.sort(key=lambda level: _to_int(level["level"]))
+    return fence_levels
+
+
+def _get_node_nvpairs(
+    cib: _Element, nvset_tag: str
+) -> Dict[str, List[Dict[str, Any]]]:
+    node_nvpairs: Dict[str, List[Dict[str, Any]]] = {}
+    for nvpair_el in cib.iterfind(
+        f"configuration/nodes/node/{nvset_tag}/nvpair"
+    ):
+        node_nvpairs.setdefault(
+            str(nvpair_el.getparent().getparent().get("uname")), []
+        ).append(
+            {
+                "id": nvpair_el.get("id"),
+                "name": nvpair_el.get("name"),
+                "value": nvpair_el.get("value"),
+            }
+        )
+    return node_nvpairs
+
+
+def get_node_attributes(cib: _Element) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return attributes of nodes sorted by their names
+    """
+    node_attrs = _get_node_nvpairs(cib, "instance_attributes")
+    for attr_list in node_attrs.values():
+        attr_list.sort(key=lambda attr: str(attr["name"]))
+    return node_attrs
+
+
+def get_nodes_utilization(cib: _Element) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return utilization attributes of nodes
+    """
+    return _get_node_nvpairs(cib, "utilization")
+
+
+def get_resource_group_ids(cib: _Element) -> List[str]:
+    """
+    Return ids of all groups including cloned ones
+    """
+    return [
+        str(group_el.get("id"))
+        for group_el in cib.iterfind("configuration/resources//group")
+    ]
+
+
+def _export_rule(rule_el: _Element) -> str:
+    part_list = []
+    for child_el in rule_el.iterchildren():
+        if child_el.tag == "expression":
+            part_list.append(_export_expression(child_el))
+        elif child_el.tag == "date_expression":
+            part_list.append(_export_date_expression(child_el))
+        elif child_el.tag == "rule":
+            part_list.append("({0})".format(_export_rule(child_el)))
+    return " {0} ".format(rule_el.get("boolean-op", "and")).join(part_list)
+
+
+def _export_expression(expression_el: _Element) -> str:
+    if expression_el.get("value") is None:
+        return " ".join(
+            [
+                expression_el.get("operation", ""),
+                expression_el.get("attribute", ""),
+            ]
+        )
+    part_list = [
+        expression_el.get("attribute", ""),
+        expression_el.get("operation", ""),
+    ]
+    if expression_el.get("type") is not None:
+        part_list.append(str(expression_el.get("type")))
+    value = str(expression_el.get("value"))
+    part_list.append(f'"{value}"' if " " in value else value)
+    return " ".join(part_list)
+
+
+def _export_attributes(element: _Element) -> List[str]:
+    return [
+        f"{name}={value}" for name, value in element.items() if name != "id"
+    ]
+
+
+def _export_date_expression(expression_el: _Element) -> str:
+    operation = expression_el.get("operation")
+    start = expression_el.get("start")
+    end = expression_el.get("end")
+    part_list: List[str] = []
+    if operation == "date_spec":
+        part_list.append("date-spec")
+        for date_spec_el in expression_el.iterfind("date_spec"):
+            part_list.extend(_export_attributes(date_spec_el))
+    elif operation == "in_range":
+        part_list.extend(["date", operation])
+        if start is not None:
+            part_list.extend([start, "to"])
+        if end is not None:
+            part_list.append(end)
+        for duration_el in expression_el.iterfind("duration"):
+            part_list.append("duration")
+            part_list.extend(_export_attributes(duration_el))
+    else:
+        part_list.extend(["date", operation or ""])
+        if start is not None:
+            part_list.append(start)
+        if end is not None:
+            part_list.append(end)
+    return " ".join(part_list)
+
+
+def get_constraints(cib: _Element) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return constraints, location rules are listed as separate constraints
+    """
+    constraints: Dict[str, List[Dict[str, Any]]] = {}
+    constraints_el = cib.find("configuration/constraints")
+    if constraints_el is None:
+        return constraints
+    for constraint_el in constraints_el.iterchildren():
+        if not isinstance(constraint_el.tag, str):
+            # skip comments
+            continue
+        has_children = any(
+            isinstance(child_el.tag, str)
+            for child_el in constraint_el.iterchildren()
+        )
+        if constraint_el.tag == "rsc_location" and has_children:
+            for rule_el in constraint_el.iterfind("rule"):
+                rule_info = {"rule_string": _export_rule(rule_el)}
+                if constraint_el.get("rsc-pattern") is not None:
+                    rule_info["rsc-pattern"] = constraint_el.get("rsc-pattern")
+                else:
+                    rule_info["rsc"] = constraint_el.get("rsc")
+                rule_info.update(
+                    (name, value)
+                    for name, value in rule_el.items()
+                    if name != "boolean-op"
+                )
+                constraints.setdefault(constraint_el.tag, []).append(rule_info)
+        elif has_children:
+            constraint_info: Dict[str, Any] = dict(constraint_el.items())
+            constraint_info["sets"] = [
+                {
+                    **dict(set_el.items()),
+                    "resources": [
+                        ref_el.get("id")
+                        for ref_el in set_el.iterfind("resource_ref")
+                    ],
+                }
+                for set_el in constraint_el.iterfind("resource_set")
+            ]
+            constraints.setdefault(constraint_el.tag, []).append(
+                constraint_info
+            )
+        else:
+            constraints.setdefault(constraint_el.tag, []).append(
+                dict(constraint_el.items())
+            )
+    return constraints
+
+
+def get_resource_status_list(
+    status_dom: Optional[_Element],
+) -> ResourceStatusList:
+    """
+    Return status of resource instances from crm_mon by primitive ids
+
+    status_dom -- crm_mon xml output, None if not available
+    """
+    status_list: ResourceStatusList = {}
+    if status_dom is None:
+        return status_list
+    for resource_el in status_dom.iterfind("resources//resource"):
+        node_el = resource_el.find("node")
+        # instances of clones are distinguished by a suffix
+        status_list.setdefault(
+            str(resource_el.get("id")).split(":", maxsplit=1)[0], []
+        ).append(
+            {
+                "id": resource_el.get("id"),
+                "resource_agent": resource_el.get("resource_agent"),
+                "managed": resource_el.get("managed") == "true",
+                "failed": resource_el.get("failed") == "true",
+                "role": _normalize_role(resource_el.get("role")),
+                "active": resource_el.get("active") == "true",
+                "orphaned": resource_el.get("orphaned") == "true",
+                "failure_ignored": (
+                    resource_el.get("failure_ignored") == "true"
+                ),
+                "nodes_running_on": _to_int(
+                    resource_el.get("nodes_running_on")
+                ),
+                "pending": resource_el.get("pending"),
+                "node": (
+                    None
+                    if node_el is None
+                    else {
+                        "name": node_el.get("name"),
+                        "id": node_el.get("id"),
+                        "cached": node_el.get("cached") == "true",
+                    }
+                ),
+                "blocked": resource_el.get("blocked") == "true",
+                "target_role": _normalize_role(resource_el.get("target_role")),
+            }
+        )
+    return status_list
+
+
+def get_resource_operations(cib: _Element) -> ResourceStatusList:
+    """
+    Return operations recorded in the CIB status section by primitive ids
+    """
+    operations: ResourceStatusList = {}
+    for node_state_el in cib.iterfind("status/node_state"):
+        for op_el in node_state_el.iterfind(
+            "lrm/lrm_resources/lrm_resource/lrm_rsc_op"
+        ):
+            on_node = op_el.get("on_node")
+            operations.setdefault(
+                str(op_el.getparent().get("id")).split(":", maxsplit=1)[0], []
+            ).append(
+                {
+                    "call_id": _to_int(op_el.get("call-id")),
+                    "crm_debug_origin": op_el.get("crm-debug-origin"),
+                    "crm_feature_set": op_el.get("crm_feature_set"),
+                    "exec_time": _to_int(op_el.get("exec-time")),
+                    "exit_reason": op_el.get("exit-reason"),
+                    "id": op_el.get("id"),
+                    "interval": _to_int(op_el.get("interval")),
+                    "last_rc_change": _to_int(op_el.get("last-rc-change")),
+                    "last_run": _to_int(op_el.get("last-run")),
+                    "on_node": (
+                        on_node
+                        if on_node is not None
+                        else node_state_el.get("uname")
+                    ),
+                    "op_digest": op_el.get("op-digest"),
+                    "operation_key": op_el.get("operation_key"),
+                    "operation": op_el.get("operation"),
+                    "op_force_restart": op_el.get("op-force-restart"),
+                    "op_restart_digest": op_el.get("op-restart-digest"),
+                    "op_status": _to_int(op_el.get("op-status")),
+                    "queue_time": _to_int(op_el.get("queue-time")),
+                    "rc_code": _to_int(op_el.get("rc-code")),
+                    "transition_key": op_el.get("transition-key"),
+                    "transition_magic": op_el.get("transition-magic"),
+                }
+            )
+    return operations
+
+
+def _is_operation_failed(operation: Mapping[str, Any]) -> bool:
+    return not any(
+        operation["rc_code"] == rc_code
+        and (op_name is None or operation["operation"] == op_name)
+        for rc_code, op_name in _OPERATION_RC_NOT_FAILED
+    )
+
+
+def _describe_failed_operation(
+    resource_id: str, operation: Mapping[str, Any]
+) -> str:
+    message = "Failed to {operation} {resource_id} on {time}".format(
+        operation=operation["operation"],
+        resource_id=resource_id,
+        time=time.asctime(time.localtime(operation["last_rc_change"])),
+    )
+    if operation["on_node"] is not None:
+        message += " on node {0}".format(operation["on_node"])
+    if operation["exit_reason"] is not None:
+        message += ": {0}".format(operation["exit_reason"])
+    return message
+
+
+def _get_resource(
+    resource_el: _Element, class_type: str, parent_id: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "id": resource_el.get("id"),
+        "error_list": [],
+        "warning_list": [],
+        "class_type": class_type,
+        "status": RESOURCE_STATUS_UNKNOWN,
+        "meta_attr": _get_nvpair_list(resource_el, "meta_attributes"),
+        "parent_id": parent_id,
+        "disabled": False,
+    }
+
+
+def _is_disabled(resource: Mapping[str, Any], parent_disabled: bool) -> bool:
+    target_role = _get_nvpair_value(resource["meta_attr"], "target-role")
+    return parent_disabled or (target_role or "").lower() == "stopped"
+
+
+def _get_primitive(
+    primitive_el: _Element,
+    parent_id: Optional[str],
+    parent_disabled: bool,
+    status_list: ResourceStatusList,
+    operations: Optional[ResourceStatusList],
+) -> Dict[str, Any]:
+    # pylint: disable=too-many-locals
+    primitive = _get_resource(primitive_el, "primitive", parent_id)
+    resource_id = primitive["id"]
+    agent_class = primitive_el.get("class")
+    provider = primitive_el.get("provider")
+    agent_type = primitive_el.get("type")
+    stonith = agent_class == "stonith"
+    instance_attr = _get_nvpair_list(primitive_el, "instance_attributes")
+    if stonith:
+        for nvpair in instance_attr:
+            if nvpair["name"] == "action":
+                primitive["warning_list"].append(
+                    {
+                        "message": (
+                            'This fence-device has the "action" option set, '
+                            'it is recommended to set "pcmk_off_action", '
+                            '"pcmk_reboot_action" instead'
+                        )
+                    }
+                )
+            if nvpair["name"] == "method" and nvpair["value"] == "cycle":
+                primitive["warning_list"].append(
+                    {
+                        "message": (
+                            'This fence-device has the "method" option set '
+                            'to "cycle" which is potentially dangerous, '
+                            'please consider using "onoff"'
+                        )
+                    }
+                )
+    # stonith resources are never disabled
+    disabled = not stonith and _is_disabled(primitive, parent_disabled)
+    crm_status = status_list.get(resource_id, []) if resource_id else []
+
+    operation_list: List[Dict[str, Any]] = []
+    message_list = []
+    if operations is not None and resource_id in operations:
+        operation_list = operations[resource_id]
+        message_list = [
+            {"message": _describe_failed_operation(resource_id, operation)}
+            for operation in operation_list
+            if _is_operation_failed(operation)
+        ]
+
+    if disabled:
+        status = RESOURCE_STATUS_DISABLED
+    elif any(status["active"] for status in crm_status):
+        status = RESOURCE_STATUS_RUNNING
+    elif message_list or any(status["failed"] for status in crm_status):
+        status = RESOURCE_STATUS_FAILED
+    else:
+        status = RESOURCE_STATUS_BLOCKED
+    if status == RESOURCE_STATUS_FAILED:
+        primitive["error_list"].extend(message_list)
+    else:
+        primitive["warning_list"].extend(message_list)
+
+    primitive.update(
+        {
+            "status": status,
+            "disabled": disabled,
+            "agentname": (
+                "{0}{1}:{2}".format(
+                    agent_class, f"::{provider}" if provider else "", agent_type
+                )
+                if agent_class and agent_type
+                else None
+            ),
+            "provider": provider,
+            "type": agent_type,
+            "stonith": stonith,
+            "utilization": _get_nvpair_list(primitive_el, "utilization"),
+            "instance_attr": instance_attr,
+            "class": agent_class,
+            "crm_status": crm_status,
+            "operations": operation_list,
+        }
+    )
+    return primitive
+
+
+def _get_group(
+    group_el: _Element,
+    parent_id: Optional[str],
+    parent_disabled: bool,
+    status_list: ResourceStatusList,
+    operations: Optional[ResourceStatusList],
+) -> Dict[str, Any]:
+    group = _get_resource(group_el, "group", parent_id)
+    disabled = _is_disabled(group, parent_disabled)
+    member_list = [
+        _get_primitive(
+            primitive_el, group["id"], disabled, status_list, operations
+        )
+        for primitive_el in group_el.iterfind("primitive")
+    ]
+    status = RESOURCE_STATUS_RUNNING
+    if any(
+        member["status"]
+        in (
+            RESOURCE_STATUS_DISABLED,
+            RESOURCE_STATUS_BLOCKED,
+            RESOURCE_STATUS_FAILED,
+        )
+        for member in member_list[1:]
+    ):
+        status = RESOURCE_STATUS_PARTIALLY_RUNNING
+    if member_list and member_list[0]["status"] not in (
+        RESOURCE_STATUS_RUNNING,
+        RESOURCE_STATUS_UNKNOWN,
+    ):
+        status = member_list[0]["status"]
+    if disabled:
+        status = RESOURCE_STATUS_DISABLED
+    group.update(
+        {"status": status, "disabled": disabled, "members": member_list}
+    )
+    return group
+
+
+def _has_promoted_instance(member: Mapping[str, Any]) -> bool:
+    primitive_list = (
+        member["members"] if member["class_type"] == "group" else [member]
+    )
+    return any(
+        status["role"] in ("Master", "Promoted") and status["node"]
+        for primitive in primitive_list
+        for status in primitive["crm_status"]
+    )
+
+
+def _get_clone(
+    clone_el: _Element,
+    status_list: ResourceStatusList,
+    operations: Optional[ResourceStatusList],
+) -> Dict[str, Any]:
+    clone = _get_resource(clone_el, "clone", None)
+    disabled = _is_disabled(clone, False)
+    promotable = clone_el.tag == "master" or is_true(
+        _get_nvpair_value(clone["meta_attr"], "promotable") or ""
+    )
+    member = None
+    status = RESOURCE_STATUS_UNKNOWN
+    for member_el in clone_el.iterchildren("group", "primitive"):
+        get_member = _get_group if member_el.tag == "group" else _get_primitive
+        member = get_member(
+            member_el, clone["id"], disabled, status_list, operations
+        )
+        status = member["status"]
+        break
+    not_promoted = (
+        member is not None and promotable and not _has_promoted_instance(member)
+    )
+    if not_promoted and status == RESOURCE_STATUS_RUNNING:
+        status = RESOURCE_STATUS_PARTIALLY_RUNNING
+    if disabled:
+        status = RESOURCE_STATUS_DISABLED
+    if not_promoted and status != RESOURCE_STATUS_DISABLED:
+        clone["warning_list"].append(
+            {
+                "message": (
+                    "Resource is promotable but has not been promoted on any "
+                    "node."
+                ),
+                "type": "no_master",
+            }
+        )
+    clone.update(
+        {
+            "status": status,
+            "disabled": disabled,
+            "promotable": promotable,
+            "member": member,
+        }
+    )
+    return clone
+
+
+def get_resource_list(
+    cib: _Element,
+    status_dom: Optional[_Element],
+    with_operations: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Return top level resources with their members and status
+
+    cib -- the CIB
+    status_dom -- crm_mon xml output, None if not available
+    with_operations -- if True, list operations of primitives and describe
+        the failed ones in errors or warnings of the primitives
+    """
+    status_list = get_resource_status_list(status_dom)
+    operations = get_resource_operations(cib) if with_operations else None
+    resource_list: List[Dict[str, Any]] = []
+    resources_el = cib.find("configuration/resources")
+    if resources_el is None:
+        return resource_list
+    # primitives go first, then groups and clones
+    for primitive_el in resources_el.iterchildren("primitive"):
+        resource_list.append(
+            _get_primitive(primitive_el, None, False, status_list, operations)
+        )
+    for group_el in resources_el.iterchildren("group"):
+        resource_list.append(
+            _get_group(group_el, None, False, status_list, operations)
+        )
+    for tag in ("clone", "master"):
+        for clone_el in resources_el.iterchildren(tag):
+            resource_list.append(_get_clone(clone_el, status_list, operations))
+    return resource_list
+
+
+def get_local_node(
+    status_dom: Optional[_Element],
+    node_id: str,
+    services: Mapping[str, Mapping[str, bool]],
+    uptime: str,
+    sbd_config: Optional[Dict[str, str]],
+    not_authorized_node_list: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Return status of the local node
+
+    status_dom -- crm_mon xml output, None if not available
+    node_id -- corosync id of the local node, empty if not available
+    services -- installed, enabled and running flags of cluster services
+    uptime -- formatted uptime of the local node
+    sbd_config -- local SBD config, None if not available
+    not_authorized_node_list -- known nodes the local node is not authorized
+        against
+    """
+    corosync = services["corosync"]["running"]
+    pacemaker = services["pacemaker"]["running"]
+    status = "offline"
+    quorum = None
+    if corosync and pacemaker and status_dom is not None:
+        status = "online"
+        for node_el in status_dom.iterfind("nodes/node"):
+            if node_el.get("id") == node_id:
+                if node_el.get("standby") == "true":
+                    status = "standby"
+                break
+        quorum = any(
+            dc_el.get("with_quorum") == "true"
+            for dc_el in status_dom.iter("current_dc")
+        )
+    not_authorized_node_list = list(not_authorized_node_list)
+    warning_list = []
+    if not_authorized_node_list:
+        warning_list.append(
+            {
+                "message": "Not authorized against node(s) {0}".format(
+                    ", ".join(not_authorized_node_list)
+                ),
+                "type": "nodes_not_authorized",
+                "node_list": not_authorized_node_list,
+            }
+        )
+    return {
+        "id": node_id,
+        "error_list": [],
+        "warning_list": warning_list,
+        "status": status,
+        "quorum": quorum,
+        "uptime": uptime,
+        "name": None,
+        "services": services,
+        "corosync": corosync,
+        "pacemaker": pacemaker,
+        "corosync_enabled": services["corosync"]["enabled"],
+        "pacemaker_enabled": services["pacemaker"]["enabled"],
+        "pcsd_enabled": services["pcsd"]["enabled"],
+        "sbd_config": sbd_config,
+    }
+
+
+def format_uptime(seconds: int) -> str:
+    """
+    Return uptime in days, hours, minutes and seconds
+    """
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return "{0} day{1}, {2:02d}:{3:02d}:{4:02d}".format(
+        days, "" if days == 1 else "s", hours, minutes, seconds
+    )
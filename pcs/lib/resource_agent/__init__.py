@@ -7,6 +7,7 @@ from pcs.common.resource_agent.dto import (
 )
 
 from .error import (
+    AgentMetadataLoadTimedOut,
     AgentNameGuessFoundMoreThanOne,
     AgentNameGuessFoundNone,
     InvalidResourceAgentName,
@@ -21,6 +22,8 @@ from .facade import (
 )
 from .list import (
     find_one_resource_agent_by_type,
+    get_resource_agents_type_index,
+    list_all_resource_agents,
     list_resource_agents,
     list_resource_agents_ocf_providers,
     list_resource_agents_standards,
@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import os.path
+from dataclasses import asdict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+from pcs import settings
+from pcs.lib.tools import write_json_file_atomically
+
+from . import const
+from .types import (
+    OcfVersion,
+    ResourceAgentAction,
+    ResourceAgentMetadata,
+    ResourceAgentName,
+    ResourceAgentParameter,
+)
+
+# The caches are only an optimization. Any error when reading or writing them
+# is treated as a cache miss.
+
+# Bump when the format of cached data changes
+_CACHE_FORMAT_VERSION = 1
+_NAME_CACHE_FORMAT_VERSION = 1
+
+
+def get_agent_executable(name: ResourceAgentName) -> Optional[str]:
+    """
+    Return path to a file implementing the specified agent, if it is known
+
+    name -- name of an agent
+    """
+    if name.standard == "ocf" and name.provider:
+        return os.path.join(
+            settings.ocf_resource_agents_dir, name.provider, name.type
+        )
+    if name.standard == "stonith":
+        return os.path.join(settings.fence_agent_binaries, name.type)
+    if name.standard == "lsb":
+        return os.path.join(settings.lsb_agents_dir, name.type)
+    if name.is_pcmk_fake_agent and name.type == const.PACEMAKER_FENCED:
+        return settings.pacemaker_fenced
+    # Systemd units and other agents are provided by pacemaker in various ways,
+    # there is no single file we could check for changes.
+    return None
+
+
+def _file_identity(path: str) -> List[Any]:
+    # raises OSError
+    stat = os.stat(path)
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def _dir_identity(path: str) -> List[Any]:
+    try:
+        return [path, os.stat(path).st_mtime_ns]
+    except OSError:
+        return [path, None]
+
+
+def _get_agent_dirs() -> List[str]:
+    """
+    Return directories whose content changes when agents are (un)installed
+    """
+    dir_list = [settings.ocf_resource_agents_dir]
+    # Agents are installed into a directory of their provider. Adding an agent
+    # only changes mtime of the provider's directory.
+    try:
+        with os.scandir(settings.ocf_resource_agents_dir) as entries:
+            dir_list.extend(
+                sorted(entry.path for entry in entries if entry.is_dir())
+            )
+    except OSError:
+        pass
+    dir_list.append(settings.lsb_agents_dir)
+    dir_list.extend(settings.systemd_unit_path)
+    dir_list.append(settings.fence_agent_binaries)
+    return dir_list
+
+
+def _metadata_from_dict(data: Dict[str, Any]) -> ResourceAgentMetadata:
+    return ResourceAgentMetadata(
+        name=ResourceAgentName(**data["name"]),
+        agent_exists=data["agent_exists"],
+        ocf_version=OcfVersion(data["ocf_version"]),
+        shortdesc=data["shortdesc"],
+        longdesc=data["longdesc"],
+        parameters=[
+            ResourceAgentParameter(**param) for param in data["parameters"]
+        ],
+        actions=[ResourceAgentAction(**action) for action in data["actions"]],
+    )
+
+
+class ResourceAgentMetadataCache:
+    """
+    Persistent cache of parsed metadata of resource and stonith agents
+
+    Each agent is stored in its own file. An entry is only valid as long as
+    neither the agent's executable nor crm_resource, which provides agents'
+    metadata, nor pcs have changed since the entry has been stored. When the
+    cache grows over its size limit, the least recently used entries are
+    removed.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = 0) -> None:
+        """
+        cache_dir -- directory to store the cache in
+        max_size -- max total size of cached entries in bytes, 0 = no limit
+        """
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+    def get(self, name: ResourceAgentName) -> Optional[ResourceAgentMetadata]:
+        """
+        Return cached metadata of an agent or None if they are not available
+
+        name -- name of an agent
+        """
+        key = self._get_key(name)
+        if key is None:
+            return None
+        path = self._get_entry_path(name)
+        try:
+            with open(path, encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            if entry.get("key") != key:
+                return None
+            metadata = _metadata_from_dict(entry["metadata"])
+            # mark the entry as recently used
+            os.utime(path)
+            return metadata
+        except (OSError, ValueError, LookupError, TypeError):
+            return None
+
+    def put(
+        self, name: ResourceAgentName, metadata: ResourceAgentMetadata
+    ) -> None:
+        """
+        Store metadata of an agent in the cache
+
+        name -- name of an agent
+        metadata -- parsed metadata of the agent
+        """
+        key = self._get_key(name)
+        if key is None:
+            return
+        try:
+            write_json_file_atomically(
+                self._get_entry_path(name),
+                {"key": key, "metadata": asdict(metadata)},
+            )
+        except OSError:
+            return
+        if self._max_size > 0:
+            self._enforce_size_limit()
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache
+        """
+        for entry in self._list_entries():
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _get_key(name: ResourceAgentName) -> Optional[Dict[str, Any]]:
+        # Entries are keyed by mtime and size of the agent's executable, so
+        # they are not used once the agent has been upgraded.
+        executable = get_agent_executable(name)
+        if executable is None:
+            return None
+        try:
+            return {
+                "format": _CACHE_FORMAT_VERSION,
+                "pcs": settings.pcs_version,
+                "name": name.full_name,
+                "agent": _file_identity(executable),
+                "pacemaker": _file_identity(settings.crm_resource_binary),
+            }
+        except OSError:
+            return None
+
+    def _get_entry_path(self, name: ResourceAgentName) -> str:
+        # Agent names may contain characters not suitable for file names
+        digest = hashlib.sha256(name.full_name.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, f"{digest}.json")
+
+    def _list_entries(self) -> List[os.DirEntry]:
+        try:
+            with os.scandir(self._cache_dir) as entries:
+                return [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError:
+            return []
+
+    def _enforce_size_limit(self) -> None:
+        entry_list = []
+        total_size = 0
+        for entry in self._list_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entry_list.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total_size += stat.st_size
+        entry_list.sort()
+        for dummy_mtime, size, path in entry_list:
+            if total_size <= self._max_size:
+                break
+            try:
+                os.unlink(path)
+                total_size -= size
+            except OSError:
+                pass
+
+
+class ResourceAgentNameCache:
+    """
+    Persistent index of names of all agents installed on the local host
+
+    The index maps lowercased agent types to full agent names. It is only valid
+    as long as none of the directories agents are installed to has changed and
+    neither crm_resource nor pcs have changed since the index has been stored.
+    """
+
+    def __init__(self, cache_file: str) -> None:
+        """
+        cache_file -- file to store the index in
+        """
+        self._cache_file = cache_file
+
+    def get(self) -> Optional[Dict[str, List[ResourceAgentName]]]:
+        """
+        Return the cached index or None if it is not available
+        """
+        try:
+            with open(self._cache_file, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            if data.get("key") != self._get_key():
+                return None
+            return {
+                type_lower: [ResourceAgentName(*name) for name in name_list]
+                for type_lower, name_list in data["index"].items()
+            }
+        except (OSError, ValueError, LookupError, TypeError, AttributeError):
+            return None
+
+    def put(self, index: Mapping[str, Iterable[ResourceAgentName]]) -> None:
+        """
+        Store an index of agents in the cache
+
+        index -- lowercased agent types mapped to full agent names
+        """
+        try:
+            write_json_file_atomically(
+                self._cache_file,
+                {
+                    "key": self._get_key(),
+                    "index": {
+                        type_lower: [
+                            [name.standard, name.provider, name.type]
+                            for name in name_list
+                        ]
+                        for type_lower, name_list in index.items()
+                    },
+                },
+            )
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove the index from the cache
+        """
+        try:
+            os.unlink(self._cache_file)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _get_key() -> Dict[str, Any]:
+        try:
+            pacemaker: Optional[List[Any]] = _file_identity(
+                settings.crm_resource_binary
+            )
+        except OSError:
+            pacemaker = None
+        return {
+            "format": _NAME_CACHE_FORMAT_VERSION,
+            "pcs": settings.pcs_version,
+            "pacemaker": pacemaker,
+            "dirs": [_dir_identity(path) for path in _get_agent_dirs()],
+        }
+
+
+def get_default_metadata_cache() -> Optional[ResourceAgentMetadataCache]:
+    """
+    Return the metadata cache configured in settings, None if it is disabled
+    """
+    if not settings.resource_agent_metadata_cache_dir:
+        return None
+    return ResourceAgentMetadataCache(
+        settings.resource_agent_metadata_cache_dir,
+        settings.resource_agent_metadata_cache_max_size,
+    )
+
+
+def get_default_name_cache() -> Optional[ResourceAgentNameCache]:
+    """
+    Return the agent name cache configured in settings, None if it is disabled
+    """
+    if not settings.resource_agent_name_cache_file:
+        return None
+    return ResourceAgentNameCache(settings.resource_agent_name_cache_file)
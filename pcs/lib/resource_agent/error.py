@@ -11,6 +11,12 @@ class ResourceAgentError(Exception):
         self.agent_name = agent_name
 
 
+class AgentMetadataLoadTimedOut(ResourceAgentError):
+    def __init__(self, agent_name: str, timeout: float):
+        super().__init__(agent_name)
+        self.timeout = timeout
+
+
 class AgentNameGuessFoundMoreThanOne(ResourceAgentError):
     def __init__(self, searched_name: str, names_found: Iterable[str]):
         super().__init__(searched_name)
@@ -54,7 +60,11 @@ def resource_agent_error_to_report_item(
     message: reports.item.ReportItemMessage = (
         reports.messages.AgentGenericError(e.agent_name)
     )
-    if isinstance(e, AgentNameGuessFoundMoreThanOne):
+    if isinstance(e, AgentMetadataLoadTimedOut):
+        message = reports.messages.AgentMetadataLoadTimedOut(
+            e.agent_name, e.timeout
+        )
+    elif isinstance(e, AgentNameGuessFoundMoreThanOne):
         message = reports.messages.AgentNameGuessFoundMoreThanOne(
             e.searched_name, sorted(e.names_found)
         )
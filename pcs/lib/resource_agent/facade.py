@@ -1,19 +1,25 @@
 from collections import defaultdict
 from dataclasses import replace as dc_replace
 from typing import (
+    Callable,
     Dict,
     Iterable,
     List,
     Optional,
+    Sequence,
     Set,
+    Union,
     cast,
 )
 
+from lxml.etree import _Element
+
 from pcs.common import reports
 from pcs.lib import validate
 from pcs.lib.external import CommandRunner
 
 from . import const
+from .cache import ResourceAgentMetadataCache
 from .error import (
     ResourceAgentError,
     resource_agent_error_to_report_item,
@@ -33,6 +39,7 @@ from .types import (
 from .xml import (
     load_fake_agent_metadata,
     load_metadata,
+    load_metadata_list,
     parse_metadata,
 )
 
@@ -199,10 +206,18 @@ class ResourceAgentFacadeFactory:
     """
 
     def __init__(
-        self, runner: CommandRunner, report_processor: reports.ReportProcessor
+        self,
+        runner: CommandRunner,
+        report_processor: reports.ReportProcessor,
+        metadata_cache: Optional[ResourceAgentMetadataCache] = None,
     ) -> None:
+        """
+        metadata_cache -- if set, load agents' metadata from it and store
+            newly loaded metadata to it
+        """
         self._runner = runner
         self._report_processor = report_processor
+        self._metadata_cache = metadata_cache
         self._fenced_metadata: Optional[ResourceAgentMetadata] = None
 
     def facade_from_parsed_name(
@@ -214,11 +229,69 @@ class ResourceAgentFacadeFactory:
         name -- agent name to get a facade for
         """
         return self._facade_from_metadata(
-            ocf_version_to_ocf_unified(
-                parse_metadata(name, load_metadata(self._runner, name))
-            )
+            self._load_metadata(name, lambda: load_metadata(self._runner, name))
         )
 
+    def facades_from_parsed_names(
+        self,
+        names: Sequence[ResourceAgentName],
+        max_parallel: int = 1,
+        timeout: Optional[float] = None,
+    ) -> List[Union[ResourceAgentFacade, ResourceAgentError]]:
+        """
+        Create ResourceAgentFacades for specified agents
+
+        Metadata of agents which are not in the metadata cache are loaded in
+        parallel.
+
+        names -- agent names to get facades for
+        max_parallel -- max number of agents being run at the same time
+        timeout -- max time in seconds to get metadata of one agent
+
+        Return a list of facades in the order of names, with an error in place
+        of each agent whose metadata cannot be loaded.
+        """
+        metadata_list: List[
+            Union[ResourceAgentMetadata, ResourceAgentError, None]
+        ] = [
+            self._metadata_cache.get(name) if self._metadata_cache else None
+            for name in names
+        ]
+        to_load = [
+            index
+            for index, metadata in enumerate(metadata_list)
+            if metadata is None
+        ]
+        loaded_list = load_metadata_list(
+            self._runner,
+            [names[index] for index in to_load],
+            max_parallel,
+            timeout,
+        )
+        for index, loaded in zip(to_load, loaded_list):
+            if isinstance(loaded, ResourceAgentError):
+                metadata_list[index] = loaded
+                continue
+            try:
+                metadata = ocf_version_to_ocf_unified(
+                    parse_metadata(names[index], loaded)
+                )
+            except ResourceAgentError as e:
+                metadata_list[index] = e
+                continue
+            if self._metadata_cache is not None:
+                self._metadata_cache.put(names[index], metadata)
+            metadata_list[index] = metadata
+
+        return [
+            metadata
+            if isinstance(metadata, ResourceAgentError)
+            else self._facade_from_metadata(
+                cast(ResourceAgentMetadata, metadata)
+            )
+            for metadata in metadata_list
+        ]
+
     def void_facade_from_parsed_name(
         self, name: ResourceAgentName
     ) -> ResourceAgentFacade:
@@ -229,6 +302,18 @@ class ResourceAgentFacadeFactory:
         """
         return self._facade_from_metadata(name_to_void_metadata(name))
 
+    def _load_metadata(
+        self, name: ResourceAgentName, load_xml: Callable[[], _Element]
+    ) -> ResourceAgentMetadata:
+        if self._metadata_cache is not None:
+            metadata = self._metadata_cache.get(name)
+            if metadata is not None:
+                return metadata
+        metadata = ocf_version_to_ocf_unified(parse_metadata(name, load_xml()))
+        if self._metadata_cache is not None:
+            self._metadata_cache.put(name, metadata)
+        return metadata
+
     def _facade_from_metadata(
         self, metadata: ResourceAgentMetadata
     ) -> ResourceAgentFacade:
@@ -251,14 +336,11 @@ class ResourceAgentFacadeFactory:
             )
             try:
                 self._fenced_metadata = ocf_unified_to_pcs(
-                    ocf_version_to_ocf_unified(
-                        parse_metadata(
-                            agent_name,
-                            load_fake_agent_metadata(
-                                self._runner,
-                                cast(FakeAgentName, agent_name.type),
-                            ),
-                        )
+                    self._load_metadata(
+                        agent_name,
+                        lambda: load_fake_agent_metadata(
+                            self._runner, cast(FakeAgentName, agent_name.type)
+                        ),
                     )
                 )
             except ResourceAgentError as e:
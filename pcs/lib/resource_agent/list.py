@@ -1,10 +1,15 @@
-from typing import List
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
 
 from pcs import settings
 from pcs.common import reports
 from pcs.common.str_tools import split_multiline
 from pcs.lib.external import CommandRunner
 
+from .cache import ResourceAgentNameCache
 from .error import (
     AgentNameGuessFoundMoreThanOne,
     AgentNameGuessFoundNone,
@@ -102,6 +107,53 @@ def list_resource_agents(
     )
 
 
+def get_resource_agents_type_index(
+    runner: CommandRunner, name_cache: Optional[ResourceAgentNameCache] = None
+) -> Dict[str, List[ResourceAgentName]]:
+    """
+    Return lowercased types of all agents on the local host mapped to full names
+
+    name_cache -- if set, load the index from it and store a newly built index
+        to it
+    """
+    if name_cache is not None:
+        cached_index = name_cache.get()
+        if cached_index is not None:
+            return cached_index
+    index: Dict[str, List[ResourceAgentName]] = {}
+    for std_provider in list_resource_agents_standards_and_providers(runner):
+        for agent_type in list_resource_agents(runner, std_provider):
+            index.setdefault(agent_type.lower(), []).append(
+                ResourceAgentName(
+                    std_provider.standard, std_provider.provider, agent_type
+                )
+            )
+    if name_cache is not None:
+        name_cache.put(index)
+    return index
+
+
+def list_all_resource_agents(
+    runner: CommandRunner, name_cache: Optional[ResourceAgentNameCache] = None
+) -> List[ResourceAgentName]:
+    """
+    Return names of all agents of all standards and providers on the local host
+
+    name_cache -- if set, load the names from it and store newly loaded names
+        to it
+    """
+    return sorted(
+        (
+            name
+            for name_list in get_resource_agents_type_index(
+                runner, name_cache
+            ).values()
+            for name in name_list
+        ),
+        key=lambda item: item.full_name,
+    )
+
+
 ### find an agent by its name
 
 
@@ -109,13 +161,17 @@ def find_one_resource_agent_by_type(
     runner: CommandRunner,
     report_processor: reports.ReportProcessor,
     type_: str,
+    name_cache: Optional[ResourceAgentNameCache] = None,
 ) -> ResourceAgentName:
     """
     Get one resource agent with the specified type from all standards:providers
 
     type_ -- last part of an agent's name
+    name_cache -- if set, use the agent name index stored in it
     """
-    possible_names = _find_all_resource_agents_by_type(runner, type_)
+    possible_names = _find_all_resource_agents_by_type(
+        runner, type_, name_cache
+    )
     if len(possible_names) == 1:
         report_processor.report(
             reports.ReportItem.info(
@@ -133,23 +189,18 @@ def find_one_resource_agent_by_type(
 
 
 def _find_all_resource_agents_by_type(
-    runner: CommandRunner, type_: str
+    runner: CommandRunner,
+    type_: str,
+    name_cache: Optional[ResourceAgentNameCache] = None,
 ) -> List[ResourceAgentName]:
     """
     List resource agents with the specified type from all standards:providers
 
     type_ -- last part of an agent name
+    name_cache -- if set, use the agent name index stored in it
     """
-    type_lower = type_.lower()
-    possible_names = []
-    for std_provider in list_resource_agents_standards_and_providers(runner):
-        for existing_type in list_resource_agents(runner, std_provider):
-            if type_lower == existing_type.lower():
-                possible_names.append(
-                    ResourceAgentName(
-                        std_provider.standard,
-                        std_provider.provider,
-                        existing_type,
-                    )
-                )
-    return possible_names
+    return list(
+        get_resource_agents_type_index(runner, name_cache).get(
+            type_.lower(), []
+        )
+    )
@@ -1,8 +1,11 @@
 from typing import (
+    Dict,
     List,
     Optional,
+    Sequence,
     Tuple,
     Union,
+    cast,
 )
 
 from lxml import etree
@@ -11,9 +14,12 @@ from lxml.etree import _Element
 from pcs import settings
 from pcs.common.tools import xml_fromstring
 from pcs.lib.external import CommandRunner
+from pcs.lib.xml_tools import get_relaxng_validator
 
 from . import const
 from .error import (
+    AgentMetadataLoadTimedOut,
+    ResourceAgentError,
     UnableToGetAgentMetadata,
     UnsupportedOcfVersion,
 )
@@ -31,6 +37,30 @@ from .types import (
 ### load metadata
 
 
+def _metadata_command(agent_name: ResourceAgentName) -> List[str]:
+    return [
+        settings.crm_resource_binary,
+        "--show-metadata",
+        agent_name.full_name,
+    ]
+
+
+def _metadata_command_env() -> Dict[str, str]:
+    return {
+        "PATH": ":".join(
+            [
+                # otherwise pacemaker cannot run RHEL fence agents to get their
+                # metadata
+                settings.fence_agent_binaries,
+                # otherwise heartbeat and cluster-glue agents don't work
+                "/bin",
+                # otherwise heartbeat and cluster-glue agents don't work
+                "/usr/bin",
+            ]
+        )
+    }
+
+
 def _load_metadata_xml(
     runner: CommandRunner, agent_name: ResourceAgentName
 ) -> str:
@@ -40,20 +70,8 @@ def _load_metadata_xml(
     runner -- external processes runner
     agent_name -- name of an agent whose metadata we want to get
     """
-    env_path = ":".join(
-        [
-            # otherwise pacemaker cannot run RHEL fence agents to get their
-            # metadata
-            settings.fence_agent_binaries,
-            # otherwise heartbeat and cluster-glue agents don't work
-            "/bin",
-            # otherwise heartbeat and cluster-glue agents don't work
-            "/usr/bin",
-        ]
-    )
     stdout, stderr, retval = runner.run(
-        [settings.crm_resource_binary, "--show-metadata", agent_name.full_name],
-        env_extend={"PATH": env_path},
+        _metadata_command(agent_name), env_extend=_metadata_command_env()
     )
     if retval != 0:
         raise UnableToGetAgentMetadata(agent_name.full_name, stderr.strip())
@@ -102,9 +120,9 @@ def _metadata_xml_to_dom(metadata: str) -> _Element:
     dom = xml_fromstring(metadata)
     ocf_version = _get_ocf_version(dom)
     if ocf_version == const.OCF_1_0:
-        etree.RelaxNG(file=settings.path.ocf_1_0_schema).assertValid(dom)
+        get_relaxng_validator(settings.path.ocf_1_0_schema).assertValid(dom)
     elif ocf_version == const.OCF_1_1:
-        etree.RelaxNG(file=settings.path.ocf_1_1_schema).assertValid(dom)
+        get_relaxng_validator(settings.path.ocf_1_1_schema).assertValid(dom)
     return dom
 
 
@@ -123,6 +141,55 @@ def load_metadata(
         raise UnableToGetAgentMetadata(agent_name.full_name, str(e)) from e
 
 
+def load_metadata_list(
+    runner: CommandRunner,
+    agent_names: Sequence[ResourceAgentName],
+    max_parallel: int,
+    timeout: Optional[float],
+) -> List[Union[_Element, ResourceAgentError]]:
+    """
+    Return metadata of specified agents, run up to max_parallel agents at once
+
+    runner -- external processes runner
+    agent_names -- names of agents whose metadata we want to get
+    max_parallel -- max number of agents being run at the same time
+    timeout -- max time in seconds to get metadata of one agent
+
+    Return a list of metadata XML documents in the order of agent_names, with
+    an error in place of each agent whose metadata cannot be loaded.
+    """
+    output_list = runner.run_parallel(
+        [_metadata_command(name) for name in agent_names],
+        env_extend=_metadata_command_env(),
+        max_parallel=max_parallel,
+        timeout=timeout,
+    )
+    result: List[Union[_Element, ResourceAgentError]] = []
+    # Metadata are parsed and validated here, in the main thread. lxml
+    # documents and validators must not be shared among threads.
+    for agent_name, output in zip(agent_names, output_list):
+        if output is None:
+            result.append(
+                AgentMetadataLoadTimedOut(
+                    agent_name.full_name, cast(float, timeout)
+                )
+            )
+            continue
+        stdout, stderr, retval = output
+        if retval != 0:
+            result.append(
+                UnableToGetAgentMetadata(agent_name.full_name, stderr.strip())
+            )
+            continue
+        try:
+            result.append(_metadata_xml_to_dom(stdout.strip()))
+        except (etree.XMLSyntaxError, etree.DocumentInvalid) as e:
+            result.append(
+                UnableToGetAgentMetadata(agent_name.full_name, str(e))
+            )
+    return result
+
+
 def load_fake_agent_metadata(
     runner: CommandRunner, agent_name: FakeAgentName
 ) -> _Element:
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 import uuid
@@ -76,6 +77,29 @@ def dict_to_environment_file(config_dict):
     return "".join(lines)
 
 
+def write_json_file_atomically(path: str, data: Any) -> None:
+    """
+    Write data to a file in JSON, so that readers never see it partially written
+
+    The data are written to a temporary file first, which then replaces the
+    file. The directory of the file is created if it does not exist. Raise
+    OSError.
+
+    path -- file to write
+    data -- data to be stored in the file
+    """
+    dir_path = os.path.dirname(path)
+    os.makedirs(dir_path, mode=0o700, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=".tmp")
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
 def write_tmpfile(data, binary=False):
     """
     Write data to a new tmp file and return the file; raises EnvironmentError.
@@ -1,6 +1,9 @@
+import os
+import threading
 from typing import (
     Dict,
     Iterable,
+    Tuple,
 )
 
 from lxml import etree
@@ -241,3 +244,34 @@ def remove_one_element(element: _Element) -> None:
     parent = element.getparent()
     if parent is not None:
         parent.remove(element)
+
+
+# schema path -> (modification time of the schema file, compiled validator)
+_relaxng_validator_cache: Dict[str, Tuple[int, etree.RelaxNG]] = {}
+_relaxng_validator_cache_lock = threading.Lock()
+
+
+def get_relaxng_validator(path: str) -> etree.RelaxNG:
+    """
+    Return a RelaxNG validator for the specified schema file
+
+    Validators are compiled once per process and reused until the schema file
+    is modified. Compiling a schema is much more expensive than validating
+    a document against it.
+
+    path -- path to a RelaxNG schema file
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        # let lxml report the error the same way as for any unusable schema
+        return etree.RelaxNG(file=path)
+    # Library code may run in several threads. Compile each schema only once
+    # and never let threads see the cache in the middle of an update.
+    with _relaxng_validator_cache_lock:
+        cached = _relaxng_validator_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        validator = etree.RelaxNG(file=path)
+        _relaxng_validator_cache[path] = (mtime, validator)
+        return validator
@@ -4,8 +4,10 @@ import sys
 from typing import (
     Any,
     Dict,
+    List,
     Mapping,
     Optional,
+    Union,
 )
 
 from dacite import DaciteError
@@ -15,7 +17,10 @@ from pcs import (
     utils,
 )
 from pcs.cli.common.env_cli import Env
-from pcs.cli.common.lib_wrapper import Library
+from pcs.cli.common.lib_wrapper import (
+    Library,
+    clear_cache,
+)
 from pcs.common import communication
 from pcs.common.interface import dto
 from pcs.common.reports import (
@@ -96,6 +101,7 @@ SUPPORTED_COMMANDS = {
     "scsi.unfence_node",
     "scsi.unfence_node_mpath",
     "status.full_cluster_status_plaintext",
+    "status.pcsd_node_status",
     "stonith_agent.describe_agent",
     "stonith_agent.list_agents",
     "stonith.create",
@@ -103,6 +109,10 @@ SUPPORTED_COMMANDS = {
 }
 
 
+class _InputError(Exception):
+    pass
+
+
 def _convert_input_data(cmd: str, data: Dict[str, Any]) -> Mapping[str, Any]:
     if cmd == "resource_agent.get_agent_metadata":
         try:
@@ -110,38 +120,43 @@ def _convert_input_data(cmd: str, data: Dict[str, Any]) -> Mapping[str, Any]:
                 ResourceAgentNameDto, data["agent_name"]
             )
         except (DaciteError, KeyError) as e:
-            _exit(
-                communication.const.COM_STATUS_INPUT_ERROR,
-                status_msg=str(e),
-            )
+            raise _InputError(str(e)) from e
     return data
 
 
+def _result(
+    status: communication.types.CommunicationResultStatus,
+    status_msg: Optional[str] = None,
+    report_list: Optional[ReportItemList] = None,
+    data: Any = None,
+) -> Dict[str, Any]:
+    return dto.to_dict(
+        communication.dto.InternalCommunicationResultDto(
+            status,
+            status_msg,
+            [report.to_dto() for report in (report_list or [])],
+            data,
+        )
+    )
+
+
 def _exit(
     status: communication.types.CommunicationResultStatus,
     status_msg: Optional[str] = None,
     report_list: Optional[ReportItemList] = None,
     data: Any = None,
 ) -> None:
-    json.dump(
-        dto.to_dict(
-            communication.dto.InternalCommunicationResultDto(
-                status,
-                status_msg,
-                [report.to_dto() for report in (report_list or [])],
-                data,
-            )
-        ),
-        sys.stdout,
-    )
+    json.dump(_result(status, status_msg, report_list, data), sys.stdout)
     sys.exit(0)
 
 
 def get_cli_env(
     options: communication.dto.InternalCommunicationRequestOptionsDto,
+    user: Optional[str],
+    groups: Optional[List[str]],
 ) -> Env:
     env = Env()
-    env.user, env.groups = utils.get_cib_user_groups()
+    env.user, env.groups = user, groups
     env.known_hosts_getter = utils.read_known_hosts_file
     # Debug messages always go to the processor. The parameter only affects if
     # they will be printed to stdout. We are not printing the messages. Instead
@@ -155,40 +170,51 @@ def get_cli_env(
 
 
 class LibraryReportProcessor(ReportProcessor):
-    processed_items: ReportItemList = []
+    def __init__(self) -> None:
+        super().__init__()
+        self.processed_items: ReportItemList = []
 
     def _do_report(self, report_item: ReportItem) -> None:
         self.processed_items.append(report_item)
 
 
-def main() -> None:
-    # pylint: disable=broad-except
-    argv = sys.argv[1:]
-    if argv:
-        _exit(
-            communication.const.COM_STATUS_INPUT_ERROR,
-            status_msg="No arguments allowed",
-        )
+def run_request(
+    request_json: Union[str, bytes],
+    user: Optional[str],
+    groups: Optional[List[str]],
+) -> Dict[str, Any]:
+    """
+    Run a library command and return its result
 
-    utils.subprocess_setup()
-    logging.basicConfig()
+    The same process may run any number of requests, nothing is shared among
+    them except for cached data independent of users running the requests.
 
+    request_json -- InternalCommunicationRequestDto in json
+    user -- name of a user running the command
+    groups -- groups of the user running the command
+    """
+    # pylint: disable=broad-except
+    # Library parts bound to an environment of a previous request and known
+    # hosts read by a previous request must not be reused.
+    clear_cache()
+    utils.read_known_hosts_file.cache_clear()
+    cli_env = None
     try:
         input_dto = dto.from_dict(
             communication.dto.InternalCommunicationRequestDto,
-            json.load(sys.stdin),
+            json.loads(request_json),
         )
-        cli_env = get_cli_env(input_dto.options)
+        cli_env = get_cli_env(input_dto.options, user, groups)
         lib = Library(cli_env, utils.get_middleware_factory())
         if input_dto.cmd not in SUPPORTED_COMMANDS:
-            _exit(
+            return _result(
                 communication.const.COM_STATUS_UNKNOWN_CMD,
                 status_msg=f"Unknown command '{input_dto.cmd}'",
             )
         for sub_cmd in input_dto.cmd.split("."):
             lib = getattr(lib, sub_cmd)
         output_data = lib(**_convert_input_data(input_dto.cmd, input_dto.cmd_data))  # type: ignore
-        _exit(
+        return _result(
             communication.const.COM_STATUS_SUCCESS,
             report_list=cli_env.report_processor.processed_items,
             data=(
@@ -198,23 +224,44 @@ def main() -> None:
             ),
         )
     except LibraryError as e:
-        _exit(
+        return _result(
             communication.const.COM_STATUS_ERROR,
             report_list=(
-                cli_env.report_processor.processed_items + list(e.args)
+                (cli_env.report_processor.processed_items if cli_env else [])
+                + list(e.args)
             ),
             data=e.output,
         )
     except json.JSONDecodeError as e:
-        _exit(
+        return _result(
             communication.const.COM_STATUS_INPUT_ERROR,
             status_msg=f"Unable to parse input data: {e.msg}",
         )
-    except DaciteError as e:
-        _exit(
+    except (DaciteError, _InputError) as e:
+        return _result(
             communication.const.COM_STATUS_INPUT_ERROR,
             status_msg=str(e),
         )
     except Exception as e:
         # TODO: maybe add traceback?
-        _exit(communication.const.COM_STATUS_EXCEPTION, status_msg=str(e))
+        return _result(
+            communication.const.COM_STATUS_EXCEPTION, status_msg=str(e)
+        )
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if argv:
+        _exit(
+            communication.const.COM_STATUS_INPUT_ERROR,
+            status_msg="No arguments allowed",
+        )
+
+    utils.subprocess_setup()
+    logging.basicConfig()
+
+    json.dump(
+        run_request(sys.stdin.read(), *utils.get_cib_user_groups()),
+        sys.stdout,
+    )
+    sys.exit(0)
@@ -956,6 +956,26 @@ def resource_agents(lib, argv, modifiers):
         )
 
 
+def resource_metadata_cache_warm(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if argv:
+        raise CmdLineInputError()
+    lib.resource_agent.warm_metadata_cache()
+
+
+def resource_metadata_cache_clear(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if argv:
+        raise CmdLineInputError()
+    lib.resource_agent.clear_metadata_cache()
+
+
 def update_cmd(lib: Any, argv: List[str], modifiers: InputModifiers) -> None:
     """
     Options:
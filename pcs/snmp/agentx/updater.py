@@ -12,21 +12,36 @@ class AgentxUpdaterBase(Updater):
 
     # this has to be set by the descendants
     _oid_tree: Oid
+    # string oids mapped to numeric oids and their Oid entities, built from
+    # _oid_tree on the first use and shared by all instances of the class
+    _oid_map = None
 
     @property
     def oid_tree(self):
         return self._oid_tree
 
-    def _set_val(self, data_type, oid, value):
-        self._data[oid] = {"name": oid, "type": data_type, "value": value}
+    @classmethod
+    def _get_oid_map(cls):
+        # A class attribute is inherited, make sure the map has been built for
+        # the tree of this very class.
+        oid_map = cls.__dict__.get("_oid_map")
+        if oid_map is None:
+            oid_map = _build_oid_map(cls._oid_tree)
+            cls._oid_map = oid_map
+        return oid_map
 
     def _set_value_list(self, data_type, oid, value):
         if not isinstance(value, list):
             value = [value]
+        data = self._data
+        prefix = f"{oid}."
         for index, val in enumerate(value):
-            self._set_val(
-                data_type, "{oid}.{index}".format(oid=oid, index=index), val
-            )
+            value_oid = f"{prefix}{index}"
+            data[value_oid] = {
+                "name": value_oid,
+                "type": data_type,
+                "value": val,
+            }
 
     def set_typed_value(self, oid, value):
         """
@@ -43,54 +58,76 @@ class AgentxUpdaterBase(Updater):
         value primitive value or list of primitive values -- value to be set on
           specified str_oid
         """
-        oid, oid_cls = _str_oid_to_oid(self.oid_tree, str_oid)
+        oid, oid_cls = _str_oid_to_oid(self._get_oid_map(), str_oid)
         self.set_typed_value(oid, oid_cls.data_type(value))
 
+    def set_values(self, value_map):
+        """
+        Set values of several string oids at once
+
+        value_map dict -- string form of oid mapped to a primitive value or
+          a list of primitive values to be set on the oid
+        """
+        oid_map = self._get_oid_map()
+        for str_oid, value in value_map.items():
+            oid, oid_cls = _str_oid_to_oid(oid_map, str_oid)
+            self.set_typed_value(oid, oid_cls.data_type(value))
+
     def set_table(self, oid, table):
         """
         oid string -- number form of oid
         table list of list of BaseType -- members of outer list represent rows
           of table and members of inner list are columns.
         """
-        for row in table:
-            if not row:
-                continue
-            row_id = _str_to_oid(str(row[0].value))
-            for index, col in enumerate(row[1:], start=2):
-                value_oid = "{base_oid}.{index}.{row_id}".format(
-                    base_oid=oid, index=index, row_id=row_id
-                )
-                self._set_val(col.data_type, value_oid, col.value)
-
-
-def _find_oid_in_sub_tree(sub_tree, section_name):
-    if sub_tree.member_list is None:
-        return None
-    for oid in sub_tree.member_list:
-        if oid.str_oid == section_name:
-            return oid
-    return None
-
-
-def _str_oid_to_oid(sub_tree, str_oid):
-    sections = str_oid.split(".")
-    oid_list = []
-    for section in sections:
-        sub_tree = _find_oid_in_sub_tree(sub_tree, section)
-        if sub_tree is None:
-            raise AssertionError(
-                "oid section '{0}' ({1}) not found in section '{2}'".format(
-                    section, str_oid, oid_list[-1] if oid_list else "."
-                )
-            )
-        oid_list.append(str(sub_tree.oid))
-        if sub_tree.data_type:
-            oid = ".".join(oid_list)
-            return (oid, sub_tree)
-    return None
+        self.set_tables({oid: table})
+
+    def set_tables(self, table_map):
+        """
+        Set several tables at once
+
+        table_map dict -- number form of oid mapped to a table, a list of rows
+          where each row is a list of BaseType columns. The first column holds
+          the index of the row.
+        """
+        data = self._data
+        for oid, table in table_map.items():
+            # oid prefixes of columns are the same for all rows
+            column_prefix_list = []
+            for row in table:
+                if not row:
+                    continue
+                for index in range(len(column_prefix_list) + 2, len(row) + 1):
+                    column_prefix_list.append(f"{oid}.{index}.")
+                row_id = _str_to_oid(str(row[0].value))
+                for column_prefix, col in zip(column_prefix_list, row[1:]):
+                    value_oid = column_prefix + row_id
+                    data[value_oid] = {
+                        "name": value_oid,
+                        "type": col.data_type,
+                        "value": col.value,
+                    }
+
+
+def _build_oid_map(sub_tree, str_prefix="", oid_prefix=""):
+    oid_map = {}
+    for member in sub_tree.member_list or []:
+        str_oid = f"{str_prefix}{member.str_oid}"
+        oid = f"{oid_prefix}{member.oid}"
+        if member.data_type:
+            oid_map[str_oid] = (oid, member)
+        else:
+            oid_map.update(_build_oid_map(member, f"{str_oid}.", f"{oid}."))
+    return oid_map
+
+
+def _str_oid_to_oid(oid_map, str_oid):
+    try:
+        return oid_map[str_oid]
+    except KeyError:
+        raise AssertionError(
+            "oid '{0}' not found in the oid tree".format(str_oid)
+        ) from None
 
 
 def _str_to_oid(data):
-    length = len(data)
-    oid_int = [str(ord(i)) for i in data]
-    return str(length) + "." + ".".join(oid_int)
+    return f"{len(data)}." + ".".join([str(ord(char)) for char in data])
@@ -6,7 +6,6 @@ import sys
 # pylint: disable=import-error
 import pyagentx
 
-import pcs.utils
 from pcs.snmp import settings
 from pcs.snmp.updaters.v1 import ClusterPcsV1Updater
 
@@ -48,9 +47,6 @@ def setup_logging(debug=False):
     level = logging.INFO
     if debug:
         level = logging.DEBUG
-        # this is required to enable debug also in the ruby code
-        # key '--debug' has to be added
-        pcs.utils.pcs_options["--debug"] = debug
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
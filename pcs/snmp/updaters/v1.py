@@ -1,12 +1,21 @@
 import logging
 
+from pcs.cli.reports.messages import report_item_msg_from_dto
+from pcs.common.reports import (
+    ReportItem,
+    ReportItemSeverity,
+    ReportProcessor,
+)
+from pcs.common.types import PrimitiveStatus
+from pcs.lib.commands.status import node_status_dto
+from pcs.lib.env import LibraryEnvironment
+from pcs.lib.errors import LibraryError
 from pcs.snmp.agentx.types import (
     IntegerType,
     Oid,
     StringType,
 )
 from pcs.snmp.agentx.updater import AgentxUpdaterBase
-from pcs.utils import run_pcsdcli
 
 logger = logging.getLogger("pcs.snmp.updaters.v1")
 logger.addHandler(logging.NullHandler())
@@ -41,166 +50,81 @@ _cluster_v1_oid_tree = Oid(
 )
 
 
-class ClusterPcsV1Updater(AgentxUpdaterBase):
-    _oid_tree = Oid(0, "pcs_v1", member_list=[_cluster_v1_oid_tree])
+_STATUS_TO_NAME = {
+    PrimitiveStatus.RUNNING: "RunningResources",
+    PrimitiveStatus.DISABLED: "StoppedResources",
+    PrimitiveStatus.FAILED: "FailedResources",
+    PrimitiveStatus.BLOCKED: "FailedResources",
+}
 
-    def update(self):
-        # pylint: disable=too-many-locals
-        output, ret_val = run_pcsdcli("node_status")
-        if ret_val != 0 or output["status"] != "ok":
-            logger.error(
-                "Unable to obtain cluster status.\nPCSD return code: %s\n"
-                "PCSD output: %s\n",
-                ret_val,
-                output,
-            )
-            return
-        data = output["data"]
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName",
-            data.get("cluster_name", ""),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterQuorate",
-            _bool_to_int(data.get("node", {}).get("quorum")),
-        )
 
-        # nodes
-        known_nodes = data.get("known_nodes", [])
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNum", len(known_nodes)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNames", known_nodes
-        )
+class _LoggingReportProcessor(ReportProcessor):
+    _log_levels = {
+        ReportItemSeverity.ERROR: logging.ERROR,
+        ReportItemSeverity.WARNING: logging.WARNING,
+        ReportItemSeverity.INFO: logging.INFO,
+    }
 
-        corosync_nodes_online = data.get("corosync_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNum",
-            len(corosync_nodes_online),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNames",
-            corosync_nodes_online,
+    def _do_report(self, report_item: ReportItem) -> None:
+        report_dto = report_item.to_dto()
+        logger.log(
+            self._log_levels.get(report_dto.severity.level, logging.DEBUG),
+            report_item_msg_from_dto(report_dto.message).message,
         )
 
-        corosync_nodes_offline = data.get("corosync_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNum",
-            len(corosync_nodes_offline),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNames",
-            corosync_nodes_offline,
-        )
 
-        pcmk_nodes_online = data.get("pacemaker_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNum",
-            len(pcmk_nodes_online),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNames",
-            pcmk_nodes_online,
-        )
+class ClusterPcsV1Updater(AgentxUpdaterBase):
+    _oid_tree = Oid(0, "pcs_v1", member_list=[_cluster_v1_oid_tree])
 
-        pcmk_nodes_standby = data.get("pacemaker_standby")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNum",
-            len(pcmk_nodes_standby),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNames",
-            pcmk_nodes_standby,
-        )
+    def update(self):
+        report_processor = _LoggingReportProcessor()
+        try:
+            data = node_status_dto(LibraryEnvironment(logger, report_processor))
+        except LibraryError as e:
+            report_processor.report_list(e.args)
+            logger.error("Unable to obtain cluster status.")
+            return
+        value_map = {
+            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName": data.cluster_name,
+            "pcmkPcsV1Cluster.pcmkPcsV1ClusterQuorate": _bool_to_int(
+                data.quorate
+            ),
+        }
 
-        pcmk_nodes_offline = data.get("pacemaker_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNum",
-            len(pcmk_nodes_offline),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNames",
-            pcmk_nodes_offline,
-        )
+        # nodes
+        for name, node_list in (
+            ("Nodes", data.known_node_list),
+            ("CorosyncNodesOnline", data.corosync_online_node_list),
+            ("CorosyncNodesOffline", data.corosync_offline_node_list),
+            ("PcmkNodesOnline", data.pacemaker_online_node_list),
+            ("PcmkNodesStandby", data.pacemaker_standby_node_list),
+            ("PcmkNodesOffline", data.pacemaker_offline_node_list),
+        ):
+            _add_id_list(value_map, name, "Names", node_list)
 
         # resources
-        primitive_list = []
-        for resource in data.get("resource_list", []):
-            primitive_list.extend(_get_primitives(resource))
-
-        primitive_id_list = _get_resource_id_list(primitive_list)
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesNum",
-            len(primitive_id_list),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesIds",
-            primitive_id_list,
-        )
-        running_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["running"])
-        )
+        all_id_list = []
+        status_id_lists = {
+            "RunningResources": [],
+            "StoppedResources": [],
+            "FailedResources": [],
+        }
+        for primitive in data.primitive_list:
+            all_id_list.append(primitive.id)
+            status_id_lists[_STATUS_TO_NAME[primitive.status]].append(
+                primitive.id
+            )
+        _add_id_list(value_map, "AllResources", "Ids", all_id_list)
+        for name, id_list in status_id_lists.items():
+            _add_id_list(value_map, name, "Ids", id_list)
 
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesNum",
-            len(running_primitive_id_list),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesIds",
-            running_primitive_id_list,
-        )
+        self.set_values(value_map)
 
-        disabled_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["disabled"])
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesNum",
-            len(disabled_primitive_id_list),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesIds",
-            disabled_primitive_id_list,
-        )
 
-        failed_primitive_id_list = _get_resource_id_list(
-            primitive_list,
-            lambda res: not _res_in_status(["running", "disabled"])(res),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesNum",
-            len(failed_primitive_id_list),
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesIds",
-            failed_primitive_id_list,
-        )
+def _add_id_list(value_map, name, list_suffix, id_list):
+    value_map[f"pcmkPcsV1Cluster.pcmkPcsV1Cluster{name}Num"] = len(id_list)
+    value_map[f"pcmkPcsV1Cluster.pcmkPcsV1Cluster{name}{list_suffix}"] = id_list
 
 
 def _bool_to_int(value):
     return 1 if value else 0
-
-
-def _get_primitives(resource):
-    res_type = resource["class_type"]
-    if res_type == "primitive":
-        return [resource]
-    if res_type == "group":
-        primitive_list = []
-        for primitive in resource["members"]:
-            primitive_list.extend(_get_primitives(primitive))
-        return primitive_list
-    # check master-slave type
-    if res_type in ["clone", "master"]:
-        return _get_primitives(resource["member"])
-    return []
-
-
-def _get_resource_id_list(resource_list, predicate=None):
-    if predicate is None:
-        predicate = lambda _: True
-    return [resource["id"] for resource in resource_list if predicate(resource)]
-
-
-def _res_in_status(status_list):
-    return lambda res: res["status"] in status_list
@@ -991,6 +991,16 @@ Commands:
     agents [standard[:provider]]
         List available agents optionally filtered by standard and provider.
 
+    metadata-cache warm
+        Load names and metadata of all resource and stonith agents available on
+        the local host to a persistent cache. Pcs then does not need to run
+        agents to get their metadata until the agents or pacemaker are updated.
+        Metadata are only cached if the metadata cache is enabled in pcs
+        settings.
+
+    metadata-cache clear
+        Remove all agents' names and metadata from the persistent cache.
+
 {update_syntax}
 {update_desc}
 
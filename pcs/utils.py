@@ -17,6 +17,7 @@ import xml.etree.ElementTree as ET
 from functools import lru_cache
 from io import BytesIO
 from typing import (
+    TYPE_CHECKING,
     Any,
     Dict,
     Sequence,
@@ -64,7 +65,6 @@ from pcs.common.tools import (
     timeout_to_seconds,
 )
 from pcs.lib.corosync.config_facade import ConfigFacade as corosync_conf_facade
-from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
     CommandRunner,
@@ -80,6 +80,9 @@ from pcs.lib.pacemaker.values import validate_id
 from pcs.lib.services import get_service_manager as _get_service_manager
 from pcs.lib.services import service_exception_to_report
 
+if TYPE_CHECKING:
+    from pcs.lib.env import LibraryEnvironment
+
 # pylint: disable=invalid-name
 # pylint: disable=too-many-branches
 # pylint: disable=too-many-locals
@@ -575,9 +578,12 @@ def sendHTTPRequest(
     handler.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handler.setopt(pycurl.URL, url.encode("utf-8"))
     handler.setopt(pycurl.WRITEFUNCTION, output.write)
-    handler.setopt(pycurl.VERBOSE, 1)
     handler.setopt(pycurl.NOSIGNAL, 1)  # required for multi-threading
-    handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if "--debug" in pcs_options:
+        # debug output is only printed in debug mode, do not waste resources
+        # gathering it otherwise
+        handler.setopt(pycurl.VERBOSE, 1)
+        handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handler.setopt(pycurl.TIMEOUT_MS, int(timeout * 1000))
     handler.setopt(pycurl.SSL_VERIFYHOST, 0)
     handler.setopt(pycurl.SSL_VERIFYPEER, 0)
@@ -2787,13 +2793,17 @@ def get_cluster_property_from_xml(etree_el):
     return prop
 
 
-def get_lib_env() -> LibraryEnvironment:
+def get_lib_env() -> "LibraryEnvironment":
     """
     Commandline options:
       * -f - CIB file
       * --corosync_conf - corosync.conf file
       * --request-timeout - timeout of HTTP requests
     """
+    # pcs.lib.env imports a large part of pcs.lib, import it only when needed
+    # pylint: disable=import-outside-toplevel
+    from pcs.lib.env import LibraryEnvironment
+
     user = None
     groups = None
     if os.geteuid() == 0:
@@ -2827,6 +2837,7 @@ def get_lib_env() -> LibraryEnvironment:
         corosync_conf_data,
         known_hosts_getter=read_known_hosts_file,
         request_timeout=pcs_options.get("--request-timeout"),
+        debug=("--debug" in pcs_options),
     )
 
 
@@ -2858,6 +2869,7 @@ def get_cli_env():
     env.known_hosts_getter = read_known_hosts_file
     env.report_processor = get_report_processor()
     env.request_timeout = pcs_options.get("--request-timeout")
+    env.debug = "--debug" in pcs_options
     return env
 
 
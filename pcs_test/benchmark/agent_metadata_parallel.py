@@ -0,0 +1,70 @@
+"""
+Compare sequential and parallel loading of agents' metadata
+
+A fake crm_resource prints metadata of an agent after a delay, like an agent
+script which takes time to start. Metadata of all agents are loaded one by one
+and then with several agents running at the same time, the same way as when
+listing agents with their descriptions.
+
+Usage: python3 -m pcs_test.benchmark.agent_metadata_parallel [agents] [delay]
+"""
+import logging
+import os
+import os.path
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from pcs.common.reports import ReportProcessor
+from pcs.lib.external import CommandRunner
+from pcs.lib.resource_agent import ResourceAgentName
+from pcs.lib.resource_agent.xml import (
+    load_metadata,
+    load_metadata_list,
+)
+
+FAKE_CRM_RESOURCE = """#!/bin/sh
+sleep {delay}
+echo '<resource-agent name="'$3'"><shortdesc>agent</shortdesc></resource-agent>'
+"""
+
+
+class NullReportProcessor(ReportProcessor):
+    def _do_report(self, report_item):
+        pass
+
+
+def main(agent_count=40, delay=0.1):
+    runner = CommandRunner(
+        logging.getLogger("benchmark"), NullReportProcessor()
+    )
+    name_list = [
+        ResourceAgentName("ocf", "benchmark", f"agent{i}")
+        for i in range(agent_count)
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        crm_resource = os.path.join(tmp_dir, "crm_resource")
+        with open(crm_resource, "w") as script:
+            script.write(FAKE_CRM_RESOURCE.format(delay=delay))
+        os.chmod(crm_resource, 0o755)
+        with mock.patch("pcs.settings.crm_resource_binary", crm_resource):
+            print(f"{agent_count} agents, {delay} s each")
+            start = time.perf_counter()
+            for name in name_list:
+                load_metadata(runner, name)
+            print(f"{'sequential':20} {time.perf_counter() - start:.3f} s")
+            for max_parallel in (1, 4, 8, 16):
+                start = time.perf_counter()
+                load_metadata_list(runner, name_list, max_parallel, 60)
+                print(
+                    f"{f'parallel, {max_parallel}':20} "
+                    f"{time.perf_counter() - start:.3f} s"
+                )
+
+
+if __name__ == "__main__":
+    main(
+        *[int(arg) for arg in sys.argv[1:2]],
+        *[float(arg) for arg in sys.argv[2:3]],
+    )
@@ -0,0 +1,77 @@
+"""
+Compare guessing a full agent name with and without the agent name index
+
+A fake crm_resource lists a number of OCF providers, each with a number of
+agents. Without the index, every guess runs crm_resource for each standard and
+provider. With the index, agents are only listed once and then looked up in
+the stored index.
+
+Usage: python3 -m pcs_test.benchmark.agent_name_guess [providers] [repeat]
+"""
+import logging
+import os
+import os.path
+import sys
+import tempfile
+from unittest import mock
+
+from pcs.lib.external import CommandRunner
+from pcs.lib.resource_agent import ResourceAgentError
+from pcs.lib.resource_agent.cache import ResourceAgentNameCache
+from pcs.lib.resource_agent.list import find_one_resource_agent_by_type
+
+from pcs_test.benchmark.agent_metadata_parallel import NullReportProcessor
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+
+FAKE_CRM_RESOURCE = """#!/bin/sh
+case "$1" in
+    --list-standards) printf 'ocf\\nlsb\\nservice\\nsystemd\\nstonith\\n';;
+    --list-ocf-providers) seq -f 'provider%g' 1 {providers};;
+    --list-agents) seq -f 'agent%g' 1 50;;
+esac
+"""
+
+
+def _guess(runner, report_processor, name_cache=None):
+    try:
+        find_one_resource_agent_by_type(
+            runner, report_processor, "AGENT1", name_cache
+        )
+    except ResourceAgentError:
+        # the agent type exists in all providers
+        pass
+
+
+def main(providers=10, repeat=10):
+    runner = CommandRunner(
+        logging.getLogger("benchmark"), NullReportProcessor()
+    )
+    report_processor = NullReportProcessor()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        crm_resource = os.path.join(tmp_dir, "crm_resource")
+        with open(crm_resource, "w") as script:
+            script.write(FAKE_CRM_RESOURCE.format(providers=providers))
+        os.chmod(crm_resource, 0o755)
+        name_cache = ResourceAgentNameCache(os.path.join(tmp_dir, "names"))
+        with mock.patch("pcs.settings.crm_resource_binary", crm_resource):
+            print(f"{providers} OCF providers, 50 agents each")
+            print_result(
+                "without index",
+                measure(lambda: _guess(runner, report_processor), repeat),
+            )
+            # build the index
+            _guess(runner, report_processor, name_cache)
+            print_result(
+                "with index",
+                measure(
+                    lambda: _guess(runner, report_processor, name_cache),
+                    repeat,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,119 @@
+"""
+Compare logins per second with a new process per login and with a pool
+
+Previously, the daemon started a new process for every login and for every
+check of groups of a logged in user. Now it runs them in a pool of long-running
+processes and caches groups of logged in users for a short time. Several
+logins and checks run at the same time.
+
+Logins are done by PAM. Set the password of the user in the environment
+variable BENCHMARK_PASSWORD to measure successful logins. Otherwise a wrong
+password is used. Failed logins then include the delay PAM adds after
+a failed login, which is usually about two seconds.
+
+Usage: python3 -m pcs_test.benchmark.auth_pool [logins] [group checks]
+    [concurrency] [workers] [user]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pcs.daemon import auth
+
+
+async def _run_in_new_process(sync_fn, *args):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return await asyncio.wrap_future(pool.submit(sync_fn, *args))
+
+
+async def _throughput(run, count, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            await run()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[limited() for _ in range(count)])
+    return count / (time.perf_counter() - start)
+
+
+async def _main(login_count, check_count, concurrency, worker_count, username):
+    password = os.environ.get("BENCHMARK_PASSWORD", "wrong password")
+    pool = auth.AuthPool(worker_count, timeout=30)
+    pool.start()
+    await pool.check_health()
+    cache = auth.UserGroupsCache(ttl=10)
+
+    async def check_groups_cached():
+        if cache.get(username) is None:
+            cache.update(
+                await pool.run(
+                    auth.check_user_groups_sync, username, auth.PlainLogger()
+                )
+            )
+
+    runs = [
+        (
+            "login, process per login",
+            login_count,
+            lambda: _run_in_new_process(
+                auth.authorize_user_sync, username, password
+            ),
+        ),
+        (
+            "login, pool",
+            login_count,
+            lambda: pool.run(auth.authorize_user_sync, username, password),
+        ),
+        (
+            "groups check, process per check",
+            check_count,
+            lambda: _run_in_new_process(
+                auth.check_user_groups_sync, username, auth.PlainLogger()
+            ),
+        ),
+        (
+            "groups check, pool",
+            check_count,
+            lambda: pool.run(
+                auth.check_user_groups_sync, username, auth.PlainLogger()
+            ),
+        ),
+        ("groups check, pool and cache", check_count, check_groups_cached),
+    ]
+    for label, count, run in runs:
+        throughput = await _throughput(run, count, concurrency)
+        print(f"{label:<35} {throughput:9.1f} per second")
+    pool.stop()
+
+
+def main(
+    login_count=20,
+    check_count=500,
+    concurrency=4,
+    worker_count=4,
+    username="root",
+):
+    # failed logins are logged, do not print them
+    logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+    print(
+        f"{login_count} logins, {check_count} group checks, {concurrency} at "
+        f"the same time, {worker_count} workers, user '{username}'"
+    )
+    asyncio.run(
+        _main(
+            int(login_count),
+            int(check_count),
+            int(concurrency),
+            int(worker_count),
+            username,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:6])
@@ -0,0 +1,95 @@
+"""
+Compare diffing CIBs in pcs with running crm_diff
+
+A CIB with a number of resources is generated and one resource is added to it,
+like when pushing a CIB modified by a pcs command. The diff is computed by pcs
+from the parsed CIBs and, if crm_diff is installed, by crm_diff run on
+temporary files holding the original CIB as loaded and the modified one.
+
+Usage: python3 -m pcs_test.benchmark.cib_diff [resources] [repeat]
+"""
+import logging
+import os.path
+import sys
+from copy import deepcopy
+from unittest import mock
+
+from lxml import etree
+
+from pcs import settings
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.live import diff_cibs
+
+from pcs_test.benchmark.agent_metadata_parallel import NullReportProcessor
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import read_test_resource
+from pcs_test.tools.xml import etree_to_str
+
+
+def _generate_cib(resource_count):
+    cib = etree.fromstring(read_test_resource("cib-empty.xml"))
+    resources = cib.find("configuration/resources")
+    for index in range(resource_count):
+        primitive = etree.SubElement(
+            resources,
+            "primitive",
+            {
+                "id": f"R{index}",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+        operations = etree.SubElement(primitive, "operations")
+        for name, interval in (("monitor", "10s"), ("start", "0s")):
+            etree.SubElement(
+                operations,
+                "op",
+                id=f"R{index}-{name}-interval-{interval}",
+                interval=interval,
+                name=name,
+                timeout="20s",
+            )
+    return cib
+
+
+def main(resource_count=5000, repeat=10):
+    runner = CommandRunner(
+        logging.getLogger("benchmark"), NullReportProcessor()
+    )
+    report_processor = NullReportProcessor()
+    cib_old = _generate_cib(resource_count)
+    cib_new = deepcopy(cib_old)
+    etree.SubElement(
+        cib_new.find("configuration/resources"),
+        "primitive",
+        {"id": "new", "class": "ocf", "provider": "pacemaker", "type": "Dummy"},
+    )
+
+    # without native diffs, the original CIB is kept as loaded from the cluster
+    cib_old_xml = etree_to_str(cib_old)
+
+    def diff():
+        diff_cibs(runner, report_processor, cib_old, cib_new)
+
+    def diff_xml():
+        diff_cibs(runner, report_processor, cib_old_xml, cib_new)
+
+    print(
+        f"{resource_count} resources, "
+        f"CIB size {len(etree_to_str(cib_old))} B"
+    )
+    with mock.patch.object(settings, "cib_diff_native", True):
+        print_result("pcs", measure(diff, repeat))
+    if os.path.exists(os.path.join(settings.pacemaker_binaries, "crm_diff")):
+        with mock.patch.object(settings, "cib_diff_native", False):
+            print_result("crm_diff", measure(diff_xml, repeat))
+    else:
+        print("crm_diff is not installed")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,141 @@
+"""
+Compare looking up ids in a CIB by XPath and by the CIB id index
+
+CIBs with a number of ids are generated, each primitive having several
+operations. Then, the functions used by library commands are run with and
+without the id index of the CIB attached, the way LibraryEnvironment attaches
+it to a loaded CIB:
+* find_unique_id for an id with many existing numbered variants,
+* IdProvider.book_ids for a batch of new ids,
+* get_elements_by_ids for a batch of existing ids,
+* creating a primitive with operations in a copy of the CIB, allocating an id
+  for each operation and adding it to the CIB before allocating the next one.
+  The copy is indexed by the index built from scratch.
+
+Usage: python3 -m pcs_test.benchmark.cib_id_index [repeat] [id counts...]
+"""
+import sys
+from functools import partial
+
+from lxml import etree
+
+from pcs.lib.cib import id_index
+from pcs.lib.cib.tools import (
+    IdProvider,
+    find_unique_id,
+    get_elements_by_ids,
+)
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import read_test_resource
+
+OPERATIONS_PER_PRIMITIVE = 4
+SUFFIXED_COUNT = 50
+BATCH_SIZE = 50
+NEW_OPERATION_COUNT = 20
+
+
+def _generate_cib(id_count):
+    cib = etree.fromstring(read_test_resource("cib-empty.xml"))
+    resources = cib.find("configuration/resources")
+    for index in range(id_count // (OPERATIONS_PER_PRIMITIVE + 2)):
+        primitive = etree.SubElement(
+            resources,
+            "primitive",
+            {
+                "id": f"R{index}",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+        operations = etree.SubElement(
+            primitive, "operations", id=f"R{index}-operations"
+        )
+        for op_index in range(OPERATIONS_PER_PRIMITIVE):
+            etree.SubElement(
+                operations,
+                "op",
+                id=f"R{index}-monitor-{op_index}",
+                name="monitor",
+                interval=f"{op_index + 10}s",
+            )
+    for index in range(SUFFIXED_COUNT):
+        etree.SubElement(
+            resources,
+            "primitive",
+            id=(f"dummy-{index}" if index else "dummy"),
+        )
+    return cib
+
+
+def _create_primitive(cib, indexed):
+    # work on a copy, so that the CIB stays the same for the next run
+    cib = etree.fromstring(etree.tostring(cib))
+    if indexed:
+        id_index.attach_id_index(cib)
+    id_provider = IdProvider(cib)
+    primitive = etree.SubElement(
+        cib.find("configuration/resources"),
+        "primitive",
+        id=id_provider.allocate_id("R0"),
+    )
+    operations = etree.SubElement(
+        primitive, "operations", id=id_provider.allocate_id("R0-operations")
+    )
+    for _ in range(NEW_OPERATION_COUNT):
+        etree.SubElement(
+            operations,
+            "op",
+            id=id_provider.allocate_id("R0-monitor-0"),
+            name="monitor",
+        )
+    id_index.detach_id_index(cib)
+
+
+def _get_cases(cib, indexed):
+    existing_ids = [f"R{index}" for index in range(BATCH_SIZE)]
+    new_ids = [f"new-{index}" for index in range(BATCH_SIZE)]
+    return [
+        ("find_unique_id", lambda: find_unique_id(cib, "dummy")),
+        ("book_ids", lambda: IdProvider(cib).book_ids(*new_ids)),
+        ("get_elements_by_ids", lambda: get_elements_by_ids(cib, existing_ids)),
+        ("create primitive", lambda: _create_primitive(cib, indexed)),
+    ]
+
+
+def _measure_indexed(cib, func, repeat):
+    times = []
+    for _ in range(repeat):
+        # A new index for each run, so that reserved ids do not accumulate.
+        # The index is built before the measured run.
+        id_index.attach_id_index(cib).get_elements("R0")
+        times.extend(measure(func, 1))
+        id_index.detach_id_index(cib)
+    return times
+
+
+def _build_index(cib):
+    id_index.CibIdIndex(cib).get_elements("R0")
+
+
+def main(repeat=5, id_counts=(1000, 10000, 50000)):
+    for id_count in id_counts:
+        cib = _generate_cib(id_count)
+        print(f"{len(cib.xpath('//@id'))} ids")
+        print_result("build index", measure(partial(_build_index, cib), repeat))
+        for name, func in _get_cases(cib, indexed=False):
+            print_result(f"{name}, xpath", measure(func, repeat))
+        for name, func in _get_cases(cib, indexed=True):
+            print_result(f"{name}, index", _measure_indexed(cib, func, repeat))
+
+
+if __name__ == "__main__":
+    int_args = [int(arg) for arg in sys.argv[1:]]
+    if len(int_args) > 1:
+        main(int_args[0], int_args[1:])
+    else:
+        main(*int_args)
@@ -0,0 +1,96 @@
+"""
+Measure time spent importing modules when running pcs commands
+
+Each command is run in a new python interpreter with "-X importtime" and
+import times of all modules imported while running the command are summed.
+Commands work with a CIB file, so no cluster is needed. Commands which need
+running pacemaker fail, but only after importing all the modules they need.
+A command is reported if its median import time exceeds its budget and the
+benchmark then exits with 1.
+
+Usage: python3 -m pcs_test.benchmark.cli_import_time [repeat]
+    [budget multiplier]
+"""
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from pcs_test import PROJECT_ROOT
+from pcs_test.tools.misc import get_test_resource
+
+# command, import time budget in milliseconds
+COMMANDS = [
+    (["--version"], 400),
+    (["status"], 600),
+    (["resource", "config"], 600),
+    (["constraint", "config"], 600),
+]
+
+_IMPORT_TIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<name>.*)$"
+)
+
+
+def _run(argv, cib_file):
+    stderr = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; from pcs import app; app.main(sys.argv[1:])",
+            "-f",
+            cib_file,
+        ]
+        + argv,
+        cwd=PROJECT_ROOT,
+        env=dict(os.environ, PYTHONPATH=PROJECT_ROOT),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    ).stderr.decode(errors="replace")
+    total_us = 0
+    module_count = 0
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        module_count += 1
+        # top level imports include import times of their nested imports
+        if not match.group("name").startswith("  "):
+            total_us += int(match.group("cumulative"))
+    return total_us / 1000, module_count
+
+
+def main(repeat=5, budget_multiplier=1.0):
+    over_budget = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cib_file = os.path.join(tmp_dir, "cib.xml")
+        shutil.copy(get_test_resource("cib-empty.xml"), cib_file)
+        # compile modules first, so that the compilation is not measured
+        _run(["--version"], cib_file)
+        for argv, budget in COMMANDS:
+            budget *= budget_multiplier
+            times = []
+            for _ in range(repeat):
+                import_time, module_count = _run(argv, cib_file)
+                times.append(import_time)
+            median = statistics.median(times)
+            label = "pcs " + " ".join(argv)
+            print(
+                f"{label:<30} median {median:9.3f} ms  "
+                f"budget {budget:9.3f} ms  modules {module_count}"
+                + ("  OVER BUDGET" if median > budget else "")
+            )
+            if median > budget:
+                over_budget.append(label)
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*[convert(arg) for convert, arg in zip((int, float), sys.argv[1:3])])
@@ -0,0 +1,125 @@
+"""
+Compare sequential and parallel loading of the full cluster status
+
+Fake crm_mon, cibadmin, crm_ticket and systemctl print their output after
+a delay, like the real tools connecting to the cluster or to systemd. The full
+cluster status is loaded the way 'pcs status' loads it:
+* the way it was loaded before: one tool after another and two systemctl runs
+  for each service,
+* one tool after another, status of services from one systemctl run,
+* pacemaker tools at the same time, status of services from one systemctl
+  run is loaded meanwhile.
+
+Usage: python3 -m pcs_test.benchmark.cluster_status [delay] [repeat]
+"""
+import logging
+import os
+import os.path
+import sys
+import tempfile
+from unittest import mock
+
+from pcs.common.reports import ReportProcessor
+from pcs.common.services.drivers import SystemdDriver
+from pcs.common.services.types import ServiceStatus
+from pcs.lib.commands.status import full_cluster_status_plaintext
+from pcs.lib.env import LibraryEnvironment
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import get_test_resource as rc
+
+FAKE_TOOL = """#!/bin/sh
+sleep {delay}
+{output}
+"""
+
+FAKE_SYSTEMCTL_OUTPUT = """
+if [ "$1" = show ]; then
+    shift 2
+    for unit in "$@"; do
+        printf 'UnitFileState=enabled\\nActiveState=active\\n\\n'
+    done
+fi
+"""
+
+FAKE_TOOL_OUTPUT = {
+    "crm_mon": "echo 'crm_mon cluster status'",
+    "cibadmin": f"cat {rc('cib-empty.xml')}",
+    "crm_ticket": "echo 'ticket status'",
+}
+
+
+class NullReportProcessor(ReportProcessor):
+    def _do_report(self, report_item):
+        pass
+
+
+def _get_services_status_one_by_one(self, service_list):
+    # the way status of services was loaded before
+    return {
+        service: ServiceStatus(
+            self.is_enabled(service), self.is_running(service)
+        )
+        for service in service_list
+    }
+
+
+def _create_tool(path, delay, output):
+    with open(path, "w") as script:
+        script.write(FAKE_TOOL.format(delay=delay, output=output))
+    os.chmod(path, 0o755)
+
+
+def _load_status():
+    return full_cluster_status_plaintext(
+        LibraryEnvironment(
+            logging.getLogger("benchmark"),
+            NullReportProcessor(),
+            known_hosts_getter=dict,
+        ),
+        verbose=True,
+    )
+
+
+def main(delay=0.05, repeat=10):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for tool, output in FAKE_TOOL_OUTPUT.items():
+            _create_tool(os.path.join(tmp_dir, tool), delay, output)
+        systemctl = os.path.join(tmp_dir, "systemctl")
+        _create_tool(systemctl, delay, FAKE_SYSTEMCTL_OUTPUT)
+        with mock.patch.multiple(
+            "pcs.settings",
+            pacemaker_binaries=tmp_dir,
+            systemctl_binary=systemctl,
+            systemd_unit_path=[tmp_dir],
+            corosync_conf_file=rc("corosync.conf"),
+        ):
+            print(f"each tool run takes {delay} s")
+            with mock.patch(
+                "pcs.settings.cluster_status_load_max_parallel", 1
+            ), mock.patch.object(
+                SystemdDriver,
+                "get_services_status",
+                _get_services_status_one_by_one,
+            ):
+                print_result(
+                    "sequential, before", measure(_load_status, repeat)
+                )
+            with mock.patch("pcs.settings.cluster_status_load_max_parallel", 1):
+                print_result(
+                    "sequential, batched systemctl",
+                    measure(_load_status, repeat),
+                )
+            print_result(
+                "parallel, batched systemctl", measure(_load_status, repeat)
+            )
+
+
+if __name__ == "__main__":
+    main(
+        *[float(arg) for arg in sys.argv[1:2]],
+        *[int(arg) for arg in sys.argv[2:3]],
+    )
@@ -0,0 +1,99 @@
+"""
+Compare removing constraint references with minidom scans and with the index
+
+A CIB with a number of constraints referencing a number of resources is
+generated, a half of the constraints being plain and a half with resource
+sets. References to some of the resources are removed by the minidom based
+code used by "pcs resource delete" (one scan per resource) and by
+ResourceConstraintIndex (the index is built once).
+
+Usage: python3 -m pcs_test.benchmark.constraint_index [constraints] [removed]
+    [repeat]
+"""
+import io
+import sys
+from contextlib import redirect_stderr
+from xml.dom.minidom import parseString
+
+from lxml import etree
+
+from pcs import constraint
+from pcs.lib.cib.constraint.index import ResourceConstraintIndex
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import read_test_resource
+from pcs_test.tools.xml import etree_to_str
+
+RESOURCE_COUNT = 1000
+
+
+def _generate_cib(constraint_count):
+    cib = etree.fromstring(read_test_resource("cib-empty.xml"))
+    resources = cib.find("configuration/resources")
+    for index in range(RESOURCE_COUNT):
+        etree.SubElement(
+            resources,
+            "primitive",
+            {
+                "id": f"R{index}",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+    constraints = cib.find("configuration/constraints")
+    for index in range(constraint_count // 2):
+        etree.SubElement(
+            constraints,
+            "rsc_order",
+            id=f"order-{index}",
+            first=f"R{index % RESOURCE_COUNT}",
+            then=f"R{(index + 1) % RESOURCE_COUNT}",
+        )
+        colocation = etree.SubElement(
+            constraints, "rsc_colocation", id=f"colocation-{index}", score="10"
+        )
+        resource_set = etree.SubElement(
+            colocation, "resource_set", id=f"colocation-{index}-set"
+        )
+        for offset in range(3):
+            etree.SubElement(
+                resource_set,
+                "resource_ref",
+                id=f"R{(index + offset * 7) % RESOURCE_COUNT}",
+            )
+    return etree_to_str(cib)
+
+
+def main(constraint_count=5000, removed_count=100, repeat=5):
+    cib_xml = _generate_cib(constraint_count)
+    resource_ids = [f"R{index}" for index in range(removed_count)]
+
+    def minidom_scans():
+        dom = parseString(cib_xml)
+        # removing emptied resource sets is always reported to stderr
+        with redirect_stderr(io.StringIO()):
+            for resource_id in resource_ids:
+                constraint.remove_constraints_containing(
+                    resource_id, passed_dom=dom
+                )
+
+    def index():
+        cib = etree.fromstring(cib_xml)
+        ResourceConstraintIndex(
+            cib.find("configuration/constraints")
+        ).remove_references(resource_ids)
+
+    print(
+        f"{constraint_count} constraints, references to {removed_count} "
+        "resources removed"
+    )
+    print_result("minidom", measure(minidom_scans, repeat))
+    print_result("index", measure(index, repeat))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,80 @@
+"""
+Compare throughput of Communicator with and without libcurl debug capture
+
+Requests with a large body are sent to a local stand-in HTTPS server, similarly
+to pushing a CIB or corosync.conf to nodes.
+
+Usage: python3 -m pcs_test.benchmark.node_communicator_debug [size_kb] [count]
+"""
+import sys
+import tracemalloc
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Communicator,
+    DebugCapture,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+
+from pcs_test.benchmark.node_communicator_pool import NullCommunicatorLogger
+from pcs_test.benchmark.tools import (
+    StandInHttpsServer,
+    measure,
+    print_result,
+)
+
+
+def _run(server, debug_capture, payload, request_count):
+    communicator = Communicator(
+        NullCommunicatorLogger(), None, None, debug_capture=debug_capture
+    )
+    communicator.add_requests(
+        [
+            Request(
+                RequestTarget(
+                    f"node{i}",
+                    dest_list=[Destination(server.addr, server.port)],
+                ),
+                RequestData("remote/set_configs", data=payload),
+            )
+            for i in range(request_count)
+        ]
+    )
+    response_list = list(communicator.start_loop())
+    for response in response_list:
+        if not response.was_connected:
+            raise AssertionError(response.error_msg)
+        # the logger reads the debug output of every response
+        response.debug  # pylint: disable=pointless-statement
+
+
+def main(size_kb=2048, request_count=8, repeat=5):
+    payload = "x" * (size_kb * 1024)
+    with StandInHttpsServer(response_body=payload.encode("utf-8")) as server:
+        for label, debug_capture in (
+            ("capture off", None),
+            ("capture on", DebugCapture()),
+            ("capture on, 64 KiB ring buffer", DebugCapture(64 * 1024)),
+        ):
+            tracemalloc.start()
+            times = measure(
+                lambda debug_capture=debug_capture: _run(
+                    server, debug_capture, payload, request_count
+                ),
+                repeat,
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            total_mb = 2 * size_kb * request_count / 1024
+            print_result(
+                label,
+                times,
+                throughput=f"{total_mb / min(times):.1f}MB/s",
+                peak_memory=f"{peak / 1024 / 1024:.1f}MB",
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
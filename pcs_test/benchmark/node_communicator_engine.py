@@ -0,0 +1,103 @@
+"""
+Compare latency of the select and socket_action communicator engines
+
+Many small requests are sent to local stand-in HTTPS servers. Latency of each
+response is measured from the start of the loop. The multiaddress variant has
+an unreachable first address for every node, so each request is retried.
+
+Usage: python3 -m pcs_test.benchmark.node_communicator_engine [requests]
+"""
+import socket
+import sys
+import time
+from contextlib import ExitStack
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Communicator,
+    MultiaddressCommunicator,
+    MultiSelectEngine,
+    MultiSocketActionEngine,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+
+from pcs_test.benchmark.node_communicator_pool import NullCommunicatorLogger
+from pcs_test.benchmark.tools import (
+    StandInHttpsServer,
+    print_result,
+)
+
+NODE_COUNT = 4
+
+
+def _get_closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run(communicator_class, engine_class, dest_lists, request_count):
+    communicator = communicator_class(
+        NullCommunicatorLogger(),
+        None,
+        None,
+        max_running=0,
+        max_running_per_host=0,
+        engine_class=engine_class,
+    )
+    communicator.add_requests(
+        [
+            Request(
+                RequestTarget(
+                    f"node{i % len(dest_lists)}",
+                    dest_list=dest_lists[i % len(dest_lists)],
+                ),
+                RequestData("remote/status"),
+            )
+            for i in range(request_count)
+        ]
+    )
+    latency_list = []
+    start = time.perf_counter()
+    for response in communicator.start_loop():
+        if not response.was_connected:
+            raise AssertionError(response.error_msg)
+        latency_list.append(time.perf_counter() - start)
+    return latency_list
+
+
+def main(request_count=200, repeat=5):
+    with ExitStack() as stack:
+        server_list = [
+            stack.enter_context(StandInHttpsServer()) for _ in range(NODE_COUNT)
+        ]
+        dest_lists = [
+            [Destination(server.addr, server.port)] for server in server_list
+        ]
+        closed_port = _get_closed_port()
+        retry_dest_lists = [
+            [Destination("127.0.0.1", closed_port)] + dest_list
+            for dest_list in dest_lists
+        ]
+        for communicator_class, dests in (
+            (Communicator, dest_lists),
+            (MultiaddressCommunicator, retry_dest_lists),
+        ):
+            for engine_class in (MultiSelectEngine, MultiSocketActionEngine):
+                latency_list = []
+                total_list = []
+                for _ in range(repeat):
+                    run_latency = _run(
+                        communicator_class, engine_class, dests, request_count
+                    )
+                    latency_list.extend(run_latency)
+                    total_list.append(run_latency[-1])
+                label = f"{communicator_class.__name__}/{engine_class.__name__}"
+                print_result(f"{label} per response", latency_list)
+                print_result(f"{label} total", total_list)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
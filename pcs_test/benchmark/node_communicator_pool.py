@@ -0,0 +1,101 @@
+"""
+Compare TLS handshakes and latency of Communicator and PooledCommunicator
+
+Every round sends one request to each of several local stand-in HTTPS servers,
+similarly to what cluster setup or config sync does with cluster nodes.
+
+Usage: python3 -m pcs_test.benchmark.node_communicator_pool [nodes] [rounds]
+"""
+import sys
+from contextlib import ExitStack
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Communicator,
+    CommunicatorLoggerInterface,
+    CurlHandlePool,
+    PooledCommunicator,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+
+from pcs_test.benchmark.tools import (
+    StandInHttpsServer,
+    measure,
+    print_result,
+)
+
+
+class NullCommunicatorLogger(CommunicatorLoggerInterface):
+    def log_request_queued(self, request, queue_time):
+        pass
+
+    def log_request_start(self, request):
+        pass
+
+    def log_response(self, response):
+        pass
+
+    def log_retry(self, response, previous_dest):
+        pass
+
+    def log_no_more_addresses(self, response):
+        pass
+
+
+def _run_round(communicator_factory, server_list):
+    communicator = communicator_factory()
+    communicator.add_requests(
+        [
+            Request(
+                RequestTarget(
+                    f"node{i}",
+                    token="token",
+                    dest_list=[Destination(server.addr, server.port)],
+                ),
+                RequestData("remote/check_auth", [("check_auth_only", 1)]),
+            )
+            for i, server in enumerate(server_list)
+        ]
+    )
+    for response in communicator.start_loop():
+        if not response.was_connected:
+            raise AssertionError(response.error_msg)
+
+
+def main(node_count=8, round_count=20):
+    logger = NullCommunicatorLogger()
+    with ExitStack() as stack:
+        server_list = [
+            stack.enter_context(StandInHttpsServer()) for _ in range(node_count)
+        ]
+        pool = CurlHandlePool()
+        for label, factory in (
+            ("Communicator", lambda: Communicator(logger, None, None)),
+            (
+                "PooledCommunicator",
+                lambda: PooledCommunicator(
+                    logger, None, None, handle_pool=pool
+                ),
+            ),
+        ):
+            for server in server_list:
+                server.reset_counters()
+            times = measure(
+                lambda factory=factory: _run_round(factory, server_list),
+                round_count,
+            )
+            print_result(
+                f"{label} ({node_count} nodes/round)",
+                times,
+                handshakes=sum(
+                    server.handshake_count for server in server_list
+                ),
+                requests=sum(server.request_count for server in server_list),
+            )
+        pool.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
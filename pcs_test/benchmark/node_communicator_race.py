@@ -0,0 +1,117 @@
+"""
+Compare sequential and racing address selection of MultiaddressCommunicator
+
+The first address of every node accepts connections but never responds, like
+a node whose first ring is unusable. The sequential mode waits for the request
+timeout before trying the second address. The racing mode starts connecting to
+the second address after a stagger delay. The second round of requests shows
+the effect of remembering the winning addresses.
+
+Usage: python3 -m pcs_test.benchmark.node_communicator_race [timeout]
+"""
+import socket
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    MultiaddressCommunicator,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+
+from pcs_test.benchmark.node_communicator_pool import NullCommunicatorLogger
+from pcs_test.benchmark.tools import StandInHttpsServer
+
+NODE_COUNT = 4
+RACE_STAGGER = 0.3
+
+
+class SilentListener:
+    """
+    TCP server accepting connections and never sending anything back
+    """
+
+    def __init__(self):
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(128)
+        self._connections = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._sock.close()
+        for conn in self._connections:
+            conn.close()
+
+    @property
+    def port(self):
+        return self._sock.getsockname()[1]
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self._connections.append(conn)
+
+
+def _run_round(communicator, dest_lists):
+    communicator.add_requests(
+        [
+            Request(
+                RequestTarget(f"node{i}", dest_list=dest_list),
+                RequestData("remote/status"),
+            )
+            for i, dest_list in enumerate(dest_lists)
+        ]
+    )
+    start = time.perf_counter()
+    for response in communicator.start_loop():
+        if not response.was_connected:
+            raise AssertionError(response.error_msg)
+    return time.perf_counter() - start
+
+
+def main(timeout=3):
+    with ExitStack() as stack:
+        silent = stack.enter_context(SilentListener())
+        server_list = [
+            stack.enter_context(StandInHttpsServer()) for _ in range(NODE_COUNT)
+        ]
+        dest_lists = [
+            [
+                Destination("127.0.0.1", silent.port),
+                Destination(server.addr, server.port),
+            ]
+            for server in server_list
+        ]
+        for label, race_stagger in (
+            ("sequential", None),
+            (f"racing (stagger {RACE_STAGGER} s)", RACE_STAGGER),
+        ):
+            communicator = MultiaddressCommunicator(
+                NullCommunicatorLogger(),
+                None,
+                None,
+                request_timeout=timeout,
+                race_stagger=race_stagger,
+            )
+            first = _run_round(communicator, dest_lists)
+            second = _run_round(communicator, dest_lists)
+            print(
+                f"{label:30} first round {first:.3f} s, "
+                f"second round {second:.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
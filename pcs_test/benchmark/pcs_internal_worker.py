@@ -0,0 +1,131 @@
+"""
+Compare throughput of running pcs_internal processes and pcs_internal workers
+
+The same requests are run by starting a new pcs_internal process for each of
+them, which is what pcsd does without workers, and by sending them to
+a pool of pcs_internal worker processes over a unix socket. Several clients
+send requests at the same time. The command run is listing resource agent
+standards. It fails without pacemaker installed, which does not matter as
+the request is processed the same way.
+
+Usage: python3 -m pcs_test.benchmark.pcs_internal_worker [requests]
+    [clients] [workers]
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tornado.ioloop import IOLoop
+
+from pcs.daemon import internal_worker
+
+from pcs_test import PROJECT_ROOT
+
+REQUEST = json.dumps(
+    {
+        "cmd": "resource_agent.list_standards",
+        "cmd_data": {},
+        "options": {"request_timeout": None},
+    }
+)
+HEADER = json.dumps({"user": "hacluster", "groups": ["haclient"]})
+
+
+def _run_process():
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from pcs import pcs_internal; pcs_internal.main()",
+        ],
+        input=REQUEST.encode(),
+        cwd=PROJECT_ROOT,
+        env=dict(
+            os.environ,
+            PYTHONPATH=PROJECT_ROOT,
+            CIB_user="hacluster",
+            CIB_user_groups="haclient",
+        ),
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+
+
+def _run_worker(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(f"{HEADER}\n{REQUEST}\n".encode())
+        response = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            response += data
+    json.loads(response)
+
+
+def _throughput(run, request_count, client_count):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=client_count) as executor:
+        for future in [executor.submit(run) for _ in range(request_count)]:
+            future.result()
+    return request_count / (time.perf_counter() - start)
+
+
+def _start_server(socket_path, worker_count):
+    started = threading.Event()
+    loop_holder = {}
+
+    def serve():
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        loop_holder["loop"] = IOLoop.current()
+        loop_holder["server"] = internal_worker.start(
+            socket_path, internal_worker.WorkerPool(worker_count)
+        )
+        loop_holder["loop"].add_callback(started.set)
+        loop_holder["loop"].start()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    return loop_holder
+
+
+def main(request_count=100, client_count=4, worker_count=4):
+    print(
+        f"{request_count} requests, {client_count} clients, "
+        f"{worker_count} workers"
+    )
+    print(
+        "process per request: {0:9.1f} requests/s".format(
+            _throughput(_run_process, request_count, client_count)
+        )
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, "pcsd-internal.socket")
+        server = _start_server(socket_path, worker_count)
+
+        def run():
+            _run_worker(socket_path)
+
+        # wait for the workers to start, pcsd starts them on its start
+        for _ in range(worker_count):
+            run()
+        print(
+            "worker pool:         {0:9.1f} requests/s".format(
+                _throughput(run, request_count, client_count)
+            )
+        )
+        server["loop"].add_callback(server["server"].stop)
+        server["loop"].add_callback(server["loop"].stop)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,267 @@
+"""
+Compare throughput of remote commands served by the daemon and by ruby pcsd
+
+Frequently polled remote commands are sent to the daemon configured with and
+without serving them itself. Without it, the daemon passes them to ruby pcsd.
+Ruby pcsd is replaced by a stand-in answering requests immediately, except
+for library commands which it sends to pcs_internal workers of the daemon, the
+same way ruby pcsd does it. The numbers therefore show the cost of passing
+requests to ruby pcsd, not including time ruby pcsd itself would spend
+processing them. The workers use a fake command runner, which returns a large
+CIB and a fixed crm_mon output instead of running pacemaker tools. Several
+clients send requests at the same time.
+
+Usage: python3 -m pcs_test.benchmark.pcsd_remote [requests] [clients]
+    [workers]
+"""
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.iostream import IOStream
+from tornado.locks import Lock
+from tornado.netutil import (
+    bind_sockets,
+    bind_unix_socket,
+)
+from tornado.web import (
+    Application,
+    RequestHandler,
+)
+
+from pcs import settings
+from pcs.daemon import (
+    internal_worker,
+    ruby_pcsd,
+)
+from pcs.daemon.app import (
+    remote,
+    sinatra_remote,
+)
+
+from pcs_test import PROJECT_ROOT
+from pcs_test.benchmark.tools import print_result
+from pcs_test.tools.misc import get_test_resource
+
+TOKEN = "benchmark-token"
+SUPERUSER = "hacluster"
+CRM_MON_TEXT = """\
+Cluster Summary:
+  * Stack: corosync
+  * Current DC: node1 (version 2.1.2) - partition with quorum
+  * 3 nodes configured
+  * 120 resource instances configured
+
+Node List:
+  * Online: [ node1 node2 node3 ]
+
+Full List of Resources:
+""" + "".join(
+    f"  * R{i}\t(ocf::pacemaker:Dummy):\t Started node{i % 3 + 1}\n"
+    for i in range(120)
+)
+REQUESTS = [
+    ("check_auth", "/remote/check_auth?check_auth_only=1"),
+    ("capabilities", "/remote/capabilities"),
+    (
+        "cluster_status_plaintext",
+        "/remote/cluster_status_plaintext?data_json="
+        + urllib.request.quote(json.dumps({"hide_inactive_resources": False})),
+    ),
+]
+
+
+class FakeRunner:
+    """
+    Command runner answering pacemaker tools with prepared outputs
+    """
+
+    def __init__(self, *args, **kwargs):
+        del args, kwargs
+        with open(get_test_resource("cib-large.xml")) as cib_file:
+            self._cib = cib_file.read()
+
+    def run(
+        self, args, stdin_string=None, env_extend=None, binary_output=False
+    ):
+        del stdin_string, env_extend, binary_output
+        name = os.path.basename(args[0])
+        if name == "cibadmin":
+            return self._cib, "", 0
+        if name == "crm_mon":
+            return CRM_MON_TEXT, "", 0
+        return "", "", 0
+
+
+def _init_benchmark_worker():
+    internal_worker._init_worker()  # pylint: disable=protected-access
+    # pylint: disable=import-outside-toplevel
+    from pcs.lib import env
+
+    env.CommandRunner = FakeRunner
+
+
+class RubyStandIn(RequestHandler):
+    """
+    Answer requests in the format of ruby pcsd, run library commands by
+    pcs_internal workers
+    """
+
+    # pylint: disable=arguments-differ, attribute-defined-outside-init
+    def initialize(self, internal_socket):
+        self._internal_socket = internal_socket
+
+    async def _run_internal(self):
+        stream = IOStream(socket.socket(socket.AF_UNIX, socket.SOCK_STREAM))
+        await stream.connect(self._internal_socket)
+        request = {
+            "cmd": "status.full_cluster_status_plaintext",
+            "cmd_data": json.loads(self.get_argument("data_json")),
+            "options": {"request_timeout": None},
+        }
+        await stream.write(
+            f'{{"user": "{SUPERUSER}", "groups": []}}\n'
+            f"{json.dumps(request)}\n".encode()
+        )
+        response = await stream.read_until_close()
+        stream.close()
+        return response
+
+    async def get(self, *args, **kwargs):
+        del args, kwargs
+        body = b'{"success":true}'
+        if self.request.path.endswith("/remote/cluster_status_plaintext"):
+            body = await self._run_internal()
+        self.write(
+            json.dumps(
+                {
+                    "status": 200,
+                    "headers": {},
+                    "body": b64encode(body).decode(),
+                    "logs": [],
+                }
+            )
+        )
+
+    def data_received(self, chunk):
+        pass
+
+
+def _start_daemon(tmp_dir, worker_count):
+    started = threading.Event()
+    ports = {}
+
+    def serve():
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        ruby_socket = os.path.join(tmp_dir, "pcsd-ruby.socket")
+        internal_socket = os.path.join(tmp_dir, "pcsd-internal.socket")
+        pool = internal_worker.WorkerPool(worker_count)
+        internal_worker.start(internal_socket, pool)
+        ruby_server = HTTPServer(
+            Application(
+                [(r".*", RubyStandIn, dict(internal_socket=internal_socket))]
+            )
+        )
+        ruby_server.add_socket(bind_unix_socket(ruby_socket))
+        wrapper = ruby_pcsd.Wrapper(ruby_socket)
+        auth_provider = remote.RemoteAuthProvider(
+            os.path.join(tmp_dir, "pcs_users.conf"),
+            os.path.join(tmp_dir, "pcs_settings.conf"),
+        )
+        for label, routes in (
+            (
+                "ruby",
+                [
+                    (
+                        r"/remote/.*",
+                        sinatra_remote.SinatraRemote,
+                        dict(ruby_pcsd_wrapper=wrapper),
+                    )
+                ],
+            ),
+            (
+                "native",
+                sinatra_remote.get_routes(
+                    wrapper, Lock(), None, pool, auth_provider
+                ),
+            ),
+        ):
+            sockets = bind_sockets(0, "127.0.0.1")
+            HTTPServer(Application(routes)).add_sockets(sockets)
+            ports[label] = sockets[0].getsockname()[1]
+        IOLoop.current().add_callback(started.set)
+        IOLoop.current().start()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    return ports
+
+
+def _fetch(port, path):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}",
+        headers={"Cookie": f"token={TOKEN}"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def _run(port, path, request_count, client_count):
+    times = []
+
+    def run():
+        start = time.perf_counter()
+        _fetch(port, path)
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=client_count) as executor:
+        for future in [executor.submit(run) for _ in range(request_count)]:
+            future.result()
+    return request_count / (time.perf_counter() - start), times
+
+
+def main(request_count=500, client_count=8, worker_count=4):
+    print(
+        f"{request_count} requests, {client_count} clients, "
+        f"{worker_count} workers"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+        settings, "pacemaker_uname", SUPERUSER
+    ), mock.patch.object(
+        settings, "pcsd_exec_location", os.path.join(PROJECT_ROOT, "pcsd")
+    ), mock.patch.object(
+        internal_worker, "_init_worker", _init_benchmark_worker
+    ):
+        with open(os.path.join(tmp_dir, "pcs_users.conf"), "w") as file:
+            json.dump([{"username": SUPERUSER, "token": TOKEN}], file)
+        ports = _start_daemon(tmp_dir, worker_count)
+        for label, path in REQUESTS:
+            # warm up, start workers
+            for _ in range(worker_count):
+                _fetch(ports["native"], path)
+            for daemon in ("ruby", "native"):
+                throughput, times = _run(
+                    ports[daemon], path, request_count, client_count
+                )
+                print_result(
+                    f"{label} {daemon}",
+                    times,
+                    throughput=f"{throughput:.1f} req/s",
+                )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
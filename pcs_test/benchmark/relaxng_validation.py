@@ -0,0 +1,92 @@
+"""
+Compare validation of agent metadata with and without cached RelaxNG validators
+
+All agent metadata files in a directory are parsed and validated, like when
+listing agents with their descriptions. Without the cache, the OCF schema is
+compiled for every agent. The same comparison is done for a pacemaker API
+result validated against its schema.
+
+Usage: python3 -m pcs_test.benchmark.relaxng_validation [directory] [repeat]
+"""
+import glob
+import os.path
+import sys
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common.tools import xml_fromstring
+from pcs.lib.resource_agent import const
+from pcs.lib.resource_agent.xml import (
+    _get_ocf_version,
+    _metadata_xml_to_dom,
+)
+from pcs.lib.xml_tools import get_relaxng_validator
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import get_test_resource as rc
+
+API_RESULT = """
+    <pacemaker-result api-version="2.3" request="crm_resource">
+        <status code="0" message="OK"/>
+    </pacemaker-result>
+"""
+
+
+def _metadata_xml_to_dom_uncached(metadata):
+    # validation as done before validators were cached
+    dom = xml_fromstring(metadata)
+    ocf_version = _get_ocf_version(dom)
+    if ocf_version == const.OCF_1_0:
+        etree.RelaxNG(file=settings.path.ocf_1_0_schema).assertValid(dom)
+    elif ocf_version == const.OCF_1_1:
+        etree.RelaxNG(file=settings.path.ocf_1_1_schema).assertValid(dom)
+    return dom
+
+
+def _validate_all(metadata_list, to_dom):
+    for metadata in metadata_list:
+        to_dom(metadata)
+
+
+def main(directory=None, repeat=20):
+    path_list = sorted(
+        glob.glob(os.path.join(directory or rc(""), "*agent*.xml"))
+    )
+    metadata_list = []
+    for path in path_list:
+        with open(path) as metadata_file:
+            metadata_list.append(metadata_file.read())
+    print(f"{len(metadata_list)} agent metadata files")
+    for label, to_dom in (
+        ("metadata, uncached", _metadata_xml_to_dom_uncached),
+        ("metadata, cached", _metadata_xml_to_dom),
+    ):
+        times = measure(
+            lambda to_dom=to_dom: _validate_all(metadata_list, to_dom), repeat
+        )
+        print_result(
+            f"{label}, per agent", [t / len(metadata_list) for t in times]
+        )
+
+    api_rng = rc(os.path.join("pcmk_api_rng", "api-result.rng"))
+    api_dom = xml_fromstring(API_RESULT)
+    print_result(
+        "api result, uncached",
+        measure(
+            lambda: etree.RelaxNG(file=api_rng).assertValid(api_dom), repeat
+        ),
+    )
+    print_result(
+        "api result, cached",
+        measure(
+            lambda: get_relaxng_validator(api_rng).assertValid(api_dom), repeat
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,108 @@
+"""
+Compare ways of parsing rule strings
+
+A corpus of rule strings similar to rules used in real clusters is generated:
+most of the rules are simple date, node attribute and resource expressions,
+the rest are compound rules with and / or, date ranges and date-specs. Each
+rule string is present in the corpus several times, the same way the same
+rules are repeated in many rule sets and parsed again by validators.
+
+The corpus is parsed by:
+* building the grammar for every rule, which was done before the grammar was
+  built only once
+* the grammar built once, without the fast path for simple rules
+* parse_rule with an empty parse cache
+* parse_rule with all the rules in the parse cache
+
+Usage: python3 -m pcs_test.benchmark.rule_parser [rules] [repeat]
+"""
+import itertools
+import sys
+
+from pcs.lib.cib.rule import parser
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+
+# how many times each rule string is present in the corpus
+DUPLICATES = 4
+
+_RULE_TEMPLATES = [
+    "date gt 2022-{month:02}-{day:02}",
+    "date lt 2022-{month:02}-{day:02}T{hour:02}:00:00",
+    "defined pingd-{index}",
+    "not_defined attr-{index}",
+    "resource ocf:pacemaker:Dummy{index}",
+    "resource systemd::service-{index}",
+    "#uname eq node{index}",
+    "pingd-{index} gt integer {index}",
+    "date in_range 2022-{month:02}-{day:02} to duration months={month}",
+    "date-spec hours=9-16 weekdays=1-5 monthdays={day}",
+    "#uname eq node{index} and date gt 2022-{month:02}-{day:02}",
+    (
+        "resource ocf:pacemaker:Dummy{index} and (op monitor interval=10s "
+        "or op start)"
+    ),
+    (
+        "(#uname eq node{index} or #uname eq node{hour}) and "
+        "date in_range 2022-01-01 to 2022-{month:02}-{day:02}"
+    ),
+]
+
+
+def _generate_corpus(rule_count):
+    unique_count = max(rule_count // DUPLICATES, 1)
+    template_cycle = itertools.cycle(_RULE_TEMPLATES)
+    unique_rules = [
+        next(template_cycle).format(
+            index=index,
+            month=index % 12 + 1,
+            day=index % 28 + 1,
+            hour=index % 24,
+        )
+        for index in range(unique_count)
+    ]
+    return unique_rules * DUPLICATES
+
+
+def main(rule_count=3000, repeat=5):
+    corpus = _generate_corpus(rule_count)
+    get_rule_parser = getattr(parser, "__get_rule_parser")
+    # make sure pyparsing settings are the same for all the measurements
+    get_rule_parser()
+
+    def grammar_per_rule():
+        for rule_string in corpus:
+            get_rule_parser.__wrapped__().parseString(
+                rule_string, parseAll=True
+            )
+
+    def grammar_once():
+        rule_parser = get_rule_parser()
+        for rule_string in corpus:
+            rule_parser.parseString(rule_string, parseAll=True)
+
+    def cache_cold():
+        getattr(parser, "__parse_rule_cached").cache_clear()
+        for rule_string in corpus:
+            parser.parse_rule(rule_string)
+
+    def cache_warm():
+        for rule_string in corpus:
+            parser.parse_rule(rule_string)
+
+    print(
+        f"{len(corpus)} rules, {len(set(corpus))} unique, "
+        f"parse cache size {getattr(parser, '_PARSE_CACHE_SIZE')}"
+    )
+    print_result("grammar built for each rule", measure(grammar_per_rule, 1))
+    print_result("grammar built once", measure(grammar_once, repeat))
+    print_result("parse_rule, empty cache", measure(cache_cold, repeat))
+    cache_warm()
+    print_result("parse_rule, rules in cache", measure(cache_warm, repeat))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
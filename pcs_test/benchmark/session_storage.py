@@ -0,0 +1,115 @@
+"""
+Compare dropping expired sessions by scanning all sessions and by the heap
+
+The daemon drops expired sessions before every request. Previously, it went
+through all the sessions to find the expired ones. Now, sessions are indexed
+by their expiration in a heap. Both ways are measured with a number of
+sessions none of which expired (a usual request) and with a tenth of them
+expired. Then, sessions are stored in and loaded from a sqlite database to show
+the cost of keeping sessions over daemon restarts.
+
+Usage: python3 -m pcs_test.benchmark.session_storage [sessions] [repeat]
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from pcs.daemon import session
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+
+LIFETIME = 3600
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drop_expired_by_scan(sessions):
+    # the way sessions were dropped before the heap was introduced
+    obsolete_sid_list = [
+        sid
+        for sid, _session in sessions.items()
+        if _session.was_unused_last(LIFETIME)
+    ]
+    for sid in obsolete_sid_list:
+        del sessions[sid]
+
+
+def _fill(storage, clock, session_count):
+    sid_list = []
+    for index in range(session_count):
+        clock.now = float(index) / session_count * LIFETIME
+        sid_list.append(storage.login(None, f"user{index}", ["haclient"]).sid)
+    return sid_list
+
+
+def _measure_drop(clock, session_count, repeat):
+    storage = session.Storage(LIFETIME)
+    _fill(storage, clock, session_count)
+    sessions = dict(
+        # pylint: disable=protected-access
+        storage._Storage__sessions
+    )
+    fill_end = clock.now
+    print_result(
+        "scan, none expired",
+        measure(lambda: _drop_expired_by_scan(sessions), repeat),
+    )
+    print_result("heap, none expired", measure(storage.drop_expired, repeat))
+
+    clock.now = fill_end + LIFETIME / 10
+    print_result(
+        "scan, 1/10 expired",
+        measure(lambda: _drop_expired_by_scan(sessions), 1),
+    )
+    print_result("heap, 1/10 expired", measure(storage.drop_expired, 1))
+
+
+def _measure_sqlite(clock, session_count):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "sessions.sqlite")
+        clock.now = 0.0
+        storage = session.Storage(
+            LIFETIME, backend=session.SqliteBackend(db_path)
+        )
+        start = time.perf_counter()
+        sid_list = _fill(storage, clock, session_count)
+        print_result(
+            f"sqlite, {session_count} logins",
+            [time.perf_counter() - start],
+        )
+        print_result("sqlite, close", measure(storage.close, 1))
+        storage = None
+
+        def load():
+            # pylint: disable=unused-variable
+            loaded = session.Storage(
+                LIFETIME, backend=session.SqliteBackend(db_path)
+            )
+            if loaded.provide(sid_list[-1]).sid != sid_list[-1]:
+                raise AssertionError("Session was not loaded")
+            loaded.close()
+
+        print_result("sqlite, load on start", measure(load, 1))
+
+
+def main(session_count=100000, repeat=20):
+    print(f"{session_count} sessions")
+    clock = _Clock()
+    with mock.patch.object(session, "now", clock):
+        _measure_drop(clock, session_count, repeat)
+        _measure_sqlite(clock, session_count)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
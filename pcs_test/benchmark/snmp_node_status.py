@@ -0,0 +1,180 @@
+"""
+Measure the cost of loading the cluster status for one SNMP agent update
+
+Fake crm_mon, cibadmin and corosync-quorumtool print their output after
+a delay, like the real tools connecting to the cluster. A CIB with a number of
+primitives and a matching cluster status are generated. The status is loaded
+the way the SNMP agent loads it on each update:
+* the first update, the CIB is loaded and its resources are parsed,
+* next updates with the CIB epoch not changed, only the CIB version is
+  checked and the parsed resources are reused.
+Both are measured with the tools run one after another and at the same time.
+
+Usage: python3 -m pcs_test.benchmark.snmp_node_status [delay] [repeat]
+    [primitive count]
+"""
+import logging
+import os
+import os.path
+import sys
+import tempfile
+from unittest import mock
+
+from lxml import etree
+
+from pcs.common.reports import ReportProcessor
+from pcs.lib.commands import status
+from pcs.lib.env import LibraryEnvironment
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.fixture_crm_mon import complete_state
+from pcs_test.tools.misc import get_test_resource as rc
+from pcs_test.tools.misc import read_test_resource
+from pcs_test.tools.xml import etree_to_str
+
+FAKE_TOOL = """#!/bin/sh
+sleep {delay}
+{output}
+"""
+
+FAKE_CIBADMIN_OUTPUT = """
+for arg in "$@"; do
+    if [ "$arg" = --no-children ]; then
+        echo '<cib admin_epoch="0" epoch="557" num_updates="130"/>'
+        exit 0
+    fi
+done
+cat {cib}
+"""
+
+FAKE_QUORUMTOOL_OUTPUT = """
+cat <<EOF
+Quorum information
+------------------
+Quorate:          Yes
+
+Votequorum information
+----------------------
+Quorum:           2
+
+Membership information
+----------------------
+    Nodeid      Votes    Qdevice Name
+         1          1         NR rh7-1 (local)
+         2          1         NR rh7-2
+EOF
+"""
+
+
+class NullReportProcessor(ReportProcessor):
+    def _do_report(self, report_item):
+        pass
+
+
+def _generate_cib(primitive_count):
+    cib = etree.fromstring(read_test_resource("cib-empty.xml"))
+    resources = cib.find("configuration/resources")
+    for index in range(primitive_count):
+        etree.SubElement(
+            resources,
+            "primitive",
+            {
+                "id": f"R{index}",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+    return etree_to_str(cib)
+
+
+def _generate_state(primitive_count):
+    resources = etree.Element("resources")
+    for index in range(primitive_count):
+        etree.SubElement(resources, "resource", id=f"R{index}")
+    return etree_to_str(
+        complete_state(
+            read_test_resource("crm_mon.minimal.xml"),
+            etree_to_str(resources),
+            """
+                <nodes>
+                    <node name="rh7-1" id="1"/>
+                    <node name="rh7-2" id="2"/>
+                </nodes>
+            """,
+        )
+    )
+
+
+def _create_tool(path, delay, output):
+    with open(path, "w") as script:
+        script.write(FAKE_TOOL.format(delay=delay, output=output))
+    os.chmod(path, 0o755)
+
+
+def _load_status(keep_snapshot):
+    if not keep_snapshot:
+        # pylint: disable=protected-access
+        status._cib_primitives_snapshot = None
+    status.node_status_dto(
+        LibraryEnvironment(
+            logging.getLogger("benchmark"), NullReportProcessor()
+        )
+    )
+
+
+def main(delay=0.05, repeat=10, primitive_count=2000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cib_path = os.path.join(tmp_dir, "cib.xml")
+        with open(cib_path, "w") as cib_file:
+            cib_file.write(_generate_cib(primitive_count))
+        state_path = os.path.join(tmp_dir, "crm_mon.xml")
+        with open(state_path, "w") as state_file:
+            state_file.write(_generate_state(primitive_count))
+        _create_tool(
+            os.path.join(tmp_dir, "crm_mon"), delay, f"cat {state_path}"
+        )
+        _create_tool(
+            os.path.join(tmp_dir, "cibadmin"),
+            delay,
+            FAKE_CIBADMIN_OUTPUT.format(cib=cib_path),
+        )
+        _create_tool(
+            os.path.join(tmp_dir, "corosync-quorumtool"),
+            delay,
+            FAKE_QUORUMTOOL_OUTPUT,
+        )
+        with mock.patch.multiple(
+            "pcs.settings",
+            pacemaker_binaries=tmp_dir,
+            corosync_binaries=tmp_dir,
+            pacemaker_api_result_schema=rc("pcmk_api_rng/api-result.rng"),
+            corosync_conf_file=rc("corosync.conf"),
+        ):
+            print(
+                f"each tool run takes {delay} s, {primitive_count} primitives"
+            )
+            for max_parallel in (1, 3):
+                with mock.patch(
+                    "pcs.settings.cluster_status_load_max_parallel",
+                    max_parallel,
+                ):
+                    mode = "sequential" if max_parallel == 1 else "parallel"
+                    print_result(
+                        f"{mode}, first update",
+                        measure(lambda: _load_status(False), repeat),
+                    )
+                    print_result(
+                        f"{mode}, CIB epoch not changed",
+                        measure(lambda: _load_status(True), repeat),
+                    )
+
+
+if __name__ == "__main__":
+    main(
+        *[float(arg) for arg in sys.argv[1:2]],
+        *[int(arg) for arg in sys.argv[2:4]],
+    )
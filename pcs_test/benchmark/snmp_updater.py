@@ -0,0 +1,173 @@
+"""
+Compare setting values by the SNMP agent updater before and after indexing oids
+
+An update cycle of the pcs SNMP agent is run with a cluster status of a number
+of resources, the way the agent runs it in each update interval. Loading the
+status is not measured, the status is generated in advance. Then, a table with
+a row for each resource is set. Both are run:
+* the way it was done before: each string oid found by walking the oid tree,
+  each value and table cell oid put together on its own,
+* with the oid map of the updater built once per tree and bulk setting of
+  values and tables.
+
+The pyagentx module has to be installed.
+
+Usage: python3 -m pcs_test.benchmark.snmp_updater [repeat] [resource count]
+"""
+import sys
+from unittest import mock
+
+from pcs.common.status_dto import (
+    NodeStatusDto,
+    PrimitiveStatusDto,
+)
+from pcs.common.types import PrimitiveStatus
+from pcs.snmp.agentx.types import (
+    IntegerType,
+    StringType,
+)
+from pcs.snmp.updaters.v1 import ClusterPcsV1Updater
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+
+TABLE_OID = "1.3.6.1.4.1.32723.100.1.1"
+
+
+class TreeWalkingUpdater(ClusterPcsV1Updater):
+    # the way values were set before
+
+    def set_value(self, str_oid, value):
+        oid, oid_cls = _str_oid_to_oid(self.oid_tree, str_oid)
+        self.set_typed_value(oid, oid_cls.data_type(value))
+
+    def set_values(self, value_map):
+        for str_oid, value in value_map.items():
+            self.set_value(str_oid, value)
+
+    def _set_value_list(self, data_type, oid, value):
+        if not isinstance(value, list):
+            value = [value]
+        for index, val in enumerate(value):
+            self._set_val(
+                data_type, "{oid}.{index}".format(oid=oid, index=index), val
+            )
+
+    def _set_val(self, data_type, oid, value):
+        self._data[oid] = {"name": oid, "type": data_type, "value": value}
+
+    def set_table(self, oid, table):
+        for row in table:
+            if not row:
+                continue
+            row_id = _str_to_oid(str(row[0].value))
+            for index, col in enumerate(row[1:], start=2):
+                value_oid = "{base_oid}.{index}.{row_id}".format(
+                    base_oid=oid, index=index, row_id=row_id
+                )
+                self._set_val(col.data_type, value_oid, col.value)
+
+
+def _find_oid_in_sub_tree(sub_tree, section_name):
+    if sub_tree.member_list is None:
+        return None
+    for oid in sub_tree.member_list:
+        if oid.str_oid == section_name:
+            return oid
+    return None
+
+
+def _str_oid_to_oid(sub_tree, str_oid):
+    oid_list = []
+    for section in str_oid.split("."):
+        sub_tree = _find_oid_in_sub_tree(sub_tree, section)
+        oid_list.append(str(sub_tree.oid))
+        if sub_tree.data_type:
+            return (".".join(oid_list), sub_tree)
+    return None
+
+
+def _str_to_oid(data):
+    length = len(data)
+    oid_int = [str(ord(i)) for i in data]
+    return str(length) + "." + ".".join(oid_int)
+
+
+def _generate_status(resource_count):
+    status_list = list(PrimitiveStatus)
+    node_list = [f"node{index}" for index in range(1, 17)]
+    return NodeStatusDto(
+        cluster_name="benchmark",
+        quorate=True,
+        known_node_list=node_list,
+        corosync_online_node_list=node_list,
+        corosync_offline_node_list=[],
+        pacemaker_online_node_list=node_list,
+        pacemaker_standby_node_list=[],
+        pacemaker_offline_node_list=[],
+        primitive_list=[
+            PrimitiveStatusDto(
+                f"resource-{index}", status_list[index % len(status_list)]
+            )
+            for index in range(resource_count)
+        ],
+    )
+
+
+def _generate_table(status):
+    return [
+        [
+            StringType(primitive.id),
+            StringType(primitive.status.value),
+            IntegerType(index),
+            StringType("ocf:pacemaker:Dummy"),
+        ]
+        for index, primitive in enumerate(status.primitive_list)
+    ]
+
+
+def _create_updater(updater_class):
+    updater = updater_class()
+    updater.agent_setup(None, TABLE_OID, 1)
+    return updater
+
+
+def _update(updater):
+    # each update cycle starts with no data
+    updater._data = {}  # pylint: disable=protected-access
+    updater.update()
+
+
+def _set_table(updater, table):
+    updater._data = {}  # pylint: disable=protected-access
+    updater.set_table(TABLE_OID, table)
+
+
+def main(repeat=20, resource_count=2000):
+    status = _generate_status(resource_count)
+    table = _generate_table(status)
+    print(f"{resource_count} resources")
+    with mock.patch(
+        "pcs.snmp.updaters.v1.node_status_dto", return_value=status
+    ):
+        for name, updater_class in (
+            ("tree walk", TreeWalkingUpdater),
+            ("oid map", ClusterPcsV1Updater),
+        ):
+            updater = _create_updater(updater_class)
+            print_result(
+                f"update, {name}",
+                measure(lambda updater=updater: _update(updater), repeat),
+            )
+            print_result(
+                f"table, {name}",
+                measure(
+                    lambda updater=updater: _set_table(updater, table), repeat
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,111 @@
+"""
+Compare loading cluster status and CIB with and without status snapshots
+
+Fake crm_mon and cibadmin print their output after a delay, like the real
+tools connecting to the cluster. crm_mon takes longer, as it runs the
+scheduler. Cluster status and CIB are loaded the way read-only commands load
+them, without snapshots and with snapshots enabled. With snapshots, the
+version of the CIB is checked by a quick cibadmin query every time and the
+snapshot taken by the first run is reused by the others.
+
+Usage: python3 -m pcs_test.benchmark.status_snapshot [status delay]
+    [cib delay] [version delay] [repeat]
+"""
+import logging
+import os
+import os.path
+import sys
+import tempfile
+from unittest import mock
+
+from pcs.common.reports import ReportProcessor
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.live import (
+    get_cib_xml,
+    get_cluster_status_dom,
+)
+
+from pcs_test.benchmark.tools import (
+    measure,
+    print_result,
+)
+from pcs_test.tools.misc import get_test_resource as rc
+
+FAKE_CRM_MON = """#!/bin/sh
+sleep {delay}
+cat {output}
+"""
+
+FAKE_CIBADMIN = """#!/bin/sh
+for arg in "$@"; do
+    if [ "$arg" = --no-children ]; then
+        sleep {version_delay}
+        echo '<cib admin_epoch="0" epoch="3" num_updates="5"/>'
+        exit 0
+    fi
+done
+sleep {delay}
+cat {output}
+"""
+
+
+class NullReportProcessor(ReportProcessor):
+    def _do_report(self, report_item):
+        pass
+
+
+def _create_tool(path, template, **kwargs):
+    with open(path, "w") as script:
+        script.write(template.format(**kwargs))
+    os.chmod(path, 0o755)
+
+
+def _measure(runner, repeat):
+    print_result(
+        "cluster status",
+        measure(lambda: get_cluster_status_dom(runner), repeat),
+    )
+    print_result("CIB", measure(lambda: get_cib_xml(runner), repeat))
+
+
+def main(status_delay=0.2, cib_delay=0.05, version_delay=0.01, repeat=10):
+    runner = CommandRunner(
+        logging.getLogger("benchmark"), NullReportProcessor()
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _create_tool(
+            os.path.join(tmp_dir, "crm_mon"),
+            FAKE_CRM_MON,
+            delay=status_delay,
+            output=rc("crm_mon.minimal.xml"),
+        )
+        _create_tool(
+            os.path.join(tmp_dir, "cibadmin"),
+            FAKE_CIBADMIN,
+            delay=cib_delay,
+            version_delay=version_delay,
+            output=rc("cib-large.xml"),
+        )
+        with mock.patch.multiple(
+            "pcs.settings",
+            pacemaker_binaries=tmp_dir,
+            pacemaker_api_result_schema=rc("pcmk_api_rng/api-result.rng"),
+            pacemaker_status_snapshot_dir=os.path.join(tmp_dir, "snapshots"),
+        ):
+            print(
+                f"crm_mon takes {status_delay} s, cibadmin {cib_delay} s, "
+                f"CIB version query {version_delay} s"
+            )
+            print("without snapshots")
+            with mock.patch("pcs.settings.pacemaker_status_snapshot_ttl", 0):
+                _measure(runner, repeat)
+            print("with snapshots")
+            with mock.patch("pcs.settings.pacemaker_status_snapshot_ttl", 5):
+                _measure(runner, repeat)
+
+
+if __name__ == "__main__":
+    main(
+        *[float(arg) for arg in sys.argv[1:4]],
+        *[int(arg) for arg in sys.argv[4:5]],
+    )
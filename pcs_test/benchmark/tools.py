@@ -0,0 +1,201 @@
+"""
+Helpers for benchmarks
+
+Benchmarks are not part of the test suite. Run them from the top directory of
+the project, e.g.: python3 -m pcs_test.benchmark.node_communicator_pool
+"""
+import os.path
+import ssl
+import statistics
+import tempfile
+import threading
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from pcs.common.ssl import (
+    dump_cert,
+    dump_key,
+    generate_cert,
+    generate_key,
+)
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    # keep connections open, same as pcsd does
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        if server.response_delay:
+            time.sleep(server.response_delay)
+        body = server.response_body
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.counter_lock:
+            server.request_count += 1
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        # pylint: disable=redefined-builtin
+        pass
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, ssl_context, response_body, response_delay):
+        super().__init__(("127.0.0.1", 0), _StandInRequestHandler)
+        self.ssl_context = ssl_context
+        self.response_body = response_body
+        self.response_delay = response_delay
+        self.counter_lock = threading.Lock()
+        self.handshake_count = 0
+        self.request_count = 0
+
+    def get_request(self):
+        sock, addr = super().get_request()
+        with self.counter_lock:
+            self.handshake_count += 1
+        # do the handshake in the thread handling the request
+        return (
+            self.ssl_context.wrap_socket(
+                sock, server_side=True, do_handshake_on_connect=False
+            ),
+            addr,
+        )
+
+    def handle_error(self, request, client_address):
+        # clients closing connections are not interesting
+        pass
+
+
+class StandInHttpsServer:
+    """
+    Local HTTPS server answering every request with the same body
+
+    It counts accepted connections (i.e. TLS handshakes) and served requests.
+    Use it as a context manager.
+    """
+
+    def __init__(self, response_body=b"{}", response_delay=0.0):
+        """
+        bytes response_body -- body sent in every response
+        float response_delay -- seconds to wait before sending a response
+        """
+        self._response_body = response_body
+        self._response_delay = response_delay
+        self._server: Optional[_StandInServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self) -> "StandInHttpsServer":
+        # pylint: disable=consider-using-with
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        key = generate_key(2048)
+        cert_path = os.path.join(self._tmp_dir.name, "cert.pem")
+        key_path = os.path.join(self._tmp_dir.name, "key.pem")
+        with open(cert_path, "wb") as cert_file:
+            cert_file.write(dump_cert(generate_cert(key, "localhost")))
+        with open(key_path, "wb") as key_file:
+            key_file.write(dump_key(key))
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(cert_path, key_path)
+        self._server = _StandInServer(
+            ssl_context, self._response_body, self._response_delay
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread:
+            self._thread.join()
+        if self._tmp_dir:
+            self._tmp_dir.cleanup()
+
+    @property
+    def _running_server(self) -> _StandInServer:
+        if self._server is None:
+            raise AssertionError("Server is not running")
+        return self._server
+
+    @property
+    def addr(self) -> str:
+        return self._running_server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._running_server.server_address[1]
+
+    @property
+    def handshake_count(self) -> int:
+        return self._running_server.handshake_count
+
+    @property
+    def request_count(self) -> int:
+        return self._running_server.request_count
+
+    def reset_counters(self) -> None:
+        server = self._running_server
+        with server.counter_lock:
+            server.handshake_count = 0
+            server.request_count = 0
+
+
+def measure(func: Callable[[], object], repeat: int) -> List[float]:
+    """
+    Run a function repeatedly, return list of run times in seconds
+    """
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """
+    Return basic statistics of run times in milliseconds
+    """
+    sorted_times = sorted(times)
+    return {
+        "min": sorted_times[0] * 1000,
+        "median": statistics.median(sorted_times) * 1000,
+        "max": sorted_times[-1] * 1000,
+    }
+
+
+def print_result(label: str, times: List[float], **extra: object) -> None:
+    stats = summarize(times)
+    print(
+        "{label:<40} min {min:9.3f} ms  median {median:9.3f} ms  "
+        "max {max:9.3f} ms{extra}".format(
+            label=label,
+            extra="".join(f"  {key} {value}" for key, value in extra.items()),
+            **stats,
+        )
+    )
@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs.cli.common import routing
+
+from pcs_test import PROJECT_ROOT
+
+
+class ImportCmd(TestCase):
+    @mock.patch("pcs.cli.common.routing.importlib.import_module")
+    def test_import_when_run(self, mock_import):
+        cmd = routing.import_cmd("pcs.cli.routing.acl", "acl_cmd")
+        mock_import.assert_not_called()
+
+        self.assertIs(
+            mock_import.return_value.acl_cmd.return_value,
+            cmd("lib", ["arg"], "modifiers"),
+        )
+        mock_import.assert_called_once_with("pcs.cli.routing.acl")
+        mock_import.return_value.acl_cmd.assert_called_once_with(
+            "lib", ["arg"], "modifiers"
+        )
+
+    def test_app_does_not_import_commands(self):
+        # run in a new interpreter, modules imported by other tests are
+        # already loaded in this one
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import json, sys; import pcs.app; "
+                    "print(json.dumps(sorted(sys.modules)))"
+                ),
+            ],
+            cwd=PROJECT_ROOT,
+            env=dict(os.environ, PYTHONPATH=PROJECT_ROOT),
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        imported = [
+            module
+            for module in json.loads(output)
+            if module.startswith(
+                ("pcs.cli.routing.", "pcs.lib.commands.", "pcs.lib.env")
+            )
+        ]
+        self.assertEqual(imported, [])
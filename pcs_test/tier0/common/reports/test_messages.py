@@ -599,6 +599,34 @@ class RunExternalProcessFinished(NameBuildTest):
         )
 
 
+class RunExternalProcessDuration(NameBuildTest):
+    def test_finished(self):
+        self.assert_message_from_report(
+            "Finished in 1.235 s: com-mand",
+            reports.RunExternalProcessDuration("com-mand", 1.23456, False),
+        )
+
+    def test_timed_out(self):
+        self.assert_message_from_report(
+            "Killed after 10.000 s due to a timeout: com-mand",
+            reports.RunExternalProcessDuration("com-mand", 10, True),
+        )
+
+
+class RunExternalProcessesFinished(NameBuildTest):
+    def test_one_process(self):
+        self.assert_message_from_report(
+            "Finished running 1 process in 0.500 s, at most 4 at a time",
+            reports.RunExternalProcessesFinished(1, 4, 0.5),
+        )
+
+    def test_more_processes(self):
+        self.assert_message_from_report(
+            "Finished running 12 processes in 2.000 s, at most 4 at a time",
+            reports.RunExternalProcessesFinished(12, 4, 2),
+        )
+
+
 class RunExternalProcessError(NameBuildTest):
     def test_all(self):
         self.assert_message_from_report(
@@ -634,6 +662,14 @@ class NodeCommunicationStarted(NameBuildTest):
         )
 
 
+class NodeCommunicationQueued(NameBuildTest):
+    def test_all(self):
+        self.assert_message_from_report(
+            "HTTP Request to: TARGET waited in queue for 12 ms",
+            reports.NodeCommunicationQueued("TARGET", 12),
+        )
+
+
 class NodeCommunicationFinished(NameBuildTest):
     def test_all(self):
         self.assert_message_from_report(
@@ -2838,6 +2874,17 @@ class UnableToGetAgentMetadata(NameBuildTest):
         )
 
 
+class AgentMetadataLoadTimedOut(NameBuildTest):
+    def test_all(self):
+        self.assert_message_from_report(
+            (
+                "Unable to load metadata of agent 'agent-name' in 60 s, "
+                "loading has been stopped"
+            ),
+            reports.AgentMetadataLoadTimedOut("agent-name", 60),
+        )
+
+
 class InvalidResourceAgentName(NameBuildTest):
     def test_build_message_with_data(self):
         self.assert_message_from_report(
@@ -3789,6 +3836,14 @@ class UseCommandNodeRemoveGuest(NameBuildTest):
         )
 
 
+class UseCommandNodeRemoveRemote(NameBuildTest):
+    def test_build_messages(self):
+        self.assert_message_from_report(
+            "this command is not sufficient for removing a remote node",
+            reports.UseCommandNodeRemoveRemote(),
+        )
+
+
 class TmpFileWrite(NameBuildTest):
     def test_success(self):
         self.assert_message_from_report(
@@ -5573,3 +5628,59 @@ class CloningStonithResourcesHasNoEffect(NameBuildTest):
                 ["fence1", "fence2"], "StonithGroup"
             ),
         )
+
+
+class StoppingResourcesBeforeDeleting(NameBuildTest):
+    def test_one_resource(self):
+        self.assert_message_from_report(
+            "Stopping resource 'resourceId' before deleting",
+            reports.StoppingResourcesBeforeDeleting(["resourceId"]),
+        )
+
+    def test_multiple_resources(self):
+        self.assert_message_from_report(
+            "Stopping resources 'resourceId1', 'resourceId2' before deleting",
+            reports.StoppingResourcesBeforeDeleting(
+                ["resourceId2", "resourceId1"]
+            ),
+        )
+
+
+class CannotStopResourcesBeforeDeleting(NameBuildTest):
+    def test_one_resource(self):
+        self.assert_message_from_report(
+            "Cannot stop resource 'resourceId' before deleting",
+            reports.CannotStopResourcesBeforeDeleting(["resourceId"]),
+        )
+
+    def test_multiple_resources(self):
+        self.assert_message_from_report(
+            "Cannot stop resources 'resourceId1', 'resourceId2' before "
+            "deleting",
+            reports.CannotStopResourcesBeforeDeleting(
+                ["resourceId2", "resourceId1"]
+            ),
+        )
+
+
+class CibRemoveDependantElements(NameBuildTest):
+    def test_one_element(self):
+        self.assert_message_from_report(
+            "Removing dependant element: rsc_location 'location-A'",
+            reports.CibRemoveDependantElements({"location-A": "rsc_location"}),
+        )
+
+    def test_multiple_elements(self):
+        self.assert_message_from_report(
+            (
+                "Removing dependant elements: rsc_location 'location-A', "
+                "rsc_location 'location-B', tag 'tag-A'"
+            ),
+            reports.CibRemoveDependantElements(
+                {
+                    "tag-A": "tag",
+                    "location-B": "rsc_location",
+                    "location-A": "rsc_location",
+                }
+            ),
+        )
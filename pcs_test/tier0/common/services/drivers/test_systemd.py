@@ -6,7 +6,10 @@ from unittest import (
 from pcs.common.services import errors
 from pcs.common.services.drivers import SystemdDriver
 from pcs.common.services.interfaces import ExecutorInterface
-from pcs.common.services.types import ExecutorResult
+from pcs.common.services.types import (
+    ExecutorResult,
+    ServiceStatus,
+)
 
 
 def service_name(service, instance=None):
@@ -190,6 +193,97 @@ class IsRunningTest(Base):
         )
 
 
+class GetServicesStatusTest(Base):
+    def setUp(self):
+        super().setUp()
+        self.show_cmd = [
+            self.binary,
+            "show",
+            "--property=UnitFileState,ActiveState",
+            "s1.service",
+            "s2.service",
+            "s3.service",
+        ]
+
+    def test_success(self):
+        self.mock_executor.run.return_value = ExecutorResult(
+            0,
+            (
+                "UnitFileState=enabled\nActiveState=active\n\n"
+                "ActiveState=reloading\nUnitFileState=disabled\n\n"
+                "UnitFileState=\nActiveState=inactive\n"
+            ),
+            "",
+        )
+        self.assertEqual(
+            self.driver.get_services_status(["s1", "s2", "s3"]),
+            {
+                "s1": ServiceStatus(enabled=True, running=True),
+                "s2": ServiceStatus(enabled=False, running=True),
+                "s3": ServiceStatus(enabled=False, running=False),
+            },
+        )
+        self.mock_executor.run.assert_called_once_with(self.show_cmd)
+
+    def test_enabled_states(self):
+        self.mock_executor.run.return_value = ExecutorResult(
+            0,
+            (
+                "UnitFileState=static\nActiveState=failed\n\n"
+                "UnitFileState=masked\nActiveState=activating\n\n"
+                "ActiveState=deactivating\n"
+            ),
+            "",
+        )
+        self.assertEqual(
+            self.driver.get_services_status(["s1", "s2", "s3"]),
+            {
+                "s1": ServiceStatus(enabled=True, running=False),
+                "s2": ServiceStatus(enabled=False, running=False),
+                "s3": ServiceStatus(enabled=False, running=False),
+            },
+        )
+
+    def test_no_services(self):
+        self.assertEqual(self.driver.get_services_status([]), {})
+        self.mock_executor.run.assert_not_called()
+
+    def _assert_fallback(self, show_result):
+        self.mock_executor.run.side_effect = [
+            show_result,
+            ExecutorResult(0, "enabled", ""),
+            ExecutorResult(3, "inactive", ""),
+            ExecutorResult(1, "disabled", ""),
+            ExecutorResult(0, "active", ""),
+            ExecutorResult(1, "", "error"),
+            ExecutorResult(1, "", "error"),
+        ]
+        self.assertEqual(
+            self.driver.get_services_status(["s1", "s2", "s3"]),
+            {
+                "s1": ServiceStatus(enabled=True, running=False),
+                "s2": ServiceStatus(enabled=False, running=True),
+                "s3": ServiceStatus(enabled=False, running=False),
+            },
+        )
+        self.mock_executor.run.assert_has_calls(
+            [mock.call(self.show_cmd)]
+            + [
+                mock.call([self.binary, subcmd, f"{service}.service"])
+                for service in ("s1", "s2", "s3")
+                for subcmd in ("is-enabled", "is-active")
+            ]
+        )
+
+    def test_show_failed(self):
+        self._assert_fallback(ExecutorResult(1, "", "error"))
+
+    def test_show_output_not_matching(self):
+        self._assert_fallback(
+            ExecutorResult(0, "UnitFileState=enabled\nActiveState=active\n", "")
+        )
+
+
 class IsInstalledTest(Base):
     def test_installed(self):
         output = (
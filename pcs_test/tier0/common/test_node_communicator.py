@@ -1,7 +1,9 @@
 import io
+import socket
 from unittest import (
     TestCase,
     mock,
+    skipUnless,
 )
 
 import pcs.common.node_communicator as lib
@@ -202,6 +204,23 @@ class RequestHostTest(TestCase):
             else:
                 request.next_dest()
 
+    def test_use_dest(self):
+        hosts = ["host1", "host2", "host3"]
+        request = self._get_request(
+            lib.RequestTarget("label", dest_list=_addr_list_to_dest(hosts))
+        )
+        request.use_dest(Destination("host2", None))
+        self.assertEqual(Destination("host2", None), request.dest)
+        request.next_dest()
+        self.assertEqual(Destination("host3", None), request.dest)
+        self.assertRaises(StopIteration, request.next_dest)
+
+    def test_use_unknown_dest(self):
+        request = self._get_request(lib.RequestTarget("host"))
+        self.assertRaises(
+            ValueError, request.use_dest, Destination("other", None)
+        )
+
 
 class RequestCookiesTest(TestCase):
     @staticmethod
@@ -272,7 +291,6 @@ class CreateRequestHandleTest(TestCase):
     # pylint: disable=no-member, protected-access
     _common_opts = {
         pycurl.PROTOCOLS: pycurl.PROTO_HTTPS,
-        pycurl.VERBOSE: 1,
         pycurl.SSL_VERIFYHOST: 0,
         pycurl.SSL_VERIFYPEER: 0,
         pycurl.NOSIGNAL: 1,
@@ -299,8 +317,11 @@ class CreateRequestHandleTest(TestCase):
             "name1": "val1",
             "name2": "val2",
         }
-        handle = lib._create_request_handle(request, cookies, 1)
+        handle = lib._create_request_handle(
+            request, cookies, 1, debug_capture=lib.DebugCapture()
+        )
         expected_opts = {
+            pycurl.VERBOSE: 1,
             pycurl.TIMEOUT: 1,
             pycurl.URL: request.url.encode("utf-8"),
             pycurl.COOKIE: "name1=val1;name2=val2;token=token_val".encode(
@@ -339,12 +360,53 @@ class CreateRequestHandleTest(TestCase):
         )
         self.assertFalse(pycurl.COOKIE in handle.opts)
         self.assertFalse(pycurl.COPYPOSTFIELDS in handle.opts)
+        self.assertFalse(pycurl.VERBOSE in handle.opts)
+        self.assertFalse(pycurl.DEBUGFUNCTION in handle.opts)
         self.assertIs(request, handle.request_obj)
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
-        self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
+        self.assertIsNone(handle.debug_buffer)
         handle.perform()
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
-        self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
+
+    def test_debug_ring_buffer(self, mock_curl):
+        mock_curl.return_value = MockCurl(
+            None,
+            b"output",
+            [
+                (pycurl.DEBUG_TEXT, b"debug"),
+                (pycurl.DEBUG_DATA_OUT, b"info\n"),
+            ],
+        )
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle = lib._create_request_handle(
+            request, {}, 10, debug_capture=lib.DebugCapture(max_size=10)
+        )
+        self.assertEqual(1, handle.opts[pycurl.VERBOSE])
+        handle.perform()
+        self.assertEqual(
+            "g\n>> info\n", handle.debug_buffer.getvalue().decode("utf-8")
+        )
+
+
+class DebugCaptureTest(TestCase):
+    def test_unbounded(self):
+        buffer = lib.DebugCapture().create_buffer()
+        for chunk in (b"abc", b"def", b"ghi"):
+            buffer.write(chunk)
+        self.assertEqual(b"abcdefghi", buffer.getvalue())
+
+    def test_bounded(self):
+        buffer = lib.DebugCapture(max_size=5).create_buffer()
+        buffer.write(b"abc")
+        self.assertEqual(b"abc", buffer.getvalue())
+        buffer.write(b"def")
+        self.assertEqual(b"bcdef", buffer.getvalue())
+        buffer.write(b"g")
+        self.assertEqual(b"cdefg", buffer.getvalue())
+        buffer.write(b"hijklmn")
+        self.assertEqual(b"jklmn", buffer.getvalue())
 
 
 def fixture_request(host_id=1, action="action"):
@@ -385,7 +447,7 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         self.assertIs(handle, response.handle)
         self.assertIs(request, response.request)
         mock_create_handle.assert_called_once_with(
-            request, {}, settings.default_request_timeout
+            request, {}, settings.default_request_timeout, debug_capture=None
         )
         return response
 
@@ -425,7 +487,7 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
     )
     def test_call_start_loop_multiple_times(self, _, mock_create_handle):
         com = self.get_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, *_, **__: MockCurl(
             request=request
         )
         com.add_requests([fixture_request(i) for i in range(2)])
@@ -487,6 +549,210 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
         com._multi_handle.assert_no_handle_left()
 
 
+class CommunicatorLimitTest(CommunicatorBaseTest):
+    @mock.patch("pcs.common.node_communicator.pycurl.Curl")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1]),
+    )
+    def test_queue_over_limit(self, _, mock_curl):
+        mock_curl.side_effect = MockCurl
+        com = lib.Communicator(
+            self.mock_com_log, None, None, max_running=1, max_running_per_host=0
+        )
+        request_list = [fixture_request(i) for i in range(3)]
+        com.add_requests(request_list)
+        self.assertEqual(1, mock_curl.call_count)
+        response_list = list(com.start_loop())
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_queued(request_list[1], mock.ANY),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_request_queued(request_list[2], mock.ANY),
+                mock.call.log_request_start(request_list[2]),
+                mock.call.log_response(response_list[2]),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch("pcs.common.node_communicator.pycurl.Curl")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([3]),
+    )
+    def test_no_limit_by_default(self, _, mock_curl):
+        mock_curl.side_effect = MockCurl
+        com = lib.Communicator(self.mock_com_log, None, None)
+        request_list = [fixture_request(0) for _ in range(3)]
+        com.add_requests(request_list)
+        self.assertEqual(3, mock_curl.call_count)
+        response_list = list(com.start_loop())
+        self.assertEqual(request_list, [r.request for r in response_list])
+
+
+class MultiSocketActionEngineTest(TestCase):
+    # pylint: disable=protected-access
+    def setUp(self):
+        self.multi_handle = mock.Mock(spec_set=["setopt", "socket_action"])
+        self.multi_handle.socket_action.return_value = (0, 1)
+        self.engine = lib.MultiSocketActionEngine(self.multi_handle)
+        self.sock_a, self.sock_b = socket.socketpair()
+        self.addCleanup(self.sock_a.close)
+        self.addCleanup(self.sock_b.close)
+
+    def test_callbacks_set(self):
+        self.multi_handle.setopt.assert_has_calls(
+            [
+                mock.call(
+                    pycurl.M_SOCKETFUNCTION, self.engine._socket_callback
+                ),
+                mock.call(pycurl.M_TIMERFUNCTION, self.engine._timer_callback),
+            ]
+        )
+
+    def test_timeout_expired(self):
+        self.engine._timer_callback(0)
+        self.engine.run_once()
+        self.multi_handle.socket_action.assert_called_once_with(
+            pycurl.SOCKET_TIMEOUT, 0
+        )
+
+    def test_socket_ready(self):
+        sock_fd = self.sock_a.fileno()
+        self.engine._timer_callback(10000)
+        self.engine._socket_callback(pycurl.POLL_IN, sock_fd, None, None)
+        self.sock_b.send(b"data")
+        self.engine.run_once()
+        self.multi_handle.socket_action.assert_called_once_with(
+            sock_fd, pycurl.CSELECT_IN
+        )
+
+    def test_socket_modified_and_removed(self):
+        sock_fd = self.sock_a.fileno()
+        self.engine._timer_callback(0)
+        self.engine._socket_callback(pycurl.POLL_IN, sock_fd, None, None)
+        self.engine._socket_callback(pycurl.POLL_OUT, sock_fd, None, None)
+        self.engine.run_once()
+        self.multi_handle.socket_action.assert_has_calls(
+            [
+                mock.call(sock_fd, pycurl.CSELECT_OUT),
+                mock.call(pycurl.SOCKET_TIMEOUT, 0),
+            ]
+        )
+        self.multi_handle.socket_action.reset_mock()
+        self.engine._socket_callback(pycurl.POLL_REMOVE, sock_fd, None, None)
+        self.engine._timer_callback(0)
+        self.engine.run_once()
+        self.multi_handle.socket_action.assert_called_once_with(
+            pycurl.SOCKET_TIMEOUT, 0
+        )
+
+    def test_call_multi_perform(self):
+        self.multi_handle.socket_action.side_effect = [
+            (pycurl.E_CALL_MULTI_PERFORM, 1),
+            (0, 1),
+        ]
+        self.engine._timer_callback(0)
+        self.engine.run_once()
+        self.assertEqual(2, self.multi_handle.socket_action.call_count)
+
+
+class RequestSchedulerTest(TestCase):
+    @staticmethod
+    def _requests(ready_list):
+        return [request for request, _ in ready_list]
+
+    def test_no_limits(self):
+        scheduler = lib.RequestScheduler()
+        request_list = [fixture_request(i % 2) for i in range(5)]
+        for request in request_list:
+            scheduler.enqueue(request)
+        ready_list = scheduler.dequeue_ready()
+        self.assertEqual(
+            sorted(request_list, key=id),
+            sorted(self._requests(ready_list), key=id),
+        )
+        self.assertEqual([None] * 5, [time for _, time in ready_list])
+        self.assertEqual(5, scheduler.running_count)
+        self.assertEqual(0, scheduler.queued_count)
+
+    def test_global_limit(self):
+        scheduler = lib.RequestScheduler(max_running=2)
+        request_list = [fixture_request(i) for i in range(3)]
+        for request in request_list:
+            scheduler.enqueue(request)
+        ready_list = scheduler.dequeue_ready()
+        self.assertEqual(request_list[:2], self._requests(ready_list))
+        self.assertEqual([], scheduler.dequeue_ready())
+        self.assertEqual(1, scheduler.queued_count)
+        scheduler.request_finished(request_list[1])
+        ready_list = scheduler.dequeue_ready()
+        self.assertEqual(request_list[2:], self._requests(ready_list))
+        self.assertGreaterEqual(ready_list[0][1], 0)
+        self.assertEqual(2, scheduler.running_count)
+
+    def test_host_limit(self):
+        scheduler = lib.RequestScheduler(max_running_per_host=1)
+        request_a1, request_a2 = fixture_request(1), fixture_request(1)
+        request_b = fixture_request(2)
+        for request in (request_a1, request_a2, request_b):
+            scheduler.enqueue(request)
+        self.assertEqual(
+            [request_a1, request_b], self._requests(scheduler.dequeue_ready())
+        )
+        scheduler.request_finished(request_b)
+        self.assertEqual([], scheduler.dequeue_ready())
+        scheduler.request_finished(request_a1)
+        self.assertEqual(
+            [request_a2], self._requests(scheduler.dequeue_ready())
+        )
+
+    def test_round_robin(self):
+        scheduler = lib.RequestScheduler(max_running=2)
+        request_a = [fixture_request(1) for _ in range(3)]
+        request_b = [fixture_request(2) for _ in range(2)]
+        request_c = [fixture_request(3)]
+        for request in request_a + request_b + request_c:
+            scheduler.enqueue(request)
+        self.assertEqual(
+            [request_a[0], request_b[0]],
+            self._requests(scheduler.dequeue_ready()),
+        )
+        scheduler.request_finished(request_a[0])
+        self.assertEqual(
+            [request_c[0]], self._requests(scheduler.dequeue_ready())
+        )
+        scheduler.request_finished(request_b[0])
+        scheduler.request_finished(request_c[0])
+        self.assertEqual(
+            [request_a[1], request_b[1]],
+            self._requests(scheduler.dequeue_ready()),
+        )
+
+    def test_dequeue(self):
+        scheduler = lib.RequestScheduler(max_running=1)
+        request_list = [fixture_request(1) for _ in range(3)]
+        for request in request_list:
+            scheduler.enqueue(request)
+        self.assertEqual(
+            request_list[:1], self._requests(scheduler.dequeue_ready())
+        )
+        self.assertFalse(scheduler.dequeue(request_list[0]))
+        self.assertTrue(scheduler.dequeue(request_list[1]))
+        self.assertFalse(scheduler.dequeue(request_list[1]))
+        self.assertEqual(1, scheduler.queued_count)
+        scheduler.request_finished(request_list[0])
+        self.assertEqual(
+            request_list[2:], self._requests(scheduler.dequeue_ready())
+        )
+
+
 def fixture_logger_request_retry_calls(response, hostname):
     return [
         mock.call.log_request_start(response.request),
@@ -520,7 +786,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             expected_response_list.append(response)
             return response
 
-        def _mock_create_request_handle(request, _, __):
+        def _mock_create_request_handle(request, *_, **__):
             counter["counter"] += 1
             return (
                 MockCurl(request=request)
@@ -555,7 +821,12 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(3, len(expected_response_list))
         mock_create_handle.assert_has_calls(
             [
-                mock.call(request, {}, settings.default_request_timeout)
+                mock.call(
+                    request,
+                    {},
+                    settings.default_request_timeout,
+                    debug_capture=None,
+                )
                 for _ in range(3)
             ]
         )
@@ -587,7 +858,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
 
         mock_con_failure.side_effect = _con_failure
         com = self.get_multiaddress_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, *_, **__: MockCurl(
             error=(pycurl.E_SEND_ERROR, "reason"),
             request=request,
         )
@@ -612,7 +883,12 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(4, len(expected_response_list))
         mock_create_handle.assert_has_calls(
             [
-                mock.call(request, {}, settings.default_request_timeout)
+                mock.call(
+                    request,
+                    {},
+                    settings.default_request_timeout,
+                    debug_capture=None,
+                )
                 for _ in range(3)
             ]
         )
@@ -635,3 +911,333 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         # pylint: disable=no-member, protected-access
         com._multi_handle.assert_no_handle_left()
+
+
+def fixture_race_request(label="label", host_count=3):
+    return lib.Request(
+        lib.RequestTarget(
+            label,
+            token="token",
+            dest_list=_addr_list_to_dest(
+                ["host{0}".format(i) for i in range(host_count)]
+            ),
+        ),
+        lib.RequestData("action", [("key", "value")]),
+    )
+
+
+@skipUnless(
+    hasattr(pycurl, "PREREQFUNCTION"),
+    "libcurl does not support CURLOPT_PREREQFUNCTION",
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorRacingTest(CommunicatorBaseTest):
+    # pylint: disable=protected-access
+    def get_racing_communicator(self, race_stagger, preferred_dests=None):
+        return lib.MultiaddressCommunicator(
+            self.mock_com_log,
+            None,
+            None,
+            race_stagger=race_stagger,
+            preferred_dests=preferred_dests,
+        )
+
+    @staticmethod
+    def set_handles(mock_create_handle, failing_addr_list=(), handle_list=None):
+        attempt_list = []
+
+        def _create_handle(request, *_, **__):
+            attempt_list.append(request)
+            if request.dest.addr in failing_addr_list:
+                handle = MockCurl(
+                    error=(pycurl.E_COULDNT_CONNECT, "reason"),
+                    request=request,
+                )
+            else:
+                handle = MockCurl(request=request)
+            if handle_list is not None:
+                handle_list.append(handle)
+            return handle
+
+        mock_create_handle.side_effect = _create_handle
+        return attempt_list
+
+    @staticmethod
+    def run_communicator(com, info_read_list, request):
+        com._multi_handle = MockCurlMulti(info_read_list)
+        com._engine = lib.MultiSelectEngine(com._multi_handle)
+        com.add_requests([request])
+        response_list = list(com.start_loop())
+        com._multi_handle.assert_no_handle_left()
+        return response_list
+
+    def test_first_address_connects(self, mock_create_handle):
+        preferred_dests = {}
+        com = self.get_racing_communicator(1000, preferred_dests)
+        attempt_list = self.set_handles(mock_create_handle)
+        request = fixture_race_request()
+        response_list = self.run_communicator(com, [1], request)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("host0", None), request.dest)
+        self.assertEqual(
+            [Destination("host0", None)],
+            [attempt.dest for attempt in attempt_list],
+        )
+        attempt = attempt_list[0]
+        self.assertIs(attempt, response.handle.request_obj)
+        self.assertEqual(request.target.token, attempt.target.token)
+        self.assertEqual(request.data, attempt.data)
+        self.assertEqual(request.url, attempt.url)
+        self.assertEqual({"label": Destination("host0", None)}, preferred_dests)
+        self.mock_com_log.log_retry.assert_not_called()
+        self.mock_com_log.log_no_more_addresses.assert_not_called()
+
+    def test_next_address_on_failure(self, mock_create_handle):
+        preferred_dests = {}
+        com = self.get_racing_communicator(1000, preferred_dests)
+        attempt_list = self.set_handles(mock_create_handle, ["host0"])
+        request = fixture_race_request()
+        response_list = self.run_communicator(com, [1, 1], request)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("host1", None), request.dest)
+        self.assertEqual(
+            [Destination("host0", None), Destination("host1", None)],
+            [attempt.dest for attempt in attempt_list],
+        )
+        self.assertEqual({"label": Destination("host1", None)}, preferred_dests)
+        self.mock_com_log.log_retry.assert_called_once_with(
+            mock.ANY, Destination("host0", None)
+        )
+
+    def test_all_addresses_fail(self, mock_create_handle):
+        preferred_dests = {}
+        com = self.get_racing_communicator(1000, preferred_dests)
+        self.set_handles(mock_create_handle, ["host0", "host1"])
+        request = fixture_race_request(host_count=2)
+        response_list = self.run_communicator(com, [1, 1], request)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertFalse(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("host1", None), request.dest)
+        self.assertEqual({}, preferred_dests)
+        self.assertEqual(1, self.mock_com_log.log_retry.call_count)
+        self.mock_com_log.log_no_more_addresses.assert_called_once_with(
+            response
+        )
+
+    def test_race_after_stagger(self, mock_create_handle):
+        com = self.get_racing_communicator(0)
+        attempt_list = self.set_handles(mock_create_handle, ["host0"])
+        request = fixture_race_request()
+        # All the attempts are started before the first info_read. The first
+        # one fails, the second one connects and the third one gets aborted.
+        response_list = self.run_communicator(com, [3], request)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertEqual(Destination("host1", None), request.dest)
+        self.assertEqual(3, len(attempt_list))
+        self.mock_com_log.log_retry.assert_not_called()
+        self.mock_com_log.log_no_more_addresses.assert_not_called()
+
+    def test_winner_cancels_other_attempts(self, mock_create_handle):
+        com = self.get_racing_communicator(0)
+        handle_list = []
+        attempt_list = self.set_handles(
+            mock_create_handle, handle_list=handle_list
+        )
+        request = fixture_race_request()
+        response_list = self.run_communicator(com, [1, 0], request)
+        self.assertEqual(1, len(response_list))
+        self.assertEqual(Destination("host0", None), request.dest)
+        self.assertEqual(3, len(attempt_list))
+        self.assertEqual(
+            [False, True, True], [handle.closed for handle in handle_list]
+        )
+        self.assertEqual([], com._race_list)
+        self.assertEqual({}, com._attempt_races)
+        self.assertEqual(0, com._scheduler.running_count)
+
+    def test_preferred_dest_first(self, mock_create_handle):
+        com = self.get_racing_communicator(
+            1000, {"label": Destination("host2", None)}
+        )
+        attempt_list = self.set_handles(mock_create_handle)
+        request = fixture_race_request()
+        self.run_communicator(com, [1], request)
+        self.assertEqual(
+            [Destination("host2", None)],
+            [attempt.dest for attempt in attempt_list],
+        )
+        self.assertEqual(Destination("host2", None), request.dest)
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.CurlShare")
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CurlHandlePoolTest(TestCase):
+    def test_share_connections(self, mock_curl, mock_share):
+        # pylint: disable=no-self-use, unused-argument
+        lib.CurlHandlePool()
+        mock_share.return_value.setopt.assert_has_calls(
+            [
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION),
+            ]
+        )
+
+    def test_new_handle(self, mock_curl, mock_share):
+        mock_curl.side_effect = MockCurl
+        pool = lib.CurlHandlePool()
+        request = fixture_request()
+        handle = pool.get_handle(request, {}, 10)
+        self.assertIs(mock_share.return_value, handle.opts[pycurl.SHARE])
+        self.assertEqual(request.url.encode("utf-8"), handle.opts[pycurl.URL])
+        self.assertEqual(10, handle.opts[pycurl.TIMEOUT])
+        self.assertIs(request, handle.request_obj)
+
+    def test_reuse_handle_for_same_dest(self, mock_curl, _):
+        mock_curl.side_effect = MockCurl
+        pool = lib.CurlHandlePool()
+        request1 = fixture_request(1, "action1")
+        request2 = fixture_request(1, "action2")
+        handle1 = pool.get_handle(request1, {"token": "a"}, 10)
+        pool.release_handle(handle1, request1.dest)
+        self.assertIsNone(handle1.request_obj)
+        handle2 = pool.get_handle(request2, {}, 10)
+        self.assertIs(handle1, handle2)
+        self.assertIs(request2, handle2.request_obj)
+        self.assertEqual(request2.url.encode("utf-8"), handle2.opts[pycurl.URL])
+        self.assertEqual(1, mock_curl.call_count)
+
+    def test_no_reuse_for_other_dest(self, mock_curl, _):
+        mock_curl.side_effect = MockCurl
+        pool = lib.CurlHandlePool()
+        request1 = fixture_request(1)
+        request2 = fixture_request(2)
+        handle1 = pool.get_handle(request1, {}, 10)
+        pool.release_handle(handle1, request1.dest)
+        handle2 = pool.get_handle(request2, {}, 10)
+        self.assertIsNot(handle1, handle2)
+        self.assertEqual(2, mock_curl.call_count)
+
+    def test_max_idle_handles(self, mock_curl, _):
+        # pylint: disable=no-self-use
+        mock_curl.side_effect = mock.Mock
+        pool = lib.CurlHandlePool(max_idle_per_dest=1)
+        request = fixture_request()
+        handle1 = pool.get_handle(request, {}, 10)
+        handle2 = pool.get_handle(request, {}, 10)
+        pool.release_handle(handle1, request.dest)
+        pool.release_handle(handle2, request.dest)
+        handle1.close.assert_not_called()
+        handle2.close.assert_called_once_with()
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1, 1]),
+)
+class PooledCommunicatorTest(CommunicatorBaseTest):
+    def test_release_and_reuse_handle(self, _):
+        # pylint: disable=no-member
+        mock_pool = mock.Mock(spec=lib.CurlHandlePool, max_connections=5)
+        handle = MockCurl(
+            {pycurl.RESPONSE_CODE: 200}, b"output", [(pycurl.DEBUG_TEXT, b"x")]
+        )
+
+        def _get_handle(request, cookies, timeout, debug_capture):
+            # pylint: disable=unused-argument
+            handle.request_obj = request
+            handle.output_buffer = io.BytesIO()
+            handle.debug_buffer = io.BytesIO()
+            handle.setopt(pycurl.WRITEFUNCTION, handle.output_buffer.write)
+            return handle
+
+        mock_pool.get_handle.side_effect = _get_handle
+        com = lib.PooledCommunicator(
+            self.mock_com_log, None, None, handle_pool=mock_pool
+        )
+        request_list = [fixture_request(1, "action1"), fixture_request(1)]
+        response_list = []
+        com.add_requests(request_list[:1])
+        for response in com.start_loop():
+            if len(response_list) == 0:
+                com.add_requests(request_list[1:])
+            response_list.append(response)
+        self.assertEqual(request_list, [r.request for r in response_list])
+        for response in response_list:
+            self.assertEqual(200, response.response_code)
+        mock_pool.get_handle.assert_has_calls(
+            [
+                mock.call(
+                    request,
+                    {},
+                    settings.default_request_timeout,
+                    debug_capture=None,
+                )
+                for request in request_list
+            ]
+        )
+        mock_pool.release_handle.assert_has_calls(
+            [mock.call(handle, request.dest) for request in request_list]
+        )
+        # pylint: disable=no-member, protected-access
+        self.assertEqual(5, com._multi_handle.opts[pycurl.M_MAXCONNECTS])
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1]),
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorEngineTest(CommunicatorBaseTest):
+    def test_engine_drives_multi_handle(self, mock_create_handle, _):
+        mock_create_handle.side_effect = lambda request, *_, **__: MockCurl(
+            request=request
+        )
+        mock_engine_class = mock.Mock()
+        com = lib.Communicator(
+            self.mock_com_log, None, None, engine_class=mock_engine_class
+        )
+        # pylint: disable=protected-access
+        mock_engine_class.assert_called_once_with(com._multi_handle)
+        com.add_requests([fixture_request()])
+        response_list = list(com.start_loop())
+        self.assertEqual(1, len(response_list))
+        mock_engine_class.return_value.assert_has_calls(
+            [mock.call.run_once(max_wait=None), mock.call.kick()]
+        )
+
+
+class NodeCommunicatorFactoryTest(TestCase):
+    def test_simple_communicator_by_default(self):
+        factory = lib.NodeCommunicatorFactory(
+            mock.Mock(spec_set=lib.CommunicatorLoggerInterface), None, None, 5
+        )
+        com = factory.get_communicator()
+        self.assertNotIsInstance(com, lib.PooledCommunicator)
+        self.assertIsInstance(com, lib.Communicator)
+
+    @mock.patch("pcs.settings.node_communication_pooled", True)
+    @mock.patch("pcs.common.node_communicator.CurlHandlePool")
+    def test_pooled_communicators_share_pool(self, mock_pool):
+        mock_pool.return_value.max_connections = 5
+        factory = lib.NodeCommunicatorFactory(
+            mock.Mock(spec_set=lib.CommunicatorLoggerInterface), None, None, 5
+        )
+        # pylint: disable=protected-access
+        com1 = factory.get_communicator()
+        com2 = factory.get_pooled_communicator(request_timeout=10)
+        self.assertIsInstance(com1, lib.PooledCommunicator)
+        self.assertIs(com1._handle_pool, com2._handle_pool)
+        self.assertEqual(5, com1._request_timeout)
+        self.assertEqual(10, com2._request_timeout)
+        mock_pool.assert_called_once_with()
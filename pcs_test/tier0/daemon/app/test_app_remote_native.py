@@ -0,0 +1,501 @@
+import base64
+import json
+import logging
+import os
+from unittest import mock
+
+from tornado.locks import Lock
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test,
+)
+
+from pcs import settings
+from pcs.daemon import (
+    http_server,
+    ruby_pcsd,
+)
+from pcs.daemon.app import (
+    remote,
+    sinatra_remote,
+)
+from pcs.daemon.auth import UserAuthInfo
+
+from pcs_test import PROJECT_ROOT
+from pcs_test.tier0.daemon.app import fixtures_app
+from pcs_test.tools.misc import (
+    get_tmp_dir,
+    read_test_resource,
+)
+
+# Don't write errors to test output.
+logging.getLogger("tornado.access").setLevel(logging.CRITICAL)
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+
+SUPERUSER = "hacluster"
+ADMIN_GROUP = "haclient"
+SUPERUSER_TOKEN = "superuser-token"
+USER_TOKEN = "user-token"
+
+
+def _report(level, code="CODE"):
+    return {
+        "severity": {"level": level, "force_code": None},
+        "message": {
+            "code": code,
+            "message": f"{code} message",
+            "payload": {"key": "value"},
+        },
+        "context": None,
+    }
+
+
+class PoolMock:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    async def run(self, request_json, user, groups):
+        self.requests.append((json.loads(request_json), user, groups))
+        return self.response
+
+
+class TmpFilesMixin:
+    def setUp(self):
+        # pylint: disable=invalid-name
+        self.tmp_dir = get_tmp_dir("tier0_daemon_app_remote_native")
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.users_conf = os.path.join(self.tmp_dir.name, "pcs_users.conf")
+        self.settings_conf = os.path.join(
+            self.tmp_dir.name, "pcs_settings.conf"
+        )
+        self.write_file(
+            self.users_conf,
+            json.dumps(
+                [
+                    {"username": SUPERUSER, "token": SUPERUSER_TOKEN},
+                    {"username": fixtures_app.USER, "token": USER_TOKEN},
+                ]
+            ),
+        )
+        for name, value in (
+            ("pacemaker_uname", SUPERUSER),
+            ("pacemaker_gname", ADMIN_GROUP),
+            ("pcsd_exec_location", os.path.join(PROJECT_ROOT, "pcsd")),
+        ):
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            remote, "check_user_groups", self.check_user_groups
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        remote.get_pcsd_capabilities.cache_clear()
+        self.addCleanup(remote.get_pcsd_capabilities.cache_clear)
+        super().setUp()
+
+    async def check_user_groups(self, username):
+        # pylint: disable=no-self-use
+        return UserAuthInfo(username, tuple(fixtures_app.GROUPS), False)
+
+    @staticmethod
+    def write_file(path, content):
+        with open(path, "w") as file:
+            file.write(content)
+
+    def write_permissions(self, permission_list):
+        self.write_file(
+            self.settings_conf,
+            json.dumps(
+                {
+                    "format_version": 2,
+                    "data_version": 1,
+                    "clusters": [],
+                    "permissions": {"local_cluster": permission_list},
+                }
+            ),
+        )
+
+
+class AppTest(TmpFilesMixin, fixtures_app.AppTest):
+    def setUp(self):
+        self.wrapper = fixtures_app.RubyPcsdWrapper(ruby_pcsd.SINATRA_REMOTE)
+        self.pool = PoolMock(
+            json.dumps(
+                {
+                    "status": "success",
+                    "status_msg": None,
+                    "report_list": [_report("DEBUG"), _report("WARNING")],
+                    "data": "cluster status",
+                }
+            ).encode()
+        )
+        super().setUp()
+
+    def get_routes(self):
+        return sinatra_remote.get_routes(
+            self.wrapper,
+            Lock(),
+            mock.MagicMock(spec_set=http_server.HttpsServerManage),
+            self.pool,
+            remote.RemoteAuthProvider(self.users_conf, self.settings_conf),
+        )
+
+    def get_with_cookies(self, path, **cookies):
+        return self.get(
+            path,
+            headers={
+                "Cookie": "; ".join(
+                    f"{name}={value}" for name, value in cookies.items()
+                )
+            },
+        )
+
+    def assert_unauthorized(self, response):
+        self.assertEqual(response.code, 401)
+        self.assertEqual(response.body, b'{"notauthorized":"true"}')
+
+
+class CheckAuth(AppTest):
+    def test_success(self):
+        response = self.get_with_cookies(
+            "/remote/check_auth?check_auth_only=1", token=SUPERUSER_TOKEN
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body, b'{"success":true}')
+
+    def test_invalid_token(self):
+        self.assert_unauthorized(
+            self.get_with_cookies("/remote/check_auth", token="nonsense")
+        )
+
+    def test_no_token(self):
+        self.assert_unauthorized(self.get("/remote/check_auth"))
+
+    def test_no_users_file(self):
+        os.unlink(self.users_conf)
+        self.assert_unauthorized(
+            self.get_with_cookies("/remote/check_auth", token=SUPERUSER_TOKEN)
+        )
+
+    def test_new_token(self):
+        self.assert_unauthorized(
+            self.get_with_cookies("/remote/check_auth", token="new-token")
+        )
+        self.write_file(
+            self.users_conf,
+            json.dumps([{"username": SUPERUSER, "token": "new-token"}]),
+        )
+        response = self.get_with_cookies(
+            "/remote/check_auth", token="new-token"
+        )
+        self.assertEqual(response.code, 200)
+
+
+class Capabilities(AppTest):
+    def test_success(self):
+        response = self.get_with_cookies(
+            "/remote/capabilities", token=USER_TOKEN
+        )
+        self.assertEqual(response.code, 200)
+        capabilities = json.loads(response.body)["pcsd_capabilities"]
+        self.assertIn("pcmk.resource.create", capabilities)
+        self.assertIn("cluster.create", capabilities)
+        self.assertNotIn("booth", capabilities)
+
+    def test_invalid_token(self):
+        self.assert_unauthorized(
+            self.get_with_cookies("/remote/capabilities", token="nonsense")
+        )
+
+
+class ClusterStatusPlaintext(AppTest):
+    url = "/remote/cluster_status_plaintext?data_json={}"
+
+    def test_success(self):
+        response = self.get_with_cookies(
+            self.url,
+            token=SUPERUSER_TOKEN,
+            CIB_user="user1",
+            CIB_user_groups=base64.b64encode(b"group1 haclient").decode(),
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(
+            json.loads(response.body),
+            {
+                "status": "success",
+                "status_msg": None,
+                "report_list": [
+                    {
+                        "severity": "WARNING",
+                        "code": "CODE",
+                        "info": {"key": "value"},
+                        "forceable": None,
+                        "report_text": "CODE message",
+                    }
+                ],
+                "data": "cluster status",
+            },
+        )
+        self.assertEqual(
+            self.pool.requests,
+            [
+                (
+                    {
+                        "cmd": "status.full_cluster_status_plaintext",
+                        "cmd_data": {},
+                        "options": {"request_timeout": None},
+                    },
+                    "user1",
+                    ["group1", ADMIN_GROUP],
+                )
+            ],
+        )
+
+    def test_superuser(self):
+        response = self.get_with_cookies(self.url, token=SUPERUSER_TOKEN)
+        self.assertEqual(response.code, 200)
+        self.assertEqual(self.pool.requests[0][1:], (SUPERUSER, None))
+
+    def test_user_allowed(self):
+        self.write_permissions(
+            [
+                {"type": "group", "name": "group2", "allow": ["write"]},
+            ]
+        )
+        response = self.get_with_cookies(self.url, token=USER_TOKEN)
+        self.assertEqual(response.code, 200)
+        self.assertEqual(
+            self.pool.requests[0][1:],
+            (fixtures_app.USER, fixtures_app.GROUPS),
+        )
+
+    def test_user_not_allowed(self):
+        self.write_permissions(
+            [
+                {"type": "group", "name": "group2", "allow": ["grant"]},
+                {"type": "user", "name": "user1", "allow": ["read"]},
+            ]
+        )
+        response = self.get_with_cookies(self.url, token=USER_TOKEN)
+        self.assertEqual(response.code, 403)
+        self.assertEqual(response.body, b"Permission denied")
+        self.assertEqual(self.pool.requests, [])
+
+    def test_invalid_data(self):
+        response = self.get_with_cookies(
+            "/remote/cluster_status_plaintext?data_json={",
+            token=SUPERUSER_TOKEN,
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(json.loads(response.body)["status"], "input_error")
+        self.assertEqual(self.pool.requests, [])
+
+    def test_invalid_token(self):
+        self.assert_unauthorized(
+            self.get_with_cookies(self.url, token="nonsense")
+        )
+        self.assertEqual(self.pool.requests, [])
+
+
+class ClusterStatusPlaintextNoWorkers(AppTest):
+    def get_routes(self):
+        self.pool = None
+        return super().get_routes()
+
+    def test_passed_to_ruby(self):
+        self.assert_wrappers_response(
+            self.get("/remote/cluster_status_plaintext")
+        )
+
+
+class NodeStatus(AppTest):
+    url = "/remote/status?version=2"
+
+    def setUp(self):
+        super().setUp()
+        self.pool.response = json.dumps(
+            {
+                "status": "success",
+                "status_msg": None,
+                "report_list": [],
+                "data": {"cluster_name": "cluster1", "node": {"id": "1"}},
+            }
+        ).encode()
+
+    def test_success(self):
+        self.write_permissions(
+            [{"type": "group", "name": "group2", "allow": ["read"]}]
+        )
+        response = self.get_with_cookies(
+            "/remote/status?version=2&operations=1", token=USER_TOKEN
+        )
+        self.assertEqual(response.code, 200)
+        node_status = json.loads(response.body)
+        self.assertIn("pcmk.resource.create", node_status["pcsd_capabilities"])
+        del node_status["pcsd_capabilities"]
+        self.assertEqual(
+            node_status, {"cluster_name": "cluster1", "node": {"id": "1"}}
+        )
+        self.assertEqual(
+            self.pool.requests,
+            [
+                (
+                    {
+                        "cmd": "status.pcsd_node_status",
+                        "cmd_data": {
+                            "operations": True,
+                            "skip_auth_check": False,
+                        },
+                        "options": {"request_timeout": None},
+                    },
+                    fixtures_app.USER,
+                    fixtures_app.GROUPS,
+                )
+            ],
+        )
+
+    def test_skip_auth_check(self):
+        response = self.get_with_cookies(
+            "/remote/status?version=2&skip_auth_check=1&node=",
+            token=SUPERUSER_TOKEN,
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(
+            self.pool.requests[0][0]["cmd_data"],
+            {"operations": False, "skip_auth_check": True},
+        )
+
+    def test_redirected(self):
+        response = self.get_with_cookies(
+            "/remote/status?version=2&node=node2&redirected=1",
+            token=SUPERUSER_TOKEN,
+        )
+        self.assertEqual(response.code, 200)
+        self.assertEqual(len(self.pool.requests), 1)
+
+    def test_other_node(self):
+        self.assert_wrappers_response(
+            self.get_with_cookies(
+                "/remote/status?version=2&node=node2", token=SUPERUSER_TOKEN
+            )
+        )
+        self.assertEqual(self.pool.requests, [])
+
+    def test_unsupported_version(self):
+        for url in ("/remote/status", "/remote/status?version=1"):
+            with self.subTest(url=url):
+                response = self.get_with_cookies(url, token=SUPERUSER_TOKEN)
+                self.assertEqual(response.code, 400)
+        self.assertEqual(
+            response.body, b"Unsupported version '1' of status requested"
+        )
+        self.assertEqual(self.pool.requests, [])
+
+    def test_user_not_allowed(self):
+        self.write_permissions(
+            [{"type": "group", "name": "group2", "allow": ["grant"]}]
+        )
+        response = self.get_with_cookies(self.url, token=USER_TOKEN)
+        self.assertEqual(response.code, 403)
+        self.assertEqual(response.body, b"Permission denied")
+        self.assertEqual(self.pool.requests, [])
+
+    def test_command_failed(self):
+        self.pool.response = json.dumps(
+            {
+                "status": "error",
+                "status_msg": None,
+                "report_list": [_report("ERROR")],
+                "data": None,
+            }
+        ).encode()
+        response = self.get_with_cookies(self.url, token=SUPERUSER_TOKEN)
+        self.assertEqual(response.code, 500)
+        self.assertEqual(response.body, b"Unable to get node status")
+
+    def test_invalid_token(self):
+        self.assert_unauthorized(
+            self.get_with_cookies(self.url, token="nonsense")
+        )
+        self.assertEqual(self.pool.requests, [])
+
+
+class NodeStatusNoWorkers(AppTest):
+    def get_routes(self):
+        self.pool = None
+        return super().get_routes()
+
+    def test_passed_to_ruby(self):
+        self.assert_wrappers_response(self.get("/remote/status?version=2"))
+
+
+class OtherCommands(AppTest):
+    def test_passed_to_ruby(self):
+        self.assert_wrappers_response(self.get("/remote/get_configs"))
+
+
+class SharedAuthCases(TmpFilesMixin, AsyncTestCase):
+    """
+    Ruby pcsd runs the same cases in pcsd/test/test_remote_auth_cases.rb
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cases = json.loads(read_test_resource("remote_auth_cases.json"))
+        self.assertEqual(self.cases["superuser"], SUPERUSER)
+        self.assertEqual(self.cases["admin_group"], ADMIN_GROUP)
+        self.provider = remote.RemoteAuthProvider(
+            self.users_conf, self.settings_conf
+        )
+
+    async def check_user_groups(self, username):
+        groups = self.cases["user_groups"].get(username)
+        if groups is None:
+            return UserAuthInfo(username, [], False)
+        return UserAuthInfo(
+            username, tuple(groups), self.cases["admin_group"] in groups
+        )
+
+    @gen_test
+    async def test_login_by_token(self):
+        self.write_file(self.users_conf, json.dumps(self.cases["users"]))
+        for test_case in self.cases["login_by_token"]:
+            with self.subTest(cookies=test_case["cookies"]):
+                expected = test_case["user"]
+                self.assertEqual(
+                    await self.provider.login_by_token(
+                        test_case["cookies"].get("token"),
+                        test_case["cookies"],
+                    ),
+                    None
+                    if expected is None
+                    else remote.RemoteUser(
+                        expected["name"], expected["groups"]
+                    ),
+                )
+
+    def test_allows_local_cluster(self):
+        for test_case in self.cases["allows_local_cluster"]:
+            if test_case["pcs_settings"] is None:
+                if os.path.exists(self.settings_conf):
+                    os.unlink(self.settings_conf)
+            else:
+                self.write_file(self.settings_conf, test_case["pcs_settings"])
+            # Files of some cases only differ in their content, make sure they
+            # are not served from a cache.
+            provider = remote.RemoteAuthProvider(
+                self.users_conf, self.settings_conf
+            )
+            for user, groups, action, allowed in test_case["checks"]:
+                with self.subTest(
+                    pcs_settings=test_case["pcs_settings"],
+                    check=(user, groups, action),
+                ):
+                    self.assertEqual(
+                        provider.allows_local_cluster(
+                            remote.RemoteUser(user, groups), action
+                        ),
+                        allowed,
+                    )
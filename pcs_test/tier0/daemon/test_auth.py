@@ -1,6 +1,13 @@
 import logging
+import os
+import time
 from unittest import TestCase
 
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test,
+)
+
 from pcs.daemon import auth
 
 from pcs_test.tools.misc import create_setup_patch_mixin
@@ -39,3 +46,108 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+
+class AuthPool(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = auth.AuthPool(worker_count=1, timeout=2)
+        self.addCleanup(self.pool.stop)
+
+    @gen_test
+    async def test_run(self):
+        self.assertEqual(await self.pool.run(pow, 2, 3), 8)
+        self.assertEqual(await self.pool.run(pow, 3, 2), 9)
+
+    @gen_test
+    async def test_timeout(self):
+        # pylint: disable=protected-access
+        self.pool._timeout = 0.2
+        with self.assertRaises(auth.AuthPoolError):
+            await self.pool.run(time.sleep, 5)
+        self.pool._timeout = 2
+        self.assertEqual(await self.pool.run(pow, 2, 3), 8)
+
+    @gen_test
+    async def test_process_died(self):
+        # pylint: disable=protected-access
+        with self.assertRaises(auth.AuthPoolError):
+            await self.pool.run(os._exit, 1)
+        self.assertEqual(await self.pool.run(pow, 2, 3), 8)
+
+    @gen_test
+    async def test_health_check(self):
+        self.assertTrue(await self.pool.check_health())
+
+
+class UserGroupsCache(TestCase):
+    def setUp(self):
+        self.now = 100
+        self.cache = auth.UserGroupsCache(10, time_fn=lambda: self.now)
+
+    def test_authorized_cached(self):
+        self.cache.update(auth.UserAuthInfo(USER, ["haclient"], True))
+        self.now = 109
+        self.assertEqual(self.cache.get(USER), ["haclient"])
+
+    def test_expired(self):
+        self.cache.update(auth.UserAuthInfo(USER, ["haclient"], True))
+        self.now = 110
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_failure_invalidates(self):
+        self.cache.update(auth.UserAuthInfo(USER, ["haclient"], True))
+        self.cache.update(auth.UserAuthInfo(USER, [], False))
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_disabled(self):
+        cache = auth.UserGroupsCache(0)
+        cache.update(auth.UserAuthInfo(USER, ["haclient"], True))
+        self.assertIsNone(cache.get(USER))
+
+
+class CheckUserGroups(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+        self.setup_patch("run_in_process", self.run_in_process)
+        self.setup_patch("user_groups_cache", auth.UserGroupsCache(10))
+        self.authorized = True
+
+    async def run_in_process(self, sync_fn, *args):
+        self.calls.append(sync_fn)
+        if sync_fn is auth.check_user_groups_sync:
+            return auth.UserAuthInfo(
+                args[0], [auth.HA_ADM_GROUP], self.authorized
+            )
+        raise auth.AuthPoolError("timeout")
+
+    @gen_test
+    async def test_cached(self):
+        for _ in range(3):
+            user = await auth.check_user_groups(USER)
+            self.assertTrue(user.is_authorized)
+        self.assertEqual(self.calls, [auth.check_user_groups_sync])
+
+    @gen_test
+    async def test_not_authorized_not_cached(self):
+        self.authorized = False
+        for _ in range(2):
+            user = await auth.check_user_groups(USER)
+            self.assertFalse(user.is_authorized)
+        self.assertEqual(len(self.calls), 2)
+
+    @gen_test
+    async def test_failed_login_invalidates(self):
+        await auth.check_user_groups(USER)
+        user = await auth.authorize_user(USER, PASSWORD)
+        self.assertFalse(user.is_authorized)
+        await auth.check_user_groups(USER)
+        self.assertEqual(
+            self.calls,
+            [
+                auth.check_user_groups_sync,
+                auth.authorize_user_sync,
+                auth.check_user_groups_sync,
+            ],
+        )
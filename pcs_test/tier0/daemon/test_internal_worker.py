@@ -0,0 +1,98 @@
+import json
+import logging
+import os
+import socket
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from tornado.iostream import IOStream
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test,
+)
+
+from pcs.daemon import internal_worker
+
+from pcs_test.tools.misc import get_tmp_dir
+
+# Don't write errors to test output.
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+
+
+class PoolMock:
+    def __init__(self):
+        self.requests = []
+
+    async def run(self, request_json, user, groups):
+        self.requests.append((request_json, user, groups))
+        return b'{"status": "success"}'
+
+    def stop(self):
+        pass
+
+
+class InternalServer(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = get_tmp_dir("tier0_daemon_internal_worker")
+        self.socket_path = os.path.join(self.tmp_dir.name, "socket")
+        self.pool = PoolMock()
+        self.server = internal_worker.InternalServer(self.pool)
+        self.server.add_socket(
+            internal_worker.bind_unix_socket(self.socket_path, mode=0o600)
+        )
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    async def _send(self, data):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stream = IOStream(sock)
+        await stream.connect(self.socket_path)
+        await stream.write(data)
+        response = await stream.read_until_close()
+        stream.close()
+        return response
+
+    @gen_test
+    async def test_success(self):
+        response = await self._send(
+            b'{"user": "hacluster", "groups": ["haclient"]}\n{"cmd": "x"}\n'
+        )
+        self.assertEqual(response, b'{"status": "success"}')
+        self.assertEqual(
+            self.pool.requests, [(b'{"cmd": "x"}\n', "hacluster", ["haclient"])]
+        )
+
+    @gen_test
+    async def test_no_user(self):
+        await self._send(b'{"user": "", "groups": []}\n{}\n')
+        self.assertEqual(self.pool.requests, [(b"{}\n", None, None)])
+
+    @gen_test
+    async def test_invalid_header(self):
+        response = await self._send(b'["user"]\n{"cmd": "x"}\n')
+        self.assertEqual(json.loads(response)["status"], "input_error")
+        self.assertEqual(self.pool.requests, [])
+
+    def test_socket_permissions(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+
+class WorkerPool(AsyncTestCase):
+    @gen_test
+    async def test_broken_pool_restarted(self):
+        future = Future()
+        future.set_exception(BrokenProcessPool("died"))
+        pool = internal_worker.WorkerPool(1)
+        with mock.patch.object(
+            internal_worker, "ProcessPoolExecutor"
+        ) as mock_executor:
+            mock_executor.return_value.submit.return_value = future
+            response = await pool.run(b"{}", None, None)
+        self.assertEqual(json.loads(response)["status"], "exception")
+        self.assertEqual(mock_executor.call_count, 2)
+        mock_executor.return_value.shutdown.assert_called_once_with(wait=False)
@@ -1,10 +1,14 @@
+import os
 from contextlib import contextmanager
 from unittest import TestCase
 
 from pcs.daemon import session
 from pcs.daemon.session import Session
 
-from pcs_test.tools.misc import create_setup_patch_mixin
+from pcs_test.tools.misc import (
+    create_setup_patch_mixin,
+    get_tmp_dir,
+)
 
 SID = "abc"
 USER = "user"
@@ -65,6 +69,15 @@ class SessionTest(TestCase, AssertMixin, PatchSessionMixin):
         with self.refresh_test() as session1:
             session1.ajax_id
 
+    def test_last_access_does_not_refresh(self):
+        self.now.return_value = 10.1
+        self.assertEqual(self.session.last_access, 0)
+        self.assertTrue(self.session.was_unused_last(10))
+
+    def test_restored_last_access(self):
+        self.now.return_value = 10.1
+        self.assertEqual(Session(SID, last_access=5).last_access, 5)
+
 
 class StorageTest(TestCase, AssertMixin, PatchSessionMixin):
     def setUp(self):
@@ -131,3 +144,97 @@ class StorageTest(TestCase, AssertMixin, PatchSessionMixin):
         session2 = self.storage.rejected_user(session1.sid, USER)
         self.assert_login_failed_session(session2, USER)
         self.assertEqual(session1.sid, session2.sid)
+
+    def test_sid_is_long_and_random(self):
+        session1 = self.storage.provide()
+        session2 = self.storage.provide()
+        self.assertEqual(len(session1.sid), 64)
+        self.assertNotEqual(session1.sid, session2.sid)
+
+    def test_does_not_drop_refreshed_session(self):
+        session1 = self.storage.provide()
+        self.now.return_value = 8
+        self.storage.provide(session1.sid)
+        self.now.return_value = 12
+        self.storage.drop_expired()
+        self.assertIs(self.storage.provide(session1.sid), session1)
+        self.now.return_value = 19
+        self.storage.drop_expired()
+        self.assertIs(self.storage.provide(session1.sid), session1)
+        self.now.return_value = 30
+        self.storage.drop_expired()
+        self.assertIsNot(self.storage.provide(session1.sid), session1)
+
+    def test_drops_logged_in_session(self):
+        session1 = self.storage.provide()
+        self.now.return_value = 5
+        session2 = self.storage.login(session1.sid, USER, GROUPS)
+        self.now.return_value = 12
+        self.storage.drop_expired()
+        self.assertIs(self.storage.provide(session2.sid), session2)
+        self.now.return_value = 30
+        self.storage.drop_expired()
+        self.assertIsNot(self.storage.provide(session2.sid), session2)
+
+
+class PersistentStorageTest(TestCase, AssertMixin, PatchSessionMixin):
+    def setUp(self):
+        self.now = self.setup_patch("now", return_value=0)
+        self.tmp_dir = get_tmp_dir("tier0_daemon_session")
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_path = os.path.join(self.tmp_dir.name, "sessions.sqlite")
+        self.storage = self.open_storage()
+
+    def open_storage(self):
+        storage = session.Storage(
+            lifetime_seconds=10, backend=session.SqliteBackend(self.db_path)
+        )
+        self.addCleanup(storage.close)
+        return storage
+
+    def restart(self):
+        self.storage.close()
+        self.storage = self.open_storage()
+
+    def test_db_is_readable_only_by_owner(self):
+        self.assertEqual(os.stat(self.db_path).st_mode & 0o777, 0o600)
+
+    def test_keeps_logged_in_session(self):
+        sid = self.storage.login(None, USER, GROUPS, ajax_id="ajax").sid
+        self.restart()
+        session1 = self.storage.provide(sid)
+        self.assertEqual(session1.sid, sid)
+        self.assert_authenticated_session(session1, USER, GROUPS)
+        self.assertEqual(session1.ajax_id, "ajax")
+
+    def test_keeps_rejected_user_session(self):
+        sid = self.storage.rejected_user(None, USER).sid
+        self.restart()
+        session1 = self.storage.provide(sid)
+        self.assertEqual(session1.sid, sid)
+        self.assert_login_failed_session(session1, USER)
+
+    def test_does_not_keep_vanilla_session(self):
+        sid = self.storage.provide().sid
+        self.restart()
+        self.assertNotEqual(self.storage.provide(sid).sid, sid)
+
+    def test_does_not_keep_destroyed_session(self):
+        sid = self.storage.login(None, USER, GROUPS).sid
+        self.storage.destroy(sid)
+        self.restart()
+        self.assertNotEqual(self.storage.provide(sid).sid, sid)
+
+    def test_does_not_load_expired_session(self):
+        sid = self.storage.login(None, USER, GROUPS).sid
+        self.now.return_value = 11
+        self.restart()
+        self.assertNotEqual(self.storage.provide(sid).sid, sid)
+
+    def test_keeps_last_access(self):
+        sid = self.storage.login(None, USER, GROUPS).sid
+        self.now.return_value = 8
+        self.storage.provide(sid)
+        self.restart()
+        self.now.return_value = 17
+        self.assertEqual(self.storage.provide(sid).sid, sid)
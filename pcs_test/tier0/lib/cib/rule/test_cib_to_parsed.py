@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs.lib.cib.rule.cib_to_parsed import rule_element_to_parsed
+from pcs.lib.cib.rule.expression_part import (
+    BOOL_AND,
+    BOOL_OR,
+    DATE_OP_GT,
+    DATE_OP_LT,
+    NODE_ATTR_OP_DEFINED,
+    NODE_ATTR_OP_GT,
+    NODE_ATTR_TYPE_INTEGER,
+    BoolExpr,
+    DateInRangeExpr,
+    DatespecExpr,
+    DateUnaryExpr,
+    NodeAttrExpr,
+    OpExpr,
+    RscExpr,
+)
+
+
+class RuleElementToParsed(TestCase):
+    def test_empty_rule(self):
+        self.assertEqual(
+            rule_element_to_parsed(etree.fromstring('<rule id="r"/>')),
+            BoolExpr(BOOL_AND, []),
+        )
+
+    def test_complex_rule(self):
+        rule_el = etree.fromstring(
+            """
+            <rule id="r" boolean-op="and" score="INFINITY">
+                <rsc_expression id="r-rsc" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+                <op_expression id="r-op" name="monitor" interval="30"/>
+                <rule id="r-rule" boolean-op="or" score="0">
+                    <expression id="r-rule-expr" operation="defined"
+                        attribute="attr1"
+                    />
+                    <expression id="r-rule-expr-1" attribute="attr2"
+                        operation="gt" type="integer" value="5"
+                    />
+                    <date_expression id="r-rule-expr-2" operation="lt"
+                        end="2020-08-07"
+                    />
+                    <date_expression id="r-rule-expr-3" operation="gt"
+                        start="2020-08-07"
+                    />
+                    <date_expression id="r-rule-expr-4" operation="in_range"
+                        start="2020-09-01" end="2020-09-11"
+                    />
+                    <date_expression id="r-rule-expr-5" operation="in_range"
+                        start="2020-10-01"
+                    >
+                        <duration id="r-rule-expr-5-duration" months="1"/>
+                    </date_expression>
+                    <date_expression id="r-rule-expr-6" operation="date_spec">
+                        <date_spec id="r-rule-expr-6-datespec"
+                            years="2021-2022" weekdays="1-5"
+                        />
+                    </date_expression>
+                    <date_expression id="r-rule-expr-7" operation="in_range"
+                        end="2020-12-11"
+                    />
+                </rule>
+            </rule>
+            """
+        )
+        self.assertEqual(
+            rule_element_to_parsed(rule_el),
+            BoolExpr(
+                BOOL_AND,
+                [
+                    RscExpr("ocf", "pacemaker", "Dummy"),
+                    OpExpr("monitor", "30"),
+                    BoolExpr(
+                        BOOL_OR,
+                        [
+                            NodeAttrExpr(
+                                NODE_ATTR_OP_DEFINED, "attr1", None, None
+                            ),
+                            NodeAttrExpr(
+                                NODE_ATTR_OP_GT,
+                                "attr2",
+                                "5",
+                                NODE_ATTR_TYPE_INTEGER,
+                            ),
+                            DateUnaryExpr(DATE_OP_LT, "2020-08-07"),
+                            DateUnaryExpr(DATE_OP_GT, "2020-08-07"),
+                            DateInRangeExpr("2020-09-01", "2020-09-11", None),
+                            DateInRangeExpr(
+                                "2020-10-01", None, [("months", "1")]
+                            ),
+                            DatespecExpr(
+                                [("years", "2021-2022"), ("weekdays", "1-5")]
+                            ),
+                            DateInRangeExpr(None, "2020-12-11", None),
+                        ],
+                    ),
+                ],
+            ),
+        )
@@ -0,0 +1,318 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from unittest import TestCase
+
+from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.cib.rule.evaluator import (
+    get_in_effect_status,
+    get_next_change,
+    is_rule_in_effect,
+)
+from pcs.lib.cib.rule.parser import parse_rule
+
+# Wednesday, dates without a time zone are in the local time
+NOW = datetime(2020, 6, 17, 12, 30)
+IN_EFFECT = CibRuleInEffectStatus.IN_EFFECT
+EXPIRED = CibRuleInEffectStatus.EXPIRED
+NOT_YET_IN_EFFECT = CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+UNKNOWN = CibRuleInEffectStatus.UNKNOWN
+
+
+class GetInEffectStatus(TestCase):
+    def assert_status(self, rule_string, status):
+        self.assertEqual(
+            get_in_effect_status(parse_rule(rule_string), NOW), status
+        )
+
+    def assert_status_list(self, test_data):
+        for rule_string, status in test_data:
+            with self.subTest(rule_string=rule_string):
+                self.assert_status(rule_string, status)
+
+    def test_no_date_expressions(self):
+        self.assert_status_list(
+            [
+                ("", UNKNOWN),
+                ("resource ocf:pacemaker:Dummy and op monitor", UNKNOWN),
+            ]
+        )
+
+    def test_date_unary(self):
+        self.assert_status_list(
+            [
+                ("date gt 2020-06-17T12:00", IN_EFFECT),
+                ("date gt 2020-06-17T13:00", NOT_YET_IN_EFFECT),
+                ("date lt 2020-06-17T13:00", IN_EFFECT),
+                ("date lt 2020-06-17T12:00", EXPIRED),
+            ]
+        )
+
+    def test_date_inrange(self):
+        self.assert_status_list(
+            [
+                ("date in_range 2020-06-01 to 2020-07-01", IN_EFFECT),
+                ("date in_range 2020-07-01 to 2020-08-01", NOT_YET_IN_EFFECT),
+                ("date in_range 2020-05-01 to 2020-06-01", EXPIRED),
+                ("date in_range to 2020-07-01", IN_EFFECT),
+                ("date in_range to 2020-06-01", EXPIRED),
+                (
+                    "date in_range 2020-06-01 to duration months=1",
+                    IN_EFFECT,
+                ),
+                (
+                    "date in_range 2020-06-01 to duration days=1 hours=2",
+                    EXPIRED,
+                ),
+            ]
+        )
+
+    def test_datespec(self):
+        self.assert_status_list(
+            [
+                ("date-spec years=2020", IN_EFFECT),
+                ("date-spec years=2019", EXPIRED),
+                ("date-spec years=2021-2022", NOT_YET_IN_EFFECT),
+                ("date-spec years=2020 months=7-12", NOT_YET_IN_EFFECT),
+                ("date-spec years=2020 months=1-5", EXPIRED),
+                ("date-spec weekdays=1-5", IN_EFFECT),
+                ("date-spec weekdays=6-7", NOT_YET_IN_EFFECT),
+                ("date-spec moon=4", UNKNOWN),
+            ]
+        )
+
+    def test_invalid_values(self):
+        self.assert_status_list(
+            [
+                ("date gt 2020-13-17", UNKNOWN),
+                ("date-spec weekdays=a-b", UNKNOWN),
+                ("date in_range 2020-06-01 to duration moon=1", UNKNOWN),
+            ]
+        )
+
+    def test_and(self):
+        self.assert_status_list(
+            [
+                ("date gt 2020-01-01 and op monitor", IN_EFFECT),
+                ("date lt 2020-01-01 and op monitor", EXPIRED),
+                (
+                    "date gt 2020-01-01 and date lt 2021-01-01",
+                    IN_EFFECT,
+                ),
+                (
+                    "date gt 2021-01-01 and date lt 2022-01-01",
+                    NOT_YET_IN_EFFECT,
+                ),
+                (
+                    "date gt 2021-01-01 and date lt 2020-01-01",
+                    EXPIRED,
+                ),
+                ("date gt 2021-01-01 and date-spec moon=4", UNKNOWN),
+            ]
+        )
+
+    def test_or(self):
+        self.assert_status_list(
+            [
+                ("date lt 2020-01-01 or op monitor", UNKNOWN),
+                ("date lt 2020-01-01 or date gt 2021-01-01", NOT_YET_IN_EFFECT),
+                ("date lt 2020-01-01 or date gt 2020-01-01", IN_EFFECT),
+                ("date lt 2020-01-01 or date lt 2019-01-01", EXPIRED),
+                ("date lt 2020-01-01 or date-spec moon=4", UNKNOWN),
+                (
+                    "(date lt 2020-01-01 or date gt 2020-05-01) "
+                    "and op monitor",
+                    IN_EFFECT,
+                ),
+            ]
+        )
+
+    def test_node_attrs_not_decided(self):
+        self.assert_status_list(
+            [
+                ("defined pingd", None),
+                ("date gt 2020-01-01 and defined pingd", None),
+                ("date lt 2020-01-01 and defined pingd", None),
+                ("date lt 2020-01-01 or defined pingd", None),
+                (
+                    "(date lt 2020-01-01 or date gt 2020-05-01) "
+                    "and #uname eq node1",
+                    None,
+                ),
+            ]
+        )
+
+    def test_time_zones(self):
+        now = NOW.astimezone()
+        offset = now.utcoffset()
+        for date, status in (
+            (now - offset + timedelta(hours=1), IN_EFFECT),
+            (now - offset - timedelta(hours=1), EXPIRED),
+        ):
+            with self.subTest(date=date):
+                self.assert_status(
+                    "date lt {}Z".format(date.strftime("%Y-%m-%dT%H:%M")),
+                    status,
+                )
+
+
+class IsRuleInEffect(TestCase):
+    def assert_in_effect(self, test_data, node_attrs=None):
+        for rule_string, in_effect in test_data:
+            with self.subTest(rule_string=rule_string):
+                self.assertEqual(
+                    is_rule_in_effect(parse_rule(rule_string), NOW, node_attrs),
+                    in_effect,
+                )
+
+    def test_dates(self):
+        self.assert_in_effect(
+            [
+                ("date gt 2020-06-17T12:30:00", False),
+                ("date gt 2020-06-17T12:29:59", True),
+                ("date lt 2020-06-17T12:30:00", False),
+                ("date lt 2020-06-17T12:30:01", True),
+                ("date in_range 2020-06-17T12:30 to 2020-06-18", True),
+                ("date in_range 2020-06-16 to 2020-06-17T12:30", True),
+                ("date in_range 2020-06-16 to 2020-06-17T12:29", False),
+                ("date-spec hours=12 minutes=30", True),
+                ("date-spec hours=9-12 weekdays=3 months=6", True),
+                ("date-spec hours=13-17", False),
+                ("date-spec weeks=25 weekyears=2020 yeardays=169", True),
+                ("date-spec monthdays=17 seconds=1-59", False),
+            ]
+        )
+
+    def test_node_attrs(self):
+        self.assert_in_effect(
+            [
+                ("defined pingd", True),
+                ("not_defined pingd", False),
+                ("defined missing", False),
+                ("not_defined missing", True),
+                ("pingd eq 100", True),
+                ("pingd ne 100", False),
+                ("missing eq 100", False),
+                ("missing ne 100", True),
+                ("missing gt 100", False),
+                ("pingd gt 99", True),
+                ("pingd gt integer 99", True),
+                ("pingd lt 1000", True),
+                ("pingd gt 20", True),
+                ("pingd gt string 20", False),
+                ("pingd gte number 100.0", True),
+                ("ratio lt 0.6", True),
+                ("name eq NODE1", True),
+                ("name lt node2", True),
+                ("version gt version 2.1.1", True),
+                ("version lt version 2.1.10", True),
+                ("version eq version 2.1.2.0", True),
+                ("pingd gt 99 and date gt 2021-01-01", False),
+                ("pingd gt 99 or date gt 2021-01-01", True),
+                ("resource ocf:pacemaker:Dummy and op monitor", True),
+            ],
+            {
+                "pingd": "100",
+                "ratio": "0.5",
+                "name": "node1",
+                "version": "2.1.2",
+            },
+        )
+
+    def test_node_attrs_default_empty(self):
+        self.assertFalse(is_rule_in_effect(parse_rule("defined pingd"), NOW))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            is_rule_in_effect(parse_rule("date-spec moon=4"), NOW)
+
+
+class GetNextChange(TestCase):
+    def assert_next_change(self, test_data, node_attrs=None):
+        for rule_string, next_change in test_data:
+            with self.subTest(rule_string=rule_string):
+                self.assertEqual(
+                    get_next_change(parse_rule(rule_string), NOW, node_attrs),
+                    next_change.astimezone() if next_change else None,
+                )
+
+    def test_dates(self):
+        self.assert_next_change(
+            [
+                ("date gt 2020-06-18", datetime(2020, 6, 18, 0, 0, 1)),
+                ("date gt 2020-06-16", None),
+                ("date lt 2020-06-18", datetime(2020, 6, 18)),
+                ("date lt 2020-06-16", None),
+                (
+                    "date in_range 2020-06-18 to 2020-06-19",
+                    datetime(2020, 6, 18),
+                ),
+                (
+                    "date in_range 2020-06-16 to 2020-06-19",
+                    datetime(2020, 6, 19, 0, 0, 1),
+                ),
+                (
+                    "date in_range 2020-06-16 to duration days=2 hours=3",
+                    datetime(2020, 6, 18, 3, 0, 1),
+                ),
+                (
+                    "date gt 2020-06-18 and date lt 2020-06-10",
+                    None,
+                ),
+                (
+                    "date lt 2020-06-18 or date gt 2020-06-18",
+                    datetime(2020, 6, 18),
+                ),
+                (
+                    "date lt 2020-06-18 or date gt 2020-06-17T23:00",
+                    None,
+                ),
+            ]
+        )
+
+    def test_datespec(self):
+        self.assert_next_change(
+            [
+                ("date-spec hours=9-16", datetime(2020, 6, 17, 17)),
+                ("date-spec hours=13-16", datetime(2020, 6, 17, 13)),
+                ("date-spec hours=1-3", datetime(2020, 6, 18, 1)),
+                ("date-spec weekdays=1-5", datetime(2020, 6, 20)),
+                ("date-spec weekdays=6-7", datetime(2020, 6, 20)),
+                ("date-spec weekdays=1", datetime(2020, 6, 22)),
+                (
+                    "date-spec weekdays=1-5 hours=9-16",
+                    datetime(2020, 6, 17, 17),
+                ),
+                ("date-spec weekdays=6 hours=9-16", datetime(2020, 6, 20, 9)),
+                ("date-spec monthdays=31", datetime(2020, 7, 31)),
+                ("date-spec months=2 monthdays=29", datetime(2024, 2, 29)),
+                ("date-spec months=2 monthdays=30", None),
+                ("date-spec yeardays=366", datetime(2020, 12, 31)),
+                ("date-spec years=2020", datetime(2021, 1, 1)),
+                ("date-spec years=2021-2022", datetime(2021, 1, 1)),
+                ("date-spec years=2019", None),
+                ("date-spec years=2020 months=1-5", None),
+                ("date-spec years=2020-2021 months=1-5", datetime(2021, 1, 1)),
+                ("date-spec weeks=26", datetime(2020, 6, 22)),
+                ("date-spec weekyears=2021", datetime(2021, 1, 4)),
+                ("date-spec minutes=0-29", datetime(2020, 6, 17, 13)),
+                ("date-spec seconds=30", datetime(2020, 6, 17, 12, 30, 30)),
+            ]
+        )
+
+    def test_node_attrs(self):
+        self.assert_next_change(
+            [
+                ("defined pingd or date gt 2020-06-18", None),
+                (
+                    "defined pingd and date gt 2020-06-18",
+                    datetime(2020, 6, 18, 0, 0, 1),
+                ),
+                ("not_defined pingd and date gt 2020-06-18", None),
+            ],
+            {"pingd": "100"},
+        )
+
+    def test_no_date_expressions(self):
+        self.assertIsNone(get_next_change(parse_rule("defined pingd"), NOW))
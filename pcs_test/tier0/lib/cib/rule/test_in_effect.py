@@ -0,0 +1,224 @@
+import os.path
+from datetime import datetime
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.cib.rule import (
+    RuleInEffectEvalAllAtOnce,
+    RuleInEffectEvalPython,
+)
+from pcs.lib.external import CommandRunner
+
+FIXTURE_CIB = etree.fromstring(
+    """
+    <cib>
+        <configuration>
+            <constraints>
+                <rsc_location id="L1" rsc="A">
+                    <rule id="r1" score="INFINITY">
+                        <date_expression id="r1-expr" operation="lt"
+                            end="2000-01-01"
+                        />
+                    </rule>
+                </rsc_location>
+                <rsc_location id="L2" rsc="A">
+                    <rule id="r2" score="INFINITY" boolean-op="or">
+                        <rule id="r2-rule" score="0">
+                            <date_expression id="r2-rule-expr" operation="gt"
+                                start="2000-01-01"
+                            />
+                        </rule>
+                        <expression id="r2-expr" operation="defined"
+                            attribute="pingd"
+                        />
+                    </rule>
+                </rsc_location>
+            </constraints>
+        </configuration>
+    </cib>
+    """
+)
+CMD = [
+    os.path.join(settings.pacemaker_binaries, "crm_rule"),
+    "--check",
+    "--output-as",
+    "xml",
+    "--xml-text",
+    "-",
+    "--rule",
+    "r1",
+    "--rule",
+    "r2",
+    "--rule",
+    "r2-rule",
+]
+
+
+CMD_ONE_RULE = [
+    os.path.join(settings.pacemaker_binaries, "crm_rule"),
+    "--check",
+    "--rule",
+    "r2",
+    "--xml-text",
+    "-",
+]
+
+
+def get_runner(stdout, returncode=0):
+    runner = mock.MagicMock(spec_set=CommandRunner)
+    runner.run.return_value = (stdout, "", returncode)
+    return runner
+
+
+def get_runner_with_fallback(stdout, returncode=0):
+    # r2 depends on node attributes, python leaves it to crm_rule
+    runner = mock.MagicMock(spec_set=CommandRunner)
+    runner.run.side_effect = [(stdout, "", returncode), ("", "", 0)]
+    return runner
+
+
+class RuleInEffectEvalAllAtOnceTest(TestCase):
+    def test_all_rules_checked_at_once(self):
+        runner = get_runner(
+            """
+            <pacemaker-result api-version="2.20" request="crm_rule">
+                <rule-check rule-id="r1" rc="110"/>
+                <rule-check rule-id="r2" rc="112"/>
+                <rule-check rule-id="r2-rule" rc="0"/>
+                <status code="112" message="Undetermined"/>
+            </pacemaker-result>
+            """,
+            returncode=112,
+        )
+        evaluator = RuleInEffectEvalAllAtOnce(FIXTURE_CIB, runner)
+        self.assertEqual(
+            [
+                evaluator.get_rule_status(rule_id)
+                for rule_id in ("r2-rule", "r2", "r1", "nonexistent")
+            ],
+            [
+                CibRuleInEffectStatus.IN_EFFECT,
+                CibRuleInEffectStatus.UNKNOWN,
+                CibRuleInEffectStatus.EXPIRED,
+                CibRuleInEffectStatus.UNKNOWN,
+            ],
+        )
+        runner.run.assert_called_once_with(CMD, stdin_string=mock.ANY)
+
+    def test_fallback_to_python(self):
+        runner = get_runner_with_fallback(
+            """
+            <pacemaker-result api-version="2.10" request="crm_rule">
+                <rule-check rule-id="r2-rule" rc="0"/>
+                <status code="0" message="OK"/>
+            </pacemaker-result>
+            """,
+        )
+        evaluator = RuleInEffectEvalAllAtOnce(FIXTURE_CIB, runner)
+        self.assertEqual(
+            [
+                evaluator.get_rule_status(rule_id)
+                for rule_id in ("r1", "r2", "r2-rule")
+            ],
+            [
+                CibRuleInEffectStatus.EXPIRED,
+                CibRuleInEffectStatus.IN_EFFECT,
+                CibRuleInEffectStatus.IN_EFFECT,
+            ],
+        )
+        self.assertEqual(
+            runner.run.call_args_list,
+            [
+                mock.call(CMD, stdin_string=mock.ANY),
+                mock.call(CMD_ONE_RULE, stdin_string=mock.ANY),
+            ],
+        )
+
+    def test_xml_output_not_supported(self):
+        runner = get_runner_with_fallback("", returncode=64)
+        evaluator = RuleInEffectEvalAllAtOnce(FIXTURE_CIB, runner)
+        self.assertEqual(
+            [
+                evaluator.get_rule_status(rule_id)
+                for rule_id in ("r1", "r2", "r2-rule")
+            ],
+            [
+                CibRuleInEffectStatus.EXPIRED,
+                CibRuleInEffectStatus.IN_EFFECT,
+                CibRuleInEffectStatus.IN_EFFECT,
+            ],
+        )
+        self.assertEqual(
+            runner.run.call_args_list,
+            [
+                mock.call(CMD, stdin_string=mock.ANY),
+                mock.call(CMD_ONE_RULE, stdin_string=mock.ANY),
+            ],
+        )
+
+
+class RuleInEffectEvalPythonTest(TestCase):
+    def setUp(self):
+        self.evaluator = RuleInEffectEvalPython(
+            FIXTURE_CIB, datetime(2020, 6, 17)
+        )
+
+    def test_get_rule_status(self):
+        self.assertEqual(
+            [
+                self.evaluator.get_rule_status(rule_id)
+                for rule_id in ("r1", "r2", "r2-rule", "nonexistent")
+            ],
+            [
+                CibRuleInEffectStatus.EXPIRED,
+                CibRuleInEffectStatus.UNKNOWN,
+                CibRuleInEffectStatus.IN_EFFECT,
+                CibRuleInEffectStatus.UNKNOWN,
+            ],
+        )
+
+    def test_is_rule_in_effect(self):
+        date = datetime(1999, 6, 17)
+        self.assertTrue(self.evaluator.is_rule_in_effect("r1", date))
+        self.assertFalse(self.evaluator.is_rule_in_effect("r2", date))
+        self.assertTrue(
+            self.evaluator.is_rule_in_effect("r2", date, {"pingd": "1"})
+        )
+        self.assertFalse(self.evaluator.is_rule_in_effect("nonexistent", date))
+
+    def test_get_rule_next_change(self):
+        date = datetime(1999, 6, 17)
+        self.assertEqual(
+            self.evaluator.get_rule_next_change("r1", date),
+            datetime(2000, 1, 1).astimezone(),
+        )
+        self.assertEqual(
+            self.evaluator.get_rule_next_change("r2", date),
+            datetime(2000, 1, 1, 0, 0, 1).astimezone(),
+        )
+        self.assertIsNone(
+            self.evaluator.get_rule_next_change("r2", date, {"pingd": "1"})
+        )
+        self.assertIsNone(
+            self.evaluator.get_rule_next_change("nonexistent", date)
+        )
+
+    def test_get_rules_in_effect(self):
+        self.assertEqual(
+            self.evaluator.get_rules_in_effect(datetime(1999, 6, 17)), ["r1"]
+        )
+        self.assertEqual(
+            self.evaluator.get_rules_in_effect(datetime(2020, 6, 17)), ["r2"]
+        )
+        self.assertEqual(
+            self.evaluator.get_rules_in_effect(
+                datetime(1999, 6, 17), {"pingd": "1"}
+            ),
+            ["r1", "r2"],
+        )
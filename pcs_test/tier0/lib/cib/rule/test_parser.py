@@ -900,3 +900,63 @@ class Parser(TestCase):
                         exception_data, (e.lineno, e.colno, e.pos, e.msg)
                     )
                 self.assertEqual(rule_string, e.rule_string)
+
+
+class ParserSimpleRules(TestCase):
+    # Simple rules are parsed without the grammar, the result must be the same
+    # as if the grammar was used. Rules in braces are always parsed by the
+    # grammar.
+    def test_same_as_grammar(self):
+        test_data = [
+            "date gt 2014-06-26",
+            "date lt 2014-06-26T12:00:00",
+            "  DATE Gt 2014-06-26  ",
+            "date lt and",
+            "date gt integer",
+            "defined pingd",
+            "not_defined pingd",
+            "Defined date",
+            "\tdefined\n\rpingd\t",
+            "resource ocf:pacemaker:Dummy",
+            "resource systemd::chronyd",
+            "RESOURCE :pacemaker:",
+            "resource ::Dummy",
+            "resource ::",
+        ]
+        for rule_string in test_data:
+            with self.subTest(rule_string=rule_string):
+                self.assertEqual(
+                    rule.parse_rule(f"({rule_string})"),
+                    rule.parse_rule(rule_string),
+                )
+
+    def test_not_simple(self):
+        test_data = [
+            ("date gt", (1, 8, 7, "Expected <date>")),
+            ("defined pingd pingd", (1, 15, 14, "Expected end of text")),
+            (
+                "resource ocf:pacemaker:Dummy:x",
+                (1, 29, 28, "Expected end of text"),
+            ),
+        ]
+        for rule_string, exception_data in test_data:
+            with self.subTest(rule_string=rule_string):
+                with self.assertRaises(rule.RuleParseError) as cm:
+                    rule.parse_rule(rule_string)
+                e = cm.exception
+                self.assertEqual(
+                    exception_data, (e.lineno, e.colno, e.pos, e.msg)
+                )
+
+
+class ParserCache(TestCase):
+    def test_same_rule_parsed_once(self):
+        rule_string = "#uname eq node1 and date gt 2014-06-26"
+        self.assertIs(
+            rule.parse_rule(rule_string), rule.parse_rule(rule_string)
+        )
+
+    def test_errors_not_cached(self):
+        for dummy_attempt in range(2):
+            with self.assertRaises(rule.RuleParseError):
+                rule.parse_rule("#uname eq")
@@ -0,0 +1,111 @@
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs.lib.cib.constraint.index import ResourceConstraintIndex
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.xml import etree_to_str
+
+
+def _ids(element_list):
+    return [element.get("id") for element in element_list]
+
+
+class ResourceConstraintIndexTest(TestCase):
+    def setUp(self):
+        self.constraints = etree.fromstring(
+            """
+            <constraints>
+                <rsc_location id="L1" rsc="A" node="node1" score="10"/>
+                <rsc_location id="L2" rsc-pattern="A.*" node="node1"
+                    score="10"
+                />
+                <rsc_order id="O1" first="B" then="A"/>
+                <rsc_colocation id="C1" rsc="A" with-rsc="A"
+                    score="INFINITY"
+                />
+                <rsc_ticket id="T1" ticket="T">
+                    <resource_set id="T1-set1">
+                        <resource_ref id="A"/>
+                        <resource_ref id="B"/>
+                    </resource_set>
+                </rsc_ticket>
+                <rsc_order id="O2">
+                    <resource_set id="O2-set1">
+                        <resource_ref id="A"/>
+                    </resource_set>
+                    <resource_set id="O2-set2">
+                        <resource_ref id="A"/>
+                        <resource_ref id="C"/>
+                    </resource_set>
+                </rsc_order>
+            </constraints>
+            """
+        )
+        self.index = ResourceConstraintIndex(self.constraints)
+
+    def test_get_plain_constraints(self):
+        self.assertEqual(
+            _ids(self.index.get_plain_constraints("A")), ["L1", "O1", "C1"]
+        )
+        self.assertEqual(_ids(self.index.get_plain_constraints("B")), ["O1"])
+        self.assertEqual(self.index.get_plain_constraints("X"), [])
+
+    def test_get_set_constraints(self):
+        self.assertEqual(
+            _ids(self.index.get_set_constraints("A")), ["T1", "O2"]
+        )
+        self.assertEqual(_ids(self.index.get_set_constraints("C")), ["O2"])
+        self.assertEqual(self.index.get_set_constraints("X"), [])
+
+    def test_remove_constraint(self):
+        self.index.remove_constraint(self.constraints[-1])
+        self.assertEqual(_ids(self.index.get_set_constraints("A")), ["T1"])
+        self.assertEqual(self.index.get_set_constraints("C"), [])
+        self.assertEqual(_ids(self.constraints), ["L1", "L2", "O1", "C1", "T1"])
+
+    def test_remove_references(self):
+        removed = self.index.remove_references(["A"])
+        self.assertEqual(_ids(removed), ["L1", "O1", "C1"])
+        assert_xml_equal(
+            """
+            <constraints>
+                <rsc_location id="L2" rsc-pattern="A.*" node="node1"
+                    score="10"
+                />
+                <rsc_ticket id="T1" ticket="T">
+                    <resource_set id="T1-set1">
+                        <resource_ref id="B"/>
+                    </resource_set>
+                </rsc_ticket>
+                <rsc_order id="O2">
+                    <resource_set id="O2-set2">
+                        <resource_ref id="C"/>
+                    </resource_set>
+                </rsc_order>
+            </constraints>
+            """,
+            etree_to_str(self.constraints),
+        )
+        self.assertEqual(self.index.get_plain_constraints("A"), [])
+        self.assertEqual(self.index.get_plain_constraints("B"), [])
+        self.assertEqual(self.index.get_set_constraints("A"), [])
+        self.assertEqual(_ids(self.index.get_set_constraints("B")), ["T1"])
+
+    def test_remove_references_empty_constraints(self):
+        removed = self.index.remove_references(["A", "B", "C"])
+        self.assertEqual(_ids(removed), ["L1", "O1", "C1", "T1", "O2"])
+        assert_xml_equal(
+            """
+            <constraints>
+                <rsc_location id="L2" rsc-pattern="A.*" node="node1"
+                    score="10"
+                />
+            </constraints>
+            """,
+            etree_to_str(self.constraints),
+        )
+        for resource_id in ("A", "B", "C"):
+            with self.subTest(resource_id=resource_id):
+                self.assertEqual(self.index.get_set_references(resource_id), [])
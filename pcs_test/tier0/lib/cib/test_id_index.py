@@ -0,0 +1,310 @@
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from lxml import etree
+
+from pcs.lib.cib import id_index
+from pcs.lib.cib import tools as lib
+
+from pcs_test.tier0.lib.cib import test_tools
+
+CIB = """
+    <cib>
+        <configuration>
+            <resources>
+                <primitive id="R1">
+                    <meta_attributes id="R1-meta">
+                        <nvpair id="R1-meta-remote" name="remote-node"
+                            value="node-R1"
+                        />
+                    </meta_attributes>
+                </primitive>
+                <primitive id="R2"/>
+                <primitive id="R2"/>
+            </resources>
+            <tags>
+                <tag id="T">
+                    <obj_ref id="R1"/>
+                    <obj_ref id="X1"/>
+                </tag>
+            </tags>
+            <acls>
+                <acl_target id="user1">
+                    <role id="role1"/>
+                </acl_target>
+            </acls>
+        </configuration>
+        <status>
+            <node_state id="S1"/>
+        </status>
+    </cib>
+"""
+
+
+class CibIdIndexTest(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring(CIB)
+        self.index = id_index.CibIdIndex(self.cib)
+
+    def assert_ids(self, element_id, expected_ids):
+        self.assertEqual(
+            [
+                element.get("id")
+                for element in self.index.get_elements(element_id)
+            ],
+            expected_ids,
+        )
+
+    def test_same_as_xpath(self):
+        for element_id in (
+            "R1",
+            "R2",
+            "R1-meta-remote",
+            "node-R1",
+            "T",
+            "X1",
+            "user1",
+            "role1",
+            "S1",
+            "missing",
+        ):
+            with self.subTest(element_id=element_id):
+                self.assertEqual(
+                    self.index.get_elements(element_id),
+                    lib.get_configuration_elements_by_id(self.cib, element_id),
+                )
+
+    def test_ids(self):
+        self.assert_ids("R1", ["R1"])
+        self.assert_ids("R2", ["R2", "R2"])
+        self.assert_ids("node-R1", ["R1"])
+        self.assert_ids("X1", [])
+        self.assert_ids("user1", [])
+        self.assert_ids("role1", [])
+        self.assert_ids("S1", [])
+
+    def test_not_cib_root(self):
+        tree = etree.fromstring('<root><direct id="a"/></root>')
+        index = id_index.CibIdIndex(tree)
+        self.assertTrue(index.id_exists("a"))
+
+    def test_removed_element(self):
+        self.assert_ids("R1", ["R1"])
+        primitive = self.cib.find(".//primitive")
+        primitive.getparent().remove(primitive)
+        self.assert_ids("R1", [])
+        self.assert_ids("node-R1", [])
+        self.assert_ids("R1-meta", [])
+
+    def test_removed_element_one_of_duplicates(self):
+        self.assert_ids("R2", ["R2", "R2"])
+        primitive = self.cib.findall(".//primitive")[1]
+        primitive.getparent().remove(primitive)
+        self.assert_ids("R2", ["R2"])
+
+    def test_element_moved_to_status(self):
+        self.assert_ids("R1", ["R1"])
+        self.cib.find("status").append(self.cib.find(".//primitive"))
+        self.assert_ids("R1", [])
+
+    def test_changed_id(self):
+        self.assert_ids("R1", ["R1"])
+        self.cib.find(".//primitive").set("id", "R1-new")
+        self.assert_ids("R1", [])
+
+    def test_changed_remote_node(self):
+        self.assert_ids("node-R1", ["R1"])
+        self.cib.find(".//nvpair").set("value", "node-new")
+        self.assert_ids("node-R1", [])
+
+    def test_added_element(self):
+        self.assert_ids("R3", [])
+        etree.SubElement(self.cib.find(".//resources"), "primitive", id="R3")
+        self.assert_ids("R3", ["R3"])
+
+    def test_added_remote_node(self):
+        self.assert_ids("node-R2", [])
+        etree.SubElement(
+            etree.SubElement(
+                self.cib.findall(".//primitive")[1], "meta_attributes"
+            ),
+            "nvpair",
+            name="remote-node",
+            value="node-R2",
+        )
+        self.assert_ids("node-R2", ["R2"])
+
+    def test_removed_and_added_element(self):
+        self.assert_ids("R1", ["R1"])
+        resources = self.cib.find(".//resources")
+        resources.remove(resources[0])
+        etree.SubElement(resources, "primitive", id="R3")
+        self.assert_ids("R3", ["R3"])
+        self.assert_ids("R1", [])
+
+    def test_changed_id_to_new_one(self):
+        self.assert_ids("R1", ["R1"])
+        self.cib.find(".//primitive").set("id", "R1-new")
+        self.assert_ids("R1-new", ["R1-new"])
+
+    def test_missing_id_searched_in_cib(self):
+        # pylint: disable=protected-access
+        self.index.get_elements("R1")
+        with mock.patch.object(
+            id_index,
+            "_find_id_candidates",
+            mock.Mock(wraps=id_index._find_id_candidates),
+        ) as find_mock, mock.patch.object(
+            id_index.CibIdIndex,
+            "_build",
+            autospec=True,
+            side_effect=id_index.CibIdIndex._build,
+        ) as build_mock:
+            self.index.get_elements("R1")
+            self.index.get_elements("missing1")
+            self.index.get_elements("missing2")
+            self.assertEqual(find_mock.call_count, 2)
+            build_mock.assert_not_called()
+
+    def test_missing_id_not_serving_as_id(self):
+        # pylint: disable=protected-access
+        self.index.get_elements("R1")
+        with mock.patch.object(
+            id_index.CibIdIndex,
+            "_build",
+            autospec=True,
+            side_effect=id_index.CibIdIndex._build,
+        ) as build_mock:
+            for element_id in ("X1", "user1", "S1"):
+                with self.subTest(element_id=element_id):
+                    self.assert_ids(element_id, [])
+            build_mock.assert_not_called()
+
+    def test_unchanged_cib_builds_index_at_most_once(self):
+        # pylint: disable=protected-access
+        self.index.get_elements("R1")
+        with mock.patch.object(
+            id_index,
+            "_find_id_candidates",
+            mock.Mock(wraps=id_index._find_id_candidates),
+        ) as find_mock, mock.patch.object(
+            id_index.CibIdIndex,
+            "_build",
+            autospec=True,
+            side_effect=id_index.CibIdIndex._build,
+        ) as build_mock:
+            with self.index.unchanged_cib():
+                self.index.get_elements("missing1")
+                build_mock.assert_not_called()
+                self.assertEqual(find_mock.call_count, 1)
+                self.index.get_elements("missing2")
+                self.index.get_elements("missing3")
+            self.assertEqual(build_mock.call_count, 1)
+            self.assertEqual(find_mock.call_count, 1)
+            self.index.get_elements("missing1")
+            self.assertEqual(build_mock.call_count, 1)
+            self.assertEqual(find_mock.call_count, 2)
+
+    def test_reserved_id(self):
+        self.assertFalse(self.index.id_exists("R3"))
+        self.index.reserve_id("R3")
+        self.assertTrue(self.index.id_exists("R3"))
+        self.assert_ids("R3", [])
+
+
+class AttachIdIndex(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring(CIB)
+        self.addCleanup(id_index.detach_id_index, self.cib)
+
+    def test_attach(self):
+        index = id_index.attach_id_index(self.cib)
+        self.assertIs(id_index.get_id_index(self.cib), index)
+        self.assertIs(id_index.get_id_index(self.cib.find(".//tag")), index)
+        self.assertIs(id_index.get_id_index(self.cib.getroottree()), index)
+
+    def test_other_tree(self):
+        id_index.attach_id_index(self.cib)
+        self.assertIsNone(id_index.get_id_index(etree.fromstring(CIB)))
+
+    def test_detach(self):
+        id_index.attach_id_index(self.cib)
+        id_index.detach_id_index(self.cib)
+        self.assertIsNone(id_index.get_id_index(self.cib))
+
+    def test_detach_other_tree(self):
+        index = id_index.attach_id_index(self.cib)
+        id_index.detach_id_index(etree.fromstring(CIB))
+        self.assertIs(id_index.get_id_index(self.cib), index)
+
+
+class IndexedMixin:
+    def setUp(self):
+        # 'setUp' not defined in TestCase class
+        # pylint: disable=invalid-name
+        super().setUp()
+        id_index.attach_id_index(self.cib.tree)
+        self.addCleanup(id_index.detach_id_index, self.cib.tree)
+
+
+class IndexedIdProviderBook(IndexedMixin, test_tools.IdProviderBook):
+    pass
+
+
+class IndexedIdProviderAllocate(IndexedMixin, test_tools.IdProviderAllocate):
+    pass
+
+
+class IndexedDoesIdExist(IndexedMixin, test_tools.DoesIdExistTest):
+    pass
+
+
+class IndexedFindUniqueId(IndexedMixin, test_tools.FindUniqueIdTest):
+    pass
+
+
+class IndexedReservedIds(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring(CIB)
+        id_index.attach_id_index(self.cib)
+        self.addCleanup(id_index.detach_id_index, self.cib)
+
+    def test_found_unique_id_is_reserved(self):
+        self.assertEqual(lib.find_unique_id(self.cib, "R3"), "R3")
+        self.assertEqual(lib.find_unique_id(self.cib, "R3"), "R3-1")
+
+    def test_booked_id_is_reserved(self):
+        self.assertEqual(lib.IdProvider(self.cib).book_ids("R3"), [])
+        self.assertEqual(lib.find_unique_id(self.cib, "R3"), "R3-1")
+
+    def test_element_searcher(self):
+        resources = self.cib.find(".//resources")
+        searcher = lib.ElementSearcher("primitive", "R1", resources)
+        self.assertIs(searcher.get_element(), resources[0])
+        searcher = lib.ElementSearcher("primitive", "node-R1", resources)
+        self.assertIsNone(searcher.get_element())
+        searcher = lib.ElementSearcher("group", "R1", resources)
+        self.assertIsNone(searcher.get_element())
+        searcher = lib.ElementSearcher("tag", "T", resources)
+        self.assertIsNone(searcher.get_element())
+
+    def test_removed_and_added_element(self):
+        resources = self.cib.find(".//resources")
+        self.assertTrue(lib.does_id_exist(self.cib, "R2"))
+        for primitive in resources.findall("primitive[@id='R2']"):
+            resources.remove(primitive)
+        primitive = etree.SubElement(resources, "primitive", id="C")
+        self.assertTrue(lib.does_id_exist(self.cib, "C"))
+        self.assertEqual(
+            lib.get_configuration_elements_by_id(self.cib, "C"), [primitive]
+        )
+        self.assertEqual(lib.find_unique_id(self.cib, "C"), "C-1")
+        self.assertFalse(lib.does_id_exist(self.cib, "R2"))
+
+    def test_get_elements_by_ids(self):
+        self.assertEqual(
+            lib.get_elements_by_ids(self.cib, ["R1", "node-R1", "X1"]),
+            ([self.cib.find(".//primitive")] * 2, ["X1"]),
+        )
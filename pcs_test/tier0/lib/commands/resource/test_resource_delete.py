@@ -0,0 +1,519 @@
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs import settings
+from pcs.common import reports
+from pcs.lib.commands import resource
+
+from pcs_test.tools import fixture
+from pcs_test.tools.command_env import get_env_tools
+from pcs_test.tools.misc import get_test_resource as rc
+
+
+def fixture_primitive(resource_id, content=""):
+    return f"""
+        <primitive class="ocf" id="{resource_id}" provider="pacemaker"
+            type="Dummy"
+        >{content}</primitive>
+    """
+
+
+def fixture_status(*resource_roles):
+    return "<resources>{}</resources>".format(
+        "".join(
+            f"""
+            <resource id="{resource_id}" managed="true" role="{role}"
+                resource_agent="ocf::pacemaker:Dummy" active="true"
+                orphaned="false" blocked="false" failed="false"
+                failure_ignored="false" nodes_running_on="1"
+            >
+                <node name="node1" id="1" cached="false"/>
+            </resource>
+            """
+            if role == "Started"
+            else f"""
+            <resource id="{resource_id}" managed="true" role="{role}"
+                resource_agent="ocf::pacemaker:Dummy" active="false"
+                orphaned="false" blocked="false" failed="false"
+                failure_ignored="false" nodes_running_on="0"
+            />
+            """
+            for resource_id, role in resource_roles
+        )
+    )
+
+
+def fixture_report_dependants(id_tag_map):
+    return fixture.info(
+        reports.codes.CIB_REMOVE_DEPENDANT_ELEMENTS, id_tag_map=id_tag_map
+    )
+
+
+FIXTURE_CONSTRAINTS = """
+    <constraints>
+        <rsc_location id="location-A" rsc="A" node="node1" score="INFINITY"/>
+        <rsc_order id="order-B-A" first="B" then="A"/>
+        <rsc_colocation id="colocation-set">
+            <resource_set id="colocation-set-1">
+                <resource_ref id="A"/>
+                <resource_ref id="B"/>
+            </resource_set>
+            <resource_set id="colocation-set-2">
+                <resource_ref id="A"/>
+            </resource_set>
+        </rsc_colocation>
+        <rsc_ticket id="ticket-set" ticket="T">
+            <resource_set id="ticket-set-1">
+                <resource_ref id="A"/>
+            </resource_set>
+        </rsc_ticket>
+    </constraints>
+"""
+
+FIXTURE_TAGS = """
+    <tags>
+        <tag id="tag-A">
+            <obj_ref id="A"/>
+        </tag>
+        <tag id="tag-AB">
+            <obj_ref id="A"/>
+            <obj_ref id="B"/>
+        </tag>
+    </tags>
+"""
+
+
+@mock.patch.object(
+    settings, "pacemaker_api_result_schema", rc("pcmk_api_rng/api-result.rng")
+)
+class DeleteNotRunning(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_not_found(self):
+        self.config.runner.cib.load(
+            resources=f"<resources>{fixture_primitive('A')}</resources>"
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: resource.delete(self.env_assist.get_env(), ["A", "X"])
+        )
+        self.env_assist.assert_reports(
+            [fixture.report_not_found("X", context_type="resources")]
+        )
+
+    def test_invalid_wait(self):
+        self.env_assist.assert_raise_library_error(
+            lambda: resource.delete(
+                self.env_assist.get_env(), ["A"], wait="abcd"
+            ),
+            [
+                fixture.error(
+                    reports.codes.INVALID_TIMEOUT_VALUE, timeout="abcd"
+                )
+            ],
+            expected_in_processor=False,
+        )
+
+    def test_wait(self):
+        self.config.runner.cib.load(
+            resources=f"<resources>{fixture_primitive('A')}</resources>"
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(("A", "Stopped"))
+        )
+        self.config.env.push_cib(resources="<resources/>", wait=10)
+        resource.delete(self.env_assist.get_env(), ["A"], wait="10")
+
+    def test_primitives_with_references(self):
+        self.config.runner.cib.load(
+            resources=f"""
+                <resources>
+                    {fixture_primitive("A")}
+                    {fixture_primitive("B")}
+                    {fixture_primitive("C")}
+                </resources>
+            """,
+            constraints=FIXTURE_CONSTRAINTS,
+            tags=FIXTURE_TAGS,
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(
+                ("A", "Stopped"), ("B", "Stopped"), ("C", "Started")
+            )
+        )
+        self.config.env.push_cib(
+            resources=f"<resources>{fixture_primitive('C')}</resources>",
+            constraints="<constraints/>",
+            tags="<tags/>",
+        )
+        resource.delete(self.env_assist.get_env(), ["A", "B"])
+        self.env_assist.assert_reports(
+            [
+                fixture_report_dependants(
+                    {
+                        "colocation-set": "rsc_colocation",
+                        "location-A": "rsc_location",
+                        "order-B-A": "rsc_order",
+                        "tag-A": "tag",
+                        "tag-AB": "tag",
+                        "ticket-set": "rsc_ticket",
+                    }
+                )
+            ]
+        )
+
+    def test_resource_set_references(self):
+        self.config.runner.cib.load(
+            resources=f"""
+                <resources>
+                    {fixture_primitive("A")}
+                    {fixture_primitive("B")}
+                </resources>
+            """,
+            constraints=FIXTURE_CONSTRAINTS,
+            tags=FIXTURE_TAGS,
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(("A", "Stopped"), ("B", "Started"))
+        )
+        self.config.env.push_cib(
+            resources=f"<resources>{fixture_primitive('B')}</resources>",
+            constraints="""
+                <constraints>
+                    <rsc_colocation id="colocation-set">
+                        <resource_set id="colocation-set-1">
+                            <resource_ref id="B"/>
+                        </resource_set>
+                    </rsc_colocation>
+                </constraints>
+            """,
+            tags="""
+                <tags>
+                    <tag id="tag-AB">
+                        <obj_ref id="B"/>
+                    </tag>
+                </tags>
+            """,
+        )
+        resource.delete(self.env_assist.get_env(), ["A"])
+        self.env_assist.assert_reports(
+            [
+                fixture_report_dependants(
+                    {
+                        "location-A": "rsc_location",
+                        "order-B-A": "rsc_order",
+                        "tag-A": "tag",
+                        "ticket-set": "rsc_ticket",
+                    }
+                )
+            ]
+        )
+
+    def test_group_members(self):
+        self.config.runner.cib.load(
+            resources=f"""
+                <resources>
+                    <clone id="G-clone">
+                        <group id="G">
+                            {fixture_primitive("A")}
+                            {fixture_primitive("B")}
+                        </group>
+                    </clone>
+                    <group id="H">
+                        {fixture_primitive("C")}
+                        {fixture_primitive("D")}
+                    </group>
+                </resources>
+            """,
+            constraints="""
+                <constraints>
+                    <rsc_location id="location-G" rsc="G-clone" node="node1"
+                        score="INFINITY"
+                    />
+                </constraints>
+            """,
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(
+                ("A", "Stopped"),
+                ("B", "Stopped"),
+                ("C", "Stopped"),
+                ("D", "Stopped"),
+            )
+        )
+        self.config.env.push_cib(
+            resources=f"""
+                <resources>
+                    <group id="H">{fixture_primitive("D")}</group>
+                </resources>
+            """,
+            constraints="<constraints/>",
+        )
+        resource.delete(self.env_assist.get_env(), ["A", "B", "C"])
+        self.env_assist.assert_reports(
+            [fixture_report_dependants({"location-G": "rsc_location"})]
+        )
+
+    def test_stonith_references(self):
+        self.config.runner.cib.load(
+            resources="""
+                <resources>
+                    <primitive class="stonith" id="S1" type="fence_xvm"/>
+                    <primitive class="stonith" id="S2" type="fence_xvm"/>
+                </resources>
+            """,
+            fencing_topology="""
+                <fencing-topology>
+                    <fencing-level id="fl1" index="1" devices="S1"
+                        target="node1"
+                    />
+                    <fencing-level id="fl2" index="2" devices="S1,S2"
+                        target="node1"
+                    />
+                </fencing-topology>
+            """,
+            optional_in_conf="""
+                <acls>
+                    <acl_role id="role1">
+                        <acl_permission id="perm1" kind="read"
+                            reference="S1"
+                        />
+                        <acl_permission id="perm2" kind="read"
+                            reference="S2"
+                        />
+                    </acl_role>
+                </acls>
+            """,
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(("S1", "Stopped"), ("S2", "Stopped"))
+        )
+        self.config.env.push_cib(
+            resources="""
+                <resources>
+                    <primitive class="stonith" id="S2" type="fence_xvm"/>
+                </resources>
+            """,
+            fencing_topology="""
+                <fencing-topology>
+                    <fencing-level id="fl2" index="2" devices="S2"
+                        target="node1"
+                    />
+                </fencing-topology>
+            """,
+            optional_in_conf="""
+                <acls>
+                    <acl_role id="role1">
+                        <acl_permission id="perm2" kind="read"
+                            reference="S2"
+                        />
+                    </acl_role>
+                </acls>
+            """,
+        )
+        resource.delete(self.env_assist.get_env(), ["S1"])
+
+    def test_remote_node(self):
+        self.config.runner.cib.load(
+            resources="""
+                <resources>
+                    <primitive class="ocf" id="R" provider="pacemaker"
+                        type="remote"
+                    />
+                </resources>
+            """,
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: resource.delete(self.env_assist.get_env(), ["R"])
+        )
+        self.env_assist.assert_reports(
+            [
+                fixture.error(
+                    reports.codes.USE_COMMAND_NODE_REMOVE_REMOTE,
+                    force_code=reports.codes.FORCE,
+                )
+            ]
+        )
+
+    def test_guest_node_forced(self):
+        self.config.runner.cib.load(
+            resources=fixture_primitive(
+                "A",
+                """
+                    <meta_attributes id="A-meta">
+                        <nvpair id="A-meta-remote-node" name="remote-node"
+                            value="guest1"
+                        />
+                    </meta_attributes>
+                """,
+            ).join(["<resources>", "</resources>"]),
+            constraints="""
+                <constraints>
+                    <rsc_location id="location-guest1" rsc="B" node="guest1"
+                        score="INFINITY"
+                    />
+                </constraints>
+            """,
+        )
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(("A", "Stopped"))
+        )
+        self.config.env.push_cib(
+            resources="<resources/>", constraints="<constraints/>", wait=0
+        )
+        self.config.runner.pcmk.remove_node("guest1")
+        resource.delete(self.env_assist.get_env(), ["A"], [reports.codes.FORCE])
+        self.env_assist.assert_reports(
+            [
+                fixture.warn(reports.codes.USE_COMMAND_NODE_REMOVE_GUEST),
+                fixture_report_dependants({"location-guest1": "rsc_location"}),
+            ]
+        )
+
+
+FIXTURE_CIB_RUNNING = f"""
+    <resources>
+        {fixture_primitive("A")}
+        {fixture_primitive("B")}
+    </resources>
+"""
+FIXTURE_CIB_DISABLED = f"""
+    <resources>
+        {fixture_primitive("A", '''
+            <meta_attributes id="A-meta_attributes">
+                <nvpair id="A-meta_attributes-target-role" name="target-role"
+                    value="Stopped"
+                />
+            </meta_attributes>
+        ''')}
+        {fixture_primitive("B")}
+    </resources>
+"""
+FIXTURE_DIFF_DISABLE = """
+    <diff format="2">
+        <change operation="create"
+            path="/cib/configuration/resources/primitive[@id='A']"
+            position="0"
+        >
+            <meta_attributes id="A-meta_attributes">
+                <nvpair id="A-meta_attributes-target-role" name="target-role"
+                    value="Stopped"
+                />
+            </meta_attributes>
+        </change>
+    </diff>
+"""
+FIXTURE_DIFF_DELETE = """
+    <diff format="2">
+        <change operation="delete"
+            path="/cib/configuration/resources/primitive[@id='A']"
+        />
+    </diff>
+"""
+
+
+@mock.patch.object(settings, "cib_diff_native", True)
+@mock.patch.object(
+    settings, "pacemaker_api_result_schema", rc("pcmk_api_rng/api-result.rng")
+)
+class DeleteRunning(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(resources=FIXTURE_CIB_RUNNING)
+        self.config.runner.pcmk.load_state(
+            resources=fixture_status(("A", "Started"), ("B", "Started"))
+        )
+        self.config.runner.cib.push_diff(
+            name="runner.cib.push_diff.disable", cib_diff=FIXTURE_DIFF_DISABLE
+        )
+        self.config.runner.pcmk.wait(timeout=0)
+
+    def _config_delete(self):
+        self.config.runner.cib.load(
+            name="runner.cib.load.disabled", resources=FIXTURE_CIB_DISABLED
+        )
+        self.config.runner.cib.push_diff(cib_diff=FIXTURE_DIFF_DELETE)
+
+    def test_stop_and_delete(self):
+        self.config.runner.pcmk.load_state(
+            name="runner.pcmk.load_state.stopped",
+            resources=fixture_status(("A", "Stopped"), ("B", "Started")),
+        )
+        self._config_delete()
+        resource.delete(self.env_assist.get_env(), ["A"])
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    reports.codes.STOPPING_RESOURCES_BEFORE_DELETING,
+                    resource_id_list=["A"],
+                ),
+                fixture.info(reports.codes.WAIT_FOR_IDLE_STARTED, timeout=0),
+            ]
+        )
+
+    def test_stop_and_delete_wait(self):
+        self.config.calls.remove("runner.pcmk.wait")
+        self.config.runner.pcmk.wait(timeout=10)
+        self.config.runner.pcmk.load_state(
+            name="runner.pcmk.load_state.stopped",
+            resources=fixture_status(("A", "Stopped"), ("B", "Started")),
+        )
+        self._config_delete()
+        self.config.runner.pcmk.wait(name="runner.pcmk.wait.delete", timeout=10)
+        resource.delete(self.env_assist.get_env(), ["A"], wait="10")
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    reports.codes.STOPPING_RESOURCES_BEFORE_DELETING,
+                    resource_id_list=["A"],
+                ),
+                fixture.info(reports.codes.WAIT_FOR_IDLE_STARTED, timeout=10),
+                fixture.info(reports.codes.WAIT_FOR_IDLE_STARTED, timeout=10),
+            ]
+        )
+
+    def test_cannot_stop(self):
+        self.config.runner.pcmk.load_state(
+            name="runner.pcmk.load_state.stopped",
+            resources=fixture_status(("A", "Started"), ("B", "Started")),
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: resource.delete(self.env_assist.get_env(), ["A"])
+        )
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    reports.codes.STOPPING_RESOURCES_BEFORE_DELETING,
+                    resource_id_list=["A"],
+                ),
+                fixture.info(reports.codes.WAIT_FOR_IDLE_STARTED, timeout=0),
+                fixture.error(
+                    reports.codes.CANNOT_STOP_RESOURCES_BEFORE_DELETING,
+                    force_code=reports.codes.FORCE,
+                    resource_id_list=["A"],
+                ),
+            ]
+        )
+
+    def test_cannot_stop_forced(self):
+        self.config.runner.pcmk.load_state(
+            name="runner.pcmk.load_state.stopped",
+            resources=fixture_status(("A", "Started"), ("B", "Started")),
+        )
+        self._config_delete()
+        resource.delete(self.env_assist.get_env(), ["A"], [reports.codes.FORCE])
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    reports.codes.STOPPING_RESOURCES_BEFORE_DELETING,
+                    resource_id_list=["A"],
+                ),
+                fixture.info(reports.codes.WAIT_FOR_IDLE_STARTED, timeout=0),
+                fixture.warn(
+                    reports.codes.CANNOT_STOP_RESOURCES_BEFORE_DELETING,
+                    resource_id_list=["A"],
+                ),
+            ]
+        )
@@ -136,6 +136,10 @@ def _simulation_synapses_fixture(resource_id, start_id=0):
 
 class MoveAutocleanCommonSetup(TestCase):
     def setUp(self):
+        # the tests expect CIBs to be diffed by crm_diff
+        cib_diff_patcher = mock.patch.object(settings, "cib_diff_native", False)
+        self.addCleanup(cib_diff_patcher.stop)
+        cib_diff_patcher.start()
         self.tmp_file_mock_obj = TmpFileMock(
             file_content_checker=assert_xml_equal,
         )
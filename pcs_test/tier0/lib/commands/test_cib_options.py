@@ -873,9 +873,8 @@ class DefaultsConfigMixin:
 
     def test_expired(self):
         self._setup_rule_in_effect()
-        self.config.runner.pcmk.get_rule_in_effect_status(
-            "my-id-rule",
-            RULE_EXPIRED_RETURNCODE,
+        self.config.runner.pcmk.get_rules_in_effect_status(
+            [("my-id-rule", RULE_EXPIRED_RETURNCODE)]
         )
         self.assertEqual(
             CibDefaultsDto(
@@ -889,9 +888,8 @@ class DefaultsConfigMixin:
 
     def test_not_yet_in_effect(self):
         self._setup_rule_in_effect()
-        self.config.runner.pcmk.get_rule_in_effect_status(
-            "my-id-rule",
-            RULE_NOT_YET_IN_EFFECT_RETURNCODE,
+        self.config.runner.pcmk.get_rules_in_effect_status(
+            [("my-id-rule", RULE_NOT_YET_IN_EFFECT_RETURNCODE)]
         )
         self.assertEqual(
             CibDefaultsDto(
@@ -907,9 +905,8 @@ class DefaultsConfigMixin:
 
     def test_in_effect(self):
         self._setup_rule_in_effect()
-        self.config.runner.pcmk.get_rule_in_effect_status(
-            "my-id-rule",
-            RULE_IN_EFFECT_RETURNCODE,
+        self.config.runner.pcmk.get_rules_in_effect_status(
+            [("my-id-rule", RULE_IN_EFFECT_RETURNCODE)]
         )
         self.assertEqual(
             CibDefaultsDto(
@@ -923,9 +920,27 @@ class DefaultsConfigMixin:
 
     def test_expired_error(self):
         self._setup_rule_in_effect()
+        self.config.runner.pcmk.get_rules_in_effect_status(
+            [("my-id-rule", 2)]  # unexpected return code
+        )
+        self.assertEqual(
+            CibDefaultsDto(
+                meta_attributes=[
+                    self.fixture_expired_dto(CibRuleInEffectStatus.UNKNOWN)
+                ],
+                instance_attributes=[],
+            ),
+            self.command(self.env_assist.get_env(), True),
+        )
+
+    def test_check_all_at_once_not_supported(self):
+        self._setup_rule_in_effect()
+        self.config.runner.pcmk.get_rules_in_effect_status(
+            [("my-id-rule", None)], stdout="", returncode=64
+        )
+        # the rule depends on node attributes, it is checked by crm_rule alone
         self.config.runner.pcmk.get_rule_in_effect_status(
-            "my-id-rule",
-            2,  # unexpected return code
+            "my-id-rule", returncode=2
         )
         self.assertEqual(
             CibDefaultsDto(
@@ -1,5 +1,8 @@
 # coding=utf-8
-from unittest import TestCase
+from unittest import (
+    TestCase,
+    mock,
+)
 
 from pcs.common import const
 from pcs.common.interface.dto import from_dict
@@ -16,6 +19,7 @@ from pcs.common.resource_agent.dto import (
     ResourceAgentParameterDto,
 )
 from pcs.lib.commands import resource_agent as lib
+from pcs.lib.env import LibraryEnvironment
 from pcs.lib.resource_agent import ResourceAgentName
 
 from pcs_test.tools import fixture
@@ -295,6 +299,93 @@ class ListAgents(TestCase):
         )
 
 
+class WarmMetadataCache(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.metadata_cache = mock.Mock(spec_set=["get", "put", "clear"])
+        self.metadata_cache.get.return_value = None
+
+    def _warm(self):
+        env = self.env_assist.get_env()
+        with mock.patch.object(
+            LibraryEnvironment,
+            "resource_agent_metadata_cache",
+            self.metadata_cache,
+        ):
+            lib.warm_metadata_cache(env)
+
+    def test_success(self):
+        self.config.runner.pcmk.list_agents_standards(
+            "\n".join(["service", "ocf"])
+        )
+        self.config.runner.pcmk.list_agents_ocf_providers("test")
+        self.config.runner.pcmk.list_agents_for_standard_and_provider(
+            "ocf:test",
+            "\n".join(["Stateful", "Delay"]),
+            name="runner.pcmk.list_agents_ocf_providers.ocf_test",
+        )
+        self.config.runner.pcmk.list_agents_for_standard_and_provider(
+            "service",
+            "corosync",
+            name="runner.pcmk.list_agents_ocf_providers.service",
+        )
+        for name in ["ocf:test:Delay", "ocf:test:Stateful", "service:corosync"]:
+            self.config.runner.pcmk.load_agent(
+                agent_name=name,
+                agent_is_missing=(name == "ocf:test:Stateful"),
+                stdout=f'<resource-agent name="{name}"/>',
+                name=f"runner.pcmk.load_agent.{name}",
+            )
+
+        self._warm()
+
+        self.assertEqual(
+            [
+                call[0][0].full_name
+                for call in self.metadata_cache.put.call_args_list
+            ],
+            ["ocf:test:Delay", "service:corosync"],
+        )
+        self.env_assist.assert_reports(
+            [
+                fixture.warn(
+                    report_codes.UNABLE_TO_GET_AGENT_METADATA,
+                    agent="ocf:test:Stateful",
+                    reason=(
+                        "Agent ocf:test:Stateful not found or does not support "
+                        "meta-data: Invalid argument (22)\nMetadata query for "
+                        "ocf:test:Stateful failed: Input/output error"
+                    ),
+                )
+            ]
+        )
+
+    def test_cache_disabled(self):
+        self.metadata_cache = None
+        self._warm()
+
+
+class ClearMetadataCache(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_success(self):
+        metadata_cache = mock.Mock(spec_set=["get", "put", "clear"])
+        name_cache = mock.Mock(spec_set=["get", "put", "clear"])
+        env = self.env_assist.get_env()
+        with mock.patch.object(
+            LibraryEnvironment, "resource_agent_metadata_cache", metadata_cache
+        ), mock.patch.object(
+            LibraryEnvironment, "resource_agent_name_cache", name_cache
+        ):
+            lib.clear_metadata_cache(env)
+        metadata_cache.clear.assert_called_once_with()
+        name_cache.clear.assert_called_once_with()
+
+    def test_cache_disabled(self):
+        lib.clear_metadata_cache(self.env_assist.get_env())
+
+
 class ActionToOperation(TestCase):
     # pylint: disable=protected-access
     @staticmethod
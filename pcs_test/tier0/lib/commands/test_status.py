@@ -1,9 +1,17 @@
 from textwrap import dedent
-from unittest import TestCase
+from unittest import (
+    TestCase,
+    mock,
+)
 
 from pcs import settings
-from pcs.common import file_type_codes
+from pcs.common import (
+    file_type_codes,
+    status_dto,
+)
 from pcs.common.reports import codes as report_codes
+from pcs.common.status_dto import PrimitiveStatusDto
+from pcs.common.types import PrimitiveStatus
 from pcs.lib.commands import status
 from pcs.lib.errors import LibraryError
 
@@ -14,6 +22,7 @@ from pcs_test.tools import (
 from pcs_test.tools.assertions import assert_xml_equal
 from pcs_test.tools.command_env import get_env_tools
 from pcs_test.tools.misc import read_test_resource as rc_read
+from pcs_test.tools.xml import etree_to_str
 
 
 class PacemakerStatusXml(TestCase):
@@ -78,11 +87,13 @@ class FullClusterStatusPlaintext(TestCase):
 
     def _fixture_config_live_minimal(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
+            .runner.pcmk.load_state_plaintext(
+                stdout="crm_mon cluster status",
+            )
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -90,17 +101,16 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """
             )
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
 
     def _fixture_config_live_remote_minimal(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=False
+            )
+            .runner.pcmk.load_state_plaintext(
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=False)
             .runner.cib.load(
                 optional_in_conf=self._fixture_xml_clustername("test-cib"),
                 resources="""
@@ -109,9 +119,6 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """,
             )
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
 
     def _fixture_config_local_daemons(
@@ -171,12 +178,12 @@ class FullClusterStatusPlaintext(TestCase):
             )
             .services.is_enabled(
                 "sbd",
-                name="services.is_enabled.sbd_2",
+                name="services.is_enabled.sbd",
                 return_value=sbd_enabled,
             )
             .services.is_running(
                 "sbd",
-                name="services.is_running.sbd_2",
+                name="services.is_running.sbd",
                 return_value=sbd_active,
             )
         )
@@ -215,12 +222,18 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_fail_getting_cluster_status(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
+            )
+            .corosync_conf.load()
+            .runner.pcmk.load_state_plaintext(
                 stdout="some stdout",
                 stderr="some stderr",
                 returncode=1,
             )
+            .runner.cib.load()
         )
+        self._fixture_config_local_daemons()
         self.env_assist.assert_raise_library_error(
             lambda: status.full_cluster_status_plaintext(
                 self.env_assist.get_env()
@@ -236,11 +249,9 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_fail_getting_corosync_conf(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
-            )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
-            .corosync_conf.load_content("invalid corosync conf")
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
+            ).corosync_conf.load_content("invalid corosync conf")
         )
         self.env_assist.assert_raise_library_error(
             lambda: status.full_cluster_status_plaintext(
@@ -257,15 +268,18 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_fail_getting_cib(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
+            .runner.pcmk.load_state_plaintext(
+                stdout="crm_mon cluster status",
+            )
             .runner.cib.load_content(
                 "some stdout", stderr="cib load error", returncode=1
             )
         )
+        self._fixture_config_local_daemons()
         self.env_assist.assert_raise_library_error(
             lambda: status.full_cluster_status_plaintext(
                 self.env_assist.get_env()
@@ -299,13 +313,13 @@ class FullClusterStatusPlaintext(TestCase):
     def test_success_live_verbose(self):
         (
             self.config.env.set_known_nodes(self.node_name_list)
+            .fs.exists(settings.corosync_conf_file, return_value=True)
+            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.pcmk.can_fence_history_status(stderr="not supported")
             .runner.pcmk.load_state_plaintext(
                 verbose=True,
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
-            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -314,9 +328,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -376,14 +387,14 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_success_live_remote_node_verbose(self):
         (
-            self.config.runner.pcmk.can_fence_history_status(
-                stderr="not supported"
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=False
             )
+            .runner.pcmk.can_fence_history_status(stderr="not supported")
             .runner.pcmk.load_state_plaintext(
                 verbose=True,
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=False)
             .runner.cib.load(
                 optional_in_conf=self._fixture_xml_clustername("test-cib"),
                 resources="""
@@ -393,9 +404,6 @@ class FullClusterStatusPlaintext(TestCase):
             """,
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons(
             corosync_enabled=False,
@@ -498,6 +506,8 @@ class FullClusterStatusPlaintext(TestCase):
     def test_success_verbose_inactive_and_fence_history(self):
         (
             self.config.env.set_known_nodes(self.node_name_list)
+            .fs.exists(settings.corosync_conf_file, return_value=True)
+            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.pcmk.can_fence_history_status()
             .runner.pcmk.load_state_plaintext(
                 verbose=True,
@@ -505,8 +515,6 @@ class FullClusterStatusPlaintext(TestCase):
                 fence_history=True,
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
-            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -515,9 +523,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -555,13 +560,13 @@ class FullClusterStatusPlaintext(TestCase):
     def _assert_success_with_ticket_status_failure(self, stderr="", msg=""):
         (
             self.config.env.set_known_nodes(self.node_name_list)
+            .fs.exists(settings.corosync_conf_file, return_value=True)
+            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.pcmk.can_fence_history_status(stderr="not supported")
             .runner.pcmk.load_state_plaintext(
                 verbose=True,
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
-            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -572,9 +577,6 @@ class FullClusterStatusPlaintext(TestCase):
             .runner.pcmk.load_ticket_state_plaintext(
                 stdout="ticket stdout", stderr=stderr, returncode=1
             )
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -618,15 +620,14 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_stonith_warning_no_devices(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
-            .runner.cib.load()
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
+            .runner.pcmk.load_state_plaintext(
+                stdout="crm_mon cluster status",
             )
+            .runner.cib.load()
         )
         self._fixture_config_local_daemons()
 
@@ -650,17 +651,16 @@ class FullClusterStatusPlaintext(TestCase):
 
     def test_stonith_warning_no_devices_sbd_enabled(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
-            .runner.cib.load()
-            .services.is_running(
-                "sbd", return_value=True, name="services.is_running.sbd"
+            .runner.pcmk.load_state_plaintext(
+                stdout="crm_mon cluster status",
             )
+            .runner.cib.load()
         )
-        self._fixture_config_local_daemons()
+        self._fixture_config_local_daemons(sbd_active=True)
 
         self.assertEqual(
             status.full_cluster_status_plaintext(self.env_assist.get_env()),
@@ -672,17 +672,20 @@ class FullClusterStatusPlaintext(TestCase):
                 Daemon Status:
                   corosync: active/enabled
                   pacemaker: active/enabled
-                  pcsd: active/enabled"""
+                  pcsd: active/enabled
+                  sbd: active/disabled"""
             ),
         )
 
     def test_stonith_warnings_regarding_devices_configuration(self):
         (
-            self.config.runner.pcmk.load_state_plaintext(
-                stdout="crm_mon cluster status",
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
+            .runner.pcmk.load_state_plaintext(
+                stdout="crm_mon cluster status",
+            )
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -706,9 +709,6 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """
             )
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons()
 
@@ -737,13 +737,13 @@ class FullClusterStatusPlaintext(TestCase):
 
         (
             self.config.env.set_known_nodes(self.node_name_list[1:])
+            .fs.exists(settings.corosync_conf_file, return_value=True)
+            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.pcmk.can_fence_history_status(stderr="not supported")
             .runner.pcmk.load_state_plaintext(
                 verbose=True,
                 stdout="crm_mon cluster status",
             )
-            .fs.exists(settings.corosync_conf_file, return_value=True)
-            .corosync_conf.load(node_name_list=self.node_name_list)
             .runner.cib.load(
                 resources="""
                 <resources>
@@ -752,9 +752,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .services.is_running(
-                "sbd", return_value=False, name="services.is_running.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -869,11 +866,11 @@ class FullClusterStatusPlaintext(TestCase):
         )
 
     def test_move_constrains_warnings(self):
+        self.config.fs.exists(settings.corosync_conf_file, return_value=True)
+        self.config.corosync_conf.load()
         self.config.runner.pcmk.load_state_plaintext(
             stdout="crm_mon cluster status",
         )
-        self.config.fs.exists(settings.corosync_conf_file, return_value=True)
-        self.config.corosync_conf.load()
         self.config.runner.cib.load(
             constraints="""
             <constraints>
@@ -900,9 +897,6 @@ class FullClusterStatusPlaintext(TestCase):
             </resources>
         """,
         )
-        self.config.services.is_running(
-            "sbd", return_value=True, name="services.is_running.sbd"
-        )
         self._fixture_config_local_daemons(sbd_enabled=True, sbd_active=True)
 
         self.assertEqual(
@@ -925,3 +919,489 @@ class FullClusterStatusPlaintext(TestCase):
                   sbd: active/enabled"""
             ),
         )
+
+
+class NodeStatusDto(TestCase):
+    resources_cib = """
+        <resources>
+            <primitive id="P1" class="ocf" provider="pacemaker" type="Dummy"/>
+            <group id="G">
+                <meta_attributes id="G-meta">
+                    <nvpair id="G-meta-role" name="target-role"
+                        value="Stopped"/>
+                </meta_attributes>
+                <primitive id="G1" class="ocf" provider="pacemaker"
+                    type="Dummy"/>
+            </group>
+            <clone id="C">
+                <primitive id="C1" class="ocf" provider="pacemaker"
+                    type="Dummy"/>
+            </clone>
+            <primitive id="P2" class="ocf" provider="pacemaker" type="Dummy">
+                <meta_attributes id="P2-meta">
+                    <nvpair id="P2-meta-role" name="target-role"
+                        value="stopped"/>
+                </meta_attributes>
+            </primitive>
+            <primitive id="P3" class="ocf" provider="pacemaker" type="Dummy"/>
+            <primitive id="P4" class="ocf" provider="pacemaker" type="Dummy"/>
+        </resources>
+    """
+    resources_state = """
+        <resources>
+            <resource id="P1"/>
+            <group id="G" number_resources="1">
+                <resource id="G1" role="Stopped" active="false"
+                    nodes_running_on="0"/>
+            </group>
+            <clone id="C" multi_state="false" unique="false" managed="true">
+                <resource id="C1:0"/>
+                <resource id="C1:1" role="Stopped" active="false"
+                    nodes_running_on="0"/>
+            </clone>
+            <resource id="P3" role="Stopped" active="false" failed="true"
+                nodes_running_on="0"/>
+        </resources>
+    """
+    nodes_state = """
+        <nodes>
+            <node name="node1" id="1"/>
+            <node name="node2" id="2" standby="true"/>
+            <node name="node3" id="3" online="false"/>
+            <node name="node4" id="4" maintenance="true"/>
+            <node name="remote1" id="remote1" type="remote"/>
+        </nodes>
+    """
+
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(self)
+        snapshot_patcher = mock.patch.object(
+            status, "_cib_primitives_snapshot", None
+        )
+        snapshot_patcher.start()
+        self.addCleanup(snapshot_patcher.stop)
+
+    def _fixture_state(self, with_quorum=True):
+        state = fixture_crm_mon.complete_state(
+            rc_read("crm_mon.minimal.xml"),
+            self.resources_state,
+            self.nodes_state,
+        )
+        state.find("summary/current_dc").attrib.update(
+            {
+                "present": "true",
+                "version": "2.1.0",
+                "name": "node1",
+                "id": "1",
+                "with_quorum": "true" if with_quorum else "false",
+            }
+        )
+        return etree_to_str(state)
+
+    def _fixture_config(self, cib_version=None, suffix="", **cib_load_kwargs):
+        self.config.corosync_conf.load(
+            node_name_list=["node1", "node2", "node3"],
+            name=f"corosync_conf.load{suffix}",
+        )
+        if cib_version:
+            self.config.runner.place(
+                [
+                    "cibadmin",
+                    "--local",
+                    "--query",
+                    "--xpath=/cib",
+                    "--no-children",
+                ],
+                name=f"runner.cib.version{suffix}",
+                stdout=(
+                    '<cib admin_epoch="{0}" epoch="{1}" num_updates="{2}"/>'
+                ).format(*cib_version),
+            )
+        self.config.runner.pcmk.load_state(
+            stdout=self._fixture_state(),
+            name=f"runner.pcmk.load_state{suffix}",
+        )
+        self.config.runner.corosync.quorum_status(
+            node_list=["node1", "node2"],
+            name=f"runner.corosync.quorum_status{suffix}",
+        )
+        if cib_load_kwargs:
+            self.config.runner.cib.load(
+                name=f"runner.cib.load{suffix}", **cib_load_kwargs
+            )
+
+    @staticmethod
+    def _fixture_primitives(**status_dict):
+        return [
+            PrimitiveStatusDto(primitive_id, status_dict[primitive_id])
+            for primitive_id in ("P1", "P2", "P3", "P4", "G1", "C1")
+        ]
+
+    def _fixture_dto(self, **kwargs):
+        dto = dict(
+            cluster_name="test99",
+            quorate=True,
+            known_node_list=["node1", "node2", "node3", "node4"],
+            corosync_online_node_list=["node1", "node2"],
+            corosync_offline_node_list=["node3"],
+            pacemaker_online_node_list=["node1", "node4"],
+            pacemaker_standby_node_list=["node2"],
+            pacemaker_offline_node_list=["node3"],
+            primitive_list=self._fixture_primitives(
+                P1=PrimitiveStatus.RUNNING,
+                P2=PrimitiveStatus.DISABLED,
+                P3=PrimitiveStatus.FAILED,
+                P4=PrimitiveStatus.BLOCKED,
+                G1=PrimitiveStatus.DISABLED,
+                C1=PrimitiveStatus.RUNNING,
+            ),
+        )
+        dto.update(kwargs)
+        return status_dto.NodeStatusDto(**dto)
+
+    def test_success(self):
+        self._fixture_config(resources=self.resources_cib)
+        self.assertEqual(
+            status.node_status_dto(self.env_assist.get_env()),
+            self._fixture_dto(),
+        )
+
+    def test_not_quorate(self):
+        self.config.corosync_conf.load(
+            node_name_list=["node1", "node2", "node3"]
+        )
+        self.config.runner.pcmk.load_state(
+            stdout=self._fixture_state(with_quorum=False)
+        )
+        self.config.runner.corosync.quorum_status(node_list=["node1", "node2"])
+        self.config.runner.cib.load(resources=self.resources_cib)
+        self.assertEqual(
+            status.node_status_dto(self.env_assist.get_env()),
+            self._fixture_dto(quorate=False),
+        )
+
+    def test_pacemaker_not_running(self):
+        self.config.corosync_conf.load(
+            node_name_list=["node1", "node2", "node3"]
+        )
+        self.config.runner.pcmk.load_state(
+            stdout=fixture_crm_mon.error_xml_not_connected(), returncode=102
+        )
+        self.config.runner.corosync.quorum_status(node_list=["node1", "node2"])
+        self.config.runner.cib.load(returncode=1, stderr="not connected")
+        self.assertEqual(
+            status.node_status_dto(self.env_assist.get_env()),
+            self._fixture_dto(
+                quorate=False,
+                known_node_list=["node1", "node2", "node3"],
+                pacemaker_online_node_list=[],
+                pacemaker_standby_node_list=[],
+                pacemaker_offline_node_list=[],
+                primitive_list=[],
+            ),
+        )
+
+    def test_corosync_not_running(self):
+        self.config.corosync_conf.load(
+            node_name_list=["node1", "node2", "node3"]
+        )
+        self.config.runner.pcmk.load_state(stdout=self._fixture_state())
+        self.config.runner.corosync.quorum_status(
+            stdout="Cannot initialize QUORUM service", returncode=1
+        )
+        self.config.runner.cib.load(resources=self.resources_cib)
+        self.assertEqual(
+            status.node_status_dto(self.env_assist.get_env()),
+            self._fixture_dto(
+                known_node_list=["node1", "node2", "node3", "node4"],
+                corosync_online_node_list=[],
+                corosync_offline_node_list=["node1", "node2", "node3"],
+            ),
+        )
+
+    def test_cib_primitives_reused_if_epoch_not_changed(self):
+        self._fixture_config(resources=self.resources_cib)
+        # the CIB is not loaded again, only its version is checked
+        self._fixture_config(cib_version=("0", "557", "130"), suffix=".2")
+        env = self.env_assist.get_env()
+        self.assertEqual(status.node_status_dto(env), self._fixture_dto())
+        self.assertEqual(status.node_status_dto(env), self._fixture_dto())
+
+    def test_cib_primitives_loaded_if_epoch_changed(self):
+        self._fixture_config(resources=self.resources_cib)
+        self._fixture_config(
+            cib_version=("0", "558", "0"),
+            suffix=".2",
+            resources="""
+                <resources>
+                    <primitive id="P1" class="ocf" provider="pacemaker"
+                        type="Dummy"/>
+                </resources>
+            """,
+        )
+        env = self.env_assist.get_env()
+        self.assertEqual(status.node_status_dto(env), self._fixture_dto())
+        self.assertEqual(
+            status.node_status_dto(env),
+            self._fixture_dto(
+                primitive_list=[
+                    PrimitiveStatusDto("P1", PrimitiveStatus.RUNNING)
+                ]
+            ),
+        )
+
+
+class PcsdNodeStatus(TestCase):
+    resources_cib = """
+        <resources>
+            <primitive id="P1" class="ocf" provider="pacemaker" type="Dummy"/>
+            <group id="G">
+                <primitive id="G1" class="ocf" provider="pacemaker"
+                    type="Dummy"/>
+            </group>
+        </resources>
+    """
+    resources_state = """
+        <resources>
+            <resource id="P1"/>
+            <group id="G" number_resources="1">
+                <resource id="G1" role="Stopped" active="false"
+                    nodes_running_on="0"/>
+            </group>
+        </resources>
+    """
+    nodes_state = """
+        <nodes>
+            <node name="node1" id="1"/>
+            <node name="node2" id="2" standby="true"/>
+            <node name="node3" id="3" online="false"/>
+        </nodes>
+    """
+
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(self)
+        self.maxDiff = None
+
+    def _fixture_state(self):
+        state = fixture_crm_mon.complete_state(
+            rc_read("crm_mon.minimal.xml"),
+            self.resources_state,
+            self.nodes_state,
+        )
+        state.find("summary/current_dc").attrib.update(
+            {"present": "true", "name": "node1", "with_quorum": "true"}
+        )
+        return etree_to_str(state)
+
+    def _fixture_config_services(self, running=True):
+        services = ("pacemaker", "pacemaker_remote", "corosync", "pcsd", "sbd")
+        for service in services:
+            self.config.services.is_enabled(
+                service,
+                name=f"services.is_enabled.{service}",
+                return_value=service == "pcsd",
+            )
+            self.config.services.is_running(
+                service,
+                name=f"services.is_running.{service}",
+                return_value=(
+                    running and service in ("pacemaker", "corosync", "pcsd")
+                ),
+            )
+        for service in services:
+            self.config.services.is_installed(
+                service,
+                name=f"services.is_installed.{service}",
+                return_value=service != "sbd",
+            )
+        # crm_mon output is processed once the services have been checked
+        self.config.fs.isfile(
+            settings.pacemaker_api_result_schema, return_value=False
+        )
+
+    def _fixture_config_local_files(self):
+        (
+            self.config.fs.open(
+                settings.sbd_config,
+                side_effect=FileNotFoundError("no sbd config"),
+                name="fs.open.sbd_config",
+            ).fs.open(
+                "/proc/uptime",
+                mock.mock_open(read_data="90061.52 170000.10\n")(),
+                name="fs.open.uptime",
+            )
+        )
+
+    def _fixture_config(self):
+        (
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
+            )
+            .corosync_conf.load(node_name_list=["node1", "node2", "node3"])
+            .runner.pcmk.load_state(stdout=self._fixture_state())
+            .runner.cib.load(resources=self.resources_cib)
+            .runner.corosync.quorum_status(node_list=["node1", "node2"])
+        )
+        self._fixture_config_services()
+
+    @staticmethod
+    def _fixture_services(running=True):
+        return {
+            service: {
+                "installed": service != "sbd",
+                "enabled": service == "pcsd",
+                "running": (
+                    running and service in ("pacemaker", "corosync", "pcsd")
+                ),
+            }
+            for service in (
+                "pacemaker",
+                "pacemaker_remote",
+                "corosync",
+                "pcsd",
+                "sbd",
+            )
+        }
+
+    def _fixture_node(self, **kwargs):
+        node = {
+            "id": "1",
+            "error_list": [],
+            "warning_list": [],
+            "status": "online",
+            "quorum": True,
+            "uptime": "1 day, 01:01:01",
+            "name": None,
+            "services": self._fixture_services(),
+            "corosync": True,
+            "pacemaker": True,
+            "corosync_enabled": False,
+            "pacemaker_enabled": False,
+            "pcsd_enabled": True,
+            "sbd_config": None,
+        }
+        node.update(kwargs)
+        return node
+
+    def test_success(self):
+        self._fixture_config()
+        self._fixture_config_local_files()
+        node_status = status.pcsd_node_status(
+            self.env_assist.get_env(), skip_auth_check=True
+        )
+        resource_list = node_status.pop("resource_list")
+        self.assertEqual(
+            node_status,
+            {
+                "cluster_name": "test99",
+                "cluster_uuid": "",
+                "groups": ["G"],
+                "constraints": {},
+                "cluster_settings": {},
+                "acls": {"role": {}, "group": {}, "user": {}, "target": {}},
+                "username": None,
+                "fence_levels": {},
+                "node_attr": {},
+                "nodes_utilization": {},
+                "alerts": [],
+                "known_nodes": ["node1", "node2", "node3"],
+                "corosync_online": ["node1", "node2"],
+                "corosync_offline": ["node3"],
+                "pacemaker_online": ["node1"],
+                "pacemaker_offline": ["node3"],
+                "pacemaker_standby": ["node2"],
+                "node": self._fixture_node(),
+            },
+        )
+        self.assertEqual(
+            [("P1", "running"), ("G", "blocked")],
+            [
+                (resource["id"], resource["status"])
+                for resource in resource_list
+            ],
+        )
+
+    def test_not_authorized_nodes(self):
+        self.config.env.set_known_nodes(["node1", "node3"])
+        self._fixture_config()
+        self.config.http.host.check_reachability(
+            communication_list=[
+                dict(label="node1"),
+                dict(
+                    label="node3",
+                    response_code=401,
+                    output='{"notauthorized":"true"}',
+                ),
+            ]
+        )
+        self._fixture_config_local_files()
+        node_status = status.pcsd_node_status(self.env_assist.get_env())
+        self.assertEqual(
+            node_status["node"]["warning_list"],
+            [
+                {
+                    "message": "Not authorized against node(s) node2, node3",
+                    "type": "nodes_not_authorized",
+                    "node_list": ["node2", "node3"],
+                }
+            ],
+        )
+
+    def test_cluster_not_running(self):
+        (
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=True
+            )
+            .corosync_conf.load(node_name_list=["node1", "node2"])
+            .runner.pcmk.load_state(
+                stdout=fixture_crm_mon.error_xml_not_connected(),
+                returncode=102,
+            )
+            .runner.cib.load(returncode=1, stderr="not connected")
+            .runner.corosync.quorum_status(
+                stdout="Cannot initialize QUORUM service", returncode=1
+            )
+        )
+        self._fixture_config_services(running=False)
+        self._fixture_config_local_files()
+        node_status = status.pcsd_node_status(
+            self.env_assist.get_env(), skip_auth_check=True
+        )
+        self.assertEqual(node_status["known_nodes"], ["node1", "node2"])
+        self.assertEqual(node_status["corosync_online"], [])
+        self.assertEqual(node_status["corosync_offline"], ["node1", "node2"])
+        self.assertEqual(node_status["pacemaker_online"], [])
+        self.assertEqual(node_status["groups"], [])
+        self.assertIsNone(node_status["alerts"])
+        self.assertEqual(node_status["resource_list"], [])
+        self.assertEqual(
+            node_status["node"],
+            self._fixture_node(
+                id="",
+                status="offline",
+                quorum=None,
+                services=self._fixture_services(running=False),
+                corosync=False,
+                pacemaker=False,
+            ),
+        )
+
+    def test_no_corosync_conf(self):
+        (
+            self.config.fs.exists(
+                settings.corosync_conf_file, return_value=False
+            )
+            .runner.pcmk.load_state(stdout=self._fixture_state())
+            .runner.cib.load(resources=self.resources_cib)
+            .runner.corosync.quorum_status(
+                stdout="Cannot initialize QUORUM service", returncode=1
+            )
+        )
+        self._fixture_config_services()
+        self._fixture_config_local_files()
+        node_status = status.pcsd_node_status(self.env_assist.get_env())
+        self.assertEqual(node_status["cluster_name"], "")
+        self.assertEqual(node_status["known_nodes"], [])
+        self.assertEqual(node_status["pacemaker_online"], [])
+        self.assertEqual(node_status["groups"], ["G"])
+        self.assertEqual(node_status["node"]["id"], "")
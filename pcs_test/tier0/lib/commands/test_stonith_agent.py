@@ -115,7 +115,6 @@ class ListAgents(TestCase):
             env={"PATH": "/usr/sbin:/bin:/usr/bin"},
             name="runner.pcmk.load_agent.fence_apc",
         )
-        self.config.runner.pcmk.load_fenced_metadata(stdout=_fixture_fenced_xml)
         self.config.runner.pcmk.load_agent(
             agent_name="stonith:fence_dummy",
             agent_is_missing=True,
@@ -128,6 +127,9 @@ class ListAgents(TestCase):
             env={"PATH": "/usr/sbin:/bin:/usr/bin"},
             name="runner.pcmk.load_agent.fence_xvm",
         )
+        # metadata of all agents are loaded at once, fenced metadata are
+        # loaded when creating the first stonith agent facade
+        self.config.runner.pcmk.load_fenced_metadata(stdout=_fixture_fenced_xml)
         agent_stub = {
             "parameters": [
                 _fixture_parameter("own-param", "testing own parameter")
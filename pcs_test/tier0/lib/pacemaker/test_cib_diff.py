@@ -0,0 +1,232 @@
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs.lib.pacemaker.cib_diff import (
+    UnsupportedCib,
+    diff_cibs,
+)
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.xml import etree_to_str
+
+
+def _cib(resources="", cib_attrs='epoch="1" num_updates="2" admin_epoch="0"'):
+    return etree.fromstring(
+        f"""
+        <cib crm_feature_set="3.1.0" {cib_attrs}>
+          <configuration>
+            <resources>{resources}</resources>
+          </configuration>
+        </cib>
+        """
+    )
+
+
+def _assert_diff(cib_old, cib_new, expected_changes):
+    assert_xml_equal(
+        f'<diff format="2">{expected_changes}</diff>',
+        etree_to_str(diff_cibs(cib_old, cib_new)),
+    )
+
+
+class DiffCibs(TestCase):
+    # pylint: disable=no-self-use
+    def test_no_change(self):
+        self.assertIsNone(
+            diff_cibs(_cib('<primitive id="A"/>'), _cib('<primitive id="A"/>'))
+        )
+
+    def test_version_change_ignored(self):
+        self.assertIsNone(
+            diff_cibs(
+                _cib(),
+                _cib(cib_attrs='epoch="5" num_updates="0" admin_epoch="1"'),
+            )
+        )
+
+    def test_unsupported_feature_set(self):
+        cib = etree.fromstring('<cib crm_feature_set="3.0.8"/>')
+        with self.assertRaises(UnsupportedCib):
+            diff_cibs(cib, cib)
+
+    def test_missing_feature_set(self):
+        cib = etree.fromstring("<cib/>")
+        with self.assertRaises(UnsupportedCib):
+            diff_cibs(cib, cib)
+
+    def test_different_root(self):
+        with self.assertRaises(UnsupportedCib):
+            diff_cibs(_cib(), etree.fromstring('<pcs crm_feature_set="3.1"/>'))
+
+    def test_modify_attributes(self):
+        _assert_diff(
+            _cib('<primitive id="A" a="1" b="2" c="3"/>'),
+            _cib('<primitive id="A" a="1" c="4" d="5"/>'),
+            """
+            <change operation="modify"
+              path="/cib/configuration/resources/primitive[@id='A']"
+            >
+              <change-list>
+                <change-attr name="c" operation="set" value="4"/>
+                <change-attr name="d" operation="set" value="5"/>
+                <change-attr name="b" operation="unset"/>
+              </change-list>
+              <change-result>
+                <primitive id="A" a="1" c="4" d="5"/>
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_modify_cib_attributes(self):
+        _assert_diff(
+            _cib(),
+            _cib(cib_attrs='epoch="3" have-quorum="1"'),
+            """
+            <change operation="modify" path="/cib">
+              <change-list>
+                <change-attr name="have-quorum" operation="set" value="1"/>
+              </change-list>
+              <change-result>
+                <cib crm_feature_set="3.1.0" epoch="1" have-quorum="1"
+                  num_updates="2" admin_epoch="0"
+                />
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_create(self):
+        _assert_diff(
+            _cib('<primitive id="A"/>'),
+            _cib(
+                """
+                <primitive id="A"/>
+                <group id="G"><primitive id="B"/></group>
+                """
+            ),
+            """
+            <change operation="create"
+              path="/cib/configuration/resources" position="1"
+            >
+              <group id="G"><primitive id="B"/></group>
+            </change>
+            """,
+        )
+
+    def test_delete(self):
+        _assert_diff(
+            _cib(
+                """
+                <primitive id="A"/>
+                <group id="G"><primitive id="B"/><primitive id="C"/></group>
+                """
+            ),
+            _cib('<group id="G"><primitive id="C"/></group>'),
+            """
+            <change operation="delete"
+              path="/cib/configuration/resources/primitive[@id='A']"
+            />
+            <change operation="delete"
+              path="/cib/configuration/resources/group[@id='G']/primitive[@id='B']"
+            />
+            """,
+        )
+
+    def test_delete_comment(self):
+        _assert_diff(
+            _cib('<primitive id="A"/><primitive id="B"/><!-- comment -->'),
+            _cib('<primitive id="B"/>'),
+            """
+            <change operation="delete"
+              path="/cib/configuration/resources/primitive[@id='A']"
+            />
+            <change operation="delete"
+              path="/cib/configuration/resources/comment" position="1"
+            />
+            """,
+        )
+
+    def test_comment_not_changed(self):
+        self.assertIsNone(
+            diff_cibs(
+                _cib('<!-- comment --><primitive id="A"/>'),
+                _cib('<!-- Comment --><primitive id="A"/>'),
+            )
+        )
+
+    def test_move(self):
+        _assert_diff(
+            _cib('<primitive id="A"/><primitive id="B"/><primitive id="C"/>'),
+            _cib('<primitive id="C"/><primitive id="A"/><primitive id="B"/>'),
+            """
+            <change operation="move"
+              path="/cib/configuration/resources/primitive[@id='C']"
+              position="0"
+            />
+            <change operation="move"
+              path="/cib/configuration/resources/primitive[@id='A']"
+              position="1"
+            />
+            """,
+        )
+
+    def test_elements_without_id_matched_by_name(self):
+        _assert_diff(
+            _cib('<primitive id="A"><meta a="1"/></primitive>'),
+            _cib('<primitive id="A"><meta a="2"/></primitive>'),
+            """
+            <change operation="modify"
+              path="/cib/configuration/resources/primitive[@id='A']/meta"
+            >
+              <change-list>
+                <change-attr name="a" operation="set" value="2"/>
+              </change-list>
+              <change-result><meta a="2"/></change-result>
+            </change>
+            """,
+        )
+
+    def test_changes_order(self):
+        _assert_diff(
+            _cib(
+                """
+                <primitive id="A"/>
+                <group id="G"><primitive id="B" a="1"/></group>
+                <primitive id="C"/>
+                """
+            ),
+            _cib(
+                """
+                <group id="G"><primitive id="D"/><primitive id="B"/></group>
+                <primitive id="A"/>
+                """
+            ),
+            """
+            <change operation="delete"
+              path="/cib/configuration/resources/primitive[@id='C']"
+            />
+            <change operation="create"
+              path="/cib/configuration/resources/group[@id='G']" position="0"
+            >
+              <primitive id="D"/>
+            </change>
+            <change operation="modify"
+              path="/cib/configuration/resources/group[@id='G']/primitive[@id='B']"
+            >
+              <change-list>
+                <change-attr name="a" operation="unset"/>
+              </change-list>
+              <change-result><primitive id="B"/></change-result>
+            </change>
+            <change operation="move"
+              path="/cib/configuration/resources/group[@id='G']"
+              position="0"
+            />
+            <change operation="move"
+              path="/cib/configuration/resources/primitive[@id='A']"
+              position="1"
+            />
+            """,
+        )
@@ -1,5 +1,10 @@
 # pylint: disable=too-many-lines
+import json
+import logging
 import os.path
+import shutil
+import tempfile
+import threading
 from unittest import (
     TestCase,
     mock,
@@ -9,10 +14,13 @@ from lxml import etree
 
 import pcs.lib.pacemaker.live as lib
 from pcs import settings
+from pcs.common import reports
+from pcs.common.reports import ReportItem
 from pcs.common.reports import ReportItemSeverity as Severity
 from pcs.common.reports import codes as report_codes
 from pcs.common.tools import Version
 from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
 from pcs.lib.pacemaker import api_result
 
@@ -28,6 +36,7 @@ from pcs_test.tools.assertions import (
 )
 from pcs_test.tools.command_env import get_env_tools
 from pcs_test.tools.custom_mock import (
+    MockLibraryReportProcessor,
     TmpFileCall,
     TmpFileMock,
 )
@@ -482,6 +491,413 @@ class GetCibTest(TestCase):
         xml_fromstring_mock.assert_called_once_with(xml)
 
 
+def fixture_cib_version(epoch="3", num_updates="5", admin_epoch="0"):
+    return (
+        f'<cib admin_epoch="{admin_epoch}" epoch="{epoch}" '
+        f'num_updates="{num_updates}"/>',
+        "",
+        0,
+    )
+
+
+CIB_VERSION_CALL = mock.call(
+    [
+        path("cibadmin"),
+        "--local",
+        "--query",
+        "--xpath=/cib",
+        "--no-children",
+    ]
+)
+CIB_QUERY_CALL = mock.call([path("cibadmin"), "--local", "--query"])
+CRM_MON_CALL = mock.call(
+    [path("crm_mon"), "--one-shot", "--inactive", "--output-as", "xml"]
+)
+
+
+class StatusSnapshotCacheTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.cache_dir = os.path.join(tmp_dir, "snapshots")
+        self.cache = lib.StatusSnapshotCache(self.cache_dir, 10)
+        self.key = {"cib": ["0", "3", "5"], "user": "user1"}
+
+    def test_put_get(self):
+        self.assertIsNone(self.cache.get("cib", self.key))
+        self.cache.put("cib", self.key, "<cib/>")
+        self.assertEqual(self.cache.get("cib", self.key), "<cib/>")
+        self.assertIsNone(self.cache.get("cluster-status", self.key))
+        self.assertEqual(os.listdir(self.cache_dir), [mock.ANY])
+
+    def test_replace(self):
+        self.cache.put("cib", self.key, "<cib/>")
+        self.cache.put("cib", dict(self.key, cib=["0", "3", "6"]), "<new/>")
+        self.assertIsNone(self.cache.get("cib", self.key))
+        self.assertEqual(
+            self.cache.get("cib", dict(self.key, cib=["0", "3", "6"])),
+            "<new/>",
+        )
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_users_separated(self):
+        self.cache.put("cib", self.key, "<cib/>")
+        self.cache.put("cib", dict(self.key, user="user2"), "<cib2/>")
+        self.assertEqual(self.cache.get("cib", self.key), "<cib/>")
+        self.assertEqual(
+            self.cache.get("cib", dict(self.key, user="user2")), "<cib2/>"
+        )
+
+    def test_expired(self):
+        with mock.patch("time.time", return_value=1000):
+            self.cache.put("cib", self.key, "<cib/>")
+        with mock.patch("time.time", return_value=1010):
+            self.assertEqual(self.cache.get("cib", self.key), "<cib/>")
+        with mock.patch("time.time", return_value=1010.5):
+            self.assertIsNone(self.cache.get("cib", self.key))
+        with mock.patch("time.time", return_value=999):
+            self.assertIsNone(self.cache.get("cib", self.key))
+
+    def test_broken_entry(self):
+        self.cache.put("cib", self.key, "<cib/>")
+        (entry_name,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, entry_name), "w") as entry:
+            json.dump({"key": self.key}, entry)
+        self.assertIsNone(self.cache.get("cib", self.key))
+
+    def test_clear(self):
+        self.cache.put("cib", self.key, "<cib/>")
+        self.cache.put("cluster-status", self.key, "<status/>")
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_clear_no_dir(self):
+        self.cache.clear()
+
+    def test_put_dir_not_writable(self):
+        with open(self.cache_dir, "w"):
+            pass
+        self.cache.put("cib", self.key, "<cib/>")
+        self.assertIsNone(self.cache.get("cib", self.key))
+
+
+class StatusSnapshotTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.cache_dir = tmp_dir
+        patcher = mock.patch.multiple(
+            settings,
+            pacemaker_status_snapshot_dir=self.cache_dir,
+            pacemaker_status_snapshot_ttl=10,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def get_runner(result_list, env_vars=None):
+        runner = get_runner(env_vars=env_vars)
+        runner.run.side_effect = result_list
+        return runner
+
+    def test_cib_reused(self):
+        runner = self.get_runner([fixture_cib_version(), ("<cib/>", "", 0)])
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL, CIB_QUERY_CALL])
+
+        runner = self.get_runner([fixture_cib_version()])
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL])
+
+    def test_cib_changed(self):
+        runner = self.get_runner([fixture_cib_version(), ("<cib/>", "", 0)])
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+
+        runner = self.get_runner(
+            [fixture_cib_version(num_updates="6"), ("<cib2/>", "", 0)]
+        )
+        self.assertEqual(lib.get_cib_xml(runner), "<cib2/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL, CIB_QUERY_CALL])
+
+    def test_cib_other_user(self):
+        runner = self.get_runner([fixture_cib_version(), ("<cib/>", "", 0)])
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+
+        runner = self.get_runner(
+            [fixture_cib_version(), ("<cib2/>", "", 0)],
+            env_vars={"CIB_user": "user1"},
+        )
+        self.assertEqual(lib.get_cib_xml(runner), "<cib2/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL, CIB_QUERY_CALL])
+
+    def test_cib_error_not_stored(self):
+        runner = self.get_runner([fixture_cib_version(), ("", "error", 1)])
+        assert_raise_library_error(
+            lambda: lib.get_cib_xml(runner),
+            fixture.error(report_codes.CIB_LOAD_ERROR, reason="error"),
+        )
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_cib_version_error(self):
+        for version_result in [
+            ("", "error", 1),
+            ("not xml", "", 0),
+            ('<cib epoch="3"/>', "", 0),
+        ]:
+            with self.subTest(version_result=version_result):
+                runner = self.get_runner([version_result, ("<cib/>", "", 0)])
+                self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+                runner.run.assert_has_calls([CIB_VERSION_CALL, CIB_QUERY_CALL])
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_cib_scope_not_reused(self):
+        runner = self.get_runner([("<resources/>", "", 0)])
+        self.assertEqual(lib.get_cib_xml(runner, "resources"), "<resources/>")
+        runner.run.assert_called_once_with(
+            [path("cibadmin"), "--local", "--query", "--scope=resources"]
+        )
+
+    def test_cib_file(self):
+        runner = self.get_runner(
+            [("<cib/>", "", 0)], env_vars={"CIB_file": "/tmp/cib.xml"}
+        )
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+        runner.run.assert_called_once_with(
+            [path("cibadmin"), "--local", "--query"]
+        )
+
+    def test_disabled(self):
+        runner = self.get_runner([("<cib/>", "", 0)])
+        with mock.patch.object(settings, "pacemaker_status_snapshot_ttl", 0):
+            self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+        runner.run.assert_called_once_with(
+            [path("cibadmin"), "--local", "--query"]
+        )
+
+    def test_cluster_status_reused(self):
+        # pylint: disable=protected-access
+        runner = self.get_runner([fixture_cib_version(), ("<status/>", "", 0)])
+        self.assertEqual(lib._get_cluster_status_xml(runner), "<status/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL, CRM_MON_CALL])
+
+        runner = self.get_runner([fixture_cib_version()])
+        self.assertEqual(lib._get_cluster_status_xml(runner), "<status/>")
+        runner.run.assert_has_calls([CIB_VERSION_CALL])
+
+    def test_invalidated_by_push(self):
+        runner = self.get_runner([fixture_cib_version(), ("<cib/>", "", 0)])
+        self.assertEqual(lib.get_cib_xml(runner), "<cib/>")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        for push in [
+            lambda runner: lib.push_cib_diff_xml(runner, "<diff/>"),
+            lambda runner: lib.replace_cib_configuration_xml(runner, "<cib/>"),
+        ]:
+            with self.subTest(push=push):
+                runner = self.get_runner(
+                    [fixture_cib_version(), ("<cib/>", "", 0), ("", "", 0)]
+                )
+                lib.get_cib_xml(runner)
+                self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+                push(runner)
+                self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+class ThreadRecordingReportProcessor(MockLibraryReportProcessor):
+    def __init__(self):
+        super().__init__()
+        self.thread_set = set()
+
+    def _do_report(self, report_item):
+        self.thread_set.add(threading.get_ident())
+        super()._do_report(report_item)
+
+
+class RunStatusCommandsTest(TestCase):
+    # Real processes are run to check that they run at the same time while
+    # their outputs are processed and reported in the calling thread.
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.tmp_dir = tmp_dir
+        self.report_processor = ThreadRecordingReportProcessor()
+        self.runner = CommandRunner(
+            mock.MagicMock(logging.Logger), self.report_processor
+        )
+        self.process_thread_set = set()
+
+    def command(self, script, process=None):
+        def record_thread(stdout, stderr, retval):
+            self.process_thread_set.add(threading.get_ident())
+            if process:
+                return process(stdout, stderr, retval)
+            return stdout.strip(), stderr.strip(), retval
+
+        return lib.StatusCommand(["/bin/sh", "-c", script], record_thread)
+
+    def wait_for_file(self, name, output):
+        # exits with an error if the file is not created in 5 seconds
+        file_path = os.path.join(self.tmp_dir, name)
+        return self.command(
+            f"for i in $(seq 500); do "
+            f"if [ -e {file_path} ]; then echo {output}; exit 0; fi; "
+            f"sleep 0.01; done; exit 1"
+        )
+
+    def create_file(self, name, output):
+        return self.command(
+            f"touch {os.path.join(self.tmp_dir, name)}; echo {output}"
+        )
+
+    def assert_calling_thread_only(self):
+        self.assertEqual(self.process_thread_set, {threading.get_ident()})
+        self.assertEqual(
+            self.report_processor.thread_set, {threading.get_ident()}
+        )
+
+    def test_run_at_the_same_time(self):
+        self.assertEqual(
+            lib.run_status_commands(
+                self.runner,
+                [
+                    self.wait_for_file("file1", "out1"),
+                    self.wait_for_file("file2", "out2"),
+                    self.create_file("file2", "out3"),
+                    self.create_file("file1", "out4"),
+                ],
+                4,
+            ),
+            [
+                ("out1", "", 0),
+                ("out2", "", 0),
+                ("out3", "", 0),
+                ("out4", "", 0),
+            ],
+        )
+        self.assert_calling_thread_only()
+
+    def test_max_parallel(self):
+        self.assertEqual(
+            lib.run_status_commands(
+                self.runner,
+                [
+                    self.create_file("file1", "out1"),
+                    self.wait_for_file("file1", "out2"),
+                ],
+                1,
+            ),
+            [("out1", "", 0), ("out2", "", 0)],
+        )
+
+    def test_first_error_raised(self):
+        def fail(stdout, stderr, retval):
+            raise LibraryError(
+                ReportItem.error(reports.messages.CrmMonError(stdout.strip()))
+            )
+
+        command_list = [
+            self.command("echo out1"),
+            self.command("echo error2", fail),
+            self.command("echo error3", fail),
+        ]
+        assert_raise_library_error(
+            lambda: lib.run_status_commands(self.runner, command_list, 3),
+            fixture.error(report_codes.CRM_MON_ERROR, reason="error2"),
+        )
+        self.assert_calling_thread_only()
+
+    def test_ignore_errors(self):
+        def fail(stdout, stderr, retval):
+            raise LibraryError()
+
+        self.assertEqual(
+            lib.run_status_commands(
+                self.runner,
+                [
+                    self.command("echo error1", fail),
+                    self.command("echo out2"),
+                ],
+                2,
+                ignore_errors=True,
+            ),
+            [None, ("out2", "", 0)],
+        )
+        self.assert_calling_thread_only()
+
+    def test_no_commands(self):
+        self.assertEqual(lib.run_status_commands(self.runner, [], 2), [])
+
+
+class RunStatusCommandsSnapshotTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.cache_dir = tmp_dir
+        patcher = mock.patch.multiple(
+            settings,
+            pacemaker_status_snapshot_dir=self.cache_dir,
+            pacemaker_status_snapshot_ttl=10,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.command_list = [
+            lib.get_cluster_status_xml_command(),
+            lib.get_cib_xml_command(),
+            lib.get_ticket_status_text_command(),
+        ]
+
+    @staticmethod
+    def get_runner(output_list):
+        runner = get_runner(*fixture_cib_version())
+        runner.run_parallel.return_value = output_list
+        return runner
+
+    def test_reused(self):
+        runner = self.get_runner(
+            [("<status/>", "", 0), ("<cib/>", "", 0), ("tickets", "", 0)]
+        )
+        self.assertEqual(
+            lib.run_status_commands(runner, self.command_list, 3),
+            ["<status/>", "<cib/>", ("tickets", "", 0)],
+        )
+        self.assertEqual(runner.run.mock_calls, [CIB_VERSION_CALL])
+        runner.run_parallel.assert_called_once_with(
+            [command.args for command in self.command_list],
+            max_parallel=3,
+            while_running=None,
+        )
+
+        runner = self.get_runner([("tickets2", "", 0)])
+        self.assertEqual(
+            lib.run_status_commands(runner, self.command_list, 3),
+            ["<status/>", "<cib/>", ("tickets2", "", 0)],
+        )
+        runner.run_parallel.assert_called_once_with(
+            [self.command_list[2].args], max_parallel=3, while_running=None
+        )
+
+    def test_error_not_stored(self):
+        runner = self.get_runner(
+            [("<status/>", "", 0), ("", "error", 1), ("tickets", "", 0)]
+        )
+        self.assertEqual(
+            lib.run_status_commands(
+                runner, self.command_list, 3, ignore_errors=True
+            ),
+            ["<status/>", None, ("tickets", "", 0)],
+        )
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_cib_file(self):
+        runner = self.get_runner(
+            [("<status/>", "", 0), ("<cib/>", "", 0), ("tickets", "", 0)]
+        )
+        runner.env_vars = {"CIB_file": "/tmp/cib.xml"}
+        lib.run_status_commands(runner, self.command_list, 3)
+        runner.run.assert_not_called()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
 class Verify(TestCase):
     def test_run_on_live_cib(self):
         runner = get_runner()
@@ -667,6 +1083,112 @@ class ReplaceCibConfigurationTest(TestCase):
         )
 
 
+class DiffCibsTest(TestCase):
+    cib_old = '<cib crm_feature_set="3.1.0" epoch="1"><configuration/></cib>'
+    cib_new = (
+        '<cib crm_feature_set="3.1.0" epoch="2"><configuration a="b"/></cib>'
+    )
+
+    def setUp(self):
+        self.reporter = MockLibraryReportProcessor()
+
+    def diff(self, runner, cib_old, cib_new):
+        return lib.diff_cibs(
+            runner, self.reporter, etree.fromstring(cib_old), cib_new
+        )
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", True)
+    def test_native(self):
+        mock_runner = get_runner()
+        assert_xml_equal(
+            """
+            <diff format="2">
+              <change operation="modify" path="/cib/configuration">
+                <change-list>
+                  <change-attr name="a" operation="set" value="b"/>
+                </change-list>
+                <change-result><configuration a="b"/></change-result>
+              </change>
+            </diff>
+            """,
+            self.diff(
+                mock_runner, self.cib_old, etree.fromstring(self.cib_new)
+            ),
+        )
+        mock_runner.run.assert_not_called()
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", True)
+    def test_native_no_change(self):
+        mock_runner = get_runner()
+        self.assertEqual(
+            "",
+            self.diff(
+                mock_runner, self.cib_old, etree.fromstring(self.cib_old)
+            ),
+        )
+        mock_runner.run.assert_not_called()
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", True)
+    def test_native_fallback_to_crm_diff(self):
+        mock_runner = get_runner("crm_diff output\n", "", 1)
+        # pacemaker does not create patchsets in the format 2 for old CIBs
+        cib_old = '<cib crm_feature_set="3.0.8"><configuration/></cib>'
+        self.assertEqual(
+            "crm_diff output",
+            self.diff(mock_runner, cib_old, etree.fromstring(cib_old)),
+        )
+        mock_runner.run.assert_called_once()
+        self.assertEqual(mock_runner.run.call_args[0][0][0], path("crm_diff"))
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", False)
+    def test_crm_diff(self):
+        mock_runner = get_runner("crm_diff output\n", "", 1)
+        self.assertEqual(
+            "crm_diff output",
+            self.diff(
+                mock_runner, self.cib_old, etree.fromstring(self.cib_new)
+            ),
+        )
+        mock_runner.run.assert_called_once()
+        self.assertEqual(mock_runner.run.call_args[0][0][0], path("crm_diff"))
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", True)
+    def test_native_original_xml(self):
+        mock_runner = get_runner()
+        self.assertEqual(
+            "",
+            lib.diff_cibs(
+                mock_runner,
+                self.reporter,
+                self.cib_old,
+                etree.fromstring(self.cib_old),
+            ),
+        )
+        mock_runner.run.assert_not_called()
+
+    @mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", False)
+    def test_crm_diff_original_xml(self):
+        mock_runner = get_runner("crm_diff output\n", "", 1)
+        cib_old = f"{self.cib_old}\n"
+        self.assertEqual(
+            "crm_diff output",
+            lib.diff_cibs(
+                mock_runner,
+                self.reporter,
+                cib_old,
+                etree.fromstring(self.cib_new),
+            ),
+        )
+        # the original CIB is written as it was loaded, not serialized again
+        self.assertEqual(
+            [cib_old, self.cib_new],
+            [
+                report_item.message.content
+                for report_item in self.reporter.report_item_list
+            ],
+        )
+
+
 class UpgradeCibTest(TestCase):
     # pylint: disable=protected-access
     # pylint: disable=no-self-use
@@ -1538,6 +2060,93 @@ class GetRulesInEffectStatus(TestCase):
                 )
 
 
+class GetRulesInEffectStatusAllAtOnce(TestCase):
+    CALL_ARGS = [
+        path("crm_rule"),
+        "--check",
+        "--output-as",
+        "xml",
+        "--xml-text",
+        "-",
+        "--rule",
+        "r1",
+        "--rule",
+        "r2",
+        "--rule",
+        "r3",
+        "--rule",
+        "r4",
+    ]
+
+    def test_success(self):
+        runner = get_runner(
+            stdout="""
+                <pacemaker-result api-version="2.20" request="crm_rule">
+                    <rule-check rule-id="r1" rc="0"/>
+                    <rule-check rule-id="r2" rc="110"/>
+                    <rule-check rule-id="r3" rc="111"/>
+                    <rule-check rule-id="r4" rc="105"/>
+                    <status code="105" message="No such object"/>
+                </pacemaker-result>
+            """,
+            returncode=105,
+        )
+        self.assertEqual(
+            lib.get_rules_in_effect_status(
+                runner, "mock cib", ["r1", "r2", "r3", "r4"]
+            ),
+            {
+                "r1": CibRuleInEffectStatus.IN_EFFECT,
+                "r2": CibRuleInEffectStatus.EXPIRED,
+                "r3": CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
+                "r4": CibRuleInEffectStatus.UNKNOWN,
+            },
+        )
+        runner.run.assert_called_once_with(
+            self.CALL_ARGS, stdin_string="mock cib"
+        )
+
+    def test_not_all_rules_checked(self):
+        runner = get_runner(
+            stdout="""
+                <pacemaker-result api-version="2.10" request="crm_rule">
+                    <rule-check rule-id="r4" rc="0"/>
+                    <status code="0" message="OK"/>
+                </pacemaker-result>
+            """,
+        )
+        self.assertEqual(
+            lib.get_rules_in_effect_status(
+                runner, "mock cib", ["r1", "r2", "r3", "r4"]
+            ),
+            {"r4": CibRuleInEffectStatus.IN_EFFECT},
+        )
+        runner.run.assert_called_once_with(
+            self.CALL_ARGS, stdin_string="mock cib"
+        )
+
+    def test_xml_output_not_supported(self):
+        runner = get_runner(
+            stderr="crm_rule: Unknown option --output-as", returncode=64
+        )
+        self.assertEqual(
+            lib.get_rules_in_effect_status(
+                runner, "mock cib", ["r1", "r2", "r3", "r4"]
+            ),
+            {},
+        )
+        runner.run.assert_called_once_with(
+            self.CALL_ARGS, stdin_string="mock cib"
+        )
+
+    def test_no_rules(self):
+        runner = get_runner()
+        self.assertEqual(
+            lib.get_rules_in_effect_status(runner, "mock cib", []), {}
+        )
+        runner.run.assert_not_called()
+
+
 @mock.patch.object(
     settings, "pacemaker_api_result_schema", rc("pcmk_api_rng/api-result.rng")
 )
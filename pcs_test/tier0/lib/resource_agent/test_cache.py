@@ -0,0 +1,347 @@
+import os
+import os.path
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs.lib import resource_agent as ra
+from pcs.lib.resource_agent.cache import (
+    ResourceAgentMetadataCache,
+    ResourceAgentNameCache,
+    get_agent_executable,
+    get_default_metadata_cache,
+)
+
+from pcs_test.tools.misc import get_tmp_dir
+
+
+def _fixture_metadata(name, shortdesc="agent"):
+    return ra.ResourceAgentMetadata(
+        name,
+        agent_exists=True,
+        ocf_version=ra.const.OCF_1_1,
+        shortdesc=shortdesc,
+        longdesc="long description",
+        parameters=[
+            ra.ResourceAgentParameter(
+                "param",
+                shortdesc=None,
+                longdesc=None,
+                type="string",
+                default="default",
+                enum_values=["a", "b"],
+                required=False,
+                advanced=False,
+                deprecated=True,
+                deprecated_by=["new-param"],
+                deprecated_desc=None,
+                unique_group="group",
+                reloadable=False,
+            )
+        ],
+        actions=[
+            ra.ResourceAgentAction(
+                "monitor",
+                timeout="20s",
+                interval="10s",
+                role=None,
+                start_delay=None,
+                depth="0",
+                automatic=False,
+                on_target=False,
+            )
+        ],
+    )
+
+
+def _write_file(path, content):
+    with open(path, "w") as a_file:
+        a_file.write(content)
+
+
+class GetAgentExecutable(TestCase):
+    @mock.patch(
+        "pcs.lib.resource_agent.cache.settings.ocf_resource_agents_dir",
+        "/ocf",
+    )
+    def test_ocf(self):
+        self.assertEqual(
+            get_agent_executable(
+                ra.ResourceAgentName("ocf", "heartbeat", "Dummy")
+            ),
+            "/ocf/heartbeat/Dummy",
+        )
+
+    @mock.patch(
+        "pcs.lib.resource_agent.cache.settings.fence_agent_binaries",
+        "/fence",
+    )
+    def test_stonith(self):
+        self.assertEqual(
+            get_agent_executable(
+                ra.ResourceAgentName("stonith", None, "fence_xvm")
+            ),
+            "/fence/fence_xvm",
+        )
+
+    @mock.patch("pcs.lib.resource_agent.cache.settings.lsb_agents_dir", "/lsb")
+    def test_lsb(self):
+        self.assertEqual(
+            get_agent_executable(ra.ResourceAgentName("lsb", None, "network")),
+            "/lsb/network",
+        )
+
+    @mock.patch(
+        "pcs.lib.resource_agent.cache.settings.pacemaker_fenced", "/fenced"
+    )
+    def test_fenced(self):
+        self.assertEqual(
+            get_agent_executable(
+                ra.ResourceAgentName(
+                    ra.const.FAKE_AGENT_STANDARD,
+                    None,
+                    ra.const.PACEMAKER_FENCED,
+                )
+            ),
+            "/fenced",
+        )
+
+    def test_systemd(self):
+        self.assertIsNone(
+            get_agent_executable(ra.ResourceAgentName("systemd", None, "pcsd"))
+        )
+
+
+class ResourceAgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.tmp_dir = get_tmp_dir("tier0_lib_ra_metadata_cache")
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        ocf_dir = os.path.join(self.tmp_dir.name, "ocf")
+        os.makedirs(os.path.join(ocf_dir, "pacemaker"))
+        self.agent_path = os.path.join(ocf_dir, "pacemaker", "Dummy")
+        _write_file(self.agent_path, "agent")
+        self.crm_resource_path = os.path.join(self.tmp_dir.name, "crm_resource")
+        _write_file(self.crm_resource_path, "crm_resource")
+
+        patcher_list = [
+            mock.patch(
+                "pcs.lib.resource_agent.cache.settings.ocf_resource_agents_dir",
+                ocf_dir,
+            ),
+            mock.patch(
+                "pcs.lib.resource_agent.cache.settings.crm_resource_binary",
+                self.crm_resource_path,
+            ),
+        ]
+        for patcher in patcher_list:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.name = ra.ResourceAgentName("ocf", "pacemaker", "Dummy")
+        self.cache = ResourceAgentMetadataCache(self.cache_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(self.name))
+
+    def test_hit(self):
+        metadata = _fixture_metadata(self.name)
+        self.cache.put(self.name, metadata)
+        self.assertEqual(self.cache.get(self.name), metadata)
+        self.assertEqual(
+            ResourceAgentMetadataCache(self.cache_dir).get(self.name), metadata
+        )
+
+    def test_agent_changed(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        _write_file(self.agent_path, "updated agent")
+        self.assertIsNone(self.cache.get(self.name))
+
+    def test_agent_removed(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        os.unlink(self.agent_path)
+        self.assertIsNone(self.cache.get(self.name))
+
+    def test_pacemaker_changed(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        _write_file(self.crm_resource_path, "updated crm_resource")
+        self.assertIsNone(self.cache.get(self.name))
+
+    def test_pcs_changed(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        with mock.patch(
+            "pcs.lib.resource_agent.cache.settings.pcs_version", "0.0.0"
+        ):
+            self.assertIsNone(self.cache.get(self.name))
+
+    def test_corrupted_entry(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        for entry in os.listdir(self.cache_dir):
+            _write_file(os.path.join(self.cache_dir, entry), "{not json")
+        self.assertIsNone(self.cache.get(self.name))
+
+    def test_agent_without_executable_not_cached(self):
+        name = ra.ResourceAgentName("systemd", None, "pcsd")
+        self.cache.put(name, _fixture_metadata(name))
+        self.assertIsNone(self.cache.get(name))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_clear(self):
+        self.cache.put(self.name, _fixture_metadata(self.name))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(self.name))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_clear_no_cache_dir(self):
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_size_limit(self):
+        name_list = [
+            ra.ResourceAgentName("ocf", "pacemaker", f"Dummy{i}")
+            for i in range(3)
+        ]
+        for name in name_list:
+            _write_file(
+                os.path.join(
+                    self.tmp_dir.name, "ocf", name.provider, name.type
+                ),
+                "agent",
+            )
+        self.cache.put(name_list[0], _fixture_metadata(name_list[0]))
+        entry_size = sum(
+            os.path.getsize(os.path.join(self.cache_dir, entry))
+            for entry in os.listdir(self.cache_dir)
+        )
+        cache = ResourceAgentMetadataCache(
+            self.cache_dir, max_size=int(entry_size * 2.5)
+        )
+        cache.put(name_list[1], _fixture_metadata(name_list[1]))
+        # make the first entry the least recently used one
+        os.utime(
+            cache._get_entry_path(  # pylint: disable=protected-access
+                name_list[0]
+            ),
+            ns=(0, 0),
+        )
+        cache.put(name_list[2], _fixture_metadata(name_list[2]))
+
+        self.assertIsNone(cache.get(name_list[0]))
+        self.assertIsNotNone(cache.get(name_list[1]))
+        self.assertIsNotNone(cache.get(name_list[2]))
+
+
+class GetDefaultMetadataCache(TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_default_metadata_cache())
+
+    @mock.patch(
+        "pcs.lib.resource_agent.cache.settings.resource_agent_metadata_cache_dir",
+        "/cache",
+    )
+    def test_enabled(self):
+        self.assertIsInstance(
+            get_default_metadata_cache(), ResourceAgentMetadataCache
+        )
+
+
+class ResourceAgentNameCacheTest(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.tmp_dir = get_tmp_dir("tier0_lib_ra_name_cache")
+        self.cache_file = os.path.join(self.tmp_dir.name, "cache", "names")
+        self.ocf_dir = os.path.join(self.tmp_dir.name, "ocf")
+        os.makedirs(os.path.join(self.ocf_dir, "pacemaker"))
+        self.systemd_dir = os.path.join(self.tmp_dir.name, "systemd")
+        os.makedirs(self.systemd_dir)
+        crm_resource_path = os.path.join(self.tmp_dir.name, "crm_resource")
+        _write_file(crm_resource_path, "crm_resource")
+
+        settings_path = "pcs.lib.resource_agent.cache.settings"
+        patcher_list = [
+            mock.patch(
+                f"{settings_path}.ocf_resource_agents_dir", self.ocf_dir
+            ),
+            mock.patch(
+                f"{settings_path}.lsb_agents_dir",
+                os.path.join(self.tmp_dir.name, "lsb"),
+            ),
+            mock.patch(
+                f"{settings_path}.systemd_unit_path", [self.systemd_dir]
+            ),
+            mock.patch(
+                f"{settings_path}.fence_agent_binaries",
+                os.path.join(self.tmp_dir.name, "fence"),
+            ),
+            mock.patch(
+                f"{settings_path}.crm_resource_binary", crm_resource_path
+            ),
+        ]
+        for patcher in patcher_list:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.index = {
+            "dummy": [
+                ra.ResourceAgentName("ocf", "heartbeat", "Dummy"),
+                ra.ResourceAgentName("ocf", "pacemaker", "Dummy"),
+            ],
+            "sshd": [ra.ResourceAgentName("systemd", None, "sshd")],
+        }
+        self.cache = ResourceAgentNameCache(self.cache_file)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def _touch_dir(path):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get())
+
+    def test_hit(self):
+        self.cache.put(self.index)
+        self.assertEqual(self.cache.get(), self.index)
+        self.assertEqual(
+            ResourceAgentNameCache(self.cache_file).get(), self.index
+        )
+
+    def test_ocf_provider_dir_changed(self):
+        self.cache.put(self.index)
+        self._touch_dir(os.path.join(self.ocf_dir, "pacemaker"))
+        self.assertIsNone(self.cache.get())
+
+    def test_ocf_provider_added(self):
+        self.cache.put(self.index)
+        os.makedirs(os.path.join(self.ocf_dir, "heartbeat"))
+        self._touch_dir(self.ocf_dir)
+        self.assertIsNone(self.cache.get())
+
+    def test_systemd_dir_changed(self):
+        self.cache.put(self.index)
+        self._touch_dir(self.systemd_dir)
+        self.assertIsNone(self.cache.get())
+
+    def test_missing_dir_created(self):
+        self.cache.put(self.index)
+        os.makedirs(os.path.join(self.tmp_dir.name, "lsb"))
+        self.assertIsNone(self.cache.get())
+
+    def test_corrupted_file(self):
+        self.cache.put(self.index)
+        _write_file(self.cache_file, "[]")
+        self.assertIsNone(self.cache.get())
+
+    def test_clear(self):
+        self.cache.put(self.index)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get())
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_clear_no_cache_file(self):
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache_file))
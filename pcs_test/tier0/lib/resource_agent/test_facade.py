@@ -141,6 +141,119 @@ class ResourceAgentFacadeFactory(TestCase):
             ).facade_from_parsed_name(name)
         self.assertEqual(cm.exception.agent_name, name.full_name)
 
+    def test_facade_metadata_cache_miss(self):
+        name = ra.ResourceAgentName("service", None, "daemon")
+        self.config.runner.pcmk.load_agent(
+            agent_name="service:daemon", stdout=self._fixture_agent_xml
+        )
+        metadata_cache = mock.Mock(spec_set=["get", "put"])
+        metadata_cache.get.return_value = None
+
+        env = self.env_assist.get_env()
+        facade = ra.ResourceAgentFacadeFactory(
+            env.cmd_runner(), env.report_processor, metadata_cache
+        ).facade_from_parsed_name(name)
+        self.assertEqual(facade.metadata.name, name)
+        metadata_cache.get.assert_called_once_with(name)
+        metadata_cache.put.assert_called_once_with(name, mock.ANY)
+        self.assertEqual(
+            [
+                param.name
+                for param in metadata_cache.put.call_args[0][1].parameters
+            ],
+            ["agent-param"],
+        )
+
+    def test_facade_metadata_cache_hit(self):
+        name = ra.ResourceAgentName("service", None, "daemon")
+        metadata_cache = mock.Mock(spec_set=["get", "put"])
+        metadata_cache.get.return_value = ra.ResourceAgentMetadata(
+            name,
+            agent_exists=True,
+            ocf_version=ra.const.OCF_1_1,
+            shortdesc="cached",
+            longdesc=None,
+            parameters=[],
+            actions=[],
+        )
+
+        env = self.env_assist.get_env()
+        facade = ra.ResourceAgentFacadeFactory(
+            env.cmd_runner(), env.report_processor, metadata_cache
+        ).facade_from_parsed_name(name)
+        self.assertEqual(facade.metadata.name, name)
+        self.assertEqual(facade.metadata.shortdesc, "cached")
+        metadata_cache.get.assert_called_once_with(name)
+        metadata_cache.put.assert_not_called()
+
+    def test_facades_from_names(self):
+        name_list = [
+            ra.ResourceAgentName("stonith", None, "fence_xvm"),
+            ra.ResourceAgentName("service", None, "cached"),
+            ra.ResourceAgentName("service", None, "missing"),
+            ra.ResourceAgentName("service", None, "daemon"),
+        ]
+        cached_metadata = ra.ResourceAgentMetadata(
+            name_list[1],
+            agent_exists=True,
+            ocf_version=ra.const.OCF_1_1,
+            shortdesc="cached",
+            longdesc=None,
+            parameters=[],
+            actions=[],
+        )
+        metadata_cache = mock.Mock(spec_set=["get", "put"])
+        metadata_cache.get.side_effect = lambda name: (
+            cached_metadata if name == name_list[1] else None
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="stonith:fence_xvm",
+            stdout=self._fixture_agent_xml,
+            name="runner.pcmk.load_agent.xvm",
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="service:missing",
+            agent_is_missing=True,
+            stderr="error message",
+            name="runner.pcmk.load_agent.missing",
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="service:daemon",
+            stdout=self._fixture_agent_xml,
+            name="runner.pcmk.load_agent.daemon",
+        )
+        self.config.runner.pcmk.load_fenced_metadata(
+            stdout=self._fixture_fenced_xml
+        )
+
+        env = self.env_assist.get_env()
+        result = ra.ResourceAgentFacadeFactory(
+            env.cmd_runner(), env.report_processor, metadata_cache
+        ).facades_from_parsed_names(name_list, max_parallel=4, timeout=10)
+
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[0].metadata.name, name_list[0])
+        self.assertEqual(
+            [param.name for param in result[0].metadata.parameters],
+            ["agent-param", "fenced-param"],
+        )
+        self.assertEqual(result[1].metadata.shortdesc, "cached")
+        self.assertIsInstance(result[2], ra.UnableToGetAgentMetadata)
+        self.assertEqual(result[2].agent_name, "service:missing")
+        self.assertEqual(result[3].metadata.name, name_list[3])
+        self.assertEqual(
+            [call[0][0] for call in metadata_cache.put.call_args_list],
+            [
+                name_list[0],
+                name_list[3],
+                ra.ResourceAgentName(
+                    ra.const.FAKE_AGENT_STANDARD,
+                    None,
+                    ra.const.PACEMAKER_FENCED,
+                ),
+            ],
+        )
+
     def test_void_load_and_cache_fenced_for_stonith(self):
         name1 = ra.ResourceAgentName("stonith", None, "fence_xvm")
         name2 = ra.ResourceAgentName("stonith", None, "fence_virt")
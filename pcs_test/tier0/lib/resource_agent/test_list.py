@@ -374,3 +374,85 @@ class FindOneResourceAgentByType(TestCase):
                 env.cmd_runner(), env.report_processor, "missing"
             )
         self.assertEqual(cm.exception.agent_name, "missing")
+
+    def test_name_cache_miss(self):
+        self._fixture_success_calls()
+        name_cache = mock.Mock(spec_set=["get", "put"])
+        name_cache.get.return_value = None
+        env = self.env_assist.get_env()
+        self.assertEqual(
+            ra_list.find_one_resource_agent_by_type(
+                env.cmd_runner(), env.report_processor, "delay", name_cache
+            ),
+            ResourceAgentName("ocf", "heartbeat", "Delay"),
+        )
+        name_cache.put.assert_called_once_with(
+            {
+                "delay": [ResourceAgentName("ocf", "heartbeat", "Delay")],
+                "dummy": [
+                    ResourceAgentName("ocf", "heartbeat", "Dummy"),
+                    ResourceAgentName("ocf", "pacemaker", "Dummy"),
+                ],
+                "stateful": [ResourceAgentName("ocf", "pacemaker", "Stateful")],
+                "sshd": [ResourceAgentName("service", None, "sshd")],
+                "nonvalid:dummy": [
+                    ResourceAgentName("service", None, "nonvalid:dummy")
+                ],
+            }
+        )
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    report_codes.AGENT_NAME_GUESSED,
+                    entered_name="delay",
+                    guessed_name="ocf:heartbeat:Delay",
+                )
+            ]
+        )
+
+    def test_name_cache_hit(self):
+        name_cache = mock.Mock(spec_set=["get", "put"])
+        name_cache.get.return_value = {
+            "delay": [ResourceAgentName("ocf", "heartbeat", "Delay")],
+        }
+        env = self.env_assist.get_env()
+        self.assertEqual(
+            ra_list.find_one_resource_agent_by_type(
+                env.cmd_runner(), env.report_processor, "DELAY", name_cache
+            ),
+            ResourceAgentName("ocf", "heartbeat", "Delay"),
+        )
+        name_cache.put.assert_not_called()
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    report_codes.AGENT_NAME_GUESSED,
+                    entered_name="DELAY",
+                    guessed_name="ocf:heartbeat:Delay",
+                )
+            ]
+        )
+
+
+class ListAllResourceAgents(TestCase):
+    def test_sorted_by_full_name(self):
+        name_cache = mock.Mock(spec_set=["get", "put"])
+        name_cache.get.return_value = {
+            "dummy": [
+                ResourceAgentName("ocf", "pacemaker", "Dummy"),
+                ResourceAgentName("ocf", "heartbeat", "Dummy"),
+            ],
+            "delay": [ResourceAgentName("ocf", "heartbeat", "Delay")],
+            "sshd": [ResourceAgentName("service", None, "sshd")],
+        }
+        self.assertEqual(
+            ra_list.list_all_resource_agents(
+                mock.Mock(spec_set=CommandRunner), name_cache
+            ),
+            [
+                ResourceAgentName("ocf", "heartbeat", "Delay"),
+                ResourceAgentName("ocf", "heartbeat", "Dummy"),
+                ResourceAgentName("ocf", "pacemaker", "Dummy"),
+                ResourceAgentName("service", None, "sshd"),
+            ],
+        )
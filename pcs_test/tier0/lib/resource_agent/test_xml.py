@@ -5,6 +5,7 @@ from unittest import (
 
 from lxml import etree
 
+from pcs import settings
 from pcs.lib import resource_agent as ra
 from pcs.lib.external import CommandRunner
 from pcs.lib.resource_agent.types import (
@@ -292,6 +293,98 @@ class LoadMetadata(TestCase):
         )
 
 
+class LoadMetadataList(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_success_and_failures(self):
+        name_list = [
+            ra.ResourceAgentName("ocf", "pacemaker", "Dummy"),
+            ra.ResourceAgentName("ocf", "pacemaker", "Missing"),
+            ra.ResourceAgentName("ocf", "pacemaker", "NotXml"),
+            ra.ResourceAgentName("ocf", "pacemaker", "Stateful"),
+        ]
+        self.config.runner.pcmk.load_agent(
+            agent_name="ocf:pacemaker:Dummy",
+            stdout='<resource-agent name="Dummy"/>',
+            name="load_agent.Dummy",
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="ocf:pacemaker:Missing",
+            agent_is_missing=True,
+            stderr="error message",
+            name="load_agent.Missing",
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="ocf:pacemaker:NotXml",
+            stdout="this is not an xml",
+            name="load_agent.NotXml",
+        )
+        self.config.runner.pcmk.load_agent(
+            agent_name="ocf:pacemaker:Stateful",
+            stdout='<resource-agent name="Stateful"/>',
+            name="load_agent.Stateful",
+        )
+
+        env = self.env_assist.get_env()
+        result = ra.xml.load_metadata_list(env.cmd_runner(), name_list, 4, 10)
+
+        self.assertEqual(len(result), 4)
+        assert_xml_equal(
+            '<resource-agent name="Dummy"/>', etree_to_str(result[0])
+        )
+        self.assertIsInstance(result[1], ra.UnableToGetAgentMetadata)
+        self.assertEqual(result[1].agent_name, "ocf:pacemaker:Missing")
+        self.assertEqual(result[1].message, "error message")
+        self.assertIsInstance(result[2], ra.UnableToGetAgentMetadata)
+        self.assertEqual(result[2].agent_name, "ocf:pacemaker:NotXml")
+        self.assertTrue(result[2].message.startswith("Start tag expected"))
+        assert_xml_equal(
+            '<resource-agent name="Stateful"/>', etree_to_str(result[3])
+        )
+
+
+class LoadMetadataListTimeout(TestCase):
+    def test_timeout(self):
+        name_list = [
+            ra.ResourceAgentName("ocf", "pacemaker", "Dummy"),
+            ra.ResourceAgentName("ocf", "pacemaker", "Stateful"),
+        ]
+        runner = mock.Mock(spec_set=CommandRunner)
+        runner.run_parallel.return_value = [
+            None,
+            ('<resource-agent name="Stateful"/>', "", 0),
+        ]
+
+        result = ra.xml.load_metadata_list(runner, name_list, 2, 5)
+
+        runner.run_parallel.assert_called_once_with(
+            [
+                [
+                    settings.crm_resource_binary,
+                    "--show-metadata",
+                    "ocf:pacemaker:Dummy",
+                ],
+                [
+                    settings.crm_resource_binary,
+                    "--show-metadata",
+                    "ocf:pacemaker:Stateful",
+                ],
+            ],
+            env_extend={
+                "PATH": f"{settings.fence_agent_binaries}:/bin:/usr/bin"
+            },
+            max_parallel=2,
+            timeout=5,
+        )
+        self.assertIsInstance(result[0], ra.AgentMetadataLoadTimedOut)
+        self.assertEqual(result[0].agent_name, "ocf:pacemaker:Dummy")
+        self.assertEqual(result[0].timeout, 5)
+        assert_xml_equal(
+            '<resource-agent name="Stateful"/>', etree_to_str(result[1])
+        )
+
+
 class LoadFakeAgentMetadata(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(test_case=self)
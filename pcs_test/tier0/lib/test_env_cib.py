@@ -214,6 +214,11 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
     wait_timeout = 10
 
     def setUp(self):
+        cib_diff_patcher = mock.patch(
+            "pcs.lib.pacemaker.live.settings.cib_diff_native", False
+        )
+        self.addCleanup(cib_diff_patcher.stop)
+        cib_diff_patcher.start()
         self.tmpfile_old = "old.cib"
         self.tmpfile_new = "new.cib"
         self.load_cib_name = "load_cib"
@@ -387,6 +392,87 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
 
+@mock.patch("pcs.lib.pacemaker.live.settings.cib_diff_native", True)
+class PushLoadedCibNativeDiff(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_push_diff(self):
+        self.config.runner.cib.load()
+        self.config.runner.cib.push_diff(
+            cib_diff="""
+                <diff format="2">
+                  <change operation="create"
+                    path="/cib/configuration/resources" position="0"
+                  >
+                    <primitive id="R" class="ocf" provider="pacemaker"
+                      type="Dummy"
+                    />
+                  </change>
+                </diff>
+            """
+        )
+        env = self.env_assist.get_env()
+
+        resources = env.get_cib().find("configuration/resources")
+        etree.SubElement(
+            resources,
+            "primitive",
+            {
+                "id": "R",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+        env.push_cib()
+
+    def test_no_change(self):
+        self.config.runner.cib.load()
+        env = self.env_assist.get_env()
+
+        env.get_cib()
+        env.push_cib()
+
+    def test_fallback_to_crm_diff(self):
+        tmp_file_mock_obj = TmpFileMock(file_content_checker=assert_xml_equal)
+        self.addCleanup(tmp_file_mock_obj.assert_all_done)
+        tmp_file_patcher = mock.patch("pcs.lib.tools.get_tmp_file")
+        self.addCleanup(tmp_file_patcher.stop)
+        tmp_file_patcher.start().side_effect = (
+            tmp_file_mock_obj.get_mock_side_effect()
+        )
+        # pacemaker does not create patchsets in the format 2 for old CIBs
+        self.config.runner.cib.load(filename="cib-empty-1.2.xml")
+        loaded_cib = self.config.calls.get("runner.cib.load").stdout
+        tmp_file_mock_obj.set_calls(
+            [
+                TmpFileCall("old.cib", orig_content=loaded_cib),
+                TmpFileCall("new.cib", orig_content=loaded_cib),
+            ]
+        )
+        self.config.runner.cib.diff("old.cib", "new.cib")
+        self.config.runner.cib.push_diff()
+        env = self.env_assist.get_env()
+
+        env.get_cib()
+        env.push_cib()
+        self.env_assist.assert_reports(
+            [
+                fixture.debug(
+                    report_codes.TMP_FILE_WRITE,
+                    file_path="old.cib",
+                    content=loaded_cib.strip(),
+                ),
+                fixture.debug(
+                    report_codes.TMP_FILE_WRITE,
+                    file_path="new.cib",
+                    content=loaded_cib.strip(),
+                ),
+            ]
+        )
+
+
 class PushCustomCib(TestCase, ManageCibAssertionMixin):
     custom_cib = "<custom_cib />"
     wait_timeout = 10
@@ -1,8 +1,14 @@
 import logging
+import os
+import signal
+import subprocess
+import threading
+import time
 from subprocess import DEVNULL
 from unittest import (
     TestCase,
     mock,
+    skipUnless,
 )
 
 import pcs.lib.external as lib
@@ -393,6 +399,212 @@ class CommandRunnerTest(TestCase):
         )
 
 
+@mock.patch("subprocess.Popen", autospec=True)
+class CommandRunnerRunParallelTest(TestCase):
+    def setUp(self):
+        self.mock_logger = mock.MagicMock(logging.Logger)
+        self.mock_reporter = MockLibraryReportProcessor()
+        self.runner = lib.CommandRunner(
+            self.mock_logger, self.mock_reporter, {"VAR": "value"}
+        )
+
+    @staticmethod
+    def _fixture_process(stdout, stderr, retval):
+        process = mock.MagicMock(spec_set=["communicate", "kill", "returncode"])
+        process.communicate.return_value = (stdout, stderr)
+        process.returncode = retval
+        return process
+
+    def _assert_report_codes(self, expected_codes):
+        self.assertEqual(
+            sorted(
+                item.message.code
+                for item in self.mock_reporter.report_item_list
+            ),
+            sorted(expected_codes),
+        )
+
+    def test_no_commands(self, mock_popen):
+        self.assertEqual(self.runner.run_parallel([]), [])
+        mock_popen.assert_not_called()
+        self._assert_report_codes([])
+
+    def test_no_commands_while_running(self, mock_popen):
+        while_running = mock.Mock()
+        self.assertEqual(
+            self.runner.run_parallel([], while_running=while_running), []
+        )
+        while_running.assert_called_once_with()
+        mock_popen.assert_not_called()
+
+    def test_while_running(self, mock_popen):
+        started = threading.Event()
+        call_thread_list = []
+
+        def communicate(*args):
+            # pylint: disable=unused-argument
+            # finish only after while_running has been called
+            started.wait(5)
+            return ("out", "err")
+
+        def while_running():
+            call_thread_list.append(threading.current_thread())
+            self.assertEqual(mock_popen.call_count, 2)
+            started.set()
+
+        process_list = []
+        for dummy_i in range(3):
+            process = self._fixture_process("", "", 0)
+            process.communicate.side_effect = communicate
+            process_list.append(process)
+        mock_popen.side_effect = process_list
+
+        result = self.runner.run_parallel(
+            [["cmd"]] * 3, max_parallel=2, while_running=while_running
+        )
+
+        self.assertEqual(result, [("out", "err", 0)] * 3)
+        self.assertEqual(call_thread_list, [threading.current_thread()])
+
+    def test_success(self, mock_popen):
+        process_list = [
+            self._fixture_process("out1", "err1", 0),
+            self._fixture_process("out2", "err2", 1),
+            self._fixture_process("out3", "err3", 2),
+        ]
+        mock_popen.side_effect = process_list
+
+        result = self.runner.run_parallel(
+            [["cmd1"], ["cmd2"], ["cmd3", "arg"]],
+            env_extend={"PATH": "/bin"},
+            max_parallel=2,
+            timeout=10,
+        )
+
+        self.assertEqual(
+            result,
+            [("out1", "err1", 0), ("out2", "err2", 1), ("out3", "err3", 2)],
+        )
+        self.assertEqual(
+            [call[0][0] for call in mock_popen.call_args_list],
+            [["cmd1"], ["cmd2"], ["cmd3", "arg"]],
+        )
+        for call in mock_popen.call_args_list:
+            self.assertEqual(call[1]["env"], {"VAR": "value", "PATH": "/bin"})
+            self.assertEqual(call[1]["stdin"], DEVNULL)
+            # preexec_fn is not safe with the waiting threads running
+            self.assertNotIn("preexec_fn", call[1])
+            self.assertTrue(call[1]["restore_signals"])
+        for process in process_list:
+            process.communicate.assert_called_once_with(None, 10)
+        self._assert_report_codes(
+            3
+            * [
+                report_codes.RUN_EXTERNAL_PROCESS_STARTED,
+                report_codes.RUN_EXTERNAL_PROCESS_FINISHED,
+                report_codes.RUN_EXTERNAL_PROCESS_DURATION,
+            ]
+            + [report_codes.RUN_EXTERNAL_PROCESSES_FINISHED]
+        )
+        summary = self.mock_reporter.report_item_list[-1].message
+        self.assertEqual(summary.process_count, 3)
+        self.assertEqual(summary.max_parallel, 2)
+
+    def test_timeout(self, mock_popen):
+        process = self._fixture_process("", "", -9)
+        process.communicate.side_effect = [
+            subprocess.TimeoutExpired("cmd1", 5),
+            ("partial out", "partial err"),
+        ]
+        mock_popen.side_effect = [
+            process,
+            self._fixture_process("out2", "err2", 0),
+        ]
+
+        result = self.runner.run_parallel(
+            [["cmd1"], ["cmd2"]], max_parallel=2, timeout=5
+        )
+
+        self.assertEqual(result, [None, ("out2", "err2", 0)])
+        process.kill.assert_called_once_with()
+        duration_reports = {
+            item.message.command: item.message
+            for item in self.mock_reporter.report_item_list
+            if item.message.code == report_codes.RUN_EXTERNAL_PROCESS_DURATION
+        }
+        self.assertTrue(duration_reports["cmd1"].timed_out)
+        self.assertFalse(duration_reports["cmd2"].timed_out)
+
+    def test_max_parallel(self, mock_popen):
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def communicate(*args):
+            # pylint: disable=unused-argument
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return ("out", "err")
+
+        process_list = []
+        for dummy_i in range(6):
+            process = self._fixture_process("", "", 0)
+            process.communicate.side_effect = communicate
+            process_list.append(process)
+        mock_popen.side_effect = process_list
+
+        result = self.runner.run_parallel([["cmd"]] * 6, max_parallel=2)
+
+        self.assertEqual(result, [("out", "err", 0)] * 6)
+        self.assertLessEqual(max_running[0], 2)
+
+    def test_popen_error(self, mock_popen):
+        exception = OSError()
+        exception.strerror = "expected error"
+        mock_popen.side_effect = exception
+        assert_raise_library_error(
+            lambda: self.runner.run_parallel([["cmd1"], ["cmd2"]]),
+            (
+                severity.ERROR,
+                report_codes.RUN_EXTERNAL_PROCESS_ERROR,
+                {
+                    "command": "cmd1",
+                    "reason": "expected error",
+                },
+            ),
+        )
+
+
+@skipUnless(os.path.exists("/proc/self/status"), "/proc is not available")
+class CommandRunnerChildSignalsTest(TestCase):
+    # Real processes are run to check that children do not inherit SIGPIPE
+    # ignored by python.
+    def setUp(self):
+        self.runner = lib.CommandRunner(
+            mock.MagicMock(logging.Logger), MockLibraryReportProcessor()
+        )
+        self.command = ["/bin/sh", "-c", "grep SigIgn /proc/self/status"]
+
+    def assert_sigpipe_not_ignored(self, result):
+        stdout, dummy_stderr, retval = result
+        self.assertEqual(retval, 0)
+        ignored_mask = int(stdout.split()[1], 16)
+        self.assertFalse(ignored_mask & (1 << (signal.SIGPIPE - 1)))
+
+    def test_run(self):
+        self.assert_sigpipe_not_ignored(self.runner.run(self.command))
+
+    def test_run_parallel(self):
+        for result in self.runner.run_parallel(
+            [self.command] * 4, max_parallel=2
+        ):
+            self.assert_sigpipe_not_ignored(result)
+
+
 class KillServicesTest(TestCase):
     def setUp(self):
         self.mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
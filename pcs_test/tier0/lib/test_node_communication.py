@@ -526,6 +526,30 @@ class CommunicatorLoggerTest(TestCase):
         self.reporter = MockLibraryReportProcessor()
         self.com_logger = lib.LibCommunicatorLogger(self.logger, self.reporter)
 
+    def test_log_request_queued(self):
+        request = fixture_request()
+        self.com_logger.log_request_queued(request, 0.0125)
+        self.reporter.assert_reports(
+            [
+                (
+                    severity.DEBUG,
+                    report_codes.NODE_COMMUNICATION_QUEUED,
+                    {
+                        "target": request.url,
+                        "queue_time_ms": 12,
+                    },
+                )
+            ]
+        )
+        self.assertEqual(
+            [
+                mock.call.debug(
+                    f"HTTP Request to: {request.url} waited in queue for 12 ms"
+                )
+            ],
+            self.logger.mock_calls,
+        )
+
     def test_log_request_start(self):
         request = fixture_request()
         self.com_logger.log_request_start(request)
@@ -566,6 +590,31 @@ class CommunicatorLoggerTest(TestCase):
         )
         self.assertEqual(logger_calls, self.logger.mock_calls)
 
+    def test_log_response_connected_debug_not_captured(self):
+        expected_code = 200
+        expected_data = "data"
+        handle = MockCurlSimple(
+            info={pycurl.RESPONSE_CODE: expected_code},
+            output=expected_data.encode("utf-8"),
+            request=fixture_request(),
+        )
+        handle.debug_buffer = None
+        response = Response.connection_successful(handle)
+        self.com_logger.log_response(response)
+        self.reporter.assert_reports(
+            fixture_report_item_list_connected(
+                response.request.url, expected_code, expected_data
+            )
+        )
+        self.assertEqual(
+            [
+                fixture_logger_call_connected(
+                    response.request.url, expected_code, expected_data
+                )
+            ],
+            self.logger.mock_calls,
+        )
+
     @mock.patch("pcs.lib.node_communication.is_proxy_set")
     def test_log_response_not_connected(self, mock_proxy):
         mock_proxy.return_value = False
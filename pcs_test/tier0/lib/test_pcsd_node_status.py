@@ -0,0 +1,633 @@
+import time
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs.lib import pcsd_node_status as lib
+
+
+def _cib(configuration="", status=""):
+    return etree.fromstring(
+        f"""
+        <cib>
+            <configuration>{configuration}</configuration>
+            <status>{status}</status>
+        </cib>
+        """
+    )
+
+
+def _crm_mon(resources="", nodes="", summary=""):
+    return etree.fromstring(
+        f"""
+        <pacemaker-result>
+            <summary>{summary}</summary>
+            <nodes>{nodes}</nodes>
+            <resources>{resources}</resources>
+        </pacemaker-result>
+        """
+    )
+
+
+def _services(corosync=True, pacemaker=True):
+    services = {
+        service: {"installed": True, "enabled": False, "running": False}
+        for service in ("pacemaker", "pacemaker_remote", "corosync", "pcsd")
+    }
+    services["corosync"]["running"] = corosync
+    services["pacemaker"]["running"] = pacemaker
+    services["pcsd"]["enabled"] = True
+    return services
+
+
+class GetClusterSettings(TestCase):
+    def test_last_value_counts(self):
+        cib = _cib(
+            """
+            <crm_config>
+                <cluster_property_set id="set1">
+                    <nvpair id="p1" name="stonith-enabled" value="true"/>
+                    <nvpair id="p2" name="cluster-name" value="c1"/>
+                </cluster_property_set>
+                <cluster_property_set id="set2">
+                    <nvpair id="p3" name="stonith-enabled" value="false"/>
+                </cluster_property_set>
+            </crm_config>
+            """
+        )
+        self.assertEqual(
+            {"stonith-enabled": "false", "cluster-name": "c1"},
+            lib.get_cluster_settings(cib),
+        )
+
+
+class GetAcls(TestCase):
+    def test_success(self):
+        cib = _cib(
+            """
+            <acls>
+                <acl_role id="r1" description="desc">
+                    <acl_permission id="p1" kind="read" xpath="/cib"/>
+                    <acl_permission id="p2" kind="write" reference="R1"/>
+                    <acl_permission id="p3" kind="deny"/>
+                </acl_role>
+                <acl_role id="r2"/>
+                <acl_target id="u1">
+                    <role id="r1"/>
+                    <role id="r2"/>
+                </acl_target>
+                <acl_group id="g1">
+                    <role id="r2"/>
+                </acl_group>
+            </acls>
+            """
+        )
+        target = {"u1": ["r1", "r2"]}
+        self.assertEqual(
+            {
+                "role": {
+                    "r1": {
+                        "description": "desc",
+                        "permissions": [
+                            "read xpath /cib (p1)",
+                            "write id R1 (p2)",
+                        ],
+                    },
+                    "r2": {"description": "", "permissions": []},
+                },
+                "group": {"g1": ["r2"]},
+                "user": target,
+                "target": target,
+            },
+            lib.get_acls(cib),
+        )
+
+
+class GetFenceLevels(TestCase):
+    def test_sorted_by_level(self):
+        cib = _cib(
+            """
+            <fencing-topology>
+                <fencing-level id="l1" index="10" target="node1"
+                    devices="d1"
+                />
+                <fencing-level id="l2" index="2" target="node1"
+                    devices="d2,d3"
+                />
+                <fencing-level id="l3" index="1" target-pattern="node.*"
+                    devices="d4"
+                />
+                <fencing-level id="l4" index="1" target="node2"
+                    devices="d5"
+                />
+            </fencing-topology>
+            """
+        )
+        self.assertEqual(
+            {
+                "node1": [
+                    {"level": "2", "devices": "d2,d3"},
+                    {"level": "10", "devices": "d1"},
+                ],
+                "node2": [{"level": "1", "devices": "d5"}],
+            },
+            lib.get_fence_levels(cib),
+        )
+
+
+class GetNodeNvpairs(TestCase):
+    cib = _cib(
+        """
+        <nodes>
+            <node id="1" uname="node1">
+                <instance_attributes id="n1-attrs">
+                    <nvpair id="n1-b" name="b" value="1"/>
+                    <nvpair id="n1-a" name="a" value="2"/>
+                </instance_attributes>
+                <utilization id="n1-util">
+                    <nvpair id="n1-cpu" name="cpu" value="4"/>
+                    <nvpair id="n1-mem" name="mem" value="8"/>
+                </utilization>
+            </node>
+            <node id="2" uname="node2"/>
+        </nodes>
+        """
+    )
+
+    def test_attributes(self):
+        self.assertEqual(
+            {
+                "node1": [
+                    {"id": "n1-a", "name": "a", "value": "2"},
+                    {"id": "n1-b", "name": "b", "value": "1"},
+                ]
+            },
+            lib.get_node_attributes(self.cib),
+        )
+
+    def test_utilization(self):
+        self.assertEqual(
+            {
+                "node1": [
+                    {"id": "n1-cpu", "name": "cpu", "value": "4"},
+                    {"id": "n1-mem", "name": "mem", "value": "8"},
+                ]
+            },
+            lib.get_nodes_utilization(self.cib),
+        )
+
+
+class GetConstraints(TestCase):
+    def test_success(self):
+        cib = _cib(
+            """
+            <constraints>
+                <rsc_location id="l1" rsc="R1" node="node1" score="100"/>
+                <rsc_location id="l2" rsc-pattern="R.*">
+                    <rule id="l2-rule" score="INFINITY" boolean-op="or">
+                        <expression id="l2-e1" attribute="#uname"
+                            operation="eq" value="node 1"
+                        />
+                        <expression id="l2-e2" attribute="pingd"
+                            operation="gt" type="number" value="1"
+                        />
+                        <rule id="l2-nested">
+                            <expression id="l2-e3" attribute="a"
+                                operation="defined"
+                            />
+                            <date_expression id="l2-d1" operation="date_spec">
+                                <date_spec id="l2-ds" hours="9-16"/>
+                            </date_expression>
+                        </rule>
+                    </rule>
+                </rsc_location>
+                <rsc_order id="o1" first="R1" then="R2"/>
+                <rsc_colocation id="c1" score="INFINITY">
+                    <resource_set id="c1-set" sequential="false">
+                        <resource_ref id="R1"/>
+                        <resource_ref id="R2"/>
+                    </resource_set>
+                </rsc_colocation>
+            </constraints>
+            """
+        )
+        self.assertEqual(
+            {
+                "rsc_location": [
+                    {"id": "l1", "rsc": "R1", "node": "node1", "score": "100"},
+                    {
+                        "rule_string": (
+                            '#uname eq "node 1" or pingd gt number 1 or '
+                            "(defined a and date-spec hours=9-16)"
+                        ),
+                        "rsc-pattern": "R.*",
+                        "id": "l2-rule",
+                        "score": "INFINITY",
+                    },
+                ],
+                "rsc_order": [{"id": "o1", "first": "R1", "then": "R2"}],
+                "rsc_colocation": [
+                    {
+                        "id": "c1",
+                        "score": "INFINITY",
+                        "sets": [
+                            {
+                                "id": "c1-set",
+                                "sequential": "false",
+                                "resources": ["R1", "R2"],
+                            }
+                        ],
+                    }
+                ],
+            },
+            lib.get_constraints(cib),
+        )
+
+    def test_date_expressions(self):
+        cib = _cib(
+            """
+            <constraints>
+                <rsc_location id="l1" rsc="R1">
+                    <rule id="r1" score="INFINITY">
+                        <date_expression id="d1" operation="gt"
+                            start="2020-01-01"
+                        />
+                    </rule>
+                    <rule id="r2" score="INFINITY">
+                        <date_expression id="d2" operation="in_range"
+                            start="2020-01-01" end="2020-02-01"
+                        />
+                    </rule>
+                    <rule id="r3" score="INFINITY">
+                        <date_expression id="d3" operation="in_range"
+                            start="2020-01-01"
+                        >
+                            <duration id="d3-duration" days="2"/>
+                        </date_expression>
+                    </rule>
+                </rsc_location>
+            </constraints>
+            """
+        )
+        self.assertEqual(
+            [
+                "date gt 2020-01-01",
+                "date in_range 2020-01-01 to 2020-02-01",
+                "date in_range 2020-01-01 to duration days=2",
+            ],
+            [
+                rule["rule_string"]
+                for rule in lib.get_constraints(cib)["rsc_location"]
+            ],
+        )
+
+    def test_no_constraints(self):
+        self.assertEqual({}, lib.get_constraints(etree.fromstring("<cib/>")))
+
+
+class GetResourceList(TestCase):
+    resources = """
+        <resources>
+            <primitive id="R1" class="ocf" provider="pacemaker" type="Dummy">
+                <instance_attributes id="R1-attrs">
+                    <nvpair id="R1-a1" name="a" value="1"/>
+                    <nvpair id="R1-b" name="b" value="2"/>
+                    <nvpair id="R1-a2" name="a" value="3"/>
+                </instance_attributes>
+            </primitive>
+            <primitive id="S1" class="stonith" type="fence_xvm">
+                <instance_attributes id="S1-attrs">
+                    <nvpair id="S1-action" name="action" value="off"/>
+                    <nvpair id="S1-method" name="method" value="cycle"/>
+                </instance_attributes>
+                <meta_attributes id="S1-meta">
+                    <nvpair id="S1-role" name="target-role" value="Stopped"/>
+                </meta_attributes>
+            </primitive>
+            <group id="G1">
+                <primitive id="G1-R1" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+                <primitive id="G1-R2" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </group>
+            <clone id="C1">
+                <meta_attributes id="C1-meta">
+                    <nvpair id="C1-promotable" name="promotable" value="true"/>
+                </meta_attributes>
+                <primitive id="C1-R1" class="ocf" provider="pacemaker"
+                    type="Stateful"
+                />
+            </clone>
+            <clone id="C2">
+                <meta_attributes id="C2-meta">
+                    <nvpair id="C2-role" name="target-role" value="stopped"/>
+                </meta_attributes>
+                <group id="C2-G1">
+                    <primitive id="C2-R1" class="ocf" provider="pacemaker"
+                        type="Dummy"
+                    />
+                </group>
+            </clone>
+        </resources>
+    """
+    status = """
+        <resource id="R1" resource_agent="ocf:pacemaker:Dummy" role="Started"
+            active="true" orphaned="false" blocked="false" managed="true"
+            failed="false" failure_ignored="false" nodes_running_on="1"
+        >
+            <node name="node1" id="1" cached="true"/>
+        </resource>
+        <group id="G1" number_resources="2">
+            <resource id="G1-R1" resource_agent="ocf:pacemaker:Dummy"
+                role="Started" active="true" orphaned="false"
+                blocked="false" managed="true" failed="false"
+                failure_ignored="false" nodes_running_on="1"
+            >
+                <node name="node1" id="1" cached="true"/>
+            </resource>
+            <resource id="G1-R2" resource_agent="ocf:pacemaker:Dummy"
+                role="Stopped" active="false" orphaned="false"
+                blocked="false" managed="true" failed="true"
+                failure_ignored="false" nodes_running_on="0"
+            />
+        </group>
+        <clone id="C1" multi_state="true" unique="false" managed="true"
+            failed="false" failure_ignored="false"
+        >
+            <resource id="C1-R1:0" resource_agent="ocf:pacemaker:Stateful"
+                role="Unpromoted" active="true" orphaned="false"
+                blocked="false" managed="true" failed="false"
+                failure_ignored="false" nodes_running_on="1"
+            >
+                <node name="node1" id="1" cached="true"/>
+            </resource>
+        </clone>
+    """
+
+    def _get_resource_list(self, with_operations=False, lrm=""):
+        return {
+            resource["id"]: resource
+            for resource in lib.get_resource_list(
+                _cib(self.resources, lrm),
+                _crm_mon(self.status),
+                with_operations,
+            )
+        }
+
+    def test_order_and_status(self):
+        resource_list = lib.get_resource_list(
+            _cib(self.resources), _crm_mon(self.status)
+        )
+        self.assertEqual(
+            [
+                ("R1", "primitive", "running"),
+                ("S1", "primitive", "blocked"),
+                ("G1", "group", "partially running"),
+                ("C1", "clone", "partially running"),
+                ("C2", "clone", "disabled"),
+            ],
+            [
+                (resource["id"], resource["class_type"], resource["status"])
+                for resource in resource_list
+            ],
+        )
+
+    def test_primitive(self):
+        self.assertEqual(
+            {
+                "id": "R1",
+                "error_list": [],
+                "warning_list": [],
+                "class_type": "primitive",
+                "status": "running",
+                "meta_attr": [],
+                "parent_id": None,
+                "disabled": False,
+                "agentname": "ocf::pacemaker:Dummy",
+                "provider": "pacemaker",
+                "type": "Dummy",
+                "stonith": False,
+                "utilization": [],
+                "instance_attr": [
+                    {"id": "R1-b", "name": "b", "value": "2"},
+                    {"id": "R1-a2", "name": "a", "value": "3"},
+                ],
+                "class": "ocf",
+                "crm_status": [
+                    {
+                        "id": "R1",
+                        "resource_agent": "ocf:pacemaker:Dummy",
+                        "managed": True,
+                        "failed": False,
+                        "role": "Started",
+                        "active": True,
+                        "orphaned": False,
+                        "failure_ignored": False,
+                        "nodes_running_on": 1,
+                        "pending": None,
+                        "node": {"name": "node1", "id": "1", "cached": True},
+                        "blocked": False,
+                        "target_role": None,
+                    }
+                ],
+                "operations": [],
+            },
+            self._get_resource_list()["R1"],
+        )
+
+    def test_stonith(self):
+        stonith = self._get_resource_list()["S1"]
+        self.assertEqual("fence_xvm", stonith["type"])
+        self.assertEqual("stonith:fence_xvm", stonith["agentname"])
+        self.assertTrue(stonith["stonith"])
+        self.assertFalse(stonith["disabled"])
+        self.assertEqual(
+            [
+                {
+                    "message": (
+                        'This fence-device has the "action" option set, it '
+                        'is recommended to set "pcmk_off_action", '
+                        '"pcmk_reboot_action" instead'
+                    )
+                },
+                {
+                    "message": (
+                        'This fence-device has the "method" option set to '
+                        '"cycle" which is potentially dangerous, please '
+                        'consider using "onoff"'
+                    )
+                },
+            ],
+            stonith["warning_list"],
+        )
+
+    def test_group_members(self):
+        group = self._get_resource_list()["G1"]
+        self.assertEqual(
+            [("G1-R1", "G1", "running"), ("G1-R2", "G1", "failed")],
+            [
+                (member["id"], member["parent_id"], member["status"])
+                for member in group["members"]
+            ],
+        )
+
+    def test_clone_not_promoted(self):
+        clone = self._get_resource_list()["C1"]
+        self.assertTrue(clone["promotable"])
+        self.assertEqual("C1-R1", clone["member"]["id"])
+        self.assertEqual("Slave", clone["member"]["crm_status"][0]["role"])
+        self.assertEqual(
+            [
+                {
+                    "message": (
+                        "Resource is promotable but has not been promoted on "
+                        "any node."
+                    ),
+                    "type": "no_master",
+                }
+            ],
+            clone["warning_list"],
+        )
+
+    def test_disabled_clone(self):
+        clone = self._get_resource_list()["C2"]
+        self.assertFalse(clone["promotable"])
+        self.assertEqual([], clone["warning_list"])
+        self.assertEqual("disabled", clone["member"]["status"])
+        self.assertEqual("disabled", clone["member"]["members"][0]["status"])
+
+    def test_operations(self):
+        lrm = """
+            <node_state id="1" uname="node1">
+                <lrm id="1">
+                    <lrm_resources>
+                        <lrm_resource id="R1" type="Dummy" class="ocf">
+                            <lrm_rsc_op id="R1_last_0" operation="start"
+                                call-id="5" rc-code="0" last-rc-change="100"
+                            />
+                            <lrm_rsc_op id="R1_monitor" operation="monitor"
+                                call-id="6" rc-code="7" last-rc-change="100"
+                            />
+                            <lrm_rsc_op id="R1_last_failure_0"
+                                operation="stop" call-id="7" rc-code="1"
+                                last-rc-change="1000" exit-reason="error"
+                            />
+                        </lrm_resource>
+                    </lrm_resources>
+                </lrm>
+            </node_state>
+        """
+        resource_list = self._get_resource_list(with_operations=True, lrm=lrm)
+        primitive = resource_list["R1"]
+        self.assertEqual(
+            ["R1_last_0", "R1_monitor", "R1_last_failure_0"],
+            [operation["id"] for operation in primitive["operations"]],
+        )
+        self.assertEqual("node1", primitive["operations"][0]["on_node"])
+        self.assertEqual(5, primitive["operations"][0]["call_id"])
+        # the resource is running, so the failure is only a warning
+        self.assertEqual([], primitive["error_list"])
+        self.assertEqual(
+            [
+                {
+                    "message": (
+                        "Failed to stop R1 on {0} on node node1: error".format(
+                            time.asctime(time.localtime(1000))
+                        )
+                    )
+                }
+            ],
+            primitive["warning_list"],
+        )
+        self.assertEqual([], resource_list["G1"]["members"][0]["operations"])
+
+    def test_operations_not_requested(self):
+        self.assertEqual([], self._get_resource_list()["R1"]["operations"])
+
+    def test_no_status(self):
+        resource_list = lib.get_resource_list(_cib(self.resources), None)
+        self.assertEqual(
+            ["blocked", "blocked", "blocked", "blocked", "disabled"],
+            [resource["status"] for resource in resource_list],
+        )
+
+    def test_no_resources(self):
+        self.assertEqual(
+            [], lib.get_resource_list(etree.fromstring("<cib/>"), None)
+        )
+
+
+class GetLocalNode(TestCase):
+    status_dom = _crm_mon(
+        nodes="""
+            <node name="node1" id="1" online="true" standby="true"/>
+            <node name="node2" id="2" online="true" standby="false"/>
+        """,
+        summary='<current_dc present="true" with_quorum="true"/>',
+    )
+
+    def test_online(self):
+        self.assertEqual(
+            {
+                "id": "2",
+                "error_list": [],
+                "warning_list": [],
+                "status": "online",
+                "quorum": True,
+                "uptime": "1 day, 00:00:00",
+                "name": None,
+                "services": _services(),
+                "corosync": True,
+                "pacemaker": True,
+                "corosync_enabled": False,
+                "pacemaker_enabled": False,
+                "pcsd_enabled": True,
+                "sbd_config": None,
+            },
+            lib.get_local_node(
+                self.status_dom, "2", _services(), "1 day, 00:00:00", None
+            ),
+        )
+
+    def test_standby(self):
+        node = lib.get_local_node(
+            self.status_dom, "1", _services(), "", {"SBD_DELAY_START": "no"}
+        )
+        self.assertEqual("standby", node["status"])
+        self.assertEqual({"SBD_DELAY_START": "no"}, node["sbd_config"])
+
+    def test_offline(self):
+        node = lib.get_local_node(
+            self.status_dom, "1", _services(pacemaker=False), "", None
+        )
+        self.assertEqual("offline", node["status"])
+        self.assertIsNone(node["quorum"])
+
+    def test_no_status(self):
+        node = lib.get_local_node(None, "", _services(), "", None)
+        self.assertEqual("offline", node["status"])
+        self.assertIsNone(node["quorum"])
+
+    def test_not_authorized(self):
+        node = lib.get_local_node(
+            self.status_dom, "2", _services(), "", None, ["node3", "node4"]
+        )
+        self.assertEqual(
+            [
+                {
+                    "message": "Not authorized against node(s) node3, node4",
+                    "type": "nodes_not_authorized",
+                    "node_list": ["node3", "node4"],
+                }
+            ],
+            node["warning_list"],
+        )
+
+
+class FormatUptime(TestCase):
+    def test_success(self):
+        self.assertEqual("0 days, 00:00:59", lib.format_uptime(59))
+        self.assertEqual("1 day, 01:01:01", lib.format_uptime(90061))
+        self.assertEqual("2 days, 23:59:59", lib.format_uptime(259199))
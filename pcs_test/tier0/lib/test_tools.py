@@ -1,4 +1,11 @@
-from unittest import TestCase
+import json
+import os
+import shutil
+import tempfile
+from unittest import (
+    TestCase,
+    mock,
+)
 
 from pcs.lib import tools
 
@@ -38,3 +45,36 @@ ANOTHER ONE="complex value"
 OPTION=value
 """
         self.assertEqual(expected, tools.dict_to_environment_file(cfg_dict))
+
+
+class WriteJsonFileAtomicallyTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.dir_path = os.path.join(tmp_dir, "cache")
+        self.path = os.path.join(self.dir_path, "file.json")
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as json_file:
+            return json.load(json_file)
+
+    def test_create_dir_and_write(self):
+        tools.write_json_file_atomically(self.path, {"a": [1, 2]})
+        self.assertEqual(self.read(), {"a": [1, 2]})
+        self.assertEqual(os.stat(self.dir_path).st_mode & 0o777, 0o700)
+        self.assertEqual(os.listdir(self.dir_path), ["file.json"])
+
+    def test_replace(self):
+        tools.write_json_file_atomically(self.path, {"a": 1})
+        tools.write_json_file_atomically(self.path, {"b": 2})
+        self.assertEqual(self.read(), {"b": 2})
+        self.assertEqual(os.listdir(self.dir_path), ["file.json"])
+
+    def test_error_no_tmp_file_left(self):
+        tools.write_json_file_atomically(self.path, {"a": 1})
+        with mock.patch(
+            "pcs.lib.tools.os.replace", side_effect=OSError("error")
+        ), self.assertRaises(OSError):
+            tools.write_json_file_atomically(self.path, {"b": 2})
+        self.assertEqual(self.read(), {"a": 1})
+        self.assertEqual(os.listdir(self.dir_path), ["file.json"])
@@ -1,10 +1,19 @@
-from unittest import TestCase
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import (
+    TestCase,
+    mock,
+)
 
 from lxml import etree
 
 from pcs.lib import xml_tools as lib
 
 from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.misc import (
+    get_tmp_file,
+    write_data_to_tmpfile,
+)
 from pcs_test.tools.xml import etree_to_str
 
 
@@ -413,3 +422,60 @@ class RemoveOneElement(TestCase):
     def test_remove_element_without_parent(self):
         lib.remove_one_element(self.root)
         assert_xml_equal("<root><sub/></root>", etree_to_str(self.root))
+
+
+SCHEMA_TEMPLATE = """
+    <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+        <start><element name="{0}"><empty/></element></start>
+    </grammar>
+"""
+
+
+class GetRelaxngValidator(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.schema_file = get_tmp_file("tier0_xml_tools_schema")
+        self.addCleanup(self.schema_file.close)
+        write_data_to_tmpfile(SCHEMA_TEMPLATE.format("a"), self.schema_file)
+
+    def test_validator_reused(self):
+        validator = lib.get_relaxng_validator(self.schema_file.name)
+        self.assertTrue(validator.validate(etree.fromstring("<a/>")))
+        self.assertFalse(validator.validate(etree.fromstring("<b/>")))
+        self.assertIs(
+            validator, lib.get_relaxng_validator(self.schema_file.name)
+        )
+
+    def test_schema_modified(self):
+        validator = lib.get_relaxng_validator(self.schema_file.name)
+        write_data_to_tmpfile(SCHEMA_TEMPLATE.format("b"), self.schema_file)
+        stat = os.stat(self.schema_file.name)
+        os.utime(
+            self.schema_file.name,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000),
+        )
+        new_validator = lib.get_relaxng_validator(self.schema_file.name)
+        self.assertIsNot(validator, new_validator)
+        self.assertTrue(new_validator.validate(etree.fromstring("<b/>")))
+
+    def test_schema_missing(self):
+        with self.assertRaises(etree.RelaxNGParseError):
+            lib.get_relaxng_validator(self.schema_file.name + ".missing")
+
+    def test_compiled_once_in_threads(self):
+        path = self.schema_file.name
+        with mock.patch.dict(
+            "pcs.lib.xml_tools._relaxng_validator_cache", clear=True
+        ), mock.patch(
+            "pcs.lib.xml_tools.etree.RelaxNG", wraps=etree.RelaxNG
+        ) as mock_relaxng, ThreadPoolExecutor(
+            max_workers=8
+        ) as executor:
+            validator_list = list(
+                executor.map(
+                    lambda _: lib.get_relaxng_validator(path), range(32)
+                )
+            )
+        mock_relaxng.assert_called_once_with(file=path)
+        for validator in validator_list:
+            self.assertIs(validator_list[0], validator)
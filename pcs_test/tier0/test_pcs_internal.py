@@ -0,0 +1,117 @@
+import json
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs import pcs_internal
+from pcs.common.reports import ReportItem
+from pcs.common.reports import messages as report_messages
+from pcs.lib.errors import LibraryError
+
+
+def _request(cmd, cmd_data=None):
+    return json.dumps(
+        {
+            "cmd": cmd,
+            "cmd_data": cmd_data or {},
+            "options": {"request_timeout": None},
+        }
+    )
+
+
+class RunRequest(TestCase):
+    def setUp(self):
+        self.lib_env_list = []
+        patcher = mock.patch(
+            "pcs.cli.common.lib_wrapper.cli_env_to_lib_env",
+            side_effect=self._cli_env_to_lib_env,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "pcs.cli.common.lib_wrapper.lib_env_to_cli_env",
+            side_effect=lambda lib_env, cli_env: cli_env,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cli_env_to_lib_env(self, cli_env):
+        self.lib_env_list.append(cli_env)
+        return cli_env
+
+    def test_unknown_command(self):
+        self.assertEqual(
+            pcs_internal.run_request(_request("acl.nonsense"), None, None),
+            {
+                "status": "unknown_cmd",
+                "status_msg": "Unknown command 'acl.nonsense'",
+                "report_list": [],
+                "data": None,
+            },
+        )
+
+    def test_invalid_json(self):
+        self.assertEqual(
+            pcs_internal.run_request("{", None, None)["status"],
+            "input_error",
+        )
+
+    @mock.patch("pcs.lib.commands.acl.remove_role")
+    def test_success(self, mock_remove_role):
+        def remove_role(env, role_id, autodelete_users_groups=False):
+            # pylint: disable=unused-argument
+            env.report_processor.report(
+                ReportItem.warning(report_messages.IdNotFound(role_id, []))
+            )
+            return "data"
+
+        mock_remove_role.side_effect = remove_role
+
+        result = pcs_internal.run_request(
+            _request("acl.remove_role", {"role_id": "R"}), "user", ["group"]
+        )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["data"], "data")
+        self.assertEqual(len(result["report_list"]), 1)
+        self.assertEqual(self.lib_env_list[0].user, "user")
+        self.assertEqual(self.lib_env_list[0].groups, ["group"])
+
+    @mock.patch("pcs.lib.commands.acl.remove_role")
+    def test_requests_isolated(self, mock_remove_role):
+        def remove_role(env, role_id):
+            env.report_processor.report(
+                ReportItem.error(report_messages.IdNotFound(role_id, []))
+            )
+            raise LibraryError()
+
+        mock_remove_role.side_effect = remove_role
+
+        result_1 = pcs_internal.run_request(
+            _request("acl.remove_role", {"role_id": "R1"}), "user1", None
+        )
+        result_2 = pcs_internal.run_request(
+            _request("acl.remove_role", {"role_id": "R2"}), "user2", ["g2"]
+        )
+
+        for result, role_id in ((result_1, "R1"), (result_2, "R2")):
+            self.assertEqual(result["status"], "error")
+            self.assertEqual(
+                [
+                    report["message"]["payload"]
+                    for report in result["report_list"]
+                ],
+                [
+                    {
+                        "id": role_id,
+                        "expected_types": [],
+                        "context_type": "",
+                        "context_id": "",
+                    }
+                ],
+            )
+        self.assertEqual(
+            [(env.user, env.groups) for env in self.lib_env_list],
+            [("user1", None), ("user2", ["g2"])],
+        )
@@ -0,0 +1,175 @@
+import os.path
+from copy import deepcopy
+from unittest import (
+    TestCase,
+    mock,
+    skipUnless,
+)
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common.tools import xml_fromstring
+from pcs.lib.pacemaker import live
+from pcs.lib.pacemaker.cib_diff import (
+    UnsupportedCib,
+    diff_cibs,
+)
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
+from pcs_test.tools.misc import (
+    read_test_resource,
+    runner,
+)
+from pcs_test.tools.xml import etree_to_str
+
+CIB_FIXTURES = [
+    "cib-empty.xml",
+    "cib-empty-3.7.xml",
+    "cib-empty-withnodes.xml",
+    "cib-large.xml",
+    "cib-resources.xml",
+    "cib-tags.xml",
+]
+
+
+def _elements_with_id(cib):
+    return cib.xpath("/cib/configuration//*[@id]")
+
+
+def _remove_element(cib):
+    element = _elements_with_id(cib)[-1]
+    element.getparent().remove(element)
+
+
+def _remove_first_and_last_elements(cib):
+    element_list = _elements_with_id(cib)
+    for element in (element_list[0], element_list[-1]):
+        if element.getparent() is not None:
+            element.getparent().remove(element)
+
+
+def _add_resources(cib):
+    resources = cib.find("configuration/resources")
+    for index, resource_id in enumerate(("conformance-A", "conformance-B")):
+        primitive = etree.Element(
+            "primitive",
+            {
+                "id": resource_id,
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            },
+        )
+        etree.SubElement(
+            etree.SubElement(
+                primitive, "meta_attributes", id=f"{resource_id}-meta"
+            ),
+            "nvpair",
+            id=f"{resource_id}-meta-target-role",
+            name="target-role",
+            value="Stopped",
+        )
+        resources.insert(index * len(resources), primitive)
+
+
+def _change_attributes(cib):
+    for element in _elements_with_id(cib)[:5]:
+        element.set("description", "conformance")
+        for name in element.keys():
+            if name not in ("id", "description"):
+                del element.attrib[name]
+                break
+    cib.set("epoch", str(int(cib.get("epoch", "0")) + 1))
+    cib.set("have-quorum", "1")
+
+
+def _reverse_children(cib):
+    for parent in cib.xpath("/cib/configuration/*"):
+        parent[:] = list(reversed(parent))
+
+
+def _add_comments(cib):
+    resources = cib.find("configuration/resources")
+    resources.insert(0, etree.Comment("first"))
+    resources.append(etree.Comment("last"))
+
+
+MODIFIERS = [
+    _remove_element,
+    _remove_first_and_last_elements,
+    _add_resources,
+    _change_attributes,
+    _reverse_children,
+    _add_comments,
+]
+
+
+@skipUnless(
+    os.path.exists(os.path.join(settings.pacemaker_binaries, "crm_diff")),
+    "crm_diff is not available",
+)
+class DiffCibsConformance(TestCase):
+    """
+    Compare patchsets created by pcs with those created by crm_diff
+    """
+
+    @staticmethod
+    def _crm_diff(cib_old, cib_new):
+        return live.diff_cibs_xml(
+            runner,
+            MockLibraryReportProcessor(),
+            etree_to_str(cib_old),
+            etree_to_str(cib_new),
+        )
+
+    def _assert_conformance(self, cib_old, cib_new):
+        try:
+            patchset = diff_cibs(cib_old, cib_new)
+        except UnsupportedCib:
+            self.skipTest("CIB not supported by pcs diff")
+        expected = self._crm_diff(cib_old, cib_new)
+        if not expected:
+            self.assertIsNone(patchset)
+        else:
+            self.assertIsNotNone(patchset)
+            assert_xml_equal(expected, etree_to_str(patchset))
+
+    def test_no_change(self):
+        for fixture in CIB_FIXTURES:
+            with self.subTest(fixture=fixture):
+                cib = xml_fromstring(read_test_resource(fixture))
+                self._assert_conformance(cib, deepcopy(cib))
+
+    def test_modifications(self):
+        for fixture in CIB_FIXTURES:
+            cib_old = xml_fromstring(read_test_resource(fixture))
+            for modifier in MODIFIERS:
+                with self.subTest(fixture=fixture, modifier=modifier.__name__):
+                    cib_new = deepcopy(cib_old)
+                    if not _elements_with_id(cib_new):
+                        _add_resources(cib_new)
+                    modifier(cib_new)
+                    self._assert_conformance(cib_old, cib_new)
+
+    def test_combined_modifications(self):
+        for fixture in CIB_FIXTURES:
+            with self.subTest(fixture=fixture):
+                cib_old = xml_fromstring(read_test_resource(fixture))
+                cib_new = deepcopy(cib_old)
+                for modifier in MODIFIERS:
+                    if _elements_with_id(cib_new):
+                        modifier(cib_new)
+                self._assert_conformance(cib_old, cib_new)
+
+    def test_live_diff_cibs(self):
+        cib_old = xml_fromstring(read_test_resource("cib-resources.xml"))
+        cib_new = deepcopy(cib_old)
+        _add_resources(cib_new)
+        _reverse_children(cib_new)
+        with mock.patch.object(settings, "cib_diff_native", True):
+            native = live.diff_cibs(
+                runner, MockLibraryReportProcessor(), cib_old, cib_new
+            )
+        assert_xml_equal(self._crm_diff(cib_old, cib_new), native)
@@ -0,0 +1,83 @@
+from datetime import datetime
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.cib.rule.cib_to_parsed import rule_element_to_parsed
+from pcs.lib.cib.rule.evaluator import get_in_effect_status
+
+from pcs_test.tools.misc import (
+    read_test_resource,
+    runner,
+    skip_unless_crm_rule,
+)
+
+# crm_rule return codes, others mean the rule cannot be checked by crm_rule
+_RETURN_CODE_TO_STATUS = {
+    0: CibRuleInEffectStatus.IN_EFFECT,
+    110: CibRuleInEffectStatus.EXPIRED,
+    111: CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
+}
+
+DATE_LIST = [
+    datetime(2019, 12, 31, 23, 59, 59),
+    datetime(2020, 1, 1, 0, 0, 0),
+    datetime(2020, 6, 16, 11, 59, 59),
+    datetime(2020, 6, 16, 12, 0, 0),
+    datetime(2020, 6, 17, 11, 59, 59),
+    datetime(2020, 6, 17, 12, 0, 0),
+    datetime(2020, 6, 17, 12, 0, 1),
+    datetime(2020, 6, 17, 17, 59, 59),
+    datetime(2020, 6, 17, 18, 0, 0),
+    datetime(2020, 6, 17, 18, 0, 1),
+    datetime(2020, 7, 1, 12, 0, 0),
+    datetime(2020, 7, 1, 12, 0, 1),
+    datetime(2020, 8, 1, 0, 0, 0),
+    datetime(2021, 1, 1, 0, 0, 0),
+    datetime(2022, 12, 31, 23, 59, 59),
+    datetime(2023, 1, 1, 0, 0, 0),
+]
+
+
+@skip_unless_crm_rule()
+class CompareWithCrmRule(TestCase):
+    """
+    Cross-check the python rule evaluator against crm_rule on a fixture CIB
+    """
+
+    def setUp(self):
+        self.cib_xml = read_test_resource("cib-rules.xml")
+        self.cib = etree.fromstring(self.cib_xml)
+
+    def _crm_rule_status(self, rule_id, date):
+        dummy_stdout, dummy_stderr, retval = runner.run(
+            [
+                settings.crm_rule,
+                "--check",
+                "--date",
+                date.strftime("%Y-%m-%d %H:%M:%S"),
+                "--rule",
+                rule_id,
+                "--xml-text",
+                "-",
+            ],
+            stdin_string=self.cib_xml,
+        )
+        return _RETURN_CODE_TO_STATUS.get(retval)
+
+    def test_rules(self):
+        checked = 0
+        for rule_el in self.cib.xpath(
+            "./configuration//rule[not(ancestor::rule)]"
+        ):
+            rule = rule_element_to_parsed(rule_el)
+            for date in DATE_LIST:
+                expected = self._crm_rule_status(rule_el.get("id"), date)
+                if expected is None:
+                    continue
+                checked += 1
+                with self.subTest(rule_id=rule_el.get("id"), date=date):
+                    self.assertEqual(get_in_effect_status(rule, date), expected)
+        self.assertTrue(checked > 0)
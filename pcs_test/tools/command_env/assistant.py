@@ -81,6 +81,9 @@ def patch_env(call_queue, config, init_env, is_systemd=True):
             else spy.get_local_corosync_conf,
         ),
         patch_lib_env("communicator_factory", mock_communicator_factory),
+        # Do not let tests read or write the persistent agent caches
+        patch_lib_env("resource_agent_metadata_cache", None),
+        patch_lib_env("resource_agent_name_cache", None),
         # Use our custom ServiceManager in tests
         # TODO: add support for Spy
         patch_lib_env(
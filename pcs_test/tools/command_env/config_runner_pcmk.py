@@ -1007,3 +1007,47 @@ class PcmkShortcuts:
                 returncode=returncode,
             ),
         )
+
+    def get_rules_in_effect_status(
+        self,
+        rule_status_list,
+        stdout=None,
+        returncode=0,
+        name="runner.pcmk.get_rules_in_effect_status",
+        cib_load_name="runner.cib.load",
+    ):
+        """
+        Create a call for running a tool to get expired status of rules
+
+        list rule_status_list -- pairs of rule id and result of its check
+        string stdout -- tool's output, generated from rule_status_list if None
+        int returncode -- tool's exit code
+        sting name -- key of the call
+        string cib_load_name -- key of a call from whose stdout the cib is taken
+        """
+        cib_xml = self.__calls.get(cib_load_name).stdout
+        cmd = ["crm_rule", "--check", "--output-as", "xml", "--xml-text", "-"]
+        for rule_id, _ in rule_status_list:
+            cmd.extend(["--rule", rule_id])
+        if stdout is None:
+            stdout = """
+                <pacemaker-result api-version="2.20" request="crm_rule">
+                    {checks}
+                    <status code="0" message="OK"/>
+                </pacemaker-result>
+            """.format(
+                checks="\n".join(
+                    f'<rule-check rule-id="{rule_id}" rc="{rule_returncode}"/>'
+                    for rule_id, rule_returncode in rule_status_list
+                )
+            )
+        self.__calls.place(
+            name,
+            RunnerCall(
+                cmd,
+                check_stdin=CheckStdinEqualXml(cib_xml),
+                stdout=stdout,
+                stderr="",
+                returncode=returncode,
+            ),
+        )
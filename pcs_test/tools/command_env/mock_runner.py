@@ -146,3 +146,22 @@ class Runner:
                 f"Command #{i}: ENV doesn't match. Expected: {call.env}; Real: {env}"
             )
         return call.stdout, call.stderr, call.returncode
+
+    def run_parallel(
+        self,
+        args_list,
+        env_extend=None,
+        max_parallel=1,
+        timeout=None,
+        while_running=None,
+    ):
+        # pylint: disable=unused-argument
+        # Processes are run one by one in order to match them with expected
+        # calls deterministically. The function to run meanwhile is called
+        # once all of them are done.
+        result_list = [
+            self.run(args, env_extend=env_extend) for args in args_list
+        ]
+        if while_running is not None:
+            while_running()
+        return result_list
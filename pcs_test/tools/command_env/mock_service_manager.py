@@ -4,6 +4,7 @@ from typing import (
 )
 
 from pcs.common.services.interfaces.manager import ServiceManagerInterface
+from pcs.common.services.types import ServiceStatus
 
 CALL_TYPE_SERVICE_MANAGER = "CALL_TYPE_SERVICE_MANAGER"
 
@@ -68,6 +69,16 @@ class ServiceManagerMock(ServiceManagerInterface):
     def is_running(self, service, instance=None):
         return self._assert_call("is_running", service, instance)
 
+    def get_services_status(self, service_list):
+        # Services are checked one by one, so that tests can specify status
+        # of each service by the is_enabled and is_running calls.
+        return {
+            service: ServiceStatus(
+                self.is_enabled(service), self.is_running(service)
+            )
+            for service in service_list
+        }
+
     def is_installed(self, service):
         return self._assert_call("is_installed", service)
 
@@ -85,6 +85,22 @@ class Runner:
         print_line("returncode:{0}".format(returncode))
         return stdout, stderr, returncode
 
+    def run_parallel(
+        self,
+        args_list,
+        env_extend=None,
+        max_parallel=1,
+        timeout=None,
+        while_running=None,
+    ):
+        # pylint: disable=unused-argument
+        result_list = [
+            self.run(args, env_extend=env_extend) for args in args_list
+        ]
+        if while_running is not None:
+            while_running()
+        return result_list
+
 
 def get_local_corosync_conf():
     print_caption("get_local_corosync_conf", indent=0)
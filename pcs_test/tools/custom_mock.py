@@ -188,6 +188,7 @@ class MockCurl:
         self._error = error
         self._exception = exception
         self.request_obj = request
+        self.closed = False
 
     @property
     def opts(self):
@@ -200,6 +201,9 @@ class MockCurl:
     def reset(self):
         self._opts = {}
 
+    def close(self):
+        self.closed = True
+
     def setopt(self, opt, val):
         if isinstance(val, list):
             # in tests we use set operations (e.g. assertLessEqual) which
@@ -228,6 +232,16 @@ class MockCurl:
         if self._exception:
             # pylint: disable=raising-bad-type
             raise self._exception
+        prereq_callback = self._opts.get(
+            getattr(pycurl, "PREREQFUNCTION", None)
+        )
+        if prereq_callback:
+            # connection established
+            result = prereq_callback("127.0.0.1", "127.0.0.1", 2224, 40000)
+            if result != pycurl.PREREQFUNC_OK:
+                raise pycurl.error(
+                    pycurl.E_ABORTED_BY_CALLBACK, "operation aborted"
+                )
         if pycurl.WRITEFUNCTION in self._opts:
             self._opts[pycurl.WRITEFUNCTION](self._output)
         if pycurl.DEBUGFUNCTION in self._opts:
@@ -13,6 +13,7 @@ require 'backports/latest'
 require 'base64'
 require 'ethon'
 require 'openssl'
+require 'socket'
 
 require 'config.rb'
 require 'cfgsync.rb'
@@ -1758,6 +1759,20 @@ def pcs_internal_proxy_old(auth_user, data, cmd)
   return JSON.generate(output)
 end
 
+def run_pcs_internal_worker(auth_user, input_json)
+  # Run a pcs_internal request by a worker process of the python daemon. The
+  # request is preceded by a header specifying the user running the request.
+  header = {
+    :user => auth_user[:username],
+    :groups => auth_user[:usergroups] || [],
+  }
+  $logger.info("Running pcs_internal request by a worker")
+  UNIXSocket.open(PCS_INTERNAL_SOCKET) { |socket|
+    socket.write(JSON.generate(header) + "\n" + input_json + "\n")
+    return socket.read()
+  }
+end
+
 def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
   input_data = {
     :cmd => cmd,
@@ -1766,18 +1781,31 @@ def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
       :request_timeout => request_timeout,
     },
   }
-  stdout, stderr, return_val = run_cmd_options(
-    auth_user,
-    {'stdin' => JSON.generate(input_data)},
-    PCS_INTERNAL
-  )
-  if return_val != 0
-    return get_pcs_internal_output_format(
-      'exception', "Command failed: #{stderr.join("\n")}"
+  input_json = JSON.generate(input_data)
+  output = nil
+  if File.socket?(PCS_INTERNAL_SOCKET)
+    begin
+      output = run_pcs_internal_worker(auth_user, input_json)
+    rescue SystemCallError, IOError => e
+      $logger.warn(
+        "Unable to run command '#{cmd}' by a pcs_internal worker, running " +
+        "pcs_internal: #{e}"
+      )
+    end
+  end
+  if output.nil?
+    stdout, stderr, return_val = run_cmd_options(
+      auth_user, {'stdin' => input_json}, PCS_INTERNAL
     )
+    if return_val != 0
+      return get_pcs_internal_output_format(
+        'exception', "Command failed: #{stderr.join("\n")}"
+      )
+    end
+    output = stdout.join("\n")
   end
   begin
-    parsed_output = JSON.parse(stdout.join("\n"), {:symbolize_names => true})
+    parsed_output = JSON.parse(output, {:symbolize_names => true})
     if (
       parsed_output.include?(:report_list) \
       and \
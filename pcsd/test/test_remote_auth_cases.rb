@@ -0,0 +1,76 @@
+require 'test/unit'
+require 'json'
+
+require 'pcsd_test_utils.rb'
+require 'auth.rb'
+require 'pcs.rb'
+
+# The python part of pcsd authenticates some remote requests and checks their
+# permissions on its own. Both pcsd parts run the same cases to make sure they
+# behave the same.
+CASES = JSON.parse(File.read(File.join(
+  CURRENT_DIR, '..', '..', 'pcs_test', 'resources', 'remote_auth_cases.json'
+)))
+
+class TestRemoteAuthCases < Test::Unit::TestCase
+
+  def setup
+    $logger = MockLogger.new
+    omit_unless(
+      (SUPERUSER == CASES['superuser'] and ADMIN_GROUP == CASES['admin_group']),
+      'pcsd is configured with different superuser or admin group'
+    )
+    @get_users_groups = PCSAuth.method(:getUsersGroups)
+    PCSAuth.define_singleton_method(:getUsersGroups) { |username|
+      groups = CASES['user_groups'][username]
+      return groups.nil? ? [false, []] : [true, groups]
+    }
+  end
+
+  def teardown
+    unless @get_users_groups.nil?
+      PCSAuth.define_singleton_method(:getUsersGroups, @get_users_groups)
+    end
+  end
+
+  def write_file(path, content)
+    File.open(path, 'w') { |file| file.write(content) }
+  end
+
+  def test_login_by_token
+    write_file(PCSD_USERS_PATH, JSON.pretty_generate(CASES['users']))
+    CASES['login_by_token'].each { |test_case|
+      expected = nil
+      unless test_case['user'].nil?
+        expected = {
+          :username => test_case['user']['name'],
+          :usergroups => test_case['user']['groups'],
+        }
+      end
+      assert_equal(
+        expected, PCSAuth.loginByToken(test_case['cookies']),
+        "cookies: #{test_case['cookies']}"
+      )
+    }
+  end
+
+  def test_allowed_for_local_cluster
+    CASES['allows_local_cluster'].each { |test_case|
+      if test_case['pcs_settings'].nil?
+        FileUtils.rm_f(CFG_PCSD_SETTINGS)
+      else
+        write_file(CFG_PCSD_SETTINGS, test_case['pcs_settings'])
+      end
+      test_case['checks'].each { |username, groups, action, allowed|
+        assert_equal(
+          allowed,
+          allowed_for_local_cluster(
+            {:username => username, :usergroups => groups}, action
+          ),
+          "pcs_settings: #{test_case['pcs_settings'].inspect}, " +
+          "check: #{[username, groups, action]}"
+        )
+      }
+    }
+  end
+end